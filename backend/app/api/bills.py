@@ -1,19 +1,21 @@
 """Bill generation API routes."""
 from typing import Optional, Dict, List
-from fastapi import APIRouter, Query, Depends, HTTPException
+from fastapi import APIRouter, Query, Depends, HTTPException, Response
 
-from app.schemas.bill import BillResponse, BillListItem, BillDetailResponse, BillGenerateRequest
-from app.services.bill_service import BillService
-from app.core.dependencies import get_bill_service
+from app.schemas.bill import BillResponse, BillListItem, BillDetailResponse, BillGenerateRequest, BillRenderJobResponse
+from app.services.bill_service import AsyncBillService
+from app.services.bill_render_service import bill_render_worker
+from app.core.dependencies import get_async_bill_service
 from app.utils.datetime_utils import serialize_datetime_optional
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter(prefix="/bills", tags=["bills"])
 
 
 @router.post("/generate", response_model=BillResponse)
-def generate_bill(
+async def generate_bill(
     request: BillGenerateRequest,
-    service: BillService = Depends(get_bill_service)
+    service: AsyncBillService = Depends(get_async_bill_service)
 ):
     """
     Generate a bill from cart items.
@@ -21,11 +23,11 @@ def generate_bill(
     Args:
         request: Bill generation request with payment method, discounts, taxes
         service: Bill service dependency
-        
+    
     Returns:
         Bill information including file path
     """
-    result = service.generate_bill(
+    result = await service.generate_bill(
         cashier_name=request.cashier_name,
         discount_percent=request.discount_percent,
         discount_amount=request.discount_amount,
@@ -39,6 +41,7 @@ def generate_bill(
         cashier=result.get("cashier"),
         file_path=result["file_path"],
         pdf_path=result.get("pdf_path"),
+        render_status=result.get("render_status"),
         subtotal=result["subtotal"],
         discount_amount=result["discount_amount"],
         tax_amount=result["tax_amount"],
@@ -48,13 +51,13 @@ def generate_bill(
 
 
 @router.get("/generate", response_model=BillResponse)
-def generate_bill_get(
+async def generate_bill_get(
     cashier_name: Optional[str] = Query(None, description="Cashier name"),
     discount_percent: Optional[float] = Query(None, ge=0, le=100, description="Discount percentage"),
     discount_amount: Optional[float] = Query(None, ge=0, description="Fixed discount amount"),
     tax_percent: Optional[float] = Query(None, ge=0, le=100, description="Tax percentage"),
     payment_method: str = Query("cash", description="Payment method"),
-    service: BillService = Depends(get_bill_service)
+    service: AsyncBillService = Depends(get_async_bill_service)
 ):
     """
     Generate a bill from cart items (GET method for backward compatibility).
@@ -66,11 +69,11 @@ def generate_bill_get(
         tax_percent: Optional tax percentage (0-100)
         payment_method: Payment method (default: cash)
         service: Bill service dependency
-        
+    
     Returns:
         Bill information including file path
     """
-    result = service.generate_bill(
+    result = await service.generate_bill(
         cashier_name=cashier_name,
         discount_percent=discount_percent,
         discount_amount=discount_amount,
@@ -84,6 +87,7 @@ def generate_bill_get(
         cashier=result.get("cashier"),
         file_path=result["file_path"],
         pdf_path=result.get("pdf_path"),
+        render_status=result.get("render_status"),
         subtotal=result["subtotal"],
         discount_amount=result["discount_amount"],
         tax_amount=result["tax_amount"],
@@ -93,7 +97,8 @@ def generate_bill_get(
 
 
 @router.get("", response_model=Dict[str, BillListItem])
-def get_bills(
+async def get_bills(
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(100, ge=1, le=1000, description="Items per page"),
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
@@ -101,12 +106,16 @@ def get_bills(
     cashier_name: Optional[str] = Query(None, description="Filter by cashier name"),
     min_amount: Optional[float] = Query(None, ge=0, description="Minimum amount filter"),
     max_amount: Optional[float] = Query(None, ge=0, description="Maximum amount filter"),
-    service: BillService = Depends(get_bill_service)
+    cursor: Optional[str] = Query(None, description="Next-page token from the X-Next-Cursor header of the previous page"),
+    service: AsyncBillService = Depends(get_async_bill_service)
 ):
     """
     Get all bills with optional filtering and pagination.
     
+    The next page's token, if any, is returned in the X-Next-Cursor header.
+    
     Args:
+        response: Response whose headers receive the next-page token
         page: Page number (1-indexed)
         page_size: Number of items per page
         start_date: Start date filter (YYYY-MM-DD format)
@@ -114,23 +123,26 @@ def get_bills(
         cashier_name: Filter by cashier name
         min_amount: Minimum total amount filter
         max_amount: Maximum total amount filter
+        cursor: Next-page token (takes precedence over page)
         service: Bill service dependency
-        
+    
     Returns:
         Dictionary of bills
     """
-    bills = service.get_bills(
+    page = await service.get_bills(
         page=page,
         page_size=page_size,
         start_date=start_date,
         end_date=end_date,
         cashier_name=cashier_name,
         min_amount=min_amount,
-        max_amount=max_amount
+        max_amount=max_amount,
+        cursor=cursor
     )
+    set_next_cursor(response, page)
     
     result = {}
-    for bill in bills:
+    for bill in page.items:
         result[str(bill['bill_id'])] = BillListItem(
             bill_id=bill['bill_id'],
             cashier=bill.get('cashier_name'),
@@ -147,9 +159,9 @@ def get_bills(
 
 
 @router.get("/{bill_id}", response_model=BillDetailResponse)
-def get_bill(
+async def get_bill(
     bill_id: int,
-    service: BillService = Depends(get_bill_service)
+    service: AsyncBillService = Depends(get_async_bill_service)
 ):
     """
     Get a specific bill by ID.
@@ -157,11 +169,11 @@ def get_bill(
     Args:
         bill_id: Bill ID
         service: Bill service dependency
-        
+    
     Returns:
         Detailed bill information
     """
-    bill = service.get_bill(bill_id)
+    bill = await service.get_bill(bill_id)
     
     if not bill:
         raise HTTPException(status_code=404, detail="Bill not found")
@@ -180,8 +192,47 @@ def get_bill(
     )
 
 
+@router.get("/{bill_id}/render", response_model=BillRenderJobResponse)
+def get_bill_render_status(bill_id: int):
+    """
+    Get the status of a bill's background file/PDF rendering.
+    
+    Args:
+        bill_id: Bill ID
+    
+    Returns:
+        Render job status, attempts, last error and output paths
+    """
+    job = bill_render_worker.get_job(bill_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Render job not found")
+    
+    return BillRenderJobResponse(**job)
+
+
+@router.post("/{bill_id}/render/retry", response_model=BillRenderJobResponse)
+def retry_bill_render(bill_id: int):
+    """
+    Requeue a failed render job.
+    
+    Args:
+        bill_id: Bill ID
+    
+    Returns:
+        Render job status after requeueing
+    """
+    if not bill_render_worker.retry(bill_id):
+        job = bill_render_worker.get_job(bill_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Render job not found")
+        raise HTTPException(status_code=409, detail=f"Render job is {job['status']}, only failed jobs can be retried")
+    
+    return BillRenderJobResponse(**bill_render_worker.get_job(bill_id))
+
+
 # Legacy endpoint for backward compatibility
 @router.get("/generate-bill", response_model=BillResponse)
-def generate_bill_legacy(cashier_name: Optional[str] = Query(None)):
+async def generate_bill_legacy(cashier_name: Optional[str] = Query(None)):
     """Legacy endpoint for bill generation."""
-    return generate_bill(cashier_name)
+    return await generate_bill(cashier_name)
@@ -3,8 +3,8 @@ from typing import Dict
 from fastapi import APIRouter, HTTPException, Depends
 
 from app.schemas.cart import CartItemCreate, CartItemUpdate, CartItemResponse, CartResponse
-from app.services.cart_service import CartService
-from app.core.dependencies import get_cart_service
+from app.services.cart_service import AsyncCartService
+from app.core.dependencies import get_async_cart_service
 from app.utils.datetime_utils import serialize_datetime
 from app.utils.validators import validate_barcode, validate_quantity, validate_price
 
@@ -12,10 +12,10 @@ router = APIRouter(prefix="/cart", tags=["cart"])
 
 
 @router.post("/products", response_model=CartItemResponse)
-def add_product_cart(
+async def add_product_cart(
     barcode: str,
     product: CartItemCreate,
-    service: CartService = Depends(get_cart_service)
+    service: AsyncCartService = Depends(get_async_cart_service)
 ):
     """
     Add a product to cart.
@@ -24,7 +24,7 @@ def add_product_cart(
         barcode: Product barcode
         product: Product data
         service: Cart service dependency
-        
+    
     Returns:
         Created cart item information
     """
@@ -48,7 +48,7 @@ def add_product_cart(
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
     
-    cart_item = service.add_product(barcode, product_dict)
+    cart_item = await service.add_product(barcode, product_dict)
     
     return CartItemResponse(
         barcode=cart_item['barcode'],
@@ -61,10 +61,10 @@ def add_product_cart(
 
 
 @router.put("/products/{barcode}", response_model=CartItemResponse)
-def modify_product_cart(
+async def modify_product_cart(
     barcode: str,
     product: CartItemUpdate,
-    service: CartService = Depends(get_cart_service)
+    service: AsyncCartService = Depends(get_async_cart_service)
 ):
     """
     Modify a product in cart.
@@ -73,7 +73,7 @@ def modify_product_cart(
         barcode: Product barcode
         product: Updated product data
         service: Cart service dependency
-        
+    
     Returns:
         Updated cart item information
     """
@@ -97,7 +97,7 @@ def modify_product_cart(
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
     
-    cart_item = service.update_cart_item(barcode, product_dict)
+    cart_item = await service.update_cart_item(barcode, product_dict)
     
     return CartItemResponse(
         barcode=cart_item['barcode'],
@@ -110,9 +110,9 @@ def modify_product_cart(
 
 
 @router.delete("/products/{barcode}")
-def delete_product_cart(
+async def delete_product_cart(
     barcode: str,
-    service: CartService = Depends(get_cart_service)
+    service: AsyncCartService = Depends(get_async_cart_service)
 ):
     """
     Delete a product from cart.
@@ -120,7 +120,7 @@ def delete_product_cart(
     Args:
         barcode: Product barcode
         service: Cart service dependency
-        
+    
     Returns:
         Success message
     """
@@ -130,7 +130,7 @@ def delete_product_cart(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    deleted_item = service.delete_cart_item(barcode)
+    deleted_item = await service.delete_cart_item(barcode)
     
     return {
         "message": "Product deleted successfully",
@@ -142,17 +142,17 @@ def delete_product_cart(
 
 
 @router.get("/products", response_model=CartResponse)
-def get_list_cart(service: CartService = Depends(get_cart_service)):
+async def get_list_cart(service: AsyncCartService = Depends(get_async_cart_service)):
     """
     Get all products in cart.
     
     Args:
         service: Cart service dependency
-        
+    
     Returns:
         Dictionary of all cart items
     """
-    cart_items = service.get_all_cart_items()
+    cart_items = await service.get_all_cart_items()
     
     products_dict = {}
     for item in cart_items:
@@ -169,17 +169,17 @@ def get_list_cart(service: CartService = Depends(get_cart_service)):
 
 
 @router.delete("/clear")
-def clear_cart(service: CartService = Depends(get_cart_service)):
+async def clear_cart(service: AsyncCartService = Depends(get_async_cart_service)):
     """
     Clear all products from cart.
     
     Args:
         service: Cart service dependency
-        
+    
     Returns:
         Success message
     """
-    count = service.clear_cart()
+    count = await service.clear_cart()
     
     return {
         "message": "All products cleared from cart",
@@ -189,6 +189,6 @@ def clear_cart(service: CartService = Depends(get_cart_service)):
 
 # Legacy endpoint for backward compatibility
 @router.get("/list", response_model=CartResponse)
-def get_list_cart_legacy():
+async def get_list_cart_legacy(service: AsyncCartService = Depends(get_async_cart_service)):
     """Legacy endpoint for getting cart list."""
-    return get_list_cart()
+    return await get_list_cart(service)
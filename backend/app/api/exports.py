@@ -0,0 +1,108 @@
+"""Bulk export API routes."""
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.services.export_service import ExportService
+from app.core.dependencies import get_export_service
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+FORMAT_DESCRIPTION = "csv, ndjson or parquet (parquet requires pyarrow)"
+COMPRESS_DESCRIPTION = "Gzip the output on the fly (not applied to parquet)"
+
+
+def _stream(service: ExportService, name: str, **params) -> StreamingResponse:
+    """
+    Build a streamed download of an export.
+    
+    Args:
+        service: Export service
+        name: Export name
+        **params: Arguments for ExportService.export
+    
+    Returns:
+        Streaming response with a Content-Disposition file name
+    """
+    chunks, media_type, filename = service.export(name, **params)
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/products")
+def export_products(
+    format: str = Query("csv", description=FORMAT_DESCRIPTION),
+    compress: bool = Query(True, description=COMPRESS_DESCRIPTION),
+    service: ExportService = Depends(get_export_service)
+):
+    """
+    Export the whole product catalogue, ordered by barcode.
+    
+    Args:
+        format: Output format
+        compress: Gzip the output
+        service: Export service dependency
+    
+    Returns:
+        Streamed file
+    """
+    return _stream(service, "products", export_format=format, compress=compress)
+
+
+@router.get("/bills")
+def export_bills(
+    format: str = Query("csv", description=FORMAT_DESCRIPTION),
+    compress: bool = Query(True, description=COMPRESS_DESCRIPTION),
+    start_date: Optional[str] = Query(None, description="First day (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Last day (YYYY-MM-DD)"),
+    service: ExportService = Depends(get_export_service)
+):
+    """
+    Export bills, ordered by id.
+    
+    Args:
+        format: Output format
+        compress: Gzip the output
+        start_date: Only bills created on or after this day
+        end_date: Only bills created on or before this day
+        service: Export service dependency
+    
+    Returns:
+        Streamed file
+    """
+    return _stream(
+        service, "bills", export_format=format, compress=compress,
+        start_date=start_date, end_date=end_date
+    )
+
+
+@router.get("/stock-history")
+def export_stock_history(
+    format: str = Query("csv", description=FORMAT_DESCRIPTION),
+    compress: bool = Query(True, description=COMPRESS_DESCRIPTION),
+    start_date: Optional[str] = Query(None, description="First day (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="Last day (YYYY-MM-DD)"),
+    barcode: Optional[str] = Query(None, description="Only this product's history"),
+    service: ExportService = Depends(get_export_service)
+):
+    """
+    Export stock history, ordered by id.
+    
+    Args:
+        format: Output format
+        compress: Gzip the output
+        start_date: Only changes on or after this day
+        end_date: Only changes on or before this day
+        barcode: Only this product's changes
+        service: Export service dependency
+    
+    Returns:
+        Streamed file
+    """
+    return _stream(
+        service, "stock-history", export_format=format, compress=compress,
+        start_date=start_date, end_date=end_date, barcode=barcode
+    )
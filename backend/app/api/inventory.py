@@ -1,21 +1,24 @@
 """Inventory management API routes."""
-from typing import Dict, Optional
-from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from starlette.concurrency import run_in_threadpool
 
-from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
-from app.services.inventory_service import InventoryService
-from app.core.dependencies import get_inventory_service
+from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductSearchResult
+from app.services.inventory_service import AsyncInventoryService
+from app.services.product_import_service import IMPORT_FORMATS, ProductImport
+from app.core.dependencies import get_async_inventory_service
 from app.utils.datetime_utils import serialize_datetime
+from app.utils.pagination import set_next_cursor
 from app.utils.validators import validate_barcode, validate_quantity, validate_price
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
 
 @router.post("/products", response_model=ProductResponse)
-def add_product(
+async def add_product(
     barcode: str,
     product: ProductCreate,
-    service: InventoryService = Depends(get_inventory_service)
+    service: AsyncInventoryService = Depends(get_async_inventory_service)
 ):
     """
     Add a new product to inventory.
@@ -24,7 +27,7 @@ def add_product(
         barcode: Product barcode
         product: Product data
         service: Inventory service dependency
-        
+    
     Returns:
         Created product information
     """
@@ -48,7 +51,7 @@ def add_product(
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
     
-    created_product = service.add_product(barcode, product_dict)
+    created_product = await service.add_product(barcode, product_dict)
     
     reorder_point = created_product.get('reorder_point', 0)
     quantity = created_product.get('quantity', 0)
@@ -65,11 +68,69 @@ def add_product(
     )
 
 
+# Content types recognized when no ?format= is given
+IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+@router.post("/products/import")
+async def import_products(
+    request: Request,
+    format: Optional[str] = Query(None, description="csv or ndjson (defaults from the Content-Type)"),
+    reason: str = Query("Bulk import", max_length=255, description="Stock history reason for quantity changes")
+):
+    """
+    Bulk insert or update products from a CSV or NDJSON request body.
+    
+    The body is streamed: rows are validated as they arrive and written in
+    batches of PRODUCT_IMPORT_BATCH_SIZE with multi-row upserts, each batch
+    in its own transaction. Invalid rows are skipped and listed in the
+    report; the other rows are still imported.
+    
+    CSV needs a header row with at least barcode, product_name and price;
+    quantity, details, reorder_point and category_id are optional. NDJSON
+    lines are objects with the same keys.
+    
+    Args:
+        request: Request whose body holds the products
+        format: Import format
+        reason: Stock history reason
+    
+    Returns:
+        Import report with row counts and per-row errors
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    import_format = (format or IMPORT_CONTENT_TYPES.get(content_type, "")).lower()
+    if import_format not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=415,
+            detail="Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson"
+        )
+    
+    product_import = ProductImport(import_format, reason=reason)
+    try:
+        async for chunk in request.stream():
+            for batch in product_import.feed(chunk):
+                await run_in_threadpool(product_import.write_batch, batch)
+        for batch in product_import.finish():
+            await run_in_threadpool(product_import.write_batch, batch)
+    except ValueError as e:
+        # Batches written before the error stay committed
+        raise HTTPException(status_code=400, detail=f"{e} (after {product_import.report()['rows']} row(s))")
+    
+    return product_import.report()
+
+
 @router.put("/products/{barcode}", response_model=ProductResponse)
-def modify_product(
+async def modify_product(
     barcode: str,
     product: ProductUpdate,
-    service: InventoryService = Depends(get_inventory_service)
+    service: AsyncInventoryService = Depends(get_async_inventory_service)
 ):
     """
     Modify an existing product in inventory.
@@ -78,7 +139,7 @@ def modify_product(
         barcode: Product barcode
         product: Updated product data
         service: Inventory service dependency
-        
+    
     Returns:
         Updated product information
     """
@@ -102,7 +163,7 @@ def modify_product(
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
     
-    updated_product = service.update_product(barcode, product_dict)
+    updated_product = await service.update_product(barcode, product_dict)
     
     reorder_point = updated_product.get('reorder_point', 0)
     quantity = updated_product.get('quantity', 0)
@@ -120,9 +181,9 @@ def modify_product(
 
 
 @router.delete("/products/{barcode}")
-def delete_product(
+async def delete_product(
     barcode: str,
-    service: InventoryService = Depends(get_inventory_service)
+    service: AsyncInventoryService = Depends(get_async_inventory_service)
 ):
     """
     Delete a product from inventory.
@@ -130,7 +191,7 @@ def delete_product(
     Args:
         barcode: Product barcode
         service: Inventory service dependency
-        
+    
     Returns:
         Success message
     """
@@ -140,7 +201,7 @@ def delete_product(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    deleted_product = service.delete_product(barcode)
+    deleted_product = await service.delete_product(barcode)
     
     return {
         "message": "Product deleted successfully",
@@ -152,7 +213,8 @@ def delete_product(
 
 
 @router.get("/products", response_model=Dict[str, ProductResponse])
-def get_list_inventory(
+async def get_list_inventory(
+    response: Response,
     search: Optional[str] = Query(None, description="Search by product name"),
     min_price: Optional[float] = Query(None, ge=0, description="Minimum price filter"),
     max_price: Optional[float] = Query(None, ge=0, description="Maximum price filter"),
@@ -160,34 +222,41 @@ def get_list_inventory(
     low_stock_only: Optional[bool] = Query(None, description="Only return low stock items"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(100, ge=1, le=1000, description="Items per page"),
-    service: InventoryService = Depends(get_inventory_service)
+    cursor: Optional[str] = Query(None, description="Next-page token from the X-Next-Cursor header of the previous page"),
+    service: AsyncInventoryService = Depends(get_async_inventory_service)
 ):
     """
     Get all products in inventory with optional search and filtering.
     
+    The next page's token, if any, is returned in the X-Next-Cursor header.
+    
     Args:
+        response: Response whose headers receive the next-page token
         search: Search term for product name
         min_price: Minimum price filter
         max_price: Maximum price filter
         page: Page number (1-indexed)
         page_size: Number of items per page
+        cursor: Next-page token (takes precedence over page)
         service: Inventory service dependency
-        
+    
     Returns:
         Dictionary of products matching filters
     """
-    products = service.get_all_products(
+    page = await service.get_all_products(
         search=search,
         min_price=min_price,
         max_price=max_price,
         category_id=category_id,
         low_stock_only=low_stock_only,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        cursor=cursor
     )
+    set_next_cursor(response, page)
     
     result = {}
-    for product in products:
+    for product in page.items:
         result[product['barcode']] = ProductResponse(
             barcode=product['barcode'],
             product_name=product['product_name'],
@@ -203,9 +272,43 @@ def get_list_inventory(
     return result
 
 
+@router.get("/products/search", response_model=List[ProductSearchResult])
+async def search_products(
+    q: str = Query(..., min_length=1, max_length=255, description="Product name terms or barcode prefix"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+    service: AsyncInventoryService = Depends(get_async_inventory_service)
+):
+    """
+    Search products by name or barcode prefix.
+    
+    Args:
+        q: Search text
+        limit: Maximum number of results
+        service: Inventory service dependency
+    
+    Returns:
+        Matching products, best matches first
+    """
+    return [
+        ProductSearchResult(
+            barcode=product['barcode'],
+            product_name=product['product_name'],
+            price=product['price'],
+            quantity=product['quantity'],
+            details=product['details'],
+            reorder_point=product.get('reorder_point', 0),
+            category_id=product.get('category_id'),
+            is_low_stock=product.get('is_low_stock', False),
+            timestamp=serialize_datetime(product['timestamp']),
+            match=product['match']
+        )
+        for product in await service.search_products(q, limit)
+    ]
+
+
 @router.get("/products/low-stock", response_model=Dict[str, ProductResponse])
-def get_low_stock_products(
-    service: InventoryService = Depends(get_inventory_service)
+async def get_low_stock_products(
+    service: AsyncInventoryService = Depends(get_async_inventory_service)
 ):
     """
     Get all products with low stock (quantity <= reorder_point).
@@ -213,7 +316,7 @@ def get_low_stock_products(
     Returns:
         Dictionary of low stock products
     """
-    products = service.get_low_stock_products()
+    products = await service.get_low_stock_products()
     
     result = {}
     for product in products:
@@ -233,18 +336,22 @@ def get_low_stock_products(
 
 
 @router.get("/products/{barcode}/stock-history")
-def get_stock_history(
+async def get_stock_history(
     barcode: str,
+    response: Response,
     limit: int = Query(50, ge=1, le=500, description="Maximum number of records"),
-    service: InventoryService = Depends(get_inventory_service)
+    cursor: Optional[str] = Query(None, description="Next-page token from the X-Next-Cursor header of the previous page"),
+    service: AsyncInventoryService = Depends(get_async_inventory_service)
 ):
     """
     Get stock history for a product.
     
     Args:
         barcode: Product barcode
+        response: Response whose headers receive the next-page token
         limit: Maximum number of records to return
-        
+        cursor: Next-page token from a previous page
+    
     Returns:
         List of stock history records
     """
@@ -253,12 +360,27 @@ def get_stock_history(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    history = service.get_stock_history(barcode, limit)
-    return {"barcode": barcode, "history": history}
+    page = await service.get_stock_history(barcode, limit, cursor=cursor)
+    set_next_cursor(response, page)
+    return {"barcode": barcode, "history": page.items}
 
 
 # Legacy endpoint for backward compatibility
 @router.put("/list", response_model=Dict[str, ProductResponse])
-def get_list_inventory_legacy():
-    """Legacy endpoint for getting inventory list."""
-    return get_list_inventory()
+async def get_list_inventory_legacy(
+    response: Response,
+    service: AsyncInventoryService = Depends(get_async_inventory_service)
+):
+    """Legacy endpoint for getting inventory list (first page, no filters)."""
+    return await get_list_inventory(
+        response,
+        search=None,
+        min_price=None,
+        max_price=None,
+        category_id=None,
+        low_stock_only=None,
+        page=1,
+        page_size=100,
+        cursor=None,
+        service=service
+    )
@@ -0,0 +1,30 @@
+"""Runtime metrics API routes."""
+from fastapi import APIRouter
+
+from app.core.async_database import async_pool
+from app.core.database import connection_pool
+from app.services.bill_render_service import bill_render_worker
+from app.services.camera_manager import camera_manager
+from app.services.inventory_service import product_cache
+from app.services.report_service import report_cache
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("")
+def get_metrics():
+    """
+    Get runtime metrics.
+    
+    Returns:
+        Metrics grouped by subsystem
+    """
+    return {
+        "db_pool": connection_pool.get_stats() if connection_pool else None,
+        "db_replicas": connection_pool.get_replica_stats() if connection_pool else None,
+        "async_db_replicas": async_pool.get_replica_stats(),
+        "camera": camera_manager.get_metrics(),
+        "product_cache": product_cache.get_stats(),
+        "report_cache": report_cache.get_stats(),
+        "bill_render": bill_render_worker.get_metrics()
+    }
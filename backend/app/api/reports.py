@@ -1,7 +1,10 @@
 """Sales reporting API routes."""
+from email.utils import formatdate, parsedate_to_datetime
 from typing import Optional
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, Query, Depends, Request, Response
 
+from app.core.cache import CachedReport
+from app.core.config import settings
 from app.services.report_service import ReportService
 from app.core.dependencies import get_report_service
 
@@ -13,8 +16,47 @@ def get_report_service() -> ReportService:
     return ReportService()
 
 
+def _report_response(request: Request, report: CachedReport) -> Response:
+    """
+    Build a report response, or a 304 if the client's copy is current.
+    
+    If-None-Match takes precedence over If-Modified-Since, as in RFC 9110.
+    Reports over the current period must be revalidated on every use;
+    closed periods may be reused for REPORT_CACHE_MAX_AGE seconds.
+    
+    Args:
+        request: Incoming request with optional conditional headers
+        report: Cached report
+    
+    Returns:
+        200 response with the report body, or an empty 304
+    """
+    headers = {
+        "ETag": report.etag,
+        "Last-Modified": formatdate(report.last_modified, usegmt=True),
+        "Cache-Control": f"max-age={settings.REPORT_CACHE_MAX_AGE}" if report.closed else "no-cache",
+    }
+    
+    not_modified = False
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        not_modified = "*" in tags or report.etag in tags
+    elif if_modified_since:
+        try:
+            not_modified = parsedate_to_datetime(if_modified_since).timestamp() >= int(report.last_modified)
+        except (TypeError, ValueError):
+            pass  # Unparseable dates are ignored
+    
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return Response(content=report.body, media_type="application/json", headers=headers)
+
+
 @router.get("/daily")
 def get_daily_sales(
+    request: Request,
     date: Optional[str] = Query(None, description="Date in YYYY-MM-DD format (defaults to today)"),
     cashier_name: Optional[str] = Query(None, description="Filter by cashier name"),
     service: ReportService = Depends(get_report_service)
@@ -23,18 +65,20 @@ def get_daily_sales(
     Get daily sales report.
     
     Args:
+        request: Incoming request
         date: Date in YYYY-MM-DD format
         cashier_name: Optional cashier name filter
         service: Report service dependency
-        
+    
     Returns:
         Daily sales summary
     """
-    return service.get_daily_sales(date=date, cashier_name=cashier_name)
+    return _report_response(request, service.get_cached_report("daily", date=date, cashier_name=cashier_name))
 
 
 @router.get("/weekly")
 def get_weekly_sales(
+    request: Request,
     week_start: Optional[str] = Query(None, description="Week start date in YYYY-MM-DD format"),
     cashier_name: Optional[str] = Query(None, description="Filter by cashier name"),
     service: ReportService = Depends(get_report_service)
@@ -43,18 +87,23 @@ def get_weekly_sales(
     Get weekly sales report.
     
     Args:
+        request: Incoming request
         week_start: Week start date in YYYY-MM-DD format
         cashier_name: Optional cashier name filter
         service: Report service dependency
-        
+    
     Returns:
         Weekly sales summary
     """
-    return service.get_weekly_sales(week_start=week_start, cashier_name=cashier_name)
+    return _report_response(
+        request,
+        service.get_cached_report("weekly", week_start=week_start, cashier_name=cashier_name)
+    )
 
 
 @router.get("/monthly")
 def get_monthly_sales(
+    request: Request,
     year: int = Query(..., description="Year (e.g., 2024)"),
     month: int = Query(..., ge=1, le=12, description="Month (1-12)"),
     cashier_name: Optional[str] = Query(None, description="Filter by cashier name"),
@@ -64,13 +113,127 @@ def get_monthly_sales(
     Get monthly sales report.
     
     Args:
+        request: Incoming request
         year: Year
         month: Month (1-12)
         cashier_name: Optional cashier name filter
         service: Report service dependency
-        
+    
     Returns:
         Monthly sales summary
     """
-    return service.get_monthly_sales(year=year, month=month, cashier_name=cashier_name)
+    return _report_response(
+        request,
+        service.get_cached_report("monthly", year=year, month=month, cashier_name=cashier_name)
+    )
+
+
+@router.get("/sales")
+def get_sales(
+    request: Request,
+    start_date: Optional[str] = Query(None, description="First day in YYYY-MM-DD format (defaults to 30 days ending today)"),
+    end_date: Optional[str] = Query(None, description="Last day in YYYY-MM-DD format (defaults to today)"),
+    breakdown: str = Query("", description="Comma-separated breakdowns: payment, cashier, day, hour"),
+    cashier_name: Optional[str] = Query(None, description="Filter by cashier name"),
+    service: ReportService = Depends(get_report_service)
+):
+    """
+    Get a sales summary with any combination of breakdowns.
+    
+    Args:
+        request: Incoming request
+        start_date: First day in YYYY-MM-DD format
+        end_date: Last day in YYYY-MM-DD format
+        breakdown: Comma-separated breakdown dimensions
+        cashier_name: Optional cashier name filter
+        service: Report service dependency
+    
+    Returns:
+        Sales summary, breakdowns and combined groups
+    """
+    dimensions = [dimension.strip() for dimension in breakdown.split(",") if dimension.strip()]
+    return _report_response(request, service.get_cached_report(
+        "sales",
+        start_date=start_date,
+        end_date=end_date,
+        dimensions=dimensions,
+        cashier_name=cashier_name
+    ))
 
+
+@router.get("/top-products")
+def get_top_products(
+    request: Request,
+    start_date: Optional[str] = Query(None, description="First day in YYYY-MM-DD format (defaults to 30 days ending today)"),
+    end_date: Optional[str] = Query(None, description="Last day in YYYY-MM-DD format (defaults to today)"),
+    limit: int = Query(10, ge=1, le=100, description="Number of products"),
+    order_by: str = Query("units", description="Rank by 'units' or 'revenue'"),
+    service: ReportService = Depends(get_report_service)
+):
+    """
+    Get the best-selling products.
+    
+    Args:
+        request: Incoming request
+        start_date: First day in YYYY-MM-DD format
+        end_date: Last day in YYYY-MM-DD format
+        limit: Number of products
+        order_by: Rank by units sold or revenue
+        service: Report service dependency
+    
+    Returns:
+        Ranked products
+    """
+    return _report_response(request, service.get_cached_report(
+        "top-products", start_date=start_date, end_date=end_date, limit=limit, order_by=order_by
+    ))
+
+
+@router.get("/category-units")
+def get_category_units(
+    request: Request,
+    start_date: Optional[str] = Query(None, description="First day in YYYY-MM-DD format (defaults to 30 days ending today)"),
+    end_date: Optional[str] = Query(None, description="Last day in YYYY-MM-DD format (defaults to today)"),
+    service: ReportService = Depends(get_report_service)
+):
+    """
+    Get units sold per product category.
+    
+    Args:
+        request: Incoming request
+        start_date: First day in YYYY-MM-DD format
+        end_date: Last day in YYYY-MM-DD format
+        service: Report service dependency
+    
+    Returns:
+        Units and revenue per category
+    """
+    return _report_response(
+        request,
+        service.get_cached_report("category-units", start_date=start_date, end_date=end_date)
+    )
+
+
+@router.get("/basket-sizes")
+def get_basket_sizes(
+    request: Request,
+    start_date: Optional[str] = Query(None, description="First day in YYYY-MM-DD format (defaults to 30 days ending today)"),
+    end_date: Optional[str] = Query(None, description="Last day in YYYY-MM-DD format (defaults to today)"),
+    service: ReportService = Depends(get_report_service)
+):
+    """
+    Get the basket size distribution.
+    
+    Args:
+        request: Incoming request
+        start_date: First day in YYYY-MM-DD format
+        end_date: Last day in YYYY-MM-DD format
+        service: Report service dependency
+    
+    Returns:
+        Bills per basket size
+    """
+    return _report_response(
+        request,
+        service.get_cached_report("basket-sizes", start_date=start_date, end_date=end_date)
+    )
@@ -1,27 +1,272 @@
 """Barcode scanning API routes."""
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+import json
+from typing import List, Optional, Tuple
 
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import UploadFile
+
+from app.core.config import settings
+from app.core.logging import logger
 from app.schemas.product import ProductInfo
-from app.services.barcode_service import BarcodeService
-from app.core.dependencies import get_barcode_service
+from app.schemas.scan import ImageDecodeResponse, ScanJobResponse
+from app.services.image_decode_service import ImageDecodeService
+from app.services.preview_service import preview_broadcaster
+from app.services.scan_job_service import scan_job_manager
+from app.services.scan_session_service import ScanSession
+from app.core.dependencies import get_image_decode_service
 
 router = APIRouter(prefix="/scan", tags=["scanner"])
 
 
 @router.get("/barcode", response_model=ProductInfo)
-def scan_barcode(service: BarcodeService = Depends(get_barcode_service)):
+async def scan_barcode():
     """
     Scan a barcode using the camera.
     
-    Args:
-        service: Barcode service dependency
-        
+    Runs the scan as a job on the dedicated scan executor and awaits it, so
+    a waiting client holds no threadpool worker. If the client disconnects
+    the scan is cancelled.
+    
     Returns:
         Product information if barcode is found
     """
-    result = service.scan_barcode()
+    job = scan_job_manager.submit()
+    try:
+        await scan_job_manager.wait(job, job.timeout + settings.CAMERA_OPEN_TIMEOUT + 5)
+    except asyncio.CancelledError:
+        scan_job_manager.cancel(job.id)
+        raise
+    
+    if job.status != job.COMPLETED:
+        if not job.done:
+            scan_job_manager.cancel(job.id)
+        raise HTTPException(status_code=400, detail=job.error or "No barcode detected")
+    
+    return job.result
+
+
+@router.post("/jobs", response_model=ScanJobResponse, status_code=202)
+def start_scan_job(
+    timeout: Optional[int] = Query(None, ge=1, le=300, description="Scan timeout in seconds")
+):
+    """
+    Start an asynchronous barcode scan.
+    
+    Poll GET /scan/jobs/{job_id}?wait=N (long-poll) or follow
+    GET /scan/jobs/{job_id}/events (Server-Sent Events) for the result.
+    
+    Args:
+        timeout: Scan timeout in seconds (defaults to SCANNER_TIMEOUT)
+    
+    Returns:
+        The queued scan job
+    """
+    return scan_job_manager.submit(timeout).to_dict()
+
+
+@router.get("/jobs/{job_id}", response_model=ScanJobResponse)
+async def get_scan_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=60, description="Seconds to wait for the job to finish (long-poll)")
+):
+    """
+    Get the state of a scan job, optionally waiting for it to finish.
+    
+    Args:
+        job_id: Scan job id
+        wait: Long-poll duration in seconds
+    
+    Returns:
+        The scan job
+    """
+    job = scan_job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    
+    await scan_job_manager.wait(job, wait)
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}/events")
+async def scan_job_events(job_id: str):
+    """
+    Stream a scan job's progress as Server-Sent Events.
     
-    if "error" in result:
-        raise HTTPException(status_code=400, detail=result["error"])
+    Emits a "status" event immediately and a final "completed", "failed" or
+    "cancelled" event carrying the job, then closes the stream.
     
-    return result
+    Args:
+        job_id: Scan job id
+    
+    Returns:
+        text/event-stream response
+    """
+    job = scan_job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    
+    return StreamingResponse(
+        scan_job_manager.events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+@router.delete("/jobs/{job_id}", response_model=ScanJobResponse)
+async def cancel_scan_job(job_id: str):
+    """
+    Cancel a scan job and release its camera subscription.
+    
+    Args:
+        job_id: Scan job id
+    
+    Returns:
+        The scan job
+    """
+    job = scan_job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    
+    # A running scan notices the cancellation at its next poll
+    await scan_job_manager.wait(job, 1.0)
+    return job.to_dict()
+
+
+@router.websocket("/stream")
+async def scan_stream(websocket: WebSocket):
+    """
+    Continuous scan session over a WebSocket.
+    
+    Pushes a {"type": "barcode", ...} event, joined with the product row,
+    for every newly detected barcode. Repeats within SCAN_SESSION_DEDUP_SECONDS
+    are suppressed. The client may send {"action": "reset"} to clear the dedup
+    window, {"action": "stats"} for session counters, or {"action": "stop"}.
+    Messages that are not valid JSON are ignored.
+    
+    Args:
+        websocket: Client connection
+    """
+    await websocket.accept()
+    session = ScanSession()
+    await websocket.send_json({"type": "session", "session_id": session.id, "dedup_window": session.dedup_window})
+    
+    async def push_events():
+        async for event in session.events():
+            await websocket.send_json(event)
+            if event["type"] == "error":
+                await websocket.close(code=1011)
+                return
+    
+    sender = asyncio.create_task(push_events())
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except json.JSONDecodeError:
+                logger.warning(f"Scan session {session.id}: ignoring message that is not JSON")
+                continue
+            action = message.get("action") if isinstance(message, dict) else None
+            if action == "reset":
+                session.reset()
+            elif action == "stats":
+                await websocket.send_json({"type": "stats", **session.get_stats()})
+            elif action == "stop":
+                await websocket.close()
+                break
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        sender.cancel()
+        logger.info(f"Scan session {session.id} closed: {session.get_stats()}")
+
+
+@router.get("/preview")
+async def scan_preview():
+    """
+    Stream the scanner camera preview as MJPEG.
+    
+    Frames are only encoded while at least one client is connected, so the
+    preview costs nothing when nobody is watching. Open the URL in a browser
+    or an <img> tag while a scan is running.
+    
+    Returns:
+        multipart/x-mixed-replace stream of JPEG frames
+    """
+    return StreamingResponse(
+        preview_broadcaster.stream(),
+        media_type=f"multipart/x-mixed-replace; boundary={preview_broadcaster.BOUNDARY}"
+    )
+
+
+async def _read_upload_images(request: Request) -> List[Tuple[Optional[str], bytes]]:
+    """
+    Collect encoded images from a multipart form or a raw request body.
+    
+    Args:
+        request: Incoming request
+    
+    Returns:
+        List of (filename, encoded bytes) pairs
+    """
+    content_type = request.headers.get("content-type", "").lower()
+    max_bytes = settings.SCANNER_DECODE_MAX_IMAGE_BYTES
+    images: List[Tuple[Optional[str], bytes]] = []
+    
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form(max_files=settings.SCANNER_DECODE_MAX_IMAGES)
+        try:
+            for _, value in form.multi_items():
+                if not isinstance(value, UploadFile):
+                    continue
+                data = await value.read()
+                if len(data) > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"Image '{value.filename}' exceeds {max_bytes} bytes")
+                images.append((value.filename, data))
+        finally:
+            await form.close()
+    elif content_type.startswith("image/") or content_type.startswith("application/octet-stream"):
+        data = await request.body()
+        if len(data) > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Image exceeds {max_bytes} bytes")
+        if data:
+            images.append((None, data))
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail="Send images as multipart/form-data or as a raw image/* body"
+        )
+    
+    if not images:
+        raise HTTPException(status_code=400, detail="No images provided")
+    if len(images) > settings.SCANNER_DECODE_MAX_IMAGES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many images (maximum {settings.SCANNER_DECODE_MAX_IMAGES} per request)"
+        )
+    return images
+
+
+@router.post("/decode", response_model=ImageDecodeResponse)
+async def decode_images(
+    request: Request,
+    service: ImageDecodeService = Depends(get_image_decode_service)
+):
+    """
+    Decode barcodes from uploaded JPEG/PNG images.
+    
+    Accepts one or more files as multipart/form-data (any field name), or a
+    single image as the raw request body. Decoding runs in a process pool,
+    so the event loop and the camera threads are never blocked.
+    
+    Args:
+        request: Incoming request carrying the images
+        service: Image decode service dependency
+    
+    Returns:
+        Decoded barcodes for each image, in upload order
+    """
+    images = await _read_upload_images(request)
+    results = await service.decode_images(images)
+    return {"count": len(results), "results": results}
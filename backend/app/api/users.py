@@ -1,11 +1,12 @@
 """User management API routes."""
 from typing import Dict, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
 from app.schemas.user import UserCreate, UserResponse
 from app.services.user_service import UserService
 from app.core.dependencies import get_user_service
 from app.utils.datetime_utils import serialize_datetime_optional
+from app.utils.pagination import set_next_cursor
 from app.utils.validators import validate_user_id
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -22,7 +23,7 @@ def add_user(
     Args:
         user: User data
         service: User service dependency
-        
+    
     Returns:
         Created user information
     """
@@ -49,7 +50,7 @@ def modify_user(
         user_id: User ID
         name: New user name
         service: User service dependency
-        
+    
     Returns:
         Updated user information
     """
@@ -85,7 +86,7 @@ def delete_user(
     Args:
         user_id: User ID
         service: User service dependency
-        
+    
     Returns:
         Success message
     """
@@ -108,25 +109,32 @@ def delete_user(
 
 @router.get("", response_model=Dict[str, UserResponse])
 def get_users(
+    response: Response,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(100, ge=1, le=1000, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Next-page token from the X-Next-Cursor header of the previous page"),
     service: UserService = Depends(get_user_service)
 ):
     """
     Get all users with pagination.
     
+    The next page's token, if any, is returned in the X-Next-Cursor header.
+    
     Args:
+        response: Response whose headers receive the next-page token
         page: Page number (1-indexed)
         page_size: Number of items per page
+        cursor: Next-page token (takes precedence over page)
         service: User service dependency
-        
+    
     Returns:
         Dictionary of users
     """
-    users = service.get_all_users(page=page, page_size=page_size)
+    page = service.get_all_users(page=page, page_size=page_size, cursor=cursor)
+    set_next_cursor(response, page)
     
     result = {}
-    for user in users:
+    for user in page.items:
         result[user['id']] = UserResponse(
             id=user['id'],
             name=user['name'],
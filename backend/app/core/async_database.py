@@ -0,0 +1,190 @@
+"""Async MySQL connection pool for async routes."""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.db_routing import ReplicaSet, mark_primary_used, parse_hosts, primary_used
+from app.core.exceptions import DatabasePoolTimeoutError
+from app.core.logging import logger
+
+try:
+    import aiomysql
+    from aiomysql import DictCursor, Error as AsyncDBError
+    AIOMYSQL_AVAILABLE = True
+except ImportError:
+    DictCursor = None
+    AsyncDBError = Exception
+    AIOMYSQL_AVAILABLE = False
+    logger.warning("aiomysql not available. Async database routes will be disabled.")
+
+
+class AsyncMySQLPool:
+    """
+    aiomysql connection pool manager.
+    
+    The pool has to be created inside the running event loop, so it is
+    opened on application startup rather than at import like the sync pool.
+    Connections run in autocommit mode: reads cost no transaction, and
+    writes spanning several statements call `await conn.begin()` first.
+    Read replicas from DB_REPLICA_HOSTS get pools of their own, routed as
+    in MySQLConnectionPool.
+    """
+    
+    def __init__(self):
+        """Initialize the (not yet opened) pool manager."""
+        self.pool = None
+        self.replicas = ReplicaSet([], settings.DB_REPLICA_SELECTION, settings.DB_REPLICA_RETRY_SECONDS, _pool_in_use)
+    
+    @staticmethod
+    async def _create_pool(host: str, port: int, minsize: int, **connect_kwargs):
+        """Create an aiomysql pool for one server."""
+        return await aiomysql.create_pool(
+            host=host,
+            port=port,
+            user=settings.DB_USER,
+            password=settings.DB_PASSWORD,
+            db=settings.DB_NAME,
+            charset=settings.DB_CHARSET,
+            autocommit=True,
+            minsize=minsize,
+            maxsize=settings.ASYNC_DB_POOL_MAX_SIZE,
+            pool_recycle=settings.ASYNC_DB_POOL_RECYCLE,
+            **connect_kwargs
+        )
+    
+    async def open(self):
+        """Create the pool; logs and leaves it closed if MySQL is unreachable."""
+        if self.pool is not None:
+            return
+        if not AIOMYSQL_AVAILABLE:
+            logger.error("Cannot create async MySQL connection pool: aiomysql is not installed")
+            return
+        try:
+            self.pool = await self._create_pool(settings.DB_HOST, settings.DB_PORT, settings.ASYNC_DB_POOL_MIN_SIZE)
+            logger.info(f"Async MySQL connection pool created: {settings.DB_NAME}@{settings.DB_HOST}")
+        except Exception as e:
+            logger.error(f"Error creating async MySQL connection pool: {e}")
+            return
+        
+        # minsize=0: replica connections are opened on first use
+        replicas = []
+        for host, port in parse_hosts(settings.DB_REPLICA_HOSTS, settings.DB_PORT):
+            pool = await self._create_pool(host, port, 0, connect_timeout=settings.DB_REPLICA_CONNECT_TIMEOUT)
+            replicas.append((f"{host}:{port}", pool))
+        self.replicas = ReplicaSet(replicas, settings.DB_REPLICA_SELECTION, settings.DB_REPLICA_RETRY_SECONDS, _pool_in_use)
+    
+    async def close(self):
+        """Close all pooled connections."""
+        if self.pool is not None:
+            for _, pool in [("primary", self.pool)] + self.replicas.replicas:
+                pool.close()
+                await pool.wait_closed()
+            self.pool = None
+            self.replicas = ReplicaSet([], settings.DB_REPLICA_SELECTION, settings.DB_REPLICA_RETRY_SECONDS, _pool_in_use)
+    
+    async def acquire(self, read_only: bool = False) -> Tuple:
+        """
+        Acquire a connection, from a replica if read_only allows it.
+        
+        Args:
+            read_only: The caller only reads
+        
+        Returns:
+            (pool, connection); the connection goes back with pool.release()
+        
+        Raises:
+            DatabasePoolTimeoutError: If no connection became available in time
+        """
+        if not read_only:
+            mark_primary_used()
+        elif self.replicas and primary_used():
+            self.replicas.record_pinned()
+        elif self.replicas:
+            for name, pool in self.replicas.candidates():
+                try:
+                    conn = await _acquire_within_timeout(pool)
+                except DatabasePoolTimeoutError as e:
+                    # Busy, not broken, unless it has no connection at all:
+                    # then the wait was for a host that does not answer
+                    if pool.size == 0:
+                        self.replicas.mark_down(name, e)
+                    continue
+                except (AsyncDBError, OSError) as e:
+                    self.replicas.mark_down(name, e)
+                    continue
+                self.replicas.record_read(name)
+                return pool, conn
+            self.replicas.record_fallback()
+        return self.pool, await _acquire_within_timeout(self.pool)
+    
+    def get_replica_stats(self) -> Optional[Dict]:
+        """
+        Get read routing counters.
+        
+        Returns:
+            Routing stats, or None if no replicas are configured
+        """
+        return self.replicas.get_stats() if self.replicas else None
+
+
+async def _acquire_within_timeout(pool):
+    """
+    Acquire from an aiomysql pool, waiting at most DB_POOL_ACQUIRE_TIMEOUT.
+    
+    aiomysql's acquire() waits indefinitely when every connection is in
+    use; the timeout gives async routes the same 503 as the sync pool.
+    
+    Raises:
+        DatabasePoolTimeoutError: If no connection became available in time
+    """
+    timeout = settings.DB_POOL_ACQUIRE_TIMEOUT
+    try:
+        return await asyncio.wait_for(pool.acquire(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Timed out after {timeout}s waiting for an async database connection ({_pool_in_use(pool)} in use)")
+        raise DatabasePoolTimeoutError(f"No database connection available within {timeout}s")
+
+
+def _pool_in_use(pool) -> int:
+    """Checked-out connections of an aiomysql pool."""
+    return pool.size - pool.freesize
+
+
+async_pool = AsyncMySQLPool()
+
+
+@asynccontextmanager
+async def get_async_db(read_only: bool = False) -> AsyncGenerator:
+    """
+    Async counterpart of get_db().
+    
+    Waits for a free connection instead of blocking a worker thread. A
+    transaction still open on exit (an error before commit) is rolled
+    back, since the pool discards connections released mid-transaction.
+    Routing of read_only blocks to replicas is the same as get_db()'s.
+    
+    Args:
+        read_only: The block only reads
+    
+    Usage:
+        async with get_async_db() as conn:
+            async with conn.cursor(DictCursor) as cursor:
+                await cursor.execute("SELECT * FROM products")
+                results = await cursor.fetchall()
+    """
+    if async_pool.pool is None:
+        raise RuntimeError("Async MySQL pool not initialized")
+    
+    pool, conn = await async_pool.acquire(read_only)
+    try:
+        yield conn
+    except AsyncDBError as e:
+        logger.error(f"Database error: {e}")
+        raise
+    finally:
+        try:
+            if not conn.closed and conn.get_transaction_status():
+                await conn.rollback()
+        finally:
+            await pool.release(conn)
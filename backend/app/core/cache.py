@@ -0,0 +1,218 @@
+"""In-process caching utilities."""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after a TTL.
+    
+    Values may be None, which is how unknown keys are negatively cached
+    (usually with a shorter TTL). Every invalidation bumps a generation
+    counter; a loader passes the generation it observed before querying the
+    database to set(), so a value read before a concurrent write committed
+    is never stored after that write invalidated the key.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 60.0, negative_ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries (0 disables caching)
+            ttl: Seconds an entry stays valid (None: until evicted or invalidated)
+            negative_ttl: Seconds a None entry stays valid (defaults to ttl)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "negative_hits": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+    
+    @property
+    def enabled(self) -> bool:
+        """True if the cache stores anything."""
+        return self.maxsize > 0
+    
+    @property
+    def generation(self) -> int:
+        """Invalidation counter; capture it before loading a value."""
+        return self._generation
+    
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a key.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            (found, value) - value may be None for a negatively cached key
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return False, None
+            
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return False, None
+            
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            if value is None:
+                self._stats["negative_hits"] += 1
+            return True, value
+    
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        """
+        Store a value, evicting the least recently used entry if full.
+        
+        Args:
+            key: Cache key
+            value: Value to store (None caches a miss)
+            generation: Generation observed before loading value; the store is
+                skipped if any invalidation happened since
+        """
+        if not self.enabled:
+            return
+        ttl = self.negative_ttl if value is None else self.ttl
+        if ttl is not None and ttl <= 0:
+            return
+        expires_at = float("inf") if ttl is None else time.monotonic() + ttl
+        
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+    
+    def invalidate(self, *keys: Hashable):
+        """
+        Remove keys from the cache.
+        
+        Args:
+            keys: Keys to remove
+        """
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if self._data.pop(key, None) is not None:
+                    self._stats["invalidations"] += 1
+    
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._generation += 1
+            self._stats["invalidations"] += len(self._data)
+            self._data.clear()
+    
+    def get_stats(self) -> Dict:
+        """
+        Get cache counters.
+        
+        Returns:
+            Dictionary with size, hit/miss/eviction counters and hit ratio
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._data)
+        stats["maxsize"] = self.maxsize
+        stats["ttl"] = self.ttl
+        stats["negative_ttl"] = self.negative_ttl
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else None
+        return stats
+
+
+class CachedReport(NamedTuple):
+    """A rendered report with its HTTP validators."""
+    body: bytes
+    etag: str
+    last_modified: float
+    closed: bool
+
+
+class ReportCache:
+    """
+    Cache of rendered report responses.
+    
+    Reports over closed periods should not change any more and are kept
+    for the long closed_ttl. Reports whose period includes the present live
+    in a separate cache that checkout clears when it commits a bill; its TTL
+    bounds how stale they can get in other worker processes. The ETag is a
+    hash of the body, so a recomputed but unchanged report still
+    revalidates with 304.
+    """
+    
+    def __init__(self, maxsize: int = 512, open_ttl: Optional[float] = 60.0, closed_ttl: Optional[float] = 86400.0):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of reports kept per cache (0 disables caching)
+            open_ttl: Seconds a report over an open period stays valid
+            closed_ttl: Seconds a report over a closed period stays valid (None: until evicted)
+        """
+        self.closed = TTLCache(maxsize=maxsize, ttl=closed_ttl)
+        self.open = TTLCache(maxsize=maxsize, ttl=open_ttl)
+    
+    def get_or_render(self, key: Hashable, closed: bool, render: Callable[[], bytes]) -> CachedReport:
+        """
+        Return a cached report or render and cache it.
+        
+        Args:
+            key: Normalized report parameters
+            closed: True if the report's period has ended
+            render: Produces the JSON body
+        
+        Returns:
+            Cached report
+        """
+        cache = self.closed if closed else self.open
+        generation = cache.generation
+        found, report = cache.get(key)
+        if found:
+            return report
+        
+        body = render()
+        report = CachedReport(
+            body=body,
+            etag=f'"{hashlib.sha1(body).hexdigest()}"',
+            last_modified=time.time(),
+            closed=closed
+        )
+        cache.set(key, report, generation=generation)
+        return report
+    
+    def invalidate_open(self):
+        """Drop every report whose period is still open."""
+        self.open.clear()
+    
+    def get_stats(self) -> Dict:
+        """
+        Get cache counters.
+        
+        Returns:
+            Counters of the closed- and open-period caches
+        """
+        return {"closed": self.closed.get_stats(), "open": self.open.get_stats()}
@@ -34,7 +34,22 @@ class Settings(BaseSettings):
     DB_NAME: str = Field(..., alias="DB_DATABASE")
     DB_CHARSET: str = "utf8mb4"
     DB_CONNECTION: Optional[str] = None  # Optional, for compatibility
-    DB_POOL_SIZE: int = Field(default=10, ge=1, le=100, description="Database connection pool size")
+    DB_POOL_SIZE: int = Field(default=10, ge=1, le=100, description="Maximum connections of the database connection pool")
+    DB_POOL_MIN_SIZE: int = Field(default=2, ge=0, le=100, description="Connections the pool keeps open when idle")
+    DB_POOL_ACQUIRE_TIMEOUT: float = Field(default=5.0, ge=0, description="Seconds a request waits for a free connection before failing with 503")
+    DB_POOL_MAX_WAITERS: int = Field(default=200, ge=0, description="Requests allowed to wait for a connection at once (0 = no limit)")
+    DB_POOL_IDLE_TIMEOUT: float = Field(default=300.0, gt=0, description="Seconds after which an idle connection above DB_POOL_MIN_SIZE is closed")
+    DB_POOL_PING_INTERVAL: float = Field(default=30.0, ge=0, description="Idle seconds after which a connection is pinged before use (0 = always)")
+    DB_POOL_SESSION_RESET: str = Field(default="when_dirty", pattern="^(always|when_dirty)$", description="Reset a returned connection's session always, or only when its checkout changed session state")
+    DB_POOL_RESET_EVERY: int = Field(default=1000, ge=0, description="With when_dirty, still reset a connection's session after this many clean checkouts (0 = never)")
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=32, ge=0, description="Server-side prepared statements kept per connection for hot queries (0 = send them as plain text)")
+    ASYNC_DB_POOL_MIN_SIZE: int = Field(default=1, ge=0, le=1000, description="Connections the async pool keeps open when idle")
+    ASYNC_DB_POOL_MAX_SIZE: int = Field(default=50, ge=1, le=1000, description="Maximum connections of the async pool used by async routes")
+    ASYNC_DB_POOL_RECYCLE: int = Field(default=3600, ge=-1, description="Seconds after which an idle async pool connection is reopened (-1 never)")
+    DB_REPLICA_HOSTS: str = Field(default="", description="Comma-separated read replicas as host[:port] (empty = all reads go to DB_HOST)")
+    DB_REPLICA_SELECTION: str = Field(default="round_robin", pattern="^(round_robin|least_connections)$", description="How a read replica is picked: round_robin or least_connections")
+    DB_REPLICA_RETRY_SECONDS: float = Field(default=30.0, ge=0, description="Seconds a replica that failed to connect is skipped before being tried again")
+    DB_REPLICA_CONNECT_TIMEOUT: int = Field(default=2, ge=1, description="Seconds a new replica connection may take before the replica is treated as down")
     
     # Database URL (constructed from above, or override with full URL)
     DATABASE_URL: Optional[str] = None
@@ -45,6 +60,47 @@ class Settings(BaseSettings):
     # Barcode Scanner
     SCANNER_TIMEOUT: int = 30  # seconds
     CAMERA_INDEX: int = 0
+    CAMERA_AUTOSTART: bool = Field(default=True, description="Open the camera at application startup and keep it warm")
+    CAMERA_OPEN_TIMEOUT: float = Field(default=5.0, gt=0, description="Seconds a scan waits for the camera to become available")
+    CAMERA_RECONNECT_MAX_BACKOFF: float = Field(default=30.0, gt=0, description="Maximum delay between camera reconnect attempts (seconds)")
+    SCANNER_DECODE_WORKERS: int = Field(default=2, ge=1, le=16, description="Number of barcode decode worker threads")
+    SCANNER_PREPROCESS: str = Field(default="regions", description="Frame preprocessor: 'regions' (locate barcode crops) or 'none' (full frame)")
+    SCANNER_DETECT_WIDTH: int = Field(default=640, ge=160, description="Width frames are downscaled to for barcode region detection")
+    SCANNER_FALLBACK_EVERY: int = Field(default=3, ge=0, description="Full-frame decode on every Nth frame whose regions decoded nothing (0 disables)")
+    SCANNER_HEADLESS: bool = Field(default=True, description="Never open a local OpenCV window; preview is served as MJPEG at /scan/preview")
+    SCANNER_PREVIEW_FPS: int = Field(default=10, ge=1, le=30, description="Maximum MJPEG preview frame rate")
+    SCANNER_MAX_CONCURRENT_SCANS: int = Field(default=4, ge=1, le=64, description="Scan jobs that may run at once on the dedicated scan executor")
+    SCAN_JOB_TTL: int = Field(default=300, ge=10, description="Seconds a finished scan job stays retrievable")
+    SCAN_SESSION_DEDUP_SECONDS: float = Field(default=2.0, ge=0, description="Continuous scan sessions suppress repeats of a barcode seen within this many seconds")
+    SCAN_SESSION_QUEUE_SIZE: int = Field(default=16, ge=1, le=1024, description="Pending detections buffered per continuous scan session (oldest dropped when full)")
+    SCANNER_DECODE_PROCESSES: int = Field(default=0, ge=0, le=64, description="Process pool size for uploaded image decoding (0 = one per CPU core)")
+    SCANNER_DECODE_BATCH_SIZE: int = Field(default=4, ge=1, le=64, description="Uploaded images decoded per process pool task")
+    SCANNER_DECODE_MAX_IMAGES: int = Field(default=32, ge=1, le=256, description="Maximum number of images accepted by one decode request")
+    SCANNER_DECODE_MAX_IMAGE_BYTES: int = Field(default=10 * 1024 * 1024, ge=1024, description="Maximum size of one uploaded image in bytes")
+    
+    # Caching
+    PRODUCT_CACHE_SIZE: int = Field(default=10000, ge=0, description="Products kept in the in-process lookup cache (0 disables)")
+    PRODUCT_CACHE_TTL: float = Field(default=60.0, ge=0, description="Seconds a cached product stays valid")
+    PRODUCT_CACHE_NEGATIVE_TTL: float = Field(default=5.0, ge=0, description="Seconds an unknown barcode stays cached as missing")
+    REPORT_CACHE_SIZE: int = Field(default=512, ge=0, description="Rendered reports kept per report cache (0 disables)")
+    REPORT_CACHE_TTL: float = Field(default=30.0, ge=0, description="Seconds a report over the current period stays valid, and after its end a period is still treated as current")
+    REPORT_CACHE_CLOSED_TTL: float = Field(default=86400.0, ge=0, description="Seconds a report over a closed period stays valid")
+    REPORT_CACHE_MAX_AGE: int = Field(default=3600, ge=0, description="Cache-Control max-age in seconds sent with reports over closed periods")
+    
+    # Product import
+    PRODUCT_IMPORT_BATCH_SIZE: int = Field(default=1000, ge=1, le=10000, description="Products written per multi-row upsert during a bulk import")
+    PRODUCT_IMPORT_MAX_ERRORS: int = Field(default=1000, ge=0, description="Row errors listed in a bulk import report (all are counted)")
+    
+    # Export
+    EXPORT_FETCH_SIZE: int = Field(default=5000, ge=1, le=100000, description="Rows fetched from the unbuffered cursor per chunk of a streamed export")
+    EXPORT_GZIP_LEVEL: int = Field(default=6, ge=0, le=9, description="zlib level for gzip-compressed exports")
+    
+    # Bill rendering
+    BILL_RENDER_WORKER_ENABLED: bool = Field(default=True, description="Run the background worker that writes bill ticket files and PDFs")
+    BILL_RENDER_POLL_SECONDS: float = Field(default=2.0, gt=0, description="Seconds the render worker sleeps between polls when idle")
+    BILL_RENDER_MAX_ATTEMPTS: int = Field(default=5, ge=1, description="Render attempts before a job is marked failed")
+    BILL_RENDER_RETRY_BASE_SECONDS: float = Field(default=2.0, ge=0, description="Delay before the first render retry, doubled on each further attempt")
+    BILL_RENDER_STALE_SECONDS: float = Field(default=300.0, gt=0, description="Seconds after which a job left running by a crashed worker is reclaimed")
     
     # API
     API_HOST: str = "127.0.0.1"
@@ -1,16 +1,26 @@
 """MySQL database connection and management."""
 import mysql.connector
-from mysql.connector import pooling, Error
+from mysql.connector import Error
 from contextlib import contextmanager
-from typing import Generator
+from typing import Dict, Generator, Optional
 import threading
 
 from app.core.config import settings
+from app.core.db_pool import BoundedConnectionPool, PooledConnection
+from app.core.db_routing import ReplicaSet, mark_primary_used, parse_hosts, primary_used
+from app.core.exceptions import DatabasePoolTimeoutError
 from app.core.logging import logger
 
 
 class MySQLConnectionPool:
-    """MySQL connection pool manager."""
+    """
+    MySQL connection pool manager.
+    
+    Holds the primary pool and, when DB_REPLICA_HOSTS is set, one pool per
+    read replica. Read-only checkouts go to a replica unless the current
+    request has already used the primary; an unreachable or saturated
+    replica falls back to the next one and finally to the primary.
+    """
     
     _instance = None
     _lock = threading.Lock()
@@ -21,9 +31,6 @@ class MySQLConnectionPool:
             raise Exception("MySQLConnectionPool is a singleton!")
         
         self.pool_config = {
-            'pool_name': 'barcode_scanner_pool',
-            'pool_size': settings.DB_POOL_SIZE,
-            'pool_reset_session': True,
             'host': settings.DB_HOST,
             'port': settings.DB_PORT,
             'user': settings.DB_USER,
@@ -37,11 +44,47 @@ class MySQLConnectionPool:
         }
         
         try:
-            self.pool = pooling.MySQLConnectionPool(**self.pool_config)
+            self.pool = BoundedConnectionPool(
+                self.pool_config,
+                min_size=settings.DB_POOL_MIN_SIZE,
+                max_size=settings.DB_POOL_SIZE,
+                acquire_timeout=settings.DB_POOL_ACQUIRE_TIMEOUT,
+                max_waiters=settings.DB_POOL_MAX_WAITERS,
+                idle_timeout=settings.DB_POOL_IDLE_TIMEOUT,
+                ping_interval=settings.DB_POOL_PING_INTERVAL,
+                statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+                reset_when_dirty=settings.DB_POOL_SESSION_RESET == "when_dirty",
+                reset_every=settings.DB_POOL_RESET_EVERY
+            )
             logger.info(f"MySQL connection pool created: {settings.DB_NAME}@{settings.DB_HOST}")
         except Error as e:
             logger.error(f"Error creating MySQL connection pool: {e}")
             raise
+        
+        # Replica pools open connections on demand, so a replica that is down
+        # at startup only costs a failover later
+        replicas = []
+        for host, port in parse_hosts(settings.DB_REPLICA_HOSTS, settings.DB_PORT):
+            replica_pool = BoundedConnectionPool(
+                dict(self.pool_config, host=host, port=port, connection_timeout=settings.DB_REPLICA_CONNECT_TIMEOUT),
+                min_size=0,
+                max_size=settings.DB_POOL_SIZE,
+                acquire_timeout=settings.DB_POOL_ACQUIRE_TIMEOUT,
+                max_waiters=settings.DB_POOL_MAX_WAITERS,
+                idle_timeout=settings.DB_POOL_IDLE_TIMEOUT,
+                ping_interval=settings.DB_POOL_PING_INTERVAL,
+                statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+                reset_when_dirty=settings.DB_POOL_SESSION_RESET == "when_dirty",
+                reset_every=settings.DB_POOL_RESET_EVERY
+            )
+            replicas.append((f"{host}:{port}", replica_pool))
+            logger.info(f"MySQL read replica pool created: {settings.DB_NAME}@{host}:{port}")
+        self.replicas = ReplicaSet(
+            replicas,
+            selection=settings.DB_REPLICA_SELECTION,
+            retry_seconds=settings.DB_REPLICA_RETRY_SECONDS,
+            in_use=lambda replica_pool: replica_pool.in_use
+        )
     
     @classmethod
     def get_instance(cls):
@@ -52,13 +95,69 @@ class MySQLConnectionPool:
                     cls._instance = cls()
         return cls._instance
     
-    def get_connection(self):
-        """Get a connection from the pool."""
+    def get_connection(self, read_only: bool = False) -> PooledConnection:
+        """
+        Get a connection from the pool, waiting up to DB_POOL_ACQUIRE_TIMEOUT if all are busy.
+        
+        Args:
+            read_only: The caller only reads, so a replica may serve it
+        
+        Raises:
+            DatabasePoolTimeoutError: If no connection became available in time
+        """
+        if not read_only:
+            mark_primary_used()
+        elif self.replicas and primary_used():
+            self.replicas.record_pinned()
+        elif self.replicas:
+            conn = self._get_replica_connection()
+            if conn is not None:
+                return conn
+        
         try:
             return self.pool.get_connection()
         except Error as e:
             logger.error(f"Error getting connection from pool: {e}")
             raise
+    
+    def _get_replica_connection(self) -> Optional[PooledConnection]:
+        """
+        Check out a connection from the first usable replica.
+        
+        Returns:
+            Replica connection, or None if every replica is down or busy
+        """
+        for name, replica_pool in self.replicas.candidates():
+            try:
+                conn = replica_pool.get_connection()
+            except DatabasePoolTimeoutError:
+                # Busy, not broken: try the next one without marking it down
+                continue
+            except Error as e:
+                self.replicas.mark_down(name, e)
+                continue
+            self.replicas.record_read(name)
+            return conn
+        self.replicas.record_fallback()
+        return None
+    
+    def get_stats(self):
+        """Get pool counters (see BoundedConnectionPool.get_stats)."""
+        return self.pool.get_stats()
+    
+    def get_replica_stats(self) -> Optional[Dict]:
+        """
+        Get read routing counters with each replica pool's counters.
+        
+        Returns:
+            Routing stats, or None if no replicas are configured
+        """
+        if not self.replicas:
+            return None
+        stats = self.replicas.get_stats()
+        for replica, (_, replica_pool) in zip(stats["replicas"], self.replicas.replicas):
+            replica["pool"] = replica_pool.get_stats()
+        return stats
 
 
 # Initialize connection pool
@@ -70,10 +169,18 @@ except Exception as e:
 
 
 @contextmanager
-def get_db() -> Generator[mysql.connector.MySQLConnection, None, None]:
+def get_db(read_only: bool = False) -> Generator[PooledConnection, None, None]:
     """
     Context manager to get MySQL database connection.
-    Yields a connection and ensures it's closed after use.
+    Yields a connection and ensures it's returned to the pool after use.
+    
+    With read_only=True the connection may come from a read replica, which
+    can lag behind the primary. Once a request has checked out a primary
+    connection, its later read-only checkouts use the primary too, so it
+    reads its own writes.
+    
+    Args:
+        read_only: The block only reads
     
     Usage:
         with get_db() as conn:
@@ -87,15 +194,22 @@ def get_db() -> Generator[mysql.connector.MySQLConnection, None, None]:
     
     conn = None
     try:
-        conn = connection_pool.get_connection()
+        conn = connection_pool.get_connection(read_only)
         yield conn
     except Error as e:
         if conn:
             conn.rollback()
+            conn.mark_session_dirty()
         logger.error(f"Database error: {e}")
         raise
+    except BaseException:
+        # Session state is unknown after a failure; have the pool reset it
+        if conn:
+            conn.mark_session_dirty()
+        raise
     finally:
-        if conn and conn.is_connected():
+        # The pool resets the session if it was changed, or discards a broken connection
+        if conn:
             conn.close()
 
 
@@ -45,6 +45,7 @@ def create_tables():
         reorder_point INT DEFAULT 0,
         category_id INT NULL,
         INDEX idx_product_name (product_name),
+        FULLTEXT INDEX ft_product_name (product_name) WITH PARSER ngram,
         INDEX idx_timestamp (timestamp),
         INDEX idx_reorder_point (reorder_point),
         INDEX idx_category_id (category_id)
@@ -70,7 +71,7 @@ def create_tables():
         quantity INT DEFAULT 1,
         details TEXT,
         timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-        INDEX idx_cart_barcode (barcode),
+        UNIQUE KEY uq_cart_barcode (barcode),
         INDEX idx_cart_timestamp (timestamp)
         -- Note: Foreign key constraint removed to preserve historical cart data
         -- even if products are deleted. Product existence is validated in service layer.
@@ -101,8 +102,77 @@ def create_tables():
         created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
         file_path TEXT NULL,
         INDEX idx_bill_created_at (created_at),
-        INDEX idx_bill_cashier (cashier_name),
-        INDEX idx_bill_payment_method (payment_method)
+        INDEX idx_bill_cashier_created (cashier_name, created_at),
+        INDEX idx_bill_payment_created (payment_method, created_at)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+    """
+    
+    create_bill_items_table = """
+    CREATE TABLE IF NOT EXISTS bill_items (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        bill_id INT NOT NULL,
+        line_no INT NOT NULL,
+        barcode VARCHAR(255) NULL,
+        product_name VARCHAR(255) NOT NULL,
+        category_id INT NULL,
+        price FLOAT NOT NULL,
+        quantity INT NOT NULL,
+        line_total FLOAT NOT NULL,
+        created_at DATETIME NOT NULL,
+        UNIQUE KEY uq_bill_item_line (bill_id, line_no),
+        INDEX idx_bill_item_created (created_at),
+        INDEX idx_bill_item_barcode (barcode, created_at),
+        INDEX idx_bill_item_category (category_id, created_at),
+        CONSTRAINT fk_bill_item_bill FOREIGN KEY (bill_id) REFERENCES bills(id) ON DELETE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+    """
+    
+    create_sales_hourly_table = """
+    CREATE TABLE IF NOT EXISTS sales_hourly (
+        period_start DATETIME NOT NULL,
+        cashier_name VARCHAR(255) NOT NULL DEFAULT '',
+        payment_method VARCHAR(50) NOT NULL,
+        bill_count INT NOT NULL DEFAULT 0,
+        subtotal DECIMAL(14, 2) NOT NULL DEFAULT 0,
+        discount_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+        tax_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+        total_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+        PRIMARY KEY (period_start, cashier_name, payment_method),
+        INDEX idx_sales_hourly_cashier (cashier_name, period_start)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+    """
+    
+    create_sales_daily_table = """
+    CREATE TABLE IF NOT EXISTS sales_daily (
+        period_start DATE NOT NULL,
+        cashier_name VARCHAR(255) NOT NULL DEFAULT '',
+        payment_method VARCHAR(50) NOT NULL,
+        bill_count INT NOT NULL DEFAULT 0,
+        subtotal DECIMAL(14, 2) NOT NULL DEFAULT 0,
+        discount_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+        tax_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+        total_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+        PRIMARY KEY (period_start, cashier_name, payment_method),
+        INDEX idx_sales_daily_cashier (cashier_name, period_start)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+    """
+    
+    create_bill_render_jobs_table = """
+    CREATE TABLE IF NOT EXISTS bill_render_jobs (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        bill_id INT NOT NULL,
+        status VARCHAR(20) NOT NULL DEFAULT 'pending',
+        attempts INT NOT NULL DEFAULT 0,
+        payload MEDIUMTEXT NOT NULL,
+        file_path TEXT NULL,
+        pdf_path TEXT NULL,
+        last_error TEXT NULL,
+        next_attempt_at DATETIME NOT NULL,
+        locked_at DATETIME NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        finished_at DATETIME NULL,
+        UNIQUE KEY uq_render_job_bill (bill_id),
+        INDEX idx_render_job_due (status, next_attempt_at)
     ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
     """
     
@@ -116,7 +186,7 @@ def create_tables():
         reason VARCHAR(255) NOT NULL,
         user_id VARCHAR(36) NULL,
         created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-        INDEX idx_stock_barcode (barcode),
+        INDEX idx_stock_barcode_created (barcode, created_at, id),
         INDEX idx_stock_created_at (created_at),
         INDEX idx_stock_user (user_id)
     ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -153,6 +223,11 @@ def create_tables():
         with get_db() as conn:
             cursor = conn.cursor()
             
+            # The ngram parser drops every ngram containing a stopword ("a",
+            # "i", ...); the stopword setting is fixed when the index is created
+            cursor.execute("SET SESSION innodb_ft_enable_stopword = OFF")
+            conn.mark_session_dirty()
+            
             # Create tables
             cursor.execute(create_products_table)
             cursor.execute(create_categories_table)
@@ -161,6 +236,10 @@ def create_tables():
             cursor.execute(create_user_auth_table)
             cursor.execute(create_user_roles_table)
             cursor.execute(create_bills_table)
+            cursor.execute(create_bill_items_table)
+            cursor.execute(create_sales_hourly_table)
+            cursor.execute(create_sales_daily_table)
+            cursor.execute(create_bill_render_jobs_table)
             cursor.execute(create_stock_history_table)
             
             # Add foreign key constraints if they don't exist
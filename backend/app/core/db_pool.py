@@ -0,0 +1,456 @@
+"""Bounded, growable MySQL connection pool with metrics."""
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Sequence, Tuple
+
+import mysql.connector
+from mysql.connector import Error
+
+from app.core.exceptions import DatabasePoolTimeoutError
+from app.core.logging import logger
+from app.core.prepared_statements import PreparedStatementRegistry
+
+# Connection properties and commands that can change server session state;
+# setting or calling them on the PooledConnection itself marks its session
+# dirty. Cursors talk to the underlying connection, so SQL run through a
+# cursor is not seen here.
+SESSION_ATTRIBUTES = frozenset({"autocommit", "database", "time_zone", "sql_mode"})
+SESSION_METHODS = frozenset({
+    "cmd_change_user", "cmd_init_db", "cmd_query", "cmd_query_iter", "set_charset_collation",
+})
+
+
+class PooledConnection:
+    """
+    A checked-out connection.
+    
+    Proxies the underlying mysql.connector connection; close() hands it
+    back to the pool instead of disconnecting. Using it after close()
+    raises an InterfaceError.
+    
+    Tracks whether the checkout changed session state, so the pool can
+    skip the session reset for clean ones. Only setting a session property
+    (autocommit, database, time_zone, sql_mode) or calling a command method
+    on this object is detected. Statements run through a cursor go straight
+    to the underlying connection, so code that changes the session with SQL
+    (SET SESSION, CREATE TEMPORARY TABLE, user variables, ...) must call
+    mark_session_dirty() itself.
+    """
+    
+    def __init__(self, pool: "BoundedConnectionPool", cnx):
+        """
+        Wrap a connection.
+        
+        Args:
+            pool: Pool the connection belongs to
+            cnx: mysql.connector connection
+        """
+        self._pool = pool
+        self._cnx = cnx
+        self._dirty = False
+    
+    def __getattr__(self, name: str) -> Any:
+        cnx = self.__dict__.get("_cnx")
+        if cnx is None:
+            raise mysql.connector.errors.InterfaceError("Connection was returned to the pool")
+        if name in SESSION_METHODS:
+            self._dirty = True
+        return getattr(cnx, name)
+    
+    def __setattr__(self, name: str, value: Any):
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+            return
+        cnx = self._cnx
+        if cnx is None:
+            raise mysql.connector.errors.InterfaceError("Connection was returned to the pool")
+        if name in SESSION_ATTRIBUTES:
+            self._dirty = True
+        setattr(cnx, name, value)
+    
+    def mark_session_dirty(self):
+        """Have the pool reset this connection's session when it is returned."""
+        self._dirty = True
+    
+    def execute_prepared(self, sql: str, params: Sequence = (), dictionary: bool = False):
+        """
+        Execute a hot statement as a server-side prepared statement.
+        
+        The statement stays prepared on this connection across checkouts
+        (see PreparedStatementRegistry). The returned cursor belongs to the
+        registry: read its whole result and do not close it.
+        
+        Args:
+            sql: Statement with %s placeholders
+            params: Statement parameters
+            dictionary: Return rows as dictionaries
+        
+        Returns:
+            Executed cursor
+        """
+        cnx = self._cnx
+        if cnx is None:
+            raise mysql.connector.errors.InterfaceError("Connection was returned to the pool")
+        return self._pool.prepared_statements(cnx).execute(cnx, sql, params, dictionary)
+    
+    def close(self):
+        """Return the connection to the pool (idempotent)."""
+        cnx, self._cnx = self._cnx, None
+        if cnx is not None:
+            self._pool.release(cnx, dirty=self._dirty)
+
+
+class BoundedConnectionPool:
+    """
+    Thread-safe MySQL connection pool that queues callers when busy.
+    
+    Opens min_size connections up front and more on demand up to max_size.
+    When all max_size connections are checked out, get_connection() waits
+    up to acquire_timeout seconds for one to be returned, with at most
+    max_waiters callers queued; beyond that it fails fast with
+    DatabasePoolTimeoutError instead of mysql.connector's immediate
+    "pool exhausted" error.
+    
+    Connections idle for longer than ping_interval are pinged before being
+    handed out, and broken ones are replaced. A background reaper closes
+    connections idle for longer than idle_timeout down to min_size.
+    Checked-in connections have their session reset, as with
+    mysql.connector's pool_reset_session. With reset_when_dirty, only
+    checkouts marked dirty pay for the reset (COM_RESET_CONNECTION, which
+    also drops prepared statements); clean ones just roll back an open
+    transaction, and every reset_every clean checkins a connection is reset
+    anyway as a safety net.
+    """
+    
+    def __init__(
+        self,
+        connection_config: Dict,
+        min_size: int,
+        max_size: int,
+        acquire_timeout: float,
+        max_waiters: int,
+        idle_timeout: float,
+        ping_interval: float,
+        reset_session: bool = True,
+        statement_cache_size: int = 0,
+        reset_when_dirty: bool = False,
+        reset_every: int = 0
+    ):
+        """
+        Initialize the pool and open min_size connections.
+        
+        Args:
+            connection_config: Keyword arguments for mysql.connector.connect()
+            min_size: Connections kept open even when idle
+            max_size: Maximum open connections
+            acquire_timeout: Seconds get_connection() waits for a free connection
+            max_waiters: Callers allowed to wait at once (0 = no limit)
+            idle_timeout: Seconds after which an idle connection above min_size is closed
+            ping_interval: Idle seconds after which a connection is pinged before use
+            reset_session: Reset session state when a connection is returned
+            statement_cache_size: Prepared statements kept per connection (0 = none)
+            reset_when_dirty: Reset only sessions marked dirty by their checkout
+            reset_every: With reset_when_dirty, reset a session after this many clean checkins anyway (0 = never)
+        
+        Raises:
+            mysql.connector.Error: If the initial connections cannot be opened
+        """
+        self.connection_config = connection_config
+        self.min_size = min(min_size, max_size)
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.max_waiters = max_waiters
+        self.idle_timeout = idle_timeout
+        self.ping_interval = ping_interval
+        self.reset_session = reset_session
+        self.statement_cache_size = statement_cache_size
+        self.reset_when_dirty = reset_when_dirty
+        self.reset_every = reset_every
+        
+        self._cond = threading.Condition()
+        # (connection, returned at); checked out from the right (LIFO) so
+        # the least recently used connections collect on the left for reaping
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._size = 0  # open connections, including ones being opened
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+        self._stats = {
+            "acquired": 0,
+            "exhausted": 0,  # checkouts that found every connection busy and had to wait
+            "timeouts": 0,
+            "rejected": 0,  # wait queue full
+            "created": 0,
+            "reaped": 0,
+            "discarded": 0,  # broken or failed to reset
+            "ping_failures": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "statements_prepared": 0,
+            "statements_reused": 0,
+            "statements_evicted": 0,
+            "session_resets": 0,
+            "resets_avoided": 0,
+        }
+        self._peak_in_use = 0
+        self._peak_waiting = 0
+        # Connection -> its prepared statements; entries go with the connection
+        self._statements: "weakref.WeakKeyDictionary[Any, PreparedStatementRegistry]" = weakref.WeakKeyDictionary()
+        # Connection -> clean checkins since its last session reset
+        self._clean_checkins: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+        
+        for _ in range(self.min_size):
+            with self._cond:
+                self._size += 1
+            self._checkin(self._open())
+        
+        self._reaper = threading.Thread(target=self._reap_loop, name="db-pool-reaper", daemon=True)
+        self._reaper.start()
+    
+    def get_connection(self, timeout: Optional[float] = None) -> PooledConnection:
+        """
+        Check out a connection, waiting if all are busy.
+        
+        Args:
+            timeout: Seconds to wait (defaults to acquire_timeout)
+        
+        Returns:
+            Pooled connection; close() returns it
+        
+        Raises:
+            DatabasePoolTimeoutError: If no connection frees up in time or the wait queue is full
+            mysql.connector.Error: If a new connection cannot be opened
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        waited = False
+        cnx = None
+        
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise DatabasePoolTimeoutError("Connection pool is closed")
+                if self._idle:
+                    cnx, returned_at = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                
+                if not waited:
+                    waited = True
+                    self._stats["exhausted"] += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    logger.warning(f"Timed out after {timeout}s waiting for a database connection ({self._in_use} in use)")
+                    raise DatabasePoolTimeoutError(f"No database connection available within {timeout}s")
+                if self.max_waiters and self._waiting >= self.max_waiters:
+                    self._stats["rejected"] += 1
+                    logger.warning(f"Database connection wait queue full ({self._waiting} waiting)")
+                    raise DatabasePoolTimeoutError("Too many requests waiting for a database connection")
+                
+                self._waiting += 1
+                self._peak_waiting = max(self._peak_waiting, self._waiting)
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+        
+        try:
+            if cnx is None:
+                cnx = self._open()
+            elif time.monotonic() - returned_at >= self.ping_interval and not self._ping(cnx):
+                with self._cond:
+                    self._stats["ping_failures"] += 1
+                self._close_quietly(cnx)
+                cnx = self._open()
+        except BaseException:
+            with self._cond:
+                self._in_use -= 1
+                self._size -= 1
+                self._cond.notify()
+            raise
+        
+        wait_seconds = time.monotonic() - started
+        with self._cond:
+            self._stats["acquired"] += 1
+            self._stats["wait_seconds_total"] += wait_seconds
+            self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], wait_seconds)
+        return PooledConnection(self, cnx)
+    
+    def release(self, cnx, dirty: bool = True):
+        """
+        Take back a checked-out connection.
+        
+        The session is reset (rolling back any open transaction), or with
+        reset_when_dirty only an open transaction is rolled back if the
+        checkout left the session clean; a connection that cannot be reset
+        is discarded.
+        
+        Args:
+            cnx: Underlying connection from a PooledConnection
+            dirty: The checkout changed session state
+        """
+        healthy = True
+        try:
+            if self._needs_reset(cnx, dirty):
+                # The reset deallocates the session's prepared statements
+                statements = self._statements.get(cnx)
+                if statements:
+                    statements.clear()
+                cnx.reset_session()
+                self._clean_checkins[cnx] = 0
+                with self._cond:
+                    self._stats["session_resets"] += 1
+            else:
+                if cnx.in_transaction:
+                    cnx.rollback()
+                if self.reset_session:
+                    with self._cond:
+                        self._stats["resets_avoided"] += 1
+        except Exception as e:
+            logger.warning(f"Discarding database connection that could not be reset: {e}")
+            healthy = False
+        
+        with self._cond:
+            self._in_use -= 1
+        if healthy and not self._closed:
+            self._checkin(cnx)
+        else:
+            self._close_quietly(cnx)
+            with self._cond:
+                if healthy is False:
+                    self._stats["discarded"] += 1
+                self._size -= 1
+                self._cond.notify()
+    
+    def close(self):
+        """Close idle connections and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for cnx, _ in idle:
+            self._close_quietly(cnx)
+    
+    def _needs_reset(self, cnx, dirty: bool) -> bool:
+        """Decide whether a returned connection's session must be reset."""
+        if not self.reset_session:
+            return False
+        if dirty or not self.reset_when_dirty:
+            return True
+        clean = self._clean_checkins.get(cnx, 0) + 1
+        self._clean_checkins[cnx] = clean
+        return bool(self.reset_every) and clean >= self.reset_every
+    
+    def prepared_statements(self, cnx) -> PreparedStatementRegistry:
+        """
+        Get the prepared statement registry of a connection.
+        
+        Args:
+            cnx: Underlying connection from a PooledConnection
+        
+        Returns:
+            Registry, created on first use
+        """
+        statements = self._statements.get(cnx)
+        if statements is None:
+            statements = PreparedStatementRegistry(self.statement_cache_size, self._stats, self._cond)
+            self._statements[cnx] = statements
+        return statements
+    
+    @property
+    def in_use(self) -> int:
+        """Number of checked-out connections."""
+        return self._in_use
+    
+    def get_stats(self) -> Dict:
+        """
+        Get pool counters.
+        
+        Returns:
+            Sizes, in-use and waiting counts (current and peak), checkout
+            waits, timeouts and rejections, and connection churn
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "waiting": self._waiting,
+                "peak_in_use": self._peak_in_use,
+                "peak_waiting": self._peak_waiting,
+            })
+        stats["min_size"] = self.min_size
+        stats["max_size"] = self.max_size
+        stats["acquire_timeout"] = self.acquire_timeout
+        stats["wait_seconds_avg"] = round(stats["wait_seconds_total"] / stats["acquired"], 6) if stats["acquired"] else None
+        stats["wait_seconds_total"] = round(stats["wait_seconds_total"], 6)
+        stats["wait_seconds_max"] = round(stats["wait_seconds_max"], 6)
+        stats["saturated"] = stats["in_use"] >= self.max_size
+        return stats
+    
+    def _open(self):
+        """Open a new connection (the slot is already counted in _size)."""
+        cnx = mysql.connector.connect(**self.connection_config)
+        with self._cond:
+            self._stats["created"] += 1
+        return cnx
+    
+    def _checkin(self, cnx):
+        """Put a connection back on the idle stack and wake one waiter."""
+        with self._cond:
+            self._idle.append((cnx, time.monotonic()))
+            self._cond.notify()
+    
+    @staticmethod
+    def _ping(cnx) -> bool:
+        """Check that a connection is still alive."""
+        try:
+            cnx.ping(reconnect=False)
+            return True
+        except Error:
+            return False
+    
+    def _close_quietly(self, cnx):
+        """Disconnect, ignoring errors from an already broken connection."""
+        self._statements.pop(cnx, None)
+        self._clean_checkins.pop(cnx, None)
+        try:
+            cnx.disconnect()
+        except Exception:
+            pass
+    
+    def _reap_loop(self):
+        """Periodically close connections idle for longer than idle_timeout."""
+        interval = max(1.0, min(self.idle_timeout / 2, 30.0))
+        while not self._closed:
+            time.sleep(interval)
+            self.reap_idle()
+    
+    def reap_idle(self) -> int:
+        """
+        Close connections idle for longer than idle_timeout, keeping min_size open.
+        
+        Returns:
+            Number of connections closed
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = []
+        with self._cond:
+            while self._idle and self._size > self.min_size and self._idle[0][1] < cutoff:
+                expired.append(self._idle.popleft()[0])
+                self._size -= 1
+            self._stats["reaped"] += len(expired)
+        for cnx in expired:
+            self._close_quietly(cnx)
+        return len(expired)
@@ -0,0 +1,192 @@
+"""Read-replica selection and per-request read-your-writes tracking."""
+import threading
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.logging import logger
+
+REPLICA_SELECTIONS = ("round_robin", "least_connections")
+
+# Per-request routing state. It holds a mutable dict so that a write made
+# inside run_in_threadpool (which runs in a copy of the context) is still
+# seen by later reads of the same request.
+_request_scope: ContextVar[Optional[Dict]] = ContextVar("db_request_scope", default=None)
+
+
+def begin_request_scope() -> Token:
+    """
+    Start tracking primary use for the current request.
+    
+    Returns:
+        Token for end_request_scope()
+    """
+    return _request_scope.set({"primary_used": False})
+
+
+def end_request_scope(token: Token):
+    """
+    Stop tracking primary use for the current request.
+    
+    Args:
+        token: Token returned by begin_request_scope()
+    """
+    _request_scope.reset(token)
+
+
+def mark_primary_used():
+    """Pin the rest of the current request's reads to the primary."""
+    scope = _request_scope.get()
+    if scope is not None:
+        scope["primary_used"] = True
+
+
+def primary_used() -> bool:
+    """
+    Check whether the current request has already used the primary.
+    
+    Returns:
+        True after a write-intent checkout in this request, so reads see its writes
+    """
+    scope = _request_scope.get()
+    return scope is not None and scope["primary_used"]
+
+
+def parse_hosts(hosts: str, default_port: int) -> List[Tuple[str, int]]:
+    """
+    Parse a comma-separated list of host[:port] entries.
+    
+    Args:
+        hosts: e.g. "replica1,replica2:3307"
+        default_port: Port used when an entry has none
+    
+    Returns:
+        (host, port) tuples in the given order
+    
+    Raises:
+        ValueError: If a port is not a number
+    """
+    parsed = []
+    for entry in hosts.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        host, _, port = entry.partition(":")
+        parsed.append((host, int(port) if port else default_port))
+    return parsed
+
+
+class ReplicaSet:
+    """
+    Chooses which read replica serves a read-only checkout.
+    
+    A replica whose checkout fails with a connection error is skipped for
+    retry_seconds and then tried again. When no replica is usable the
+    caller falls back to the primary.
+    """
+    
+    def __init__(
+        self,
+        replicas: List[Tuple[str, Any]],
+        selection: str,
+        retry_seconds: float,
+        in_use: Callable[[Any], int]
+    ):
+        """
+        Initialize the replica set.
+        
+        Args:
+            replicas: (name, pool) pairs
+            selection: "round_robin" or "least_connections"
+            retry_seconds: Seconds a failed replica is skipped
+            in_use: Returns a pool's checked-out connection count (for least_connections)
+        
+        Raises:
+            ValueError: If selection is unknown
+        """
+        if selection not in REPLICA_SELECTIONS:
+            raise ValueError(f"Unknown replica selection '{selection}', expected one of {REPLICA_SELECTIONS}")
+        self.replicas = replicas
+        self.selection = selection
+        self.retry_seconds = retry_seconds
+        self._in_use = in_use
+        self._lock = threading.Lock()
+        self._next = 0
+        self._down_until: Dict[str, float] = {}
+        self._stats = {name: {"reads": 0, "failures": 0, "last_error": None} for name, _ in replicas}
+        self._primary_fallbacks = 0
+        self._pinned_reads = 0
+    
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+    
+    def candidates(self) -> List[Tuple[str, Any]]:
+        """
+        Get the usable replicas in the order they should be tried.
+        
+        Returns:
+            (name, pool) pairs; empty if every replica is marked down
+        """
+        now = time.monotonic()
+        with self._lock:
+            healthy = [
+                (name, pool) for name, pool in self.replicas
+                if self._down_until.get(name, 0) <= now
+            ]
+            if not healthy:
+                return []
+            if self.selection == "least_connections":
+                return sorted(healthy, key=lambda replica: self._in_use(replica[1]))
+            start = self._next % len(healthy)
+            self._next += 1
+            return healthy[start:] + healthy[:start]
+    
+    def record_read(self, name: str):
+        """Count a checkout served by a replica and clear its down mark."""
+        with self._lock:
+            self._stats[name]["reads"] += 1
+            self._down_until.pop(name, None)
+    
+    def mark_down(self, name: str, error: Exception):
+        """
+        Skip a replica for retry_seconds after a connection error.
+        
+        Args:
+            name: Replica name
+            error: Error raised by its checkout
+        """
+        logger.warning(f"Read replica {name} unavailable, skipping it for {self.retry_seconds}s: {error}")
+        with self._lock:
+            self._stats[name]["failures"] += 1
+            self._stats[name]["last_error"] = str(error)
+            self._down_until[name] = time.monotonic() + self.retry_seconds
+    
+    def record_fallback(self):
+        """Count a read-only checkout that no replica could serve."""
+        with self._lock:
+            self._primary_fallbacks += 1
+    
+    def record_pinned(self):
+        """Count a read-only checkout sent to the primary after a write in the same request."""
+        with self._lock:
+            self._pinned_reads += 1
+    
+    def get_stats(self) -> Dict:
+        """
+        Get routing counters.
+        
+        Returns:
+            Selection policy, primary fallbacks and pinned reads, and per
+            replica reads, failures and health
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "selection": self.selection,
+                "primary_fallbacks": self._primary_fallbacks,
+                "pinned_reads": self._pinned_reads,
+                "replicas": [
+                    dict(self._stats[name], name=name, healthy=self._down_until.get(name, 0) <= now, in_use=self._in_use(pool))
+                    for name, pool in self.replicas
+                ],
+            }
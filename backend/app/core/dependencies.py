@@ -1,8 +1,8 @@
 """Dependency injection for services."""
-from app.services.inventory_service import InventoryService
-from app.services.cart_service import CartService
+from app.services.inventory_service import InventoryService, AsyncInventoryService
+from app.services.cart_service import CartService, AsyncCartService
 from app.services.user_service import UserService
-from app.services.bill_service import BillService
+from app.services.bill_service import BillService, AsyncBillService
 from app.services.barcode_service import BarcodeService
 from app.services.category_service import CategoryService
 
@@ -37,6 +37,21 @@ def get_category_service() -> CategoryService:
     return CategoryService()
 
 
+def get_async_inventory_service() -> AsyncInventoryService:
+    """Get async inventory service instance."""
+    return AsyncInventoryService()
+
+
+def get_async_cart_service() -> AsyncCartService:
+    """Get async cart service instance."""
+    return AsyncCartService()
+
+
+def get_async_bill_service() -> AsyncBillService:
+    """Get async bill service instance."""
+    return AsyncBillService()
+
+
 def get_auth_service():
     """Get auth service instance."""
     from app.services.auth_service import AuthService
@@ -48,3 +63,14 @@ def get_report_service():
     from app.services.report_service import ReportService
     return ReportService()
 
+
+def get_export_service():
+    """Get export service instance."""
+    from app.services.export_service import ExportService
+    return ExportService()
+
+
+def get_image_decode_service():
+    """Get image decode service instance."""
+    from app.services.image_decode_service import ImageDecodeService
+    return ImageDecodeService()
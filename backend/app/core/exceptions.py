@@ -47,6 +47,21 @@ class BarcodeScanError(AppException):
     pass
 
 
+class InvalidDateRangeError(AppException):
+    """Invalid date or date range error."""
+    pass
+
+
+class InvalidCursorError(AppException):
+    """Malformed or foreign pagination cursor."""
+    pass
+
+
+class DatabasePoolTimeoutError(DatabaseError):
+    """No pooled database connection became available in time."""
+    pass
+
+
 def handle_app_exception(exception: AppException) -> HTTPException:
     """Convert application exception to HTTP exception."""
     exception_map = {
@@ -57,7 +72,10 @@ def handle_app_exception(exception: AppException) -> HTTPException:
         UserNotFoundError: (status.HTTP_404_NOT_FOUND, "User not found."),
         EmptyCartError: (status.HTTP_404_NOT_FOUND, "Cart is empty."),
         BarcodeScanError: (status.HTTP_400_BAD_REQUEST, "Error scanning barcode."),
+        InvalidDateRangeError: (status.HTTP_400_BAD_REQUEST, "Dates must be YYYY-MM-DD and the start must not be after the end."),
+        InvalidCursorError: (status.HTTP_400_BAD_REQUEST, "Invalid page cursor."),
         DatabaseError: (status.HTTP_500_INTERNAL_SERVER_ERROR, "Database operation failed."),
+        DatabasePoolTimeoutError: (status.HTTP_503_SERVICE_UNAVAILABLE, "Database is busy, please retry."),
     }
     
     status_code, detail = exception_map.get(
@@ -2,6 +2,7 @@
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.db_routing import begin_request_scope, end_request_scope
 from app.core.exceptions import AppException, handle_app_exception
 from app.core.logging import logger
 
@@ -28,3 +29,27 @@ class ExceptionHandlerMiddleware(BaseHTTPMiddleware):
                 content={"detail": "Internal server error"}
             )
 
+
+class DatabaseRoutingMiddleware:
+    """
+    Scope read-replica routing to each request.
+    
+    Lets a request that has written through the primary keep reading from
+    it (see get_db). Pure ASGI so streamed responses stay in the scope
+    until their last chunk.
+    """
+    
+    def __init__(self, app):
+        """Wrap an ASGI app."""
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        """Run the request inside its own routing scope."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = begin_request_scope()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            end_request_scope(token)
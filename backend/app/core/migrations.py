@@ -3,6 +3,13 @@ import mysql.connector
 from mysql.connector import Error
 from app.core.database import get_db
 from app.core.logging import logger
+from app.utils.bill_text import parse_bill_items
+
+# Bills parsed per transaction when backfilling bill_items
+BILL_ITEMS_BACKFILL_CHUNK = 500
+
+# schema_migrations entry recorded once the bill_items backfill has finished
+BILL_ITEMS_BACKFILL_MIGRATION = "bill_items_backfill"
 
 
 def migrate_database():
@@ -11,6 +18,21 @@ def migrate_database():
         with get_db() as conn:
             cursor = conn.cursor()
             
+            # One-off data migrations that have finished, so they are not rerun.
+            # Tables are checked first: the pool raises CREATE TABLE IF NOT
+            # EXISTS's "table exists" note as an error.
+            try:
+                if not _table_exists(cursor, "schema_migrations"):
+                    cursor.execute("""
+                        CREATE TABLE schema_migrations (
+                            name VARCHAR(100) PRIMARY KEY,
+                            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                    """)
+                    logger.info("Created schema_migrations table")
+            except Error as e:
+                logger.warning(f"Could not create schema_migrations table: {e}")
+            
             # Add new columns to products table if they don't exist
             try:
                 cursor.execute("ALTER TABLE products ADD COLUMN reorder_point INT DEFAULT 0")
@@ -65,7 +87,7 @@ def migrate_database():
                     AND TABLE_NAME = 'bills' 
                     AND COLUMN_NAME = 'subtotal'
                 """)
-                col_exists = cursor.fetchone()['count'] > 0
+                col_exists = cursor.fetchone()[0] > 0
                 
                 if not col_exists:
                     # Add as nullable first
@@ -116,7 +138,7 @@ def migrate_database():
                         reason VARCHAR(255) NOT NULL,
                         user_id VARCHAR(36) NULL,
                         created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        INDEX idx_stock_barcode (barcode),
+                        INDEX idx_stock_barcode_created (barcode, created_at, id),
                         INDEX idx_stock_created_at (created_at),
                         INDEX idx_stock_user (user_id)
                     ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
@@ -125,6 +147,114 @@ def migrate_database():
             except Error as e:
                 logger.warning(f"Could not create stock_history table: {e}")
             
+            # Create bill_items table and backfill it from stored bill text
+            try:
+                if not _table_exists(cursor, "bill_items"):
+                    cursor.execute("""
+                        CREATE TABLE bill_items (
+                            id INT AUTO_INCREMENT PRIMARY KEY,
+                            bill_id INT NOT NULL,
+                            line_no INT NOT NULL,
+                            barcode VARCHAR(255) NULL,
+                            product_name VARCHAR(255) NOT NULL,
+                            category_id INT NULL,
+                            price FLOAT NOT NULL,
+                            quantity INT NOT NULL,
+                            line_total FLOAT NOT NULL,
+                            created_at DATETIME NOT NULL,
+                            UNIQUE KEY uq_bill_item_line (bill_id, line_no),
+                            INDEX idx_bill_item_created (created_at),
+                            INDEX idx_bill_item_barcode (barcode, created_at),
+                            INDEX idx_bill_item_category (category_id, created_at),
+                            CONSTRAINT fk_bill_item_bill FOREIGN KEY (bill_id) REFERENCES bills(id) ON DELETE CASCADE
+                        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                    """)
+                    logger.info("Created bill_items table")
+            except Error as e:
+                logger.warning(f"Could not create bill_items table: {e}")
+            
+            # Backfill once; the finished run is recorded in schema_migrations
+            try:
+                if not _migration_done(cursor, BILL_ITEMS_BACKFILL_MIGRATION):
+                    _backfill_bill_items(conn, cursor)
+                    _record_migration(conn, cursor, BILL_ITEMS_BACKFILL_MIGRATION)
+            except Error as e:
+                logger.warning(f"Could not backfill bill_items: {e}")
+            
+            # Create sales rollup tables and fill them from history on first run
+            try:
+                if not _table_exists(cursor, "sales_hourly"):
+                    cursor.execute("""
+                        CREATE TABLE sales_hourly (
+                            period_start DATETIME NOT NULL,
+                            cashier_name VARCHAR(255) NOT NULL DEFAULT '',
+                            payment_method VARCHAR(50) NOT NULL,
+                            bill_count INT NOT NULL DEFAULT 0,
+                            subtotal DECIMAL(14, 2) NOT NULL DEFAULT 0,
+                            discount_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+                            tax_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+                            total_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+                            PRIMARY KEY (period_start, cashier_name, payment_method),
+                            INDEX idx_sales_hourly_cashier (cashier_name, period_start)
+                        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                    """)
+                    logger.info("Created sales_hourly table")
+                if not _table_exists(cursor, "sales_daily"):
+                    cursor.execute("""
+                        CREATE TABLE sales_daily (
+                            period_start DATE NOT NULL,
+                            cashier_name VARCHAR(255) NOT NULL DEFAULT '',
+                            payment_method VARCHAR(50) NOT NULL,
+                            bill_count INT NOT NULL DEFAULT 0,
+                            subtotal DECIMAL(14, 2) NOT NULL DEFAULT 0,
+                            discount_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+                            tax_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+                            total_amount DECIMAL(14, 2) NOT NULL DEFAULT 0,
+                            PRIMARY KEY (period_start, cashier_name, payment_method),
+                            INDEX idx_sales_daily_cashier (cashier_name, period_start)
+                        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                    """)
+                    logger.info("Created sales_daily table")
+            except Error as e:
+                logger.warning(f"Could not create sales rollup tables: {e}")
+            
+            # Rollups start empty next to an existing bill history (whether the
+            # tables were created here or by db_init): fill them once
+            try:
+                cursor.execute("SELECT EXISTS(SELECT 1 FROM sales_daily), EXISTS(SELECT 1 FROM bills)")
+                has_rollups, has_bills = cursor.fetchone()
+                if has_bills and not has_rollups:
+                    conn.commit()
+                    from app.services.sales_rollup_service import SalesRollupService
+                    SalesRollupService().rebuild()
+            except Error as e:
+                logger.warning(f"Could not fill sales rollup tables: {e}")
+            
+            # Create bill_render_jobs table (background ticket/PDF rendering queue)
+            try:
+                if not _table_exists(cursor, "bill_render_jobs"):
+                    cursor.execute("""
+                        CREATE TABLE bill_render_jobs (
+                            id INT AUTO_INCREMENT PRIMARY KEY,
+                            bill_id INT NOT NULL,
+                            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                            attempts INT NOT NULL DEFAULT 0,
+                            payload MEDIUMTEXT NOT NULL,
+                            file_path TEXT NULL,
+                            pdf_path TEXT NULL,
+                            last_error TEXT NULL,
+                            next_attempt_at DATETIME NOT NULL,
+                            locked_at DATETIME NULL,
+                            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                            finished_at DATETIME NULL,
+                            UNIQUE KEY uq_render_job_bill (bill_id),
+                            INDEX idx_render_job_due (status, next_attempt_at)
+                        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                    """)
+                    logger.info("Created bill_render_jobs table")
+            except Error as e:
+                logger.warning(f"Could not create bill_render_jobs table: {e}")
+            
             # Create user_auth table
             try:
                 cursor.execute("""
@@ -178,6 +308,101 @@ def migrate_database():
             except Error:
                 pass
             
+            # One cart line per barcode, so adding to the cart can be a single upsert
+            try:
+                cursor.execute("""
+                    SELECT COUNT(*)
+                    FROM INFORMATION_SCHEMA.STATISTICS
+                    WHERE TABLE_SCHEMA = DATABASE()
+                    AND TABLE_NAME = 'cart'
+                    AND INDEX_NAME = 'uq_cart_barcode'
+                """)
+                if cursor.fetchone()[0] == 0:
+                    # Merge duplicate lines into the oldest one before adding the key
+                    cursor.execute("""
+                        UPDATE cart c
+                        JOIN (
+                            SELECT MIN(id) AS keep_id, SUM(quantity) AS total
+                            FROM cart GROUP BY barcode HAVING COUNT(*) > 1
+                        ) d ON c.id = d.keep_id
+                        SET c.quantity = d.total
+                    """)
+                    cursor.execute("""
+                        DELETE c FROM cart c
+                        JOIN (
+                            SELECT barcode, MIN(id) AS keep_id
+                            FROM cart GROUP BY barcode HAVING COUNT(*) > 1
+                        ) d ON c.barcode = d.barcode AND c.id <> d.keep_id
+                    """)
+                    cursor.execute("ALTER TABLE cart ADD UNIQUE KEY uq_cart_barcode (barcode)")
+                    logger.info("Added unique key on cart barcode")
+                    
+                    # The unique key makes the plain barcode index redundant
+                    try:
+                        cursor.execute("DROP INDEX idx_cart_barcode ON cart")
+                    except Error:
+                        pass
+            except Error as e:
+                logger.warning(f"Could not add unique key on cart barcode: {e}")
+            
+            # Composite indexes for cashier- and payment-filtered date ranges;
+            # they replace the single-column indexes they start with
+            for index_name, columns, old_index in (
+                ("idx_bill_cashier_created", "cashier_name, created_at", "idx_bill_cashier"),
+                ("idx_bill_payment_created", "payment_method, created_at", "idx_bill_payment_method"),
+            ):
+                try:
+                    cursor.execute("""
+                        SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+                        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'bills' AND INDEX_NAME = %s
+                    """, (index_name,))
+                    if cursor.fetchone()[0] == 0:
+                        cursor.execute(f"ALTER TABLE bills ADD INDEX {index_name} ({columns})")
+                        logger.info(f"Added index {index_name} on bills")
+                        try:
+                            cursor.execute(f"DROP INDEX {old_index} ON bills")
+                        except Error:
+                            pass
+                except Error as e:
+                    logger.warning(f"Could not add index {index_name} on bills: {e}")
+            
+            # Keyset pagination of a product's stock history seeks on
+            # (barcode, created_at, id); the index replaces idx_stock_barcode.
+            # Products, bills and users need no new index: InnoDB appends the
+            # primary key to idx_timestamp, idx_bill_created_at and idx_user_added_at.
+            try:
+                cursor.execute("""
+                    SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+                    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'stock_history'
+                    AND INDEX_NAME = 'idx_stock_barcode_created'
+                """)
+                if cursor.fetchone()[0] == 0:
+                    cursor.execute("ALTER TABLE stock_history ADD INDEX idx_stock_barcode_created (barcode, created_at, id)")
+                    logger.info("Added index idx_stock_barcode_created on stock_history")
+                    try:
+                        cursor.execute("DROP INDEX idx_stock_barcode ON stock_history")
+                    except Error:
+                        pass
+            except Error as e:
+                logger.warning(f"Could not add index idx_stock_barcode_created on stock_history: {e}")
+            
+            # Product search uses an ngram FULLTEXT index instead of LIKE '%term%'.
+            # Adding the first FULLTEXT index rebuilds the table, and InnoDB
+            # reports that as a warning (raised by the pool), so success is
+            # judged by whether the index exists afterwards.
+            if not _index_exists(cursor, "products", "ft_product_name"):
+                try:
+                    cursor.execute("SET SESSION innodb_ft_enable_stopword = OFF")
+                    conn.mark_session_dirty()
+                    cursor.execute(
+                        "ALTER TABLE products ADD FULLTEXT INDEX ft_product_name (product_name) WITH PARSER ngram"
+                    )
+                except Error as e:
+                    if not _index_exists(cursor, "products", "ft_product_name"):
+                        logger.warning(f"Could not add FULLTEXT index ft_product_name on products: {e}")
+                if _index_exists(cursor, "products", "ft_product_name"):
+                    logger.info("Added FULLTEXT index ft_product_name on products")
+            
             # Ensure all existing bills have proper subtotal (already handled above, but double-check)
             try:
                 cursor.execute("UPDATE bills SET subtotal = total_amount WHERE subtotal IS NULL OR subtotal = 0")
@@ -196,3 +421,104 @@ def migrate_database():
         logger.error(f"Error running migrations: {e}")
         raise
 
+
+def _backfill_bill_items(conn, cursor):
+    """
+    Create bill_items rows for bills stored before line items were recorded.
+    
+    Bills are read in keyset-paginated chunks and each chunk is committed on
+    its own, so a large history never holds one long transaction. Bills that
+    already have items are skipped, which makes the backfill resumable.
+    Barcode and category are filled in where the product name still matches
+    exactly one product. Bills without a created_at (bill_items requires
+    one) are skipped and counted.
+    
+    Args:
+        conn: Open connection
+        cursor: Tuple cursor on that connection
+    """
+    last_id = 0
+    backfilled_bills = 0
+    backfilled_items = 0
+    skipped_bills = 0
+    
+    while True:
+        cursor.execute("""
+            SELECT b.id, b.bill_text, b.created_at
+            FROM bills b
+            WHERE b.id > %s
+            AND NOT EXISTS (SELECT 1 FROM bill_items bi WHERE bi.bill_id = b.id)
+            ORDER BY b.id
+            LIMIT %s
+        """, (last_id, BILL_ITEMS_BACKFILL_CHUNK))
+        bills = cursor.fetchall()
+        if not bills:
+            break
+        
+        rows = []
+        for bill_id, bill_text, created_at in bills:
+            if created_at is None:
+                skipped_bills += 1
+                continue
+            items = parse_bill_items(bill_text)
+            if items:
+                backfilled_bills += 1
+            for line_no, item in enumerate(items, start=1):
+                rows.append((
+                    bill_id, line_no, item['product_name'], item['price'],
+                    item['quantity'], item['line_total'], created_at
+                ))
+        
+        if rows:
+            cursor.executemany("""
+                INSERT INTO bill_items (bill_id, line_no, product_name, price, quantity, line_total, created_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, rows)
+            backfilled_items += len(rows)
+        conn.commit()
+        last_id = bills[-1][0]
+    
+    if backfilled_items:
+        cursor.execute("""
+            UPDATE bill_items bi
+            JOIN (
+                SELECT product_name, MIN(barcode) AS barcode, MIN(category_id) AS category_id
+                FROM products GROUP BY product_name HAVING COUNT(*) = 1
+            ) p ON p.product_name = bi.product_name
+            SET bi.barcode = p.barcode, bi.category_id = p.category_id
+            WHERE bi.barcode IS NULL
+        """)
+        conn.commit()
+        logger.info(f"Backfilled {backfilled_items} bill item(s) for {backfilled_bills} bill(s)")
+    if skipped_bills:
+        logger.warning(f"Skipped {skipped_bills} bill(s) without created_at while backfilling bill_items")
+
+
+def _table_exists(cursor, table: str) -> bool:
+    """Check whether a table exists in the current database."""
+    cursor.execute("""
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """, (table,))
+    return cursor.fetchone()[0] > 0
+
+
+def _migration_done(cursor, name: str) -> bool:
+    """Check whether a one-off data migration has been recorded as finished."""
+    cursor.execute("SELECT COUNT(*) FROM schema_migrations WHERE name = %s", (name,))
+    return cursor.fetchone()[0] > 0
+
+
+def _record_migration(conn, cursor, name: str):
+    """Record a one-off data migration as finished."""
+    cursor.execute("INSERT INTO schema_migrations (name) VALUES (%s)", (name,))
+    conn.commit()
+
+
+def _index_exists(cursor, table: str, index_name: str) -> bool:
+    """Check whether an index exists on a table of the current database."""
+    cursor.execute("""
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+    """, (table, index_name))
+    return cursor.fetchone()[0] > 0
@@ -0,0 +1,132 @@
+"""Per-connection registry of server-side prepared statements."""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from mysql.connector import Error, errorcode
+
+
+class PreparedStatementRegistry:
+    """
+    Prepared cursors of one connection, keyed by SQL text.
+    
+    The first execution of a statement prepares it on the server
+    (COM_STMT_PREPARE); later ones only send the parameters
+    (COM_STMT_EXECUTE), so MySQL does not parse the SQL again. The registry
+    belongs to the pool, not to a checkout, so statements outlive the
+    request that prepared them. It is cleared when the server session goes
+    away: on a session reset, and when the connection id changes after a
+    reconnect. At most max_size statements are kept, least recently used
+    first out.
+    
+    Cursors returned by execute() stay owned by the registry: read their
+    whole result and do not close them.
+    """
+    
+    def __init__(self, max_size: int, stats: Dict, lock: threading.Condition):
+        """
+        Initialize an empty registry.
+        
+        Args:
+            max_size: Statements kept prepared (0 = execute as plain text)
+            stats: Pool counters updated with prepares, reuses and evictions
+            lock: Lock guarding stats
+        """
+        self.max_size = max_size
+        self._stats = stats
+        self._lock = lock
+        # (sql, dictionary) -> (sql object, cursor). mysql.connector only
+        # re-executes a prepared statement when given the very same string
+        # object, so the first one seen is kept and passed on every call.
+        self._cursors: "OrderedDict[Tuple[str, bool], Tuple[str, Any]]" = OrderedDict()
+        self._connection_id: Optional[int] = None
+    
+    def __len__(self) -> int:
+        return len(self._cursors)
+    
+    def execute(self, cnx, sql: str, params: Sequence = (), dictionary: bool = False):
+        """
+        Execute a statement, preparing it on first use.
+        
+        Args:
+            cnx: mysql.connector connection the registry belongs to
+            sql: Statement with %s placeholders
+            params: Statement parameters
+            dictionary: Return rows as dictionaries
+        
+        Returns:
+            Executed cursor (owned by the registry)
+        
+        Raises:
+            mysql.connector.Error: If the statement fails
+        """
+        if self.max_size <= 0:
+            cursor = cnx.cursor(dictionary=dictionary)
+            cursor.execute(sql, params)
+            return cursor
+        
+        connection_id = cnx.connection_id
+        if connection_id != self._connection_id:
+            # New server session (reconnect): its statements are gone
+            self.forget()
+            self._connection_id = connection_id
+        
+        key = (sql, dictionary)
+        try:
+            return self._execute(cnx, key, params)
+        except Error as e:
+            if e.errno != errorcode.ER_UNKNOWN_STMT_HANDLER:
+                raise
+            # Deallocated behind our back; prepare it again once
+            self._cursors.pop(key, None)
+            return self._execute(cnx, key, params)
+    
+    def _execute(self, cnx, key: Tuple[str, bool], params: Sequence):
+        """Execute through the cached cursor, creating it on a miss."""
+        entry = self._cursors.get(key)
+        created = entry is None
+        if not created:
+            self._cursors.move_to_end(key)
+            self._count("statements_reused")
+        else:
+            entry = (key[0], cnx.cursor(prepared=True, dictionary=key[1]))
+            self._cursors[key] = entry
+            self._count("statements_prepared")
+            while len(self._cursors) > self.max_size:
+                _, (_, evicted) = self._cursors.popitem(last=False)
+                self._close_quietly(evicted)
+                self._count("statements_evicted")
+        sql, cursor = entry
+        try:
+            cursor.execute(sql, params)
+        except Error:
+            if created:
+                # The statement may not have been prepared; start over next time
+                self._cursors.pop(key, None)
+                self._close_quietly(cursor)
+            raise
+        return cursor
+    
+    def clear(self):
+        """Deallocate every statement (COM_STMT_CLOSE, no server reply)."""
+        cursors = [cursor for _, cursor in self._cursors.values()]
+        self.forget()
+        for cursor in cursors:
+            self._close_quietly(cursor)
+    
+    def forget(self):
+        """Drop every statement without telling the server (its session is gone)."""
+        self._cursors.clear()
+        self._connection_id = None
+    
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+    
+    @staticmethod
+    def _close_quietly(cursor):
+        """Close a cursor, ignoring errors from a broken connection."""
+        try:
+            cursor.close()
+        except Exception:
+            pass
@@ -3,10 +3,16 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.async_database import async_pool
 from app.core.database import init_db
 from app.core.logging import logger
-from app.core.middleware import ExceptionHandlerMiddleware
-from app.api import scanner, inventory, cart, users, bills, categories, auth, reports
+from app.core.middleware import DatabaseRoutingMiddleware, ExceptionHandlerMiddleware
+from app.api import scanner, inventory, cart, users, bills, categories, auth, reports, metrics, exports
+from app.services.bill_render_service import bill_render_worker
+from app.services.camera_manager import camera_manager
+from app.services.image_decode_service import ImageDecodeService
+from app.services.scan_job_service import scan_job_manager
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
 # API versioning
 API_V1_PREFIX = "/api/v1"
@@ -28,11 +34,16 @@ app = FastAPI(
 # Add exception handling middleware
 app.add_middleware(ExceptionHandlerMiddleware)
 
+# Track per request whether reads must stay on the primary (read-your-writes)
+app.add_middleware(DatabaseRoutingMiddleware)
+
 # Configure CORS
 # Security: In production, restrict methods and headers
 cors_kwargs = {
     "allow_origins": settings.cors_origins,
     "allow_credentials": True,
+    # Lets browser clients read the next-page token of paginated lists
+    "expose_headers": [NEXT_CURSOR_HEADER],
 }
 
 if settings.DEBUG:
@@ -55,6 +66,8 @@ app.include_router(users.router, prefix=API_V1_PREFIX)
 app.include_router(bills.router, prefix=API_V1_PREFIX)
 app.include_router(auth.router, prefix=API_V1_PREFIX)
 app.include_router(reports.router, prefix=API_V1_PREFIX)
+app.include_router(exports.router, prefix=API_V1_PREFIX)
+app.include_router(metrics.router, prefix=API_V1_PREFIX)
 
 # Legacy endpoints (without versioning) for backward compatibility
 # These will be removed in version 2.0.0 - migrate to /api/v1/* endpoints
@@ -206,12 +219,28 @@ async def startup_event():
     """Application startup event."""
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     logger.info(f"Database: {settings.DATABASE_URL}")
+    
+    # Async routes use their own pool, which must be created inside the event loop
+    await async_pool.open()
+    
+    # Open the scanner camera once and keep it warm for all scan requests
+    if settings.CAMERA_AUTOSTART:
+        camera_manager.start()
+    
+    # Render bill files and PDFs queued by checkout
+    if settings.BILL_RENDER_WORKER_ENABLED:
+        bill_render_worker.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown event."""
     logger.info("Shutting down application")
+    scan_job_manager.shutdown()
+    camera_manager.stop()
+    ImageDecodeService.shutdown_pool()
+    bill_render_worker.stop()
+    await async_pool.close()
 
 
 @app.get("/")
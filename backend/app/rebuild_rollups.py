@@ -0,0 +1,34 @@
+"""Script to recompute the sales rollup tables from the bills table."""
+import argparse
+import sys
+from pathlib import Path
+
+# Add the backend directory to Python path so imports work
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.core.logging import logger
+from app.services.sales_rollup_service import SalesRollupService
+
+
+def rebuild_rollups(since=None):
+    """
+    Recompute sales_hourly and sales_daily from bills.
+
+    Args:
+        since: Only rebuild periods from this day on (YYYY-MM-DD); all history if None
+    """
+    try:
+        written = SalesRollupService().rebuild(since=since)
+        logger.info(f"✅ Sales rollups rebuilt: {written}")
+    except Exception as e:
+        logger.error(f"Error rebuilding sales rollups: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute the sales rollup tables used by the sales reports.")
+    parser.add_argument("--since", help="Only rebuild from this day on (YYYY-MM-DD); default is all history")
+    args = parser.parse_args()
+    rebuild_rollups(since=args.since)
@@ -20,6 +20,7 @@ class BillResponse(BaseModel):
     cashier: Optional[str] = None
     file_path: str
     pdf_path: Optional[str] = None
+    render_status: Optional[str] = None
     subtotal: float
     discount_amount: float
     tax_amount: float
@@ -27,6 +28,19 @@ class BillResponse(BaseModel):
     payment_method: str
 
 
+class BillRenderJobResponse(BaseModel):
+    """Schema for a bill's background render job."""
+    bill_id: int
+    status: str
+    attempts: int
+    last_error: Optional[str] = None
+    file_path: Optional[str] = None
+    pdf_path: Optional[str] = None
+    next_attempt_at: Optional[str] = None
+    created_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
 class BillListItem(BaseModel):
     """Schema for bill list item."""
     bill_id: int
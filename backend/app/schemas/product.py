@@ -82,6 +82,11 @@ class ProductResponse(ProductInfo):
     pass
 
 
+class ProductSearchResult(ProductResponse):
+    """Product search hit."""
+    match: str = Field(..., description="How the product matched: barcode, prefix (name starts with the query) or name")
+
+
 class CategoryCreate(BaseModel):
     """Schema for creating a category."""
     name: str = Field(..., min_length=1, max_length=255, description="Category name")
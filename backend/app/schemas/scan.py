@@ -0,0 +1,32 @@
+"""Scanner-related Pydantic schemas."""
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from app.schemas.product import ProductInfo
+
+
+class ImageDecodeResult(BaseModel):
+    """Barcodes decoded from one uploaded image."""
+    index: int = Field(..., description="Position of the image in the request")
+    filename: Optional[str] = Field(None, description="Uploaded file name, if any")
+    barcodes: List[str] = Field(default_factory=list, description="Decoded barcode values")
+    width: Optional[int] = Field(None, description="Image width in pixels")
+    height: Optional[int] = Field(None, description="Image height in pixels")
+    decode_ms: Optional[float] = Field(None, description="Server-side decode time in milliseconds")
+    error: Optional[str] = Field(None, description="Why the image could not be decoded")
+
+
+class ImageDecodeResponse(BaseModel):
+    """Response schema for image decoding."""
+    count: int = Field(..., description="Number of images processed")
+    results: List[ImageDecodeResult]
+
+
+class ScanJobResponse(BaseModel):
+    """Response schema for an asynchronous scan job."""
+    job_id: str = Field(..., description="Scan job id")
+    status: str = Field(..., description="pending, running, completed, failed or cancelled")
+    result: Optional[ProductInfo] = Field(None, description="Scanned product once completed")
+    error: Optional[str] = Field(None, description="Why the scan failed")
+    created_at: float = Field(..., description="Unix time the job was created")
+    finished_at: Optional[float] = Field(None, description="Unix time the job finished")
@@ -0,0 +1,277 @@
+"""Barcode decoding with a pluggable preprocessing stage."""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+from pyzbar.pyzbar import decode
+
+from app.core.config import settings
+
+
+class FramePreprocessor:
+    """
+    Base preprocessing stage.
+    
+    A preprocessor receives a grayscale frame and returns the image regions
+    that should be handed to pyzbar. The base implementation decodes the
+    whole frame.
+    """
+    
+    name = "none"
+    
+    def regions(self, gray: np.ndarray) -> List[np.ndarray]:
+        """
+        Get the regions to decode.
+        
+        Args:
+            gray: Grayscale frame
+        
+        Returns:
+            List of grayscale images to decode
+        """
+        return [gray]
+
+
+class RegionPreprocessor(FramePreprocessor):
+    """
+    Locate likely 1D barcode regions with gradient/morphology analysis.
+    
+    Detection runs on a copy downscaled to detect_width, so its cost does not
+    grow with camera resolution. Matching regions are cropped from the
+    full-resolution grayscale frame and only upscaled when they are too small
+    for pyzbar to resolve the bars.
+    """
+    
+    name = "regions"
+    
+    def __init__(
+        self,
+        detect_width: int = 640,
+        max_regions: int = 4,
+        min_area_ratio: float = 0.002,
+        min_crop_height: int = 80,
+        padding: float = 0.15
+    ):
+        """
+        Initialize the region preprocessor.
+        
+        Args:
+            detect_width: Width of the downscaled image used for detection
+            max_regions: Maximum number of candidate regions per frame
+            min_area_ratio: Minimum region area as a fraction of the frame
+            min_crop_height: Crops shorter than this are upscaled before decoding
+            padding: Padding added around each region (fraction of its size)
+        """
+        self.detect_width = detect_width
+        self.max_regions = max_regions
+        self.min_area_ratio = min_area_ratio
+        self.min_crop_height = min_crop_height
+        self.padding = padding
+    
+    def regions(self, gray: np.ndarray) -> List[np.ndarray]:
+        """Crop candidate barcode regions from the full-resolution frame."""
+        height, width = gray.shape[:2]
+        scale = min(1.0, self.detect_width / float(width))
+        small = gray if scale == 1.0 else cv2.resize(
+            gray, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA
+        )
+        
+        crops = []
+        for x, y, w, h in self._locate(small):
+            pad_x, pad_y = int(w * self.padding), int(h * self.padding)
+            x0 = max(0, int((x - pad_x) / scale))
+            y0 = max(0, int((y - pad_y) / scale))
+            x1 = min(width, int((x + w + pad_x) / scale))
+            y1 = min(height, int((y + h + pad_y) / scale))
+            crop = gray[y0:y1, x0:x1]
+            if crop.size == 0:
+                continue
+            if crop.shape[0] < self.min_crop_height:
+                factor = self.min_crop_height / float(crop.shape[0])
+                crop = cv2.resize(crop, None, fx=factor, fy=factor, interpolation=cv2.INTER_LINEAR)
+            crops.append(crop)
+        return crops
+    
+    def _locate(self, small: np.ndarray) -> List[tuple]:
+        """
+        Find bounding boxes of high horizontal-gradient areas.
+        
+        Args:
+            small: Downscaled grayscale frame
+        
+        Returns:
+            List of (x, y, w, h) boxes in downscaled coordinates, largest first
+        """
+        grad_x = cv2.Sobel(small, cv2.CV_32F, 1, 0, ksize=-1)
+        grad_y = cv2.Sobel(small, cv2.CV_32F, 0, 1, ksize=-1)
+        gradient = cv2.convertScaleAbs(cv2.subtract(np.abs(grad_x), np.abs(grad_y)))
+        
+        blurred = cv2.blur(gradient, (9, 9))
+        _, thresh = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (21, 7))
+        closed = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+        closed = cv2.erode(closed, None, iterations=4)
+        closed = cv2.dilate(closed, None, iterations=4)
+        
+        contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        min_area = self.min_area_ratio * small.shape[0] * small.shape[1]
+        boxes = [cv2.boundingRect(c) for c in contours]
+        boxes = [b for b in boxes if b[2] * b[3] >= min_area]
+        boxes.sort(key=lambda b: b[2] * b[3], reverse=True)
+        return boxes[:self.max_regions]
+
+
+PREPROCESSORS = {
+    FramePreprocessor.name: FramePreprocessor,
+    RegionPreprocessor.name: RegionPreprocessor,
+}
+
+
+class BarcodeDecoder:
+    """
+    Decode barcodes from camera frames.
+    
+    Frames go through grayscale conversion, the configured preprocessor and
+    pyzbar. When the preprocessor's regions yield nothing, the full grayscale
+    frame is decoded as a fallback on every fallback_every-th miss, so a
+    barcode the locator cannot see is still found without paying full-frame
+    cost on every frame. Per-stage timings are accumulated for metrics.
+    """
+    
+    STAGES = ("grayscale", "locate", "decode", "fallback")
+    
+    def __init__(self, preprocessor: Optional[FramePreprocessor] = None, fallback_every: int = 1):
+        """
+        Initialize the decoder.
+        
+        Args:
+            preprocessor: Preprocessing stage (defaults to full-frame decode)
+            fallback_every: Run a full-frame decode on every Nth frame whose
+                regions decoded nothing (0 disables the fallback)
+        """
+        self.preprocessor = preprocessor or FramePreprocessor()
+        self.fallback_every = fallback_every
+        self._lock = threading.Lock()
+        self._misses = 0
+        self._timings = {stage: 0.0 for stage in self.STAGES}
+        self._counts = {stage: 0 for stage in self.STAGES}
+        self._hits = {"region": 0, "fallback": 0}
+        self._frames = 0
+    
+    @contextmanager
+    def _timed(self, stage: str):
+        """Accumulate the wall time spent in a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._timings[stage] += elapsed
+                self._counts[stage] += 1
+    
+    def decode(self, frame: np.ndarray) -> List[str]:
+        """
+        Decode all barcodes in a frame.
+        
+        Args:
+            frame: BGR or grayscale frame
+        
+        Returns:
+            List of unique decoded barcode strings
+        """
+        with self._lock:
+            self._frames += 1
+        
+        with self._timed("grayscale"):
+            gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        
+        with self._timed("locate"):
+            regions = self.preprocessor.regions(gray)
+        
+        barcodes: List[str] = []
+        with self._timed("decode"):
+            for region in regions:
+                barcodes.extend(self._decode_image(region))
+        if barcodes:
+            with self._lock:
+                self._hits["region"] += 1
+            return list(dict.fromkeys(barcodes))
+        
+        if not self._should_fallback(regions, gray):
+            return []
+        
+        with self._timed("fallback"):
+            barcodes = self._decode_image(gray)
+        if barcodes:
+            with self._lock:
+                self._hits["fallback"] += 1
+        return list(dict.fromkeys(barcodes))
+    
+    def _should_fallback(self, regions: List[np.ndarray], gray: np.ndarray) -> bool:
+        """Decide whether a missed frame gets a full-frame decode."""
+        if self.fallback_every <= 0:
+            return False
+        # The full frame was already decoded
+        if len(regions) == 1 and regions[0] is gray:
+            return False
+        with self._lock:
+            self._misses += 1
+            return self._misses % self.fallback_every == 0
+    
+    @staticmethod
+    def _decode_image(image: np.ndarray) -> List[str]:
+        """Run pyzbar on a single grayscale image."""
+        return [barcode.data.decode("utf-8") for barcode in decode(image)]
+    
+    def get_stats(self) -> Dict:
+        """
+        Get per-stage timing counters.
+        
+        Returns:
+            Dictionary with frame count, hit counts and per-stage totals/averages
+        """
+        with self._lock:
+            return {
+                "preprocessor": self.preprocessor.name,
+                "frames": self._frames,
+                "region_hits": self._hits["region"],
+                "fallback_hits": self._hits["fallback"],
+                "stages": {
+                    stage: {
+                        "calls": self._counts[stage],
+                        "total_ms": round(self._timings[stage] * 1000, 3),
+                        "avg_ms": round(self._timings[stage] * 1000 / self._counts[stage], 3)
+                        if self._counts[stage] else 0.0,
+                    }
+                    for stage in self.STAGES
+                },
+            }
+
+
+def create_decoder(preprocess: Optional[str] = None, fallback_every: Optional[int] = None) -> BarcodeDecoder:
+    """
+    Build a decoder from settings.
+    
+    Args:
+        preprocess: Preprocessor name (defaults to settings.SCANNER_PREPROCESS)
+        fallback_every: Full-frame fallback interval (defaults to settings.SCANNER_FALLBACK_EVERY)
+    
+    Returns:
+        Configured BarcodeDecoder
+    """
+    name = preprocess or settings.SCANNER_PREPROCESS
+    if name not in PREPROCESSORS:
+        raise ValueError(f"Unknown scanner preprocessor '{name}'. Choose from: {', '.join(PREPROCESSORS)}")
+    
+    if name == RegionPreprocessor.name:
+        preprocessor = RegionPreprocessor(detect_width=settings.SCANNER_DETECT_WIDTH)
+    else:
+        preprocessor = PREPROCESSORS[name]()
+    if fallback_every is None:
+        fallback_every = settings.SCANNER_FALLBACK_EVERY
+    return BarcodeDecoder(preprocessor, fallback_every=fallback_every)
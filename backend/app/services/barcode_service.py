@@ -1,102 +1,125 @@
 """Barcode scanning service using raw MySQL queries."""
 import cv2
+import threading
 import time
-from pyzbar.pyzbar import decode
-from typing import Dict
+from typing import Dict, Optional
 from datetime import datetime
 
 from app.core.config import settings
 from app.core.logging import logger
 from app.services.inventory_service import InventoryService
+from app.services.camera_manager import camera_manager
 
 
 class BarcodeService:
     """Service for barcode scanning operations."""
     
-    def scan_barcode(self) -> Dict:
+    def scan_barcode(
+        self,
+        timeout: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Dict:
         """
         Scan a barcode using the camera.
         
+        The device is owned by the long-lived CameraManager, so a scan only
+        subscribes to its detections instead of opening and warming up the
+        camera. In headless mode (settings.SCANNER_HEADLESS) OpenCV HighGUI is
+        never touched; frames are offered to the MJPEG preview stream instead.
+        
+        Args:
+            timeout: Maximum scan duration in seconds (defaults to settings.SCANNER_TIMEOUT)
+            cancel_event: Set to abort the scan and release the subscription
+        
         Returns:
             Dictionary containing product information or error
         """
-        cap = cv2.VideoCapture(settings.CAMERA_INDEX)
         scanned_barcodes = set()
         start_time = time.time()
-        timeout = settings.SCANNER_TIMEOUT
+        timeout = timeout or settings.SCANNER_TIMEOUT
+        headless = settings.SCANNER_HEADLESS
         
-        if not cap.isOpened():
-            logger.error("Could not open camera")
-            return {"error": "Could not open camera"}
+        camera_manager.start()
+        if not camera_manager.wait_until_open(min(timeout, settings.CAMERA_OPEN_TIMEOUT)):
+            error = camera_manager.last_error or "Could not open camera"
+            logger.error(error)
+            return {"error": error}
         
-        product_info = None
         inventory_service = InventoryService()
         
         try:
-            while time.time() - start_time < timeout:
-                ret, frame = cap.read()
-                if not ret:
-                    logger.warning("Failed to capture image")
-                    return {"error": "Failed to capture image"}
-                
-                detected_barcodes = decode(frame)
-                
-                for barcode in detected_barcodes:
-                    barcode_data = barcode.data.decode("utf-8")
-                    if barcode_data not in scanned_barcodes:
-                        scanned_barcodes.add(barcode_data)
-                        logger.info(f"Barcode scanned: {barcode_data}")
-                        
-                        # Check if product exists in inventory
-                        product = inventory_service.get_product(barcode_data)
-                        
-                        if product:
-                            product_info = {
-                                "barcode": barcode_data,
-                                "product_name": product["product_name"],
-                                "price": product["price"],
-                                "quantity": product["quantity"],
-                                "details": product["details"],
-                                "timestamp": product["timestamp"].isoformat() if isinstance(product["timestamp"], datetime) else product["timestamp"]
-                            }
-                        else:
-                            # Add product to inventory if not found
-                            logger.info(f"Product not found, adding to inventory: {barcode_data}")
-                            inventory_service.add_product(
-                                barcode_data,
-                                {
-                                    'product_name': 'Unknown Product',
-                                    'price': 0.0,
-                                    'quantity': 1,
-                                    'details': 'to fill'
-                                }
-                            )
-                            product_info = {
-                                "barcode": barcode_data,
-                                "product_name": "Unknown Product",
-                                "price": 0.0,
-                                "quantity": 1,
-                                "details": "to fill",
-                                "timestamp": datetime.now().isoformat()
-                            }
-                        
-                        cap.release()
-                        cv2.destroyAllWindows()
-                        return product_info
-                
-                cv2.imshow("Barcode Scanner", frame)
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    break
-            
-            if not product_info:
-                logger.warning("No barcode detected within timeout period")
-                return {"error": "No barcode detected"}
-            
-            return product_info
+            with camera_manager.subscribe() as subscription:
+                while time.time() - start_time < timeout:
+                    if cancel_event is not None and cancel_event.is_set():
+                        logger.info("Barcode scan cancelled")
+                        return {"error": "Scan cancelled"}
+                    
+                    detected_barcodes = subscription.get(timeout=0.25 if headless else 0.03)
+                    
+                    for barcode_data in detected_barcodes:
+                        if barcode_data not in scanned_barcodes:
+                            scanned_barcodes.add(barcode_data)
+                            logger.info(f"Barcode scanned: {barcode_data}")
+                            return self._resolve_product(barcode_data, inventory_service)
+                    
+                    if headless:
+                        continue
+                    
+                    frame = camera_manager.latest_frame()
+                    if frame is not None:
+                        cv2.imshow("Barcode Scanner", frame)
+                    if cv2.waitKey(1) & 0xFF == ord('q'):
+                        break
             
+            logger.warning("No barcode detected within timeout period")
+            return {"error": "No barcode detected"}
+        
         except Exception as e:
             logger.error(f"Error during barcode scanning: {e}")
             return {"error": f"Error scanning barcode: {str(e)}"}
         finally:
-            cap.release()
-            cv2.destroyAllWindows()
+            if not headless:
+                cv2.destroyAllWindows()
+    
+    def _resolve_product(self, barcode_data: str, inventory_service: InventoryService) -> Dict:
+        """
+        Look up a scanned barcode, adding a placeholder product if it is unknown.
+        
+        Args:
+            barcode_data: Decoded barcode string
+            inventory_service: Inventory service used for lookup/insert
+        
+        Returns:
+            Product information dictionary
+        """
+        product = inventory_service.get_product(barcode_data)
+        
+        if product:
+            return {
+                "barcode": barcode_data,
+                "product_name": product["product_name"],
+                "price": product["price"],
+                "quantity": product["quantity"],
+                "details": product["details"],
+                "timestamp": product["timestamp"].isoformat() if isinstance(product["timestamp"], datetime) else product["timestamp"]
+            }
+        
+        # Add product to inventory if not found
+        logger.info(f"Product not found, adding to inventory: {barcode_data}")
+        inventory_service.add_product(
+            barcode_data,
+            {
+                'product_name': 'Unknown Product',
+                'price': 0.0,
+                'quantity': 1,
+                'details': 'to fill'
+            }
+        )
+        return {
+            "barcode": barcode_data,
+            "product_name": "Unknown Product",
+            "price": 0.0,
+            "quantity": 1,
+            "details": "to fill",
+            "timestamp": datetime.now().isoformat()
+        }
@@ -0,0 +1,402 @@
+"""Background rendering of bill ticket files and PDFs."""
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.logging import logger
+
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.pdfgen import canvas
+    PDF_AVAILABLE = True
+except ImportError:
+    PDF_AVAILABLE = False
+    logger.warning("reportlab not available. PDF generation will be disabled.")
+
+
+class BillRenderWorker:
+    """
+    Renders bill files from the bill_render_jobs table.
+    
+    Checkout inserts a job row in the same transaction as the bill, so a
+    committed bill always has a job and a crashed server picks it up again
+    on restart. Jobs are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so
+    several API processes can run workers against the same table. A failed
+    render is retried with exponential backoff until BILL_RENDER_MAX_ATTEMPTS,
+    then left in the 'failed' state for inspection or a manual retry.
+    """
+    
+    def __init__(
+        self,
+        poll_interval: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_base: Optional[float] = None,
+        stale_after: Optional[float] = None
+    ):
+        """
+        Initialize the worker.
+        
+        Args:
+            poll_interval: Seconds between polls when idle (defaults to settings)
+            max_attempts: Render attempts before a job is marked failed (defaults to settings)
+            retry_base: Delay before the first retry, doubled per attempt (defaults to settings)
+            stale_after: Seconds after which a 'running' job is reclaimed (defaults to settings)
+        """
+        self.poll_interval = poll_interval or settings.BILL_RENDER_POLL_SECONDS
+        self.max_attempts = max_attempts or settings.BILL_RENDER_MAX_ATTEMPTS
+        self.retry_base = settings.BILL_RENDER_RETRY_BASE_SECONDS if retry_base is None else retry_base
+        self.stale_after = stale_after or settings.BILL_RENDER_STALE_SECONDS
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._metrics = {
+            "rendered": 0,
+            "retries": 0,
+            "failed": 0,
+            "last_render_ms": None,
+            "last_lag_ms": None,
+        }
+    
+    @staticmethod
+    def enqueue(cursor, bill_id: int, payload: Dict):
+        """
+        Queue a render job inside the caller's transaction.
+        
+        Args:
+            cursor: Cursor of the open checkout transaction
+            bill_id: ID of the bill just inserted
+            payload: Everything needed to render without reading the bill back
+        """
+        cursor.execute(
+            "INSERT INTO bill_render_jobs (bill_id, payload, next_attempt_at, created_at) "
+            "VALUES (%s, %s, %s, %s)",
+            (bill_id, json.dumps(payload), datetime.utcnow(), datetime.utcnow())
+        )
+    
+    def start(self):
+        """Start the worker thread if it is not already running."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="bill-render", daemon=True)
+        self._thread.start()
+        logger.info("Bill render worker started")
+    
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop the worker thread.
+        
+        Args:
+            timeout: Seconds to wait for an in-flight render to finish
+        """
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info("Bill render worker stopped")
+    
+    def notify(self):
+        """Wake the worker after a job was committed."""
+        self._wakeup.set()
+    
+    def _run(self):
+        """Worker loop: render due jobs, sleep until notified or the next poll."""
+        while not self._stop.is_set():
+            try:
+                job = self._claim()
+                if job:
+                    self._process(job)
+                    continue
+            except Exception as e:
+                # Keep the thread alive (e.g. pool timeout, database down);
+                # an unfinished job goes stale and is reclaimed later
+                logger.error(f"Bill render worker error, retrying in {self.poll_interval}s: {e}")
+                self._stop.wait(self.poll_interval)
+                continue
+            
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+    
+    def _claim(self) -> Optional[Dict]:
+        """
+        Claim the next due job.
+        
+        Returns:
+            Job row (id, bill_id, attempts, payload, created_at) or None
+        """
+        now = datetime.utcnow()
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute("""
+                    SELECT id, bill_id, attempts, payload, created_at
+                    FROM bill_render_jobs
+                    WHERE (status = 'pending' AND next_attempt_at <= %s)
+                       OR (status = 'running' AND locked_at < %s)
+                    ORDER BY next_attempt_at
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                """, (now, now - timedelta(seconds=self.stale_after)))
+                job = cursor.fetchone()
+                if job:
+                    cursor.execute(
+                        "UPDATE bill_render_jobs SET status = 'running', attempts = attempts + 1, locked_at = %s "
+                        "WHERE id = %s",
+                        (now, job['id'])
+                    )
+                    job['attempts'] += 1
+                conn.commit()
+                return job
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+    
+    def _process(self, job: Dict):
+        """
+        Render a claimed job and record the outcome.
+        
+        Args:
+            job: Claimed job row
+        """
+        start = time.perf_counter()
+        try:
+            file_path, pdf_path = self.render(json.loads(job['payload']))
+        except Exception as e:
+            self._record_failure(job, e)
+            return
+        
+        render_ms = round((time.perf_counter() - start) * 1000, 2)
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE bill_render_jobs SET status = 'done', file_path = %s, pdf_path = %s, "
+                "last_error = NULL, finished_at = %s WHERE id = %s",
+                (str(file_path), str(pdf_path) if pdf_path else None, datetime.utcnow(), job['id'])
+            )
+            conn.commit()
+            cursor.close()
+        
+        self._metrics["rendered"] += 1
+        self._metrics["last_render_ms"] = render_ms
+        if isinstance(job.get('created_at'), datetime):
+            self._metrics["last_lag_ms"] = round((datetime.utcnow() - job['created_at']).total_seconds() * 1000, 2)
+        logger.info(f"Bill {job['bill_id']} rendered in {render_ms} ms: {file_path}")
+    
+    def _record_failure(self, job: Dict, error: Exception):
+        """
+        Schedule a retry with exponential backoff, or mark the job failed.
+        
+        Args:
+            job: Claimed job row
+            error: Render error
+        """
+        attempts = job['attempts']
+        error = f"{type(error).__name__}: {error}"
+        try:
+            with get_db() as conn:
+                cursor = conn.cursor()
+                if attempts >= self.max_attempts:
+                    cursor.execute(
+                        "UPDATE bill_render_jobs SET status = 'failed', last_error = %s, finished_at = %s WHERE id = %s",
+                        (error, datetime.utcnow(), job['id'])
+                    )
+                    self._metrics["failed"] += 1
+                    logger.error(f"Bill {job['bill_id']} render failed after {attempts} attempt(s): {error}")
+                else:
+                    delay = self.retry_base * 2 ** (attempts - 1)
+                    cursor.execute(
+                        "UPDATE bill_render_jobs SET status = 'pending', last_error = %s, next_attempt_at = %s "
+                        "WHERE id = %s",
+                        (error, datetime.utcnow() + timedelta(seconds=delay), job['id'])
+                    )
+                    self._metrics["retries"] += 1
+                    logger.warning(f"Bill {job['bill_id']} render attempt {attempts} failed, retrying in {delay:.0f}s: {error}")
+                conn.commit()
+                cursor.close()
+        except Exception as e:
+            # The job stays 'running' and is reclaimed once it goes stale
+            logger.error(f"Could not record render failure for bill {job['bill_id']}: {e}")
+    
+    def render(self, payload: Dict):
+        """
+        Write the ticket text file and, if reportlab is installed, the PDF.
+        
+        Both are rewritten on retry, so a half-written file from a failed
+        attempt is replaced.
+        
+        Args:
+            payload: Job payload stored by checkout
+        
+        Returns:
+            Tuple of (text file path, PDF path or None)
+        """
+        file_path = Path(payload['file_path'])
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(payload['bill_text'])
+        
+        pdf_path = None
+        if PDF_AVAILABLE:
+            pdf_path = self._render_pdf(payload, file_path.with_suffix(".pdf"))
+        return file_path, pdf_path
+    
+    def _render_pdf(self, payload: Dict, pdf_file_path: Path) -> Path:
+        """
+        Generate a PDF version of the bill.
+        
+        Args:
+            payload: Job payload (items, amounts, cashier, payment method, date)
+            pdf_file_path: Where to write the PDF
+        
+        Returns:
+            Path to generated PDF file
+        """
+        cashier_name = payload.get('cashier_name')
+        subtotal = payload['subtotal']
+        discount = payload['discount']
+        tax = payload['tax']
+        total_amount = payload['total_amount']
+        payment_method = payload['payment_method']
+        
+        c = canvas.Canvas(str(pdf_file_path), pagesize=letter)
+        width, height = letter
+        
+        # Title
+        c.setFont("Helvetica-Bold", 20)
+        c.drawString(2 * inch, height - 1 * inch, "BILL TICKET")
+        
+        # Date and cashier
+        c.setFont("Helvetica", 12)
+        y_position = height - 1.5 * inch
+        c.drawString(1 * inch, y_position, f"Date: {payload['date']}")
+        y_position -= 0.25 * inch
+        
+        if cashier_name:
+            c.drawString(1 * inch, y_position, f"Cashier: {cashier_name}")
+            y_position -= 0.25 * inch
+        
+        # Line separator
+        y_position -= 0.1 * inch
+        c.line(1 * inch, y_position, width - 1 * inch, y_position)
+        y_position -= 0.3 * inch
+        
+        # Items
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(1 * inch, y_position, "Items:")
+        y_position -= 0.3 * inch
+        c.setFont("Helvetica", 10)
+        
+        for item in payload['items']:
+            if y_position < 2 * inch:  # Start new page if needed
+                c.showPage()
+                y_position = height - 1 * inch
+                c.setFont("Helvetica", 10)
+            
+            item_total = round(item['price'] * item['quantity'], 2)
+            c.drawString(1 * inch, y_position, f"{item['product_name']}")
+            y_position -= 0.2 * inch
+            c.drawString(1.2 * inch, y_position, f"Qty: {item['quantity']} x ${item['price']:.2f} = ${item_total:.2f}")
+            y_position -= 0.3 * inch
+        
+        # Subtotal, discount, tax, total
+        y_position -= 0.2 * inch
+        c.line(1 * inch, y_position, width - 1 * inch, y_position)
+        y_position -= 0.3 * inch
+        c.setFont("Helvetica", 10)
+        c.drawString(1 * inch, y_position, f"Subtotal: ${subtotal:.2f}")
+        y_position -= 0.25 * inch
+        
+        if discount > 0:
+            c.drawString(1 * inch, y_position, f"Discount: -${discount:.2f}")
+            y_position -= 0.25 * inch
+        
+        if tax > 0:
+            c.drawString(1 * inch, y_position, f"Tax: ${tax:.2f}")
+            y_position -= 0.25 * inch
+        
+        y_position -= 0.1 * inch
+        c.line(1 * inch, y_position, width - 1 * inch, y_position)
+        y_position -= 0.3 * inch
+        c.setFont("Helvetica-Bold", 14)
+        c.drawString(1 * inch, y_position, f"Total: ${total_amount:.2f}")
+        y_position -= 0.3 * inch
+        c.setFont("Helvetica", 10)
+        c.drawString(1 * inch, y_position, f"Payment: {payment_method.upper()}")
+        
+        c.save()
+        return pdf_file_path
+    
+    def get_job(self, bill_id: int) -> Optional[Dict]:
+        """
+        Get the render job of a bill.
+        
+        Args:
+            bill_id: Bill ID
+        
+        Returns:
+            Job status dictionary or None if the bill has no render job
+        """
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                "SELECT bill_id, status, attempts, last_error, file_path, pdf_path, "
+                "next_attempt_at, created_at, finished_at FROM bill_render_jobs WHERE bill_id = %s",
+                (bill_id,)
+            )
+            job = cursor.fetchone()
+            cursor.close()
+        
+        if job:
+            for key in ("next_attempt_at", "created_at", "finished_at"):
+                if isinstance(job[key], datetime):
+                    job[key] = job[key].isoformat()
+        return job
+    
+    def retry(self, bill_id: int) -> bool:
+        """
+        Requeue a failed render job with a fresh attempt budget.
+        
+        Args:
+            bill_id: Bill ID
+        
+        Returns:
+            True if a failed job was requeued
+        """
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE bill_render_jobs SET status = 'pending', attempts = 0, next_attempt_at = %s, "
+                "finished_at = NULL WHERE bill_id = %s AND status = 'failed'",
+                (datetime.utcnow(), bill_id)
+            )
+            requeued = cursor.rowcount > 0
+            conn.commit()
+            cursor.close()
+        
+        if requeued:
+            self.notify()
+        return requeued
+    
+    def get_metrics(self) -> Dict:
+        """
+        Get worker counters.
+        
+        Returns:
+            Dictionary with render counts and the last render time and queue lag
+        """
+        metrics = dict(self._metrics)
+        metrics["running"] = bool(self._thread and self._thread.is_alive())
+        metrics["pdf_available"] = PDF_AVAILABLE
+        return metrics
+
+
+# Global worker instance
+bill_render_worker = BillRenderWorker()
@@ -1,22 +1,22 @@
 """Bill generation service using raw MySQL queries."""
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
-from pathlib import Path
+from functools import partial
 from fastapi import HTTPException
+import mysql.connector
+from starlette.concurrency import run_in_threadpool
 
+from app.core.async_database import DictCursor, get_async_db
 from app.core.config import settings
 from app.core.database import get_db
 from app.core.logging import logger
 from app.core.exceptions import EmptyCartError
-
-try:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib.units import inch
-    from reportlab.pdfgen import canvas
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
-    logger.warning("reportlab not available. PDF generation will be disabled.")
+from app.services.bill_render_service import bill_render_worker
+from app.services.inventory_service import product_cache
+from app.services.report_service import report_cache
+from app.services.sales_rollup_service import SalesRollupService
+from app.utils.date_ranges import period_range
+from app.utils.pagination import Page, build_page, decode_cursor, keyset_condition
 
 
 class BillService:
@@ -35,10 +35,10 @@ class BillService:
         
         Args:
             cashier_name: Optional cashier name
-            
+        
         Returns:
             Dictionary containing bill information
-            
+        
         Raises:
             HTTPException: If cart is empty
         """
@@ -47,8 +47,15 @@ class BillService:
         with get_db() as conn:
             cursor = conn.cursor(dictionary=True)
             try:
-                # Lock cart rows to prevent concurrent modifications
-                cursor.execute("SELECT * FROM cart ORDER BY timestamp ASC FOR UPDATE")
+                # Lock cart rows to prevent concurrent modifications; the product
+                # category is read along so line items keep it as of the sale
+                cursor.execute("""
+                    SELECT c.*, p.category_id
+                    FROM cart c
+                    LEFT JOIN products p ON p.barcode = c.barcode
+                    ORDER BY c.timestamp ASC
+                    FOR UPDATE OF c
+                """)
                 cart_items = cursor.fetchall()
                 
                 if not cart_items:
@@ -59,7 +66,8 @@ class BillService:
                 
                 bill_lines.append("BILL TICKET")
                 bill_lines.append("-------------------------")
-                bill_lines.append(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+                bill_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                bill_lines.append(f"Date: {bill_date}")
                 if cashier_name:
                     bill_lines.append(f"Cashier: {cashier_name}")
                 bill_lines.append("-------------------------")
@@ -104,22 +112,17 @@ class BillService:
                 
                 bill_text = "\n".join(bill_lines)
                 
-                # Save bill to file (outside transaction, but if it fails, transaction will rollback)
+                # Ticket files are rendered by the background worker after commit;
+                # only the path is decided here so it can be stored with the bill
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 bill_file_path = settings.bills_path / f"bill_ticket_{timestamp}.txt"
                 
-                try:
-                    with open(bill_file_path, 'w') as file:
-                        file.write(bill_text)
-                    logger.info(f"Bill generated: {bill_file_path}")
-                except Exception as e:
-                    logger.error(f"Error saving bill file: {e}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"Error saving bill file: {str(e)}"
-                    )
-                
-                # Save bill to database and clear the cart in the same transaction
+                # Save bill to database and clear the cart in the same transaction.
+                # The bill and stock history inserts run as prepared statements,
+                # parsed once per connection. created_at is stored as
+                # DATETIME(0), where MySQL would round the microseconds: drop
+                # them so the bill, its items and its rollup hour and day agree
+                created_at = datetime.utcnow().replace(microsecond=0)
                 insert_query = """
                     INSERT INTO bills (bill_text, cashier_name, total_amount, subtotal, discount_amount, tax_amount, payment_method, file_path, created_at)
                     VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
@@ -133,31 +136,87 @@ class BillService:
                     tax,
                     payment_method,
                     str(bill_file_path),
-                    datetime.utcnow()
+                    created_at
                 )
-                cursor.execute(insert_query, values)
-                bill_id = cursor.lastrowid
+                bill_id = conn.execute_prepared(insert_query, values).lastrowid
                 
-                # Decrement inventory quantities for all cart items
-                for item in cart_items:
-                    # Check current inventory quantity
-                    cursor.execute("SELECT quantity FROM products WHERE barcode = %s FOR UPDATE", (item['barcode'],))
-                    product = cursor.fetchone()
-                    
-                    if product:
-                        new_quantity = max(0, product['quantity'] - item['quantity'])
-                        cursor.execute(
-                            "UPDATE products SET quantity = %s WHERE barcode = %s",
-                            (new_quantity, item['barcode'])
-                        )
-                        logger.info(f"Inventory updated: {item['barcode']} -> {new_quantity} (decremented {item['quantity']})")
-                    else:
-                        logger.warning(f"Product {item['barcode']} not found in inventory, skipping inventory update")
+                # Structured line items for item-level reports; executemany
+                # sends them as a single multi-row INSERT
+                cursor.executemany("""
+                    INSERT INTO bill_items
+                    (bill_id, line_no, barcode, product_name, category_id, price, quantity, line_total, created_at)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """, [
+                    (bill_id, line_no, item['barcode'], item['product_name'], item['category_id'],
+                     item['price'], item['quantity'], round(item['price'] * item['quantity'], 2), created_at)
+                    for line_no, item in enumerate(cart_items, start=1)
+                ])
+                
+                SalesRollupService.record_bill(
+                    cursor, created_at, cashier_name, payment_method,
+                    subtotal, discount, tax, total_amount
+                )
+                
+                bill_render_worker.enqueue(cursor, bill_id, {
+                    "file_path": str(bill_file_path),
+                    "bill_text": bill_text,
+                    "date": bill_date,
+                    "cashier_name": cashier_name,
+                    "items": [
+                        {"product_name": item['product_name'], "price": item['price'], "quantity": item['quantity']}
+                        for item in cart_items
+                    ],
+                    "subtotal": subtotal,
+                    "discount": discount,
+                    "tax": tax,
+                    "total_amount": total_amount,
+                    "payment_method": payment_method,
+                })
+                
+                # Decrement inventory for the whole basket with a fixed number of
+                # set-based statements joined against the locked cart rows, so
+                # checkout cost does not grow with the number of lines.
+                # Cart lines are summed per barcode first: a multi-table UPDATE
+                # changes each product once, so a second line for the same
+                # product would otherwise be lost (the cart key normally
+                # merges them, but the migration adding it may have failed).
+                # History first: it needs the quantities before the decrement.
+                try:
+                    conn.execute_prepared("""
+                        INSERT INTO stock_history
+                        (barcode, quantity_change, previous_quantity, new_quantity, reason, user_id, created_at)
+                        SELECT p.barcode,
+                               GREATEST(p.quantity - c.quantity, 0) - p.quantity,
+                               p.quantity,
+                               GREATEST(p.quantity - c.quantity, 0),
+                               %s, NULL, %s
+                        FROM (SELECT barcode, SUM(quantity) AS quantity FROM cart GROUP BY barcode) c
+                        JOIN products p ON p.barcode = c.barcode
+                        WHERE p.quantity > 0
+                    """, (f"Sale (bill #{bill_id})", datetime.utcnow()))
+                except mysql.connector.Error as e:
+                    logger.warning(f"Could not record stock history for bill {bill_id}: {e}")
+                
+                cursor.execute("""
+                    UPDATE products p
+                    JOIN (SELECT barcode, SUM(quantity) AS quantity FROM cart GROUP BY barcode) c
+                        ON c.barcode = p.barcode
+                    SET p.quantity = GREATEST(p.quantity - c.quantity, 0)
+                """)
+                updated_products = cursor.rowcount
+                logger.info(f"Inventory decremented for {updated_products} product(s)")
+                
+                missing = len({item['barcode'] for item in cart_items}) - updated_products
+                if missing > 0:
+                    logger.warning(f"{missing} cart item(s) not found in inventory or already at zero stock, skipping inventory update")
                 
                 cursor.execute("DELETE FROM cart")
                 cleared_items = cursor.rowcount
                 
                 conn.commit()
+                product_cache.invalidate(*(item['barcode'] for item in cart_items))
+                report_cache.invalidate_open()
+                bill_render_worker.notify()
                 logger.info(f"Bill stored in database (ID: {bill_id}), inventory updated, and cart cleared ({cleared_items} item(s))")
             except (EmptyCartError, HTTPException):
                 # Re-raise application exceptions
@@ -174,30 +233,13 @@ class BillService:
             finally:
                 cursor.close()
         
-        # Generate PDF if available
-        pdf_path = None
-        if PDF_AVAILABLE:
-            try:
-                pdf_path = self._generate_pdf_bill(
-                    cart_items,
-                    subtotal,
-                    discount,
-                    tax,
-                    total_amount,
-                    payment_method,
-                    cashier_name,
-                    timestamp
-                )
-                logger.info(f"PDF bill generated: {pdf_path}")
-            except Exception as e:
-                logger.error(f"Error generating PDF bill: {e}")
-        
         return {
             "message": "Bill ticket generated successfully",
             "bill_id": bill_id,
             "cashier": cashier_name if cashier_name else "No cashier name provided",
             "file_path": str(bill_file_path),
-            "pdf_path": str(pdf_path) if pdf_path else None,
+            "pdf_path": None,
+            "render_status": "pending",
             "subtotal": subtotal,
             "discount_amount": discount,
             "tax_amount": tax,
@@ -205,105 +247,6 @@ class BillService:
             "payment_method": payment_method
         }
     
-    def _generate_pdf_bill(
-        self,
-        cart_items: list,
-        subtotal: float,
-        discount: float,
-        tax: float,
-        total_amount: float,
-        payment_method: str,
-        cashier_name: Optional[str],
-        timestamp: str
-    ) -> Path:
-        """
-        Generate a PDF version of the bill.
-        
-        Args:
-            cart_items: List of cart items
-            subtotal: Subtotal amount
-            discount: Discount amount
-            tax: Tax amount
-            total_amount: Total bill amount
-            payment_method: Payment method used
-            cashier_name: Optional cashier name
-            timestamp: Timestamp string for filename
-            
-        Returns:
-            Path to generated PDF file
-        """
-        if not PDF_AVAILABLE:
-            raise RuntimeError("PDF generation not available. Install reportlab.")
-        
-        pdf_file_path = settings.bills_path / f"bill_ticket_{timestamp}.pdf"
-        c = canvas.Canvas(str(pdf_file_path), pagesize=letter)
-        width, height = letter
-        
-        # Title
-        c.setFont("Helvetica-Bold", 20)
-        c.drawString(2 * inch, height - 1 * inch, "BILL TICKET")
-        
-        # Date and cashier
-        c.setFont("Helvetica", 12)
-        y_position = height - 1.5 * inch
-        c.drawString(1 * inch, y_position, f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        y_position -= 0.25 * inch
-        
-        if cashier_name:
-            c.drawString(1 * inch, y_position, f"Cashier: {cashier_name}")
-            y_position -= 0.25 * inch
-        
-        # Line separator
-        y_position -= 0.1 * inch
-        c.line(1 * inch, y_position, width - 1 * inch, y_position)
-        y_position -= 0.3 * inch
-        
-        # Items
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(1 * inch, y_position, "Items:")
-        y_position -= 0.3 * inch
-        c.setFont("Helvetica", 10)
-        
-        for item in cart_items:
-            if y_position < 2 * inch:  # Start new page if needed
-                c.showPage()
-                y_position = height - 1 * inch
-                c.setFont("Helvetica", 10)
-            
-            item_total = round(item['price'] * item['quantity'], 2)
-            c.drawString(1 * inch, y_position, f"{item['product_name']}")
-            y_position -= 0.2 * inch
-            c.drawString(1.2 * inch, y_position, f"Qty: {item['quantity']} x ${item['price']:.2f} = ${item_total:.2f}")
-            y_position -= 0.3 * inch
-        
-        # Subtotal, discount, tax, total
-        y_position -= 0.2 * inch
-        c.line(1 * inch, y_position, width - 1 * inch, y_position)
-        y_position -= 0.3 * inch
-        c.setFont("Helvetica", 10)
-        c.drawString(1 * inch, y_position, f"Subtotal: ${subtotal:.2f}")
-        y_position -= 0.25 * inch
-        
-        if discount > 0:
-            c.drawString(1 * inch, y_position, f"Discount: -${discount:.2f}")
-            y_position -= 0.25 * inch
-        
-        if tax > 0:
-            c.drawString(1 * inch, y_position, f"Tax: ${tax:.2f}")
-            y_position -= 0.25 * inch
-        
-        y_position -= 0.1 * inch
-        c.line(1 * inch, y_position, width - 1 * inch, y_position)
-        y_position -= 0.3 * inch
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(1 * inch, y_position, f"Total: ${total_amount:.2f}")
-        y_position -= 0.3 * inch
-        c.setFont("Helvetica", 10)
-        c.drawString(1 * inch, y_position, f"Payment: {payment_method.upper()}")
-        
-        c.save()
-        return pdf_file_path
-    
     def get_bills(
         self,
         page: int = 1,
@@ -312,75 +255,40 @@ class BillService:
         end_date: Optional[str] = None,
         cashier_name: Optional[str] = None,
         min_amount: Optional[float] = None,
-        max_amount: Optional[float] = None
-    ) -> List[Dict]:
+        max_amount: Optional[float] = None,
+        cursor: Optional[str] = None
+    ) -> Page:
         """
         Get all bills with optional filtering and pagination.
         
+        Bills are ordered newest first by (created_at, id). A cursor from a
+        previous page seeks past the rows already returned instead of
+        skipping them with OFFSET, so deep pages cost the same as the first.
+        
         Args:
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), ignored when a cursor is given
             page_size: Number of items per page
             start_date: Start date filter (YYYY-MM-DD format)
             end_date: End date filter (YYYY-MM-DD format)
             cashier_name: Filter by cashier name
             min_amount: Minimum total amount filter
             max_amount: Maximum total amount filter
-            
+            cursor: Next-page token from a previous page
+        
         Returns:
-            List of bill dictionaries
+            Page of bill dictionaries and the next-page token
         """
-        with get_db() as conn:
-            cursor = conn.cursor(dictionary=True)
-            
-            # Build WHERE clause
-            where_clauses = []
-            params = []
-            
-            if start_date:
-                where_clauses.append("DATE(created_at) >= %s")
-                params.append(start_date)
-            
-            if end_date:
-                where_clauses.append("DATE(created_at) <= %s")
-                params.append(end_date)
-            
-            if cashier_name:
-                where_clauses.append("cashier_name = %s")
-                params.append(cashier_name)
-            
-            if min_amount is not None:
-                where_clauses.append("total_amount >= %s")
-                params.append(min_amount)
-            
-            if max_amount is not None:
-                where_clauses.append("total_amount <= %s")
-                params.append(max_amount)
-            
-            # Build query
-            query_parts = ["SELECT id as bill_id, cashier_name, subtotal, discount_amount, tax_amount, total_amount, payment_method, created_at, file_path FROM bills"]
-            
-            if where_clauses:
-                query_parts.append("WHERE")
-                query_parts.append(" AND ".join(where_clauses))
-            
-            query_parts.append("ORDER BY created_at DESC")
-            
-            # Add pagination
-            offset = (page - 1) * page_size
-            query_parts.append("LIMIT %s OFFSET %s")
-            params.extend([page_size, offset])
-            
-            query = " ".join(query_parts)
-            cursor.execute(query, params)
-            bills = cursor.fetchall()
-            cursor.close()
-            
-            # Convert datetime to string
-            for bill in bills:
-                if bill['created_at'] and isinstance(bill['created_at'], datetime):
-                    bill['created_at'] = bill['created_at'].isoformat()
-            
-            return bills
+        query, params = _bill_list_query(
+            page, page_size, start_date, end_date, cashier_name, min_amount, max_amount, cursor
+        )
+        with get_db(read_only=True) as conn:
+            db_cursor = conn.cursor(dictionary=True)
+            db_cursor.execute(query, params)
+            page = build_page(db_cursor.fetchall(), page_size, "bills", ("created_at", "bill_id"))
+            db_cursor.close()
+        
+        _isoformat_created_at(page.items)
+        return page
     
     def get_bill(self, bill_id: int) -> Optional[Dict]:
         """
@@ -388,11 +296,11 @@ class BillService:
         
         Args:
             bill_id: Bill ID
-            
+        
         Returns:
             Bill dictionary or None if not found
         """
-        with get_db() as conn:
+        with get_db(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute(
                 "SELECT * FROM bills WHERE id = %s",
@@ -400,11 +308,135 @@ class BillService:
             )
             bill = cursor.fetchone()
             cursor.close()
-            
-            if bill:
-                # Convert datetime to string
-                if bill['created_at'] and isinstance(bill['created_at'], datetime):
-                    bill['created_at'] = bill['created_at'].isoformat()
-                bill['bill_id'] = bill.pop('id')
-            
-            return bill
+        
+        if bill:
+            _isoformat_created_at([bill])
+            bill['bill_id'] = bill.pop('id')
+        return bill
+
+
+class AsyncBillService:
+    """
+    Bill operations for async routes.
+    
+    Listing and lookups run on the async pool. Checkout stays one
+    transaction of BillService (cart lock, stock updates, sales counters
+    and render job) and runs on the threadpool.
+    """
+    
+    def __init__(self):
+        """Initialize the service."""
+        self.sync = BillService()
+    
+    async def generate_bill(self, **options) -> Dict:
+        """Generate a bill from cart items (see BillService.generate_bill)."""
+        return await run_in_threadpool(partial(self.sync.generate_bill, **options))
+    
+    async def get_bills(
+        self,
+        page: int = 1,
+        page_size: int = 100,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        cashier_name: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """
+        Get bills with optional filtering and pagination (see BillService.get_bills).
+        
+        Returns:
+            Page of bill dictionaries and the next-page token
+        """
+        query, params = _bill_list_query(
+            page, page_size, start_date, end_date, cashier_name, min_amount, max_amount, cursor
+        )
+        async with get_async_db(read_only=True) as conn:
+            async with conn.cursor(DictCursor) as db_cursor:
+                await db_cursor.execute(query, params)
+                page = build_page(list(await db_cursor.fetchall()), page_size, "bills", ("created_at", "bill_id"))
+        
+        _isoformat_created_at(page.items)
+        return page
+    
+    async def get_bill(self, bill_id: int) -> Optional[Dict]:
+        """
+        Get a specific bill by ID.
+        
+        Args:
+            bill_id: Bill ID
+        
+        Returns:
+            Bill dictionary or None if not found
+        """
+        async with get_async_db(read_only=True) as conn:
+            async with conn.cursor(DictCursor) as cursor:
+                await cursor.execute("SELECT * FROM bills WHERE id = %s", (bill_id,))
+                bill = await cursor.fetchone()
+        
+        if bill:
+            _isoformat_created_at([bill])
+            bill['bill_id'] = bill.pop('id')
+        return bill
+
+
+def _bill_list_query(
+    page: int,
+    page_size: int,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    cashier_name: Optional[str],
+    min_amount: Optional[float],
+    max_amount: Optional[float],
+    cursor: Optional[str]
+) -> Tuple[str, List]:
+    """
+    Build the bill list query of get_bills.
+    
+    Returns:
+        (query, params) fetching page_size + 1 rows
+    """
+    # Build WHERE clause
+    where_clauses, params = period_range(start_date, end_date).clauses()
+    
+    if cashier_name:
+        where_clauses.append("cashier_name = %s")
+        params.append(cashier_name)
+    
+    if min_amount is not None:
+        where_clauses.append("total_amount >= %s")
+        params.append(min_amount)
+    
+    if max_amount is not None:
+        where_clauses.append("total_amount <= %s")
+        params.append(max_amount)
+    
+    if cursor:
+        condition, condition_params = keyset_condition("created_at", "id", decode_cursor("bills", cursor))
+        where_clauses.append(condition)
+        params.extend(condition_params)
+    
+    # Build query
+    query_parts = ["SELECT id as bill_id, cashier_name, subtotal, discount_amount, tax_amount, total_amount, payment_method, created_at, file_path FROM bills"]
+    
+    if where_clauses:
+        query_parts.append("WHERE")
+        query_parts.append(" AND ".join(where_clauses))
+    
+    query_parts.append("ORDER BY created_at DESC, id DESC")
+    
+    # Add pagination; one extra row tells whether a next page exists
+    offset = 0 if cursor else (page - 1) * page_size
+    query_parts.append("LIMIT %s OFFSET %s")
+    params.extend([page_size + 1, offset])
+    
+    query = " ".join(query_parts)
+    return query, params
+
+
+def _isoformat_created_at(bills: List[Dict]):
+    """Convert created_at datetimes to strings."""
+    for bill in bills:
+        if bill['created_at'] and isinstance(bill['created_at'], datetime):
+            bill['created_at'] = bill['created_at'].isoformat()
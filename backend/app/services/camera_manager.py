@@ -0,0 +1,405 @@
+"""Long-lived camera session shared by all scan requests."""
+import asyncio
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.barcode_decoder import create_decoder
+from app.services.preview_service import preview_broadcaster
+from app.services.scan_pipeline import ScanPipeline
+
+
+class ScanSubscription:
+    """
+    Bounded stream of detections delivered to one consumer.
+    
+    If the consumer falls behind, the oldest detection is discarded so the
+    capture side never blocks on a slow subscriber.
+    """
+    
+    def __init__(self, manager: "CameraManager", maxsize: int = 16):
+        """
+        Initialize the subscription.
+        
+        Args:
+            manager: Camera manager that feeds this subscription
+            maxsize: Maximum number of undelivered detections
+        """
+        self._manager = manager
+        self._queue: "queue.Queue[List[str]]" = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self.closed = False
+    
+    def put(self, barcodes: List[str]):
+        """Deliver a detection, dropping the oldest one if the queue is full."""
+        while True:
+            try:
+                self._queue.put_nowait(barcodes)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+    
+    def get(self, timeout: float) -> List[str]:
+        """
+        Wait for the next detection.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+        
+        Returns:
+            Barcodes decoded from one frame, or an empty list on timeout
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return []
+    
+    def close(self):
+        """Stop receiving detections."""
+        if not self.closed:
+            self.closed = True
+            self._manager.unsubscribe(self)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class AsyncScanSubscription(ScanSubscription):
+    """
+    Subscription consumed from an asyncio event loop.
+    
+    Detections are handed to the loop with call_soon_threadsafe, so a
+    consumer awaits them without holding a thread. The queue is bounded and
+    drops the oldest detection when full, like ScanSubscription.
+    """
+    
+    def __init__(self, manager: "CameraManager", loop: asyncio.AbstractEventLoop, maxsize: int = 16):
+        """
+        Initialize the subscription.
+        
+        Args:
+            manager: Camera manager that feeds this subscription
+            loop: Event loop the consumer runs on
+            maxsize: Maximum number of undelivered detections
+        """
+        super().__init__(manager, maxsize)
+        self._loop = loop
+        self._async_queue: "asyncio.Queue[List[str]]" = asyncio.Queue(maxsize=maxsize)
+    
+    def put(self, barcodes: List[str]):
+        """Deliver a detection from the camera thread."""
+        if self.closed:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, barcodes)
+        except RuntimeError:
+            # Event loop already closed
+            self.closed = True
+    
+    def _deliver(self, barcodes: List[str]):
+        """Enqueue on the event loop, dropping the oldest detection if full."""
+        if self._async_queue.full():
+            self._async_queue.get_nowait()
+            self.dropped += 1
+        self._async_queue.put_nowait(barcodes)
+    
+    async def get_async(self, timeout: float) -> List[str]:
+        """
+        Wait for the next detection.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+        
+        Returns:
+            Barcodes decoded from one frame, or an empty list on timeout
+        """
+        try:
+            return await asyncio.wait_for(self._async_queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return []
+
+
+class CameraManager:
+    """
+    Owns the scanner camera for the lifetime of the application.
+    
+    A supervisor thread opens the device once, keeps a ScanPipeline running
+    on it and fans decoded barcodes out to subscriptions. The device stays
+    open between requests so no request pays camera open/warm-up cost;
+    frames are still captured while nobody is subscribed (keeping exposure
+    settled) but are not decoded. When the device fails it is reopened with
+    exponential backoff.
+    """
+    
+    STOPPED = "stopped"
+    OPENING = "opening"
+    RUNNING = "running"
+    BACKOFF = "backoff"
+    
+    def __init__(
+        self,
+        camera_index: int = 0,
+        workers: int = 2,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 30.0
+    ):
+        """
+        Initialize the camera manager.
+        
+        Args:
+            camera_index: OpenCV camera index
+            workers: Number of decode worker threads
+            initial_backoff: First reconnect delay in seconds
+            max_backoff: Maximum reconnect delay in seconds
+        """
+        self.camera_index = camera_index
+        self.workers = workers
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        
+        self.decoder = create_decoder()
+        self.state = self.STOPPED
+        self.last_error: Optional[str] = None
+        
+        self._lock = threading.Lock()
+        self._subscribers: List[ScanSubscription] = []
+        self._stop_event = threading.Event()
+        self._opened_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pipeline: Optional[ScanPipeline] = None
+        
+        self._metrics = {
+            "open_attempts": 0,
+            "open_failures": 0,
+            "reconnects": 0,
+            "last_open_time_ms": None,
+            "total_open_time_ms": 0.0,
+            "frames_captured": 0,
+            "frames_processed": 0,
+            "frames_dropped": 0,
+            "detections": 0,
+        }
+    
+    @property
+    def running(self) -> bool:
+        """True while the supervisor thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def is_open(self) -> bool:
+        """True while the device is open and frames are flowing."""
+        return self._opened_event.is_set()
+    
+    def start(self):
+        """Start the supervisor thread (no-op if already running)."""
+        with self._lock:
+            if self.running:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="camera-manager", daemon=True)
+            self._thread.start()
+        logger.info(f"Camera manager started (camera {self.camera_index})")
+    
+    def stop(self, timeout: float = 5.0):
+        """Stop the supervisor and release the device."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        logger.info("Camera manager stopped")
+    
+    def wait_until_open(self, timeout: float) -> bool:
+        """
+        Wait until the device is open.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+        
+        Returns:
+            True if the device is open
+        """
+        return self._opened_event.wait(timeout)
+    
+    def subscribe(self, maxsize: int = 16) -> ScanSubscription:
+        """
+        Subscribe to decoded barcodes.
+        
+        Args:
+            maxsize: Maximum number of undelivered detections
+        
+        Returns:
+            ScanSubscription (use as a context manager to unsubscribe)
+        """
+        subscription = ScanSubscription(self, maxsize)
+        with self._lock:
+            self._subscribers.append(subscription)
+        return subscription
+    
+    def subscribe_async(self, maxsize: int = 16) -> AsyncScanSubscription:
+        """
+        Subscribe to decoded barcodes from the running event loop.
+        
+        Args:
+            maxsize: Maximum number of undelivered detections
+        
+        Returns:
+            AsyncScanSubscription (use as a context manager to unsubscribe)
+        """
+        subscription = AsyncScanSubscription(self, asyncio.get_running_loop(), maxsize)
+        with self._lock:
+            self._subscribers.append(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: ScanSubscription):
+        """Remove a subscription."""
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+    
+    def latest_frame(self) -> Optional[np.ndarray]:
+        """Return the most recently captured frame."""
+        pipeline = self._pipeline
+        return pipeline.latest_frame() if pipeline else None
+    
+    def get_metrics(self) -> Dict:
+        """
+        Get camera session metrics.
+        
+        Returns:
+            Dictionary with state, open timings, frame counters and decoder stats
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+            subscribers = list(self._subscribers)
+            pipeline = self._pipeline
+        
+        if pipeline is not None:
+            stats = pipeline.get_stats()
+            metrics["frames_captured"] += stats["frames_captured"]
+            metrics["frames_processed"] += stats["frames_decoded"]
+            metrics["frames_dropped"] += stats["frames_dropped"]
+        
+        metrics["state"] = self.state
+        metrics["last_error"] = self.last_error
+        metrics["subscribers"] = len(subscribers)
+        metrics["subscriber_drops"] = sum(s.dropped for s in subscribers)
+        metrics["decoder"] = self.decoder.get_stats()
+        return metrics
+    
+    def _decode(self, frame: np.ndarray) -> List[str]:
+        """Decode a frame only when somebody is listening."""
+        if not self._subscribers:
+            return []
+        return self.decoder.decode(frame)
+    
+    def _open(self) -> Optional[cv2.VideoCapture]:
+        """Open and warm up the device, recording how long it took."""
+        self.state = self.OPENING
+        self._metrics["open_attempts"] += 1
+        start = time.perf_counter()
+        
+        cap = cv2.VideoCapture(self.camera_index)
+        if not cap.isOpened():
+            cap.release()
+            self.last_error = "Could not open camera"
+            return None
+        
+        # Keep the driver buffer minimal; the pipeline always wants the newest frame
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        ret, _ = cap.read()
+        if not ret:
+            cap.release()
+            self.last_error = "Failed to capture image"
+            return None
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._metrics["last_open_time_ms"] = round(elapsed_ms, 1)
+            self._metrics["total_open_time_ms"] += elapsed_ms
+        logger.info(f"Camera {self.camera_index} opened in {elapsed_ms:.0f} ms")
+        return cap
+    
+    def _run(self):
+        """Supervisor loop: open, pump detections, reconnect on failure."""
+        backoff = self.initial_backoff
+        first_attempt = True
+        
+        while not self._stop_event.is_set():
+            cap = self._open()
+            if cap is None:
+                self._metrics["open_failures"] += 1
+                log = logger.warning if first_attempt else logger.debug
+                log(f"{self.last_error} (camera {self.camera_index}); retrying in {backoff:.1f}s")
+                first_attempt = False
+                self.state = self.BACKOFF
+                self._stop_event.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            
+            if not first_attempt:
+                self._metrics["reconnects"] += 1
+            first_attempt = False
+            backoff = self.initial_backoff
+            
+            pipeline = ScanPipeline(
+                cap,
+                decoder=self._decode,
+                workers=self.workers,
+                on_frame=preview_broadcaster.publish
+            )
+            self._pipeline = pipeline
+            pipeline.start()
+            self.state = self.RUNNING
+            self.last_error = None
+            self._opened_event.set()
+            
+            try:
+                while not self._stop_event.is_set() and not pipeline.finished:
+                    barcodes = pipeline.get_barcodes(timeout=0.25)
+                    if barcodes:
+                        self._dispatch(barcodes)
+            finally:
+                self._opened_event.clear()
+                pipeline.stop()
+                cap.release()
+                stats = pipeline.get_stats()
+                with self._lock:
+                    self._metrics["frames_captured"] += stats["frames_captured"]
+                    self._metrics["frames_processed"] += stats["frames_decoded"]
+                    self._metrics["frames_dropped"] += stats["frames_dropped"]
+                    self._pipeline = None
+            
+            if not self._stop_event.is_set():
+                self.last_error = pipeline.error or "Camera stream ended"
+                logger.warning(f"Camera {self.camera_index} lost: {self.last_error}; reconnecting")
+        
+        self.state = self.STOPPED
+    
+    def _dispatch(self, barcodes: List[str]):
+        """Fan a detection out to all subscribers."""
+        with self._lock:
+            self._metrics["detections"] += 1
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.put(barcodes)
+
+
+# Global camera manager
+camera_manager = CameraManager(
+    camera_index=settings.CAMERA_INDEX,
+    workers=settings.SCANNER_DECODE_WORKERS,
+    max_backoff=settings.CAMERA_RECONNECT_MAX_BACKOFF
+)
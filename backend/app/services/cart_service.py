@@ -1,16 +1,70 @@
 """Cart management service using raw MySQL queries."""
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from fastapi import HTTPException
+import mysql.connector
+from mysql.connector import errorcode
 
+from app.core.async_database import AsyncDBError, DictCursor, get_async_db
 from app.core.database import get_db
 from app.core.logging import logger
 from app.core.exceptions import CartItemNotFoundError, CartItemAlreadyExistsError, ProductNotFoundError
+from app.services.inventory_service import AsyncInventoryService, InventoryService
 
 
 class CartService:
     """Service for cart management operations."""
     
+    # Adds the requested quantity to the cart line, inserting it if missing.
+    # The derived table reads the product row, so the stock check and the
+    # write are one statement; on an existing line the check is re-done
+    # against the locked cart row. Name, price and details left NULL by the
+    # caller come from the product row for a new line and are kept as they
+    # are on an existing one (it may carry an edited price). Assignments are
+    # conditional so a refused add changes nothing (rowcount 0), and
+    # LAST_INSERT_ID(expr) hands the resulting quantity back in the OK packet.
+    ADD_PRODUCT_UPSERT = """
+        INSERT INTO cart (barcode, product_name, price, quantity, details, timestamp)
+        SELECT src.barcode,
+               COALESCE(src.product_name, src.catalog_name),
+               COALESCE(src.price, src.catalog_price),
+               src.quantity,
+               COALESCE(src.details, NULLIF(src.catalog_details, ''), 'to fill'),
+               src.timestamp
+        FROM (
+            SELECT p.barcode AS barcode,
+                   %s AS product_name,
+                   %s AS price,
+                   %s AS quantity,
+                   %s AS details,
+                   %s AS timestamp,
+                   p.product_name AS catalog_name,
+                   p.price AS catalog_price,
+                   p.details AS catalog_details,
+                   p.quantity AS available
+            FROM products p
+            WHERE p.barcode = %s AND p.quantity >= %s
+        ) AS src
+        ON DUPLICATE KEY UPDATE
+            product_name = IF(
+                cart.quantity + src.quantity <= src.available,
+                COALESCE(src.product_name, cart.product_name), cart.product_name
+            ),
+            price = IF(cart.quantity + src.quantity <= src.available, COALESCE(src.price, cart.price), cart.price),
+            details = IF(
+                cart.quantity + src.quantity <= src.available,
+                COALESCE(src.details, NULLIF(cart.details, ''), 'to fill'), cart.details
+            ),
+            timestamp = IF(cart.quantity + src.quantity <= src.available, src.timestamp, cart.timestamp),
+            quantity = LAST_INSERT_ID(
+                IF(cart.quantity + src.quantity <= src.available, cart.quantity + src.quantity, cart.quantity)
+            )
+    """
+    
+    CART_ITEM_BY_BARCODE = "SELECT * FROM cart WHERE barcode = %s"
+    
+    DEADLOCK_RETRIES = 3
+    
     def add_product(self, barcode: str, product_data: Dict) -> Dict:
         """
         Add a product to cart.
@@ -20,6 +74,13 @@ class CartService:
         the behaviour of a physical caisse where scanning the same item again
         increments its quantity.
         
+        The add is a single INSERT ... ON DUPLICATE KEY UPDATE on the unique
+        cart barcode key, with the inventory availability check in the same
+        statement. Omitted name, price and details are taken from the
+        product for a new line and left unchanged on an existing one. The
+        returned row is built from the statement's result instead of being
+        read back, unless some of those fields were omitted.
+        
         Args:
             barcode: Product barcode
             product_data: Product data dictionary
@@ -30,122 +91,63 @@ class CartService:
         Raises:
             HTTPException: If product not found in inventory
         """
+        quantity_to_add = product_data.get('quantity')
+        if quantity_to_add is None:
+            quantity_to_add = 1
+        
+        product_name, price, details = _requested_fields(product_data)
+        
+        # DATETIME has no fractional seconds; drop them so the returned row matches
+        timestamp = datetime.utcnow().replace(microsecond=0)
+        params = (product_name, price, quantity_to_add, details, timestamp, barcode, quantity_to_add)
+        
+        stored = None
         with get_db() as conn:
-            cursor = conn.cursor(dictionary=True)
-            
-            # Use SELECT FOR UPDATE to lock the row and prevent race conditions
-            cursor.execute("SELECT * FROM cart WHERE barcode = %s FOR UPDATE", (barcode,))
-            cart_item = cursor.fetchone()
-            
-            if cart_item:
-                quantity_to_add = product_data.get('quantity')
-                if quantity_to_add is None:
-                    quantity_to_add = 1
-                
-                # Check inventory availability for existing cart items
-                cursor.execute("SELECT * FROM products WHERE barcode = %s", (barcode,))
-                product = cursor.fetchone()
-                if not product:
-                    cursor.close()
-                    raise ProductNotFoundError(f"Product with barcode {barcode} not found in inventory.")
-                
-                # Check if adding this quantity would exceed available inventory
-                if product['quantity'] < (cart_item['quantity'] + quantity_to_add):
-                    cursor.close()
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Insufficient inventory. Available: {product['quantity']}, Requested: {cart_item['quantity'] + quantity_to_add}"
-                    )
-                
-                new_quantity = cart_item['quantity'] + quantity_to_add
-                updated_name = product_data.get('product_name') or cart_item['product_name']
-                updated_price = (
-                    product_data['price']
-                    if product_data.get('price') is not None
-                    else cart_item['price']
-                )
-                updated_details = (
-                    product_data.get('details')
-                    if product_data.get('details')
-                    else cart_item.get('details') or 'to fill'
-                )
-                
-                update_query = """
-                    UPDATE cart
-                    SET product_name = %s,
-                        price = %s,
-                        quantity = %s,
-                        details = %s,
-                        timestamp = %s
-                    WHERE barcode = %s
-                """
-                cursor.execute(
-                    update_query,
-                    (
-                        updated_name,
-                        updated_price,
-                        new_quantity,
-                        updated_details,
-                        datetime.utcnow(),
-                        barcode
-                    )
-                )
-                conn.commit()
-                
-                cursor.execute("SELECT * FROM cart WHERE barcode = %s", (barcode,))
-                updated_cart_item = cursor.fetchone()
-                cursor.close()
-                
-                logger.info(f"Cart quantity updated: {barcode} -> {new_quantity}")
-                return updated_cart_item
-            
-            # Verify product exists in inventory for new cart entries
-            cursor.execute("SELECT * FROM products WHERE barcode = %s", (barcode,))
-            product = cursor.fetchone()
+            for attempt in range(self.DEADLOCK_RETRIES):
+                try:
+                    # Prepared once per connection; the upsert is the costliest statement to parse
+                    cursor = conn.execute_prepared(self.ADD_PRODUCT_UPSERT, params)
+                    affected = cursor.rowcount
+                    result_quantity = cursor.lastrowid
+                    if affected and None in (product_name, price, details):
+                        # Filled in by the statement; read the line in the same transaction
+                        rows = conn.execute_prepared(self.CART_ITEM_BY_BARCODE, (barcode,), dictionary=True).fetchall()
+                        stored = rows[0] if rows else None
+                    conn.commit()
+                    break
+                except mysql.connector.Error as e:
+                    conn.rollback()
+                    if e.errno != errorcode.ER_LOCK_DEADLOCK or attempt == self.DEADLOCK_RETRIES - 1:
+                        raise
+                    logger.warning(f"Deadlock adding {barcode} to cart, retrying")
+        
+        if affected == 0:
+            # Nothing written: unknown product or not enough stock
+            product = InventoryService().get_product(barcode)
             if not product:
-                cursor.close()
                 raise ProductNotFoundError(f"Product with barcode {barcode} not found in inventory.")
-            
-            # Check inventory availability (for new cart entries)
-            quantity_to_add = product_data.get('quantity')
-            if quantity_to_add is None:
-                quantity_to_add = 1
-            
-            if product['quantity'] < quantity_to_add:
-                cursor.close()
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Insufficient inventory. Available: {product['quantity']}, Requested: {quantity_to_add}"
-                )
-            
-            insert_query = """
-                INSERT INTO cart (barcode, product_name, price, quantity, details, timestamp)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            details = product_data.get('details') or product.get('details') or 'to fill'
-            quantity = product_data.get('quantity')
-            if quantity is None:
-                quantity = 1
-            
-            values = (
-                barcode,
-                product_data.get('product_name', product['product_name']),
-                product_data.get('price', product['price']),
-                quantity,
-                details,
-                datetime.utcnow()
+            raise HTTPException(
+                status_code=400,
+                detail=f"Insufficient inventory. Available: {product['quantity']}, Requested: {(result_quantity or 0) + quantity_to_add}"
             )
-            
-            cursor.execute(insert_query, values)
-            conn.commit()
-            
-            # Fetch created cart item
-            cursor.execute("SELECT * FROM cart WHERE barcode = %s", (barcode,))
-            new_cart_item = cursor.fetchone()
-            cursor.close()
-            
+        
+        if affected == 1:
+            new_quantity = quantity_to_add
             logger.info(f"Product added to cart: {barcode}")
-            return new_cart_item
+        else:
+            new_quantity = result_quantity
+            logger.info(f"Cart quantity updated: {barcode} -> {new_quantity}")
+        
+        if stored is not None:
+            return stored
+        return {
+            "barcode": barcode,
+            "product_name": product_name,
+            "price": price,
+            "quantity": new_quantity,
+            "details": details,
+            "timestamp": timestamp
+        }
     
     def get_cart_item(self, barcode: str) -> Optional[Dict]:
         """Get a cart item by barcode."""
@@ -178,29 +180,7 @@ class CartService:
                 cursor.close()
                 raise CartItemNotFoundError(f"Product with barcode {barcode} not found in cart.")
             
-            # Build update query
-            update_fields = []
-            values = []
-            
-            if 'product_name' in product_data:
-                update_fields.append("product_name = %s")
-                values.append(product_data['product_name'])
-            if 'price' in product_data:
-                update_fields.append("price = %s")
-                values.append(product_data['price'])
-            if 'quantity' in product_data:
-                update_fields.append("quantity = %s")
-                values.append(product_data['quantity'])
-            if 'details' in product_data:
-                update_fields.append("details = %s")
-                values.append(product_data['details'])
-            
-            update_fields.append("timestamp = %s")
-            values.append(datetime.utcnow())
-            values.append(barcode)
-            
-            update_query = f"UPDATE cart SET {', '.join(update_fields)} WHERE barcode = %s"
-            cursor.execute(update_query, values)
+            cursor.execute(*_cart_update_query(barcode, product_data))
             conn.commit()
             
             # Fetch updated item
@@ -248,3 +228,183 @@ class CartService:
             
             logger.info(f"Cart cleared: {count} items removed")
             return count
+
+
+class AsyncCartService:
+    """
+    Cart operations for async routes, on the async pool.
+    
+    Same statements as CartService; the pool runs in autocommit mode, so
+    each single-statement write commits on its own.
+    """
+    
+    async def add_product(self, barcode: str, product_data: Dict) -> Dict:
+        """
+        Add a product to cart, merging with an existing line (see CartService.add_product).
+        
+        Args:
+            barcode: Product barcode
+            product_data: Product data dictionary
+        
+        Returns:
+            Created or updated cart item dictionary
+        
+        Raises:
+            ProductNotFoundError: If product not found in inventory
+            HTTPException: If there is not enough stock
+        """
+        quantity_to_add = product_data.get('quantity')
+        if quantity_to_add is None:
+            quantity_to_add = 1
+        
+        product_name, price, details = _requested_fields(product_data)
+        
+        # DATETIME has no fractional seconds; drop them so the returned row matches
+        timestamp = datetime.utcnow().replace(microsecond=0)
+        params = (product_name, price, quantity_to_add, details, timestamp, barcode, quantity_to_add)
+        
+        stored = None
+        async with get_async_db() as conn:
+            async with conn.cursor() as cursor:
+                for attempt in range(CartService.DEADLOCK_RETRIES):
+                    try:
+                        await cursor.execute(CartService.ADD_PRODUCT_UPSERT, params)
+                        break
+                    except AsyncDBError as e:
+                        if e.args[0] != errorcode.ER_LOCK_DEADLOCK or attempt == CartService.DEADLOCK_RETRIES - 1:
+                            raise
+                        logger.warning(f"Deadlock adding {barcode} to cart, retrying")
+                affected = cursor.rowcount
+                result_quantity = cursor.lastrowid
+            if affected and None in (product_name, price, details):
+                # Filled in by the statement; read the stored line back
+                async with conn.cursor(DictCursor) as cursor:
+                    await cursor.execute(CartService.CART_ITEM_BY_BARCODE, (barcode,))
+                    stored = await cursor.fetchone()
+        
+        if affected == 0:
+            # Nothing written: unknown product or not enough stock
+            product = await AsyncInventoryService().get_product(barcode)
+            if not product:
+                raise ProductNotFoundError(f"Product with barcode {barcode} not found in inventory.")
+            raise HTTPException(
+                status_code=400,
+                detail=f"Insufficient inventory. Available: {product['quantity']}, Requested: {(result_quantity or 0) + quantity_to_add}"
+            )
+        
+        if affected == 1:
+            new_quantity = quantity_to_add
+            logger.info(f"Product added to cart: {barcode}")
+        else:
+            new_quantity = result_quantity
+            logger.info(f"Cart quantity updated: {barcode} -> {new_quantity}")
+        
+        if stored is not None:
+            return stored
+        return {
+            "barcode": barcode,
+            "product_name": product_name,
+            "price": price,
+            "quantity": new_quantity,
+            "details": details,
+            "timestamp": timestamp
+        }
+    
+    async def get_cart_item(self, barcode: str) -> Optional[Dict]:
+        """Get a cart item by barcode."""
+        async with get_async_db() as conn:
+            async with conn.cursor(DictCursor) as cursor:
+                await cursor.execute("SELECT * FROM cart WHERE barcode = %s", (barcode,))
+                return await cursor.fetchone()
+    
+    async def get_all_cart_items(self) -> List[Dict]:
+        """Get all items in cart."""
+        async with get_async_db() as conn:
+            async with conn.cursor(DictCursor) as cursor:
+                await cursor.execute("SELECT * FROM cart ORDER BY timestamp DESC")
+                return list(await cursor.fetchall())
+    
+    async def update_cart_item(self, barcode: str, product_data: Dict) -> Dict:
+        """Update a cart item."""
+        async with get_async_db() as conn:
+            async with conn.cursor(DictCursor) as cursor:
+                await cursor.execute(*_cart_update_query(barcode, product_data))
+                await cursor.execute("SELECT * FROM cart WHERE barcode = %s", (barcode,))
+                updated_item = await cursor.fetchone()
+        
+        if not updated_item:
+            raise CartItemNotFoundError(f"Product with barcode {barcode} not found in cart.")
+        logger.info(f"Cart item updated: {barcode}")
+        return updated_item
+    
+    async def delete_cart_item(self, barcode: str) -> Dict:
+        """Delete a cart item."""
+        async with get_async_db() as conn:
+            async with conn.cursor(DictCursor) as cursor:
+                await conn.begin()
+                await cursor.execute("SELECT * FROM cart WHERE barcode = %s FOR UPDATE", (barcode,))
+                cart_item = await cursor.fetchone()
+                
+                if not cart_item:
+                    raise CartItemNotFoundError(f"Product with barcode {barcode} not found in cart.")
+                
+                await cursor.execute("DELETE FROM cart WHERE barcode = %s", (barcode,))
+                await conn.commit()
+        
+        logger.info(f"Cart item deleted: {barcode}")
+        return cart_item
+    
+    async def clear_cart(self) -> int:
+        """Clear all items from cart."""
+        async with get_async_db() as conn:
+            async with conn.cursor() as cursor:
+                # The deleted row count is the number of items removed
+                count = await cursor.execute("DELETE FROM cart")
+        
+        logger.info(f"Cart cleared: {count} items removed")
+        return count
+
+
+def _requested_fields(product_data: Dict) -> Tuple[Optional[str], Optional[float], Optional[str]]:
+    """
+    Name, price and details given by an add-to-cart request.
+    
+    Returns:
+        (product_name, price, details); None for each one left out, which
+        ADD_PRODUCT_UPSERT fills from the product or keeps from the cart line
+    """
+    return product_data.get('product_name') or None, product_data.get('price'), product_data.get('details') or None
+
+
+def _cart_update_query(barcode: str, product_data: Dict) -> Tuple[str, List]:
+    """
+    Build the UPDATE for the given cart item fields.
+    
+    Args:
+        barcode: Product barcode
+        product_data: Fields to change
+    
+    Returns:
+        (query, params), also refreshing the timestamp
+    """
+    update_fields = []
+    values = []
+    
+    if 'product_name' in product_data:
+        update_fields.append("product_name = %s")
+        values.append(product_data['product_name'])
+    if 'price' in product_data:
+        update_fields.append("price = %s")
+        values.append(product_data['price'])
+    if 'quantity' in product_data:
+        update_fields.append("quantity = %s")
+        values.append(product_data['quantity'])
+    if 'details' in product_data:
+        update_fields.append("details = %s")
+        values.append(product_data['details'])
+    
+    update_fields.append("timestamp = %s")
+    values.append(datetime.utcnow())
+    values.append(barcode)
+    
+    return f"UPDATE cart SET {', '.join(update_fields)} WHERE barcode = %s", values
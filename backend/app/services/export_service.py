@@ -0,0 +1,253 @@
+"""Streaming bulk export of products, bills and stock history."""
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.logging import logger
+from app.utils.date_ranges import period_range
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+    logger.warning("pyarrow not available. Parquet export will be disabled.")
+
+EXPORT_FORMATS = ("csv", "ndjson", "parquet")
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class ExportService:
+    """
+    Streams whole tables as CSV, NDJSON or Parquet.
+    
+    Rows are read from an unbuffered cursor in chunks of EXPORT_FETCH_SIZE,
+    so the server sends the result as it is consumed and neither side holds
+    more than one chunk; each chunk is encoded (and gzip-compressed) before
+    the next one is fetched. Exports are ordered by primary key.
+    """
+    
+    # Export name -> (query, columns as (name, type) with type one of
+    # string, int, float, datetime)
+    EXPORTS = {
+        "products": (
+            """
+            SELECT barcode, product_name, price, quantity, details, reorder_point, category_id, timestamp
+            FROM products
+            {where}
+            ORDER BY barcode
+            """,
+            (("barcode", "string"), ("product_name", "string"), ("price", "float"), ("quantity", "int"),
+             ("details", "string"), ("reorder_point", "int"), ("category_id", "int"), ("timestamp", "datetime")),
+        ),
+        "bills": (
+            """
+            SELECT id, cashier_name, subtotal, discount_amount, tax_amount, total_amount,
+                   payment_method, created_at, file_path
+            FROM bills
+            {where}
+            ORDER BY id
+            """,
+            (("bill_id", "int"), ("cashier_name", "string"), ("subtotal", "float"), ("discount_amount", "float"),
+             ("tax_amount", "float"), ("total_amount", "float"), ("payment_method", "string"),
+             ("created_at", "datetime"), ("file_path", "string")),
+        ),
+        "stock-history": (
+            """
+            SELECT id, barcode, quantity_change, previous_quantity, new_quantity, reason, user_id, created_at
+            FROM stock_history
+            {where}
+            ORDER BY id
+            """,
+            (("id", "int"), ("barcode", "string"), ("quantity_change", "int"), ("previous_quantity", "int"),
+             ("new_quantity", "int"), ("reason", "string"), ("user_id", "string"), ("created_at", "datetime")),
+        ),
+    }
+    
+    def __init__(self, fetch_size: Optional[int] = None, gzip_level: Optional[int] = None):
+        """
+        Initialize the service.
+        
+        Args:
+            fetch_size: Rows per fetchmany (defaults to EXPORT_FETCH_SIZE)
+            gzip_level: zlib compression level (defaults to EXPORT_GZIP_LEVEL)
+        """
+        self.fetch_size = fetch_size or settings.EXPORT_FETCH_SIZE
+        self.gzip_level = settings.EXPORT_GZIP_LEVEL if gzip_level is None else gzip_level
+    
+    def export(
+        self,
+        name: str,
+        export_format: str = "csv",
+        compress: bool = True,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        barcode: Optional[str] = None
+    ) -> Tuple[Iterator[bytes], str, str]:
+        """
+        Prepare a streamed export.
+        
+        Parameters are validated here; the database is only queried once
+        the returned iterator is consumed.
+        
+        Args:
+            name: Export name (key of EXPORTS)
+            export_format: csv, ndjson or parquet
+            compress: Gzip the output (ignored for Parquet, which compresses internally)
+            start_date: First day (YYYY-MM-DD) for bills and stock history
+            end_date: Last day (YYYY-MM-DD) for bills and stock history
+            barcode: Only this product's stock history
+        
+        Returns:
+            (byte chunks, media type, file name)
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+        if export_format == "parquet" and not PARQUET_AVAILABLE:
+            raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+        
+        query, columns = self.EXPORTS[name]
+        where_clauses, params = [], []
+        if name != "products":
+            where_clauses, params = period_range(start_date, end_date).clauses()
+        if barcode:
+            where_clauses.append("barcode = %s")
+            params.append(barcode)
+        query = query.format(where=f"WHERE {' AND '.join(where_clauses)}" if where_clauses else "")
+        
+        chunks = self._fetch_chunks(query, params)
+        if export_format == "csv":
+            output = self._encode_csv(chunks, columns)
+        elif export_format == "ndjson":
+            output = self._encode_ndjson(chunks, columns)
+        else:
+            output = self._encode_parquet(chunks, columns)
+        
+        filename = f"{name}-{datetime.utcnow():%Y%m%dT%H%M%SZ}.{export_format}"
+        if compress and export_format != "parquet":
+            return self._gzip(output), "application/gzip", f"{filename}.gz"
+        return output, MEDIA_TYPES[export_format], filename
+    
+    def _fetch_chunks(self, query: str, params: List) -> Iterator[List[tuple]]:
+        """
+        Stream query results in chunks from an unbuffered cursor.
+        
+        If the consumer stops early (e.g. the client disconnected), the rest
+        of the result is drained before the connection goes back to the
+        pool, since MySQL cannot reuse a connection with unread rows.
+        """
+        with get_db(read_only=True) as conn:
+            cursor = conn.cursor(buffered=False)
+            finished = False
+            try:
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(self.fetch_size)
+                    if not rows:
+                        break
+                    yield rows
+                finished = True
+            finally:
+                if not finished:
+                    conn.consume_results()
+                cursor.close()
+    
+    @staticmethod
+    def _encode_csv(chunks: Iterator[List[tuple]], columns: Sequence[Tuple[str, str]]) -> Iterator[bytes]:
+        """Encode row chunks as CSV with a header row."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([column for column, _ in columns])
+        for rows in chunks:
+            writer.writerows(rows)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        # Header only for an empty export
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+    
+    @staticmethod
+    def _encode_ndjson(chunks: Iterator[List[tuple]], columns: Sequence[Tuple[str, str]]) -> Iterator[bytes]:
+        """Encode row chunks as one JSON object per line."""
+        names = [column for column, _ in columns]
+        for rows in chunks:
+            yield "".join(
+                json.dumps(dict(zip(names, row)), default=_json_default, ensure_ascii=False) + "\n"
+                for row in rows
+            ).encode("utf-8")
+    
+    @staticmethod
+    def _encode_parquet(chunks: Iterator[List[tuple]], columns: Sequence[Tuple[str, str]]) -> Iterator[bytes]:
+        """Encode row chunks as Parquet, one row group per chunk."""
+        arrow_types = {"string": pa.string(), "int": pa.int64(), "float": pa.float64(), "datetime": pa.timestamp("us")}
+        schema = pa.schema([(column, arrow_types[kind]) for column, kind in columns])
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+            for rows in chunks:
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)],
+                    schema=schema
+                ))
+                data = sink.drain()
+                if data:
+                    yield data
+        yield sink.drain()
+    
+    def _gzip(self, output: Iterator[bytes]) -> Iterator[bytes]:
+        """Gzip a byte stream on the fly (wbits=31 writes the gzip container)."""
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        for data in output:
+            compressed = compressor.compress(data)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file collecting bytes until they are drained."""
+    
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def drain(self) -> bytes:
+        """Return and forget everything written so far."""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _json_default(value):
+    """Serialize database values json cannot handle."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
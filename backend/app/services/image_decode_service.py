@@ -0,0 +1,141 @@
+"""Barcode decoding for uploaded images using a process pool."""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.core.config import settings
+from app.core.logging import logger
+
+# Decoder owned by each pool worker process (created on first use)
+_worker_decoder = None
+
+
+def decode_image_bytes(data: bytes) -> Dict:
+    """
+    Decode barcodes from an encoded JPEG/PNG image.
+    
+    The buffer is wrapped with np.frombuffer (no copy) and decoded straight
+    to grayscale by cv2.imdecode, which is all pyzbar needs.
+    
+    Args:
+        data: Encoded image bytes
+    
+    Returns:
+        Dictionary with barcodes, image size and decode time, or an error
+    """
+    global _worker_decoder
+    if _worker_decoder is None:
+        from app.services.barcode_decoder import create_decoder
+        # Still images are independent: always fall back to a full-frame decode
+        _worker_decoder = create_decoder(fallback_every=1)
+    
+    start = time.perf_counter()
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        return {"barcodes": [], "error": "Could not decode image (expected JPEG or PNG)"}
+    
+    barcodes = _worker_decoder.decode(image)
+    return {
+        "barcodes": barcodes,
+        "width": image.shape[1],
+        "height": image.shape[0],
+        "decode_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def decode_image_batch(images: List[bytes]) -> List[Dict]:
+    """
+    Decode a batch of encoded images in one pool task.
+    
+    Args:
+        images: Encoded image bytes
+    
+    Returns:
+        One result dictionary per image, in order
+    """
+    results = []
+    for data in images:
+        try:
+            results.append(decode_image_bytes(data))
+        except Exception as e:
+            results.append({"barcodes": [], "error": f"Error decoding image: {e}"})
+    return results
+
+
+class ImageDecodeService:
+    """Service for decoding barcodes from uploaded images."""
+    
+    _pool: Optional[ProcessPoolExecutor] = None
+    _pool_lock = threading.Lock()
+    
+    @classmethod
+    def get_pool(cls) -> ProcessPoolExecutor:
+        """Get the shared decode process pool, creating it on first use."""
+        if cls._pool is None:
+            with cls._pool_lock:
+                if cls._pool is None:
+                    workers = settings.SCANNER_DECODE_PROCESSES or os.cpu_count() or 1
+                    # spawn: never fork a process that runs camera threads
+                    cls._pool = ProcessPoolExecutor(
+                        max_workers=workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                    logger.info(f"Image decode process pool started with {workers} worker(s)")
+        return cls._pool
+    
+    @classmethod
+    def shutdown_pool(cls):
+        """Shut down the shared process pool."""
+        with cls._pool_lock:
+            if cls._pool is not None:
+                cls._pool.shutdown(wait=False, cancel_futures=True)
+                cls._pool = None
+    
+    async def decode_images(self, images: List[Tuple[Optional[str], bytes]]) -> List[Dict]:
+        """
+        Decode barcodes from several images in parallel.
+        
+        Images are split into batches of settings.SCANNER_DECODE_BATCH_SIZE so
+        each pool task amortises inter-process overhead over several images.
+        
+        Args:
+            images: List of (filename, encoded bytes) pairs
+        
+        Returns:
+            One result dictionary per image, in request order
+        """
+        pool = self.get_pool()
+        loop = asyncio.get_running_loop()
+        batch_size = max(1, settings.SCANNER_DECODE_BATCH_SIZE)
+        
+        batches = [images[i:i + batch_size] for i in range(0, len(images), batch_size)]
+        futures = [
+            loop.run_in_executor(pool, decode_image_batch, [data for _, data in batch])
+            for batch in batches
+        ]
+        try:
+            batch_results = await asyncio.gather(*futures)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); start a fresh pool next time
+            logger.error("Image decode process pool broke; it will be recreated")
+            self.shutdown_pool()
+            raise
+        
+        results = []
+        for batch, decoded in zip(batches, batch_results):
+            for (filename, _), result in zip(batch, decoded):
+                result["index"] = len(results)
+                result["filename"] = filename
+                results.append(result)
+        
+        found = sum(1 for r in results if r.get("barcodes"))
+        logger.debug(f"Decoded {len(results)} uploaded image(s), {found} with barcodes")
+        return results
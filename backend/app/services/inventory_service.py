@@ -1,17 +1,60 @@
 """Inventory management service using raw MySQL queries."""
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from fastapi import HTTPException
 import mysql.connector
+from starlette.concurrency import run_in_threadpool
 
+from app.core.async_database import DictCursor, get_async_db
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.logging import logger
 from app.core.exceptions import ProductNotFoundError, ProductAlreadyExistsError
+from app.utils.pagination import Page, build_page, decode_cursor, keyset_condition
+from app.utils.search import build_fulltext_query, escape_like, is_barcode_prefix
+
+# Barcode -> product row (None for unknown barcodes), shared by all requests.
+# Writers invalidate after commit; the TTL bounds staleness across processes.
+product_cache = TTLCache(
+    maxsize=settings.PRODUCT_CACHE_SIZE,
+    ttl=settings.PRODUCT_CACHE_TTL,
+    negative_ttl=settings.PRODUCT_CACHE_NEGATIVE_TTL
+)
 
 
 class InventoryService:
     """Service for inventory management operations."""
     
+    # Scan path lookup; run as a prepared statement on the sync pool
+    PRODUCT_BY_BARCODE = "SELECT * FROM products WHERE barcode = %s"
+    
+    # Barcode prefix lookup through the primary key, exact match first
+    SEARCH_BY_BARCODE = """
+        SELECT * FROM products
+        WHERE barcode LIKE %s
+        ORDER BY barcode = %s DESC, barcode
+        LIMIT %s
+    """
+    
+    # Name search through the ngram FULLTEXT index, names starting with the
+    # search text first, then by relevance
+    SEARCH_BY_NAME = """
+        SELECT *,
+            product_name LIKE %s AS is_prefix,
+            MATCH(product_name) AGAINST (%s IN BOOLEAN MODE) AS relevance
+        FROM products
+        WHERE MATCH(product_name) AGAINST (%s IN BOOLEAN MODE)
+        ORDER BY is_prefix DESC, relevance DESC, product_name
+        LIMIT %s
+    """
+    
+    LOW_STOCK_QUERY = """
+        SELECT * FROM products 
+        WHERE quantity <= reorder_point AND reorder_point > 0
+        ORDER BY (quantity - reorder_point) ASC
+    """
+    
     def add_product(self, barcode: str, product_data: Dict) -> Dict:
         """
         Add a new product to inventory.
@@ -19,10 +62,10 @@ class InventoryService:
         Args:
             barcode: Product barcode
             product_data: Product data dictionary
-            
+        
         Returns:
             Created product dictionary
-            
+        
         Raises:
             HTTPException: If product already exists
         """
@@ -59,6 +102,7 @@ class InventoryService:
             
             cursor.execute(insert_query, values)
             conn.commit()
+            product_cache.invalidate(barcode)
             
             # Fetch created product
             cursor.execute("SELECT * FROM products WHERE barcode = %s", (barcode,))
@@ -72,18 +116,27 @@ class InventoryService:
         """
         Get a product by barcode.
         
+        Served from the in-process product cache when possible; unknown
+        barcodes are cached too (for PRODUCT_CACHE_NEGATIVE_TTL seconds).
+        Do not use this for stock checks inside a transaction.
+        
         Args:
             barcode: Product barcode
-            
+        
         Returns:
             Product dictionary or None
         """
+        found, product = product_cache.get(barcode)
+        if found:
+            return dict(product) if product is not None else None
+        
+        generation = product_cache.generation
         with get_db() as conn:
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("SELECT * FROM products WHERE barcode = %s", (barcode,))
-            product = cursor.fetchone()
-            cursor.close()
-            return product
+            rows = conn.execute_prepared(self.PRODUCT_BY_BARCODE, (barcode,), dictionary=True).fetchall()
+            product = rows[0] if rows else None
+        
+        product_cache.set(barcode, product, generation=generation)
+        return dict(product) if product is not None else None
     
     def get_all_products(
         self,
@@ -93,77 +146,80 @@ class InventoryService:
         category_id: Optional[int] = None,
         low_stock_only: Optional[bool] = None,
         page: int = 1,
-        page_size: int = 100
-    ) -> List[Dict]:
+        page_size: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
         """
         Get all products in inventory with optional search and filtering.
         
+        Products are ordered newest first by (timestamp, barcode). A cursor
+        from a previous page seeks straight to the next rows through the
+        timestamp index (InnoDB appends the barcode primary key to it);
+        page/page_size without a cursor still work via OFFSET.
+        
         Args:
             search: Search term for product name
             min_price: Minimum price filter
             max_price: Maximum price filter
             category_id: Filter by category ID
             low_stock_only: If True, only return products below reorder point
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), ignored when a cursor is given
             page_size: Number of items per page
-            
+            cursor: Next-page token from a previous page
+        
         Returns:
-            List of product dictionaries
+            Page of product dictionaries and the next-page token
         """
-        with get_db() as conn:
+        query, params = _product_list_query(
+            search, min_price, max_price, category_id, low_stock_only, page, page_size, cursor
+        )
+        with get_db(read_only=True) as conn:
+            db_cursor = conn.cursor(dictionary=True)
+            db_cursor.execute(query, params)
+            products = db_cursor.fetchall()
+            db_cursor.close()
+        
+        _flag_low_stock(products)
+        return build_page(products, page_size, "products", ("timestamp", "barcode"))
+    
+    def search_products(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Search products by name or barcode prefix, best matches first.
+        
+        Barcode-like text is first looked up as a barcode prefix through the
+        primary key, so a partially typed or scanned code finds its product.
+        Names are matched through the ngram FULLTEXT index on product_name:
+        each term must occur in the name, names starting with the search
+        text rank first, then by FULLTEXT relevance.
+        
+        Args:
+            query: Search text
+            limit: Maximum number of results
+        
+        Returns:
+            Product dictionaries in rank order, each with the kind of match
+            ("barcode", "prefix" for names starting with the query, or "name")
+        """
+        query = query.strip()
+        results = {}
+        
+        with get_db(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             
-            # Build WHERE clause using parameterized queries
-            # All clause strings are hardcoded to prevent SQL injection
-            where_clauses = []
-            params = []
-            
-            if search:
-                where_clauses.append("product_name LIKE %s")
-                params.append(f"%{search}%")
-            
-            if min_price is not None:
-                where_clauses.append("price >= %s")
-                params.append(min_price)
-            
-            if max_price is not None:
-                where_clauses.append("price <= %s")
-                params.append(max_price)
+            if is_barcode_prefix(query):
+                cursor.execute(self.SEARCH_BY_BARCODE, (f"{escape_like(query)}%", query, limit))
+                _add_search_results(results, cursor.fetchall(), "barcode")
             
-            if category_id is not None:
-                where_clauses.append("category_id = %s")
-                params.append(category_id)
+            fulltext_query = build_fulltext_query(query)
+            if fulltext_query and len(results) < limit:
+                cursor.execute(self.SEARCH_BY_NAME, (f"{escape_like(query)}%", fulltext_query, fulltext_query, limit))
+                _add_search_results(results, cursor.fetchall(), None)
             
-            if low_stock_only:
-                where_clauses.append("quantity <= reorder_point AND reorder_point > 0")
-            
-            # Build query with parameterized WHERE clause
-            # WHERE clause parts are hardcoded strings, only values are parameterized
-            query_parts = ["SELECT * FROM products"]
-            
-            if where_clauses:
-                query_parts.append("WHERE")
-                query_parts.append(" AND ".join(where_clauses))
-            
-            query_parts.append("ORDER BY timestamp DESC")
-            
-            # Validate pagination parameters are integers (already validated in API layer)
-            offset = (page - 1) * page_size
-            query_parts.append("LIMIT %s OFFSET %s")
-            params.extend([page_size, offset])
-            
-            query = " ".join(query_parts)
-            cursor.execute(query, params)
-            products = cursor.fetchall()
             cursor.close()
-            
-            # Add is_low_stock flag
-            for product in products:
-                reorder_point = product.get('reorder_point', 0)
-                quantity = product.get('quantity', 0)
-                product['is_low_stock'] = reorder_point > 0 and quantity <= reorder_point
-            
-            return products
+        
+        products = list(results.values())[:limit]
+        _flag_low_stock(products)
+        return products
     
     def update_product(self, barcode: str, product_data: Dict) -> Dict:
         """
@@ -172,10 +228,10 @@ class InventoryService:
         Args:
             barcode: Product barcode
             product_data: Updated product data
-            
+        
         Returns:
             Updated product dictionary
-            
+        
         Raises:
             HTTPException: If product not found
         """
@@ -234,6 +290,7 @@ class InventoryService:
                 )
             
             conn.commit()
+            product_cache.invalidate(barcode)
             
             # Fetch updated product
             cursor.execute("SELECT * FROM products WHERE barcode = %s", (barcode,))
@@ -249,10 +306,10 @@ class InventoryService:
         
         Args:
             barcode: Product barcode
-            
+        
         Returns:
             Deleted product dictionary
-            
+        
         Raises:
             HTTPException: If product not found
         """
@@ -270,6 +327,7 @@ class InventoryService:
             # Delete product
             cursor.execute("DELETE FROM products WHERE barcode = %s", (barcode,))
             conn.commit()
+            product_cache.invalidate(barcode)
             cursor.close()
             
             logger.info(f"Product deleted: {barcode}")
@@ -310,42 +368,301 @@ class InventoryService:
         Returns:
             List of products with low stock
         """
-        with get_db() as conn:
+        with get_db(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT * FROM products 
-                WHERE quantity <= reorder_point AND reorder_point > 0
-                ORDER BY (quantity - reorder_point) ASC
-            """)
+            cursor.execute(self.LOW_STOCK_QUERY)
             products = cursor.fetchall()
             cursor.close()
             return products
     
-    def get_stock_history(self, barcode: str, limit: int = 50) -> List[Dict]:
+    def get_stock_history(self, barcode: str, limit: int = 50, cursor: Optional[str] = None) -> Page:
         """
-        Get stock history for a product.
+        Get stock history for a product, newest first.
         
         Args:
             barcode: Product barcode
             limit: Maximum number of records to return
-            
+            cursor: Next-page token from a previous page
+        
         Returns:
-            List of stock history records
+            Page of stock history records and the next-page token
         """
-        with get_db() as conn:
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT * FROM stock_history 
-                WHERE barcode = %s 
-                ORDER BY created_at DESC 
-                LIMIT %s
-            """, (barcode, limit))
-            history = cursor.fetchall()
-            cursor.close()
-            
-            # Convert datetime to string
-            for record in history:
-                if record['created_at'] and isinstance(record['created_at'], datetime):
-                    record['created_at'] = record['created_at'].isoformat()
-            
-            return history
+        query, params = _stock_history_query(barcode, limit, cursor)
+        with get_db(read_only=True) as conn:
+            db_cursor = conn.cursor(dictionary=True)
+            db_cursor.execute(query, params)
+            page = build_page(db_cursor.fetchall(), limit, "stock_history", ("created_at", "id"))
+            db_cursor.close()
+        
+        _isoformat_created_at(page.items)
+        return page
+
+
+class AsyncInventoryService:
+    """
+    Inventory operations for async routes.
+    
+    Reads run on the async pool with the same queries as InventoryService.
+    Product writes (with their stock history and cache invalidation) are
+    delegated to InventoryService on the threadpool.
+    """
+    
+    def __init__(self):
+        """Initialize the service."""
+        self.sync = InventoryService()
+    
+    async def add_product(self, barcode: str, product_data: Dict) -> Dict:
+        """Add a new product (see InventoryService.add_product)."""
+        return await run_in_threadpool(self.sync.add_product, barcode, product_data)
+    
+    async def update_product(self, barcode: str, product_data: Dict) -> Dict:
+        """Update an existing product (see InventoryService.update_product)."""
+        return await run_in_threadpool(self.sync.update_product, barcode, product_data)
+    
+    async def delete_product(self, barcode: str) -> Dict:
+        """Delete a product (see InventoryService.delete_product)."""
+        return await run_in_threadpool(self.sync.delete_product, barcode)
+    
+    async def get_product(self, barcode: str) -> Optional[Dict]:
+        """
+        Get a product by barcode, through the shared product cache.
+        
+        Args:
+            barcode: Product barcode
+        
+        Returns:
+            Product dictionary or None
+        """
+        found, product = product_cache.get(barcode)
+        if found:
+            return dict(product) if product is not None else None
+        
+        generation = product_cache.generation
+        async with get_async_db() as conn:
+            async with conn.cursor(DictCursor) as cursor:
+                await cursor.execute(InventoryService.PRODUCT_BY_BARCODE, (barcode,))
+                product = await cursor.fetchone()
+        
+        product_cache.set(barcode, product, generation=generation)
+        return dict(product) if product is not None else None
+    
+    async def get_all_products(
+        self,
+        search: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        category_id: Optional[int] = None,
+        low_stock_only: Optional[bool] = None,
+        page: int = 1,
+        page_size: int = 100,
+        cursor: Optional[str] = None
+    ) -> Page:
+        """
+        Get products with optional search and filtering (see InventoryService.get_all_products).
+        
+        Returns:
+            Page of product dictionaries and the next-page token
+        """
+        query, params = _product_list_query(
+            search, min_price, max_price, category_id, low_stock_only, page, page_size, cursor
+        )
+        async with get_async_db(read_only=True) as conn:
+            async with conn.cursor(DictCursor) as db_cursor:
+                await db_cursor.execute(query, params)
+                products = list(await db_cursor.fetchall())
+        
+        _flag_low_stock(products)
+        return build_page(products, page_size, "products", ("timestamp", "barcode"))
+    
+    async def search_products(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Search products by name or barcode prefix (see InventoryService.search_products).
+        
+        Returns:
+            Product dictionaries in rank order, each with the kind of match
+        """
+        query = query.strip()
+        results = {}
+        
+        async with get_async_db(read_only=True) as conn:
+            async with conn.cursor(DictCursor) as cursor:
+                if is_barcode_prefix(query):
+                    await cursor.execute(InventoryService.SEARCH_BY_BARCODE, (f"{escape_like(query)}%", query, limit))
+                    _add_search_results(results, await cursor.fetchall(), "barcode")
+                
+                fulltext_query = build_fulltext_query(query)
+                if fulltext_query and len(results) < limit:
+                    await cursor.execute(
+                        InventoryService.SEARCH_BY_NAME,
+                        (f"{escape_like(query)}%", fulltext_query, fulltext_query, limit)
+                    )
+                    _add_search_results(results, await cursor.fetchall(), None)
+        
+        products = list(results.values())[:limit]
+        _flag_low_stock(products)
+        return products
+    
+    async def get_low_stock_products(self) -> List[Dict]:
+        """
+        Get all products with quantity below reorder point.
+        
+        Returns:
+            List of products with low stock
+        """
+        async with get_async_db(read_only=True) as conn:
+            async with conn.cursor(DictCursor) as cursor:
+                await cursor.execute(InventoryService.LOW_STOCK_QUERY)
+                return list(await cursor.fetchall())
+    
+    async def get_stock_history(self, barcode: str, limit: int = 50, cursor: Optional[str] = None) -> Page:
+        """
+        Get stock history for a product, newest first.
+        
+        Args:
+            barcode: Product barcode
+            limit: Maximum number of records to return
+            cursor: Next-page token from a previous page
+        
+        Returns:
+            Page of stock history records and the next-page token
+        """
+        query, params = _stock_history_query(barcode, limit, cursor)
+        async with get_async_db(read_only=True) as conn:
+            async with conn.cursor(DictCursor) as db_cursor:
+                await db_cursor.execute(query, params)
+                page = build_page(list(await db_cursor.fetchall()), limit, "stock_history", ("created_at", "id"))
+        
+        _isoformat_created_at(page.items)
+        return page
+
+
+def _product_list_query(
+    search: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    category_id: Optional[int],
+    low_stock_only: Optional[bool],
+    page: int,
+    page_size: int,
+    cursor: Optional[str]
+) -> Tuple[str, List]:
+    """
+    Build the product list query of get_all_products.
+    
+    Returns:
+        (query, params) fetching page_size + 1 rows
+    """
+    # Build WHERE clause using parameterized queries
+    # All clause strings are hardcoded to prevent SQL injection
+    where_clauses = []
+    params = []
+    
+    # Substring search through the ngram FULLTEXT index instead of a
+    # leading-wildcard LIKE, which always scans the whole table
+    fulltext_query = build_fulltext_query(search) if search else None
+    if fulltext_query:
+        where_clauses.append("MATCH(product_name) AGAINST (%s IN BOOLEAN MODE)")
+        params.append(fulltext_query)
+    elif search and search.strip():
+        # Only boolean operators ("-", "()"): match the text literally as
+        # a name prefix rather than dropping the filter
+        where_clauses.append("product_name LIKE %s")
+        params.append(f"{escape_like(search.strip())}%")
+    
+    if min_price is not None:
+        where_clauses.append("price >= %s")
+        params.append(min_price)
+    
+    if max_price is not None:
+        where_clauses.append("price <= %s")
+        params.append(max_price)
+    
+    if category_id is not None:
+        where_clauses.append("category_id = %s")
+        params.append(category_id)
+    
+    if low_stock_only:
+        where_clauses.append("quantity <= reorder_point AND reorder_point > 0")
+    
+    if cursor:
+        condition, condition_params = keyset_condition(
+            "timestamp", "barcode", decode_cursor("products", cursor)
+        )
+        where_clauses.append(condition)
+        params.extend(condition_params)
+    
+    # Build query with parameterized WHERE clause
+    # WHERE clause parts are hardcoded strings, only values are parameterized
+    query_parts = ["SELECT * FROM products"]
+    
+    if where_clauses:
+        query_parts.append("WHERE")
+        query_parts.append(" AND ".join(where_clauses))
+    
+    query_parts.append("ORDER BY timestamp DESC, barcode DESC")
+    
+    # Validate pagination parameters are integers (already validated in API layer)
+    # One extra row tells whether a next page exists
+    offset = 0 if cursor else (page - 1) * page_size
+    query_parts.append("LIMIT %s OFFSET %s")
+    params.extend([page_size + 1, offset])
+    
+    query = " ".join(query_parts)
+    return query, params
+
+
+def _flag_low_stock(products: List[Dict]):
+    """Add the is_low_stock flag to product rows."""
+    for product in products:
+        reorder_point = product.get('reorder_point', 0)
+        quantity = product.get('quantity', 0)
+        product['is_low_stock'] = reorder_point > 0 and quantity <= reorder_point
+
+
+def _add_search_results(results: Dict[str, Dict], rows: List[Dict], match: Optional[str]):
+    """
+    Merge search rows into results, keeping earlier (better) matches.
+    
+    Args:
+        results: Barcode -> product, in rank order
+        rows: Rows of SEARCH_BY_BARCODE or SEARCH_BY_NAME
+        match: Match kind, or None to derive "prefix"/"name" from is_prefix
+    """
+    for product in rows:
+        if match is None:
+            is_prefix = product.pop('is_prefix')
+            product.pop('relevance')
+            product['match'] = "prefix" if is_prefix else "name"
+        else:
+            product['match'] = match
+        results.setdefault(product['barcode'], product)
+
+
+def _stock_history_query(barcode: str, limit: int, cursor: Optional[str]) -> Tuple[str, List]:
+    """
+    Build the stock history query of get_stock_history.
+    
+    Returns:
+        (query, params) fetching limit + 1 rows
+    """
+    where_clauses = ["barcode = %s"]
+    params = [barcode]
+    if cursor:
+        condition, condition_params = keyset_condition("created_at", "id", decode_cursor("stock_history", cursor))
+        where_clauses.append(condition)
+        params.extend(condition_params)
+    
+    query = f"""
+        SELECT * FROM stock_history 
+        WHERE {' AND '.join(where_clauses)}
+        ORDER BY created_at DESC, id DESC 
+        LIMIT %s
+    """
+    return query, [*params, limit + 1]
+
+
+def _isoformat_created_at(records: List[Dict]):
+    """Convert created_at datetimes to strings."""
+    for record in records:
+        if record['created_at'] and isinstance(record['created_at'], datetime):
+            record['created_at'] = record['created_at'].isoformat()
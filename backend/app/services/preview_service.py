@@ -0,0 +1,116 @@
+"""Camera preview broadcasting as an MJPEG stream."""
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import AsyncIterator, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.core.config import settings
+
+
+class PreviewBroadcaster:
+    """
+    Fan out scanner preview frames to MJPEG viewers.
+    
+    The capture thread publishes every frame, but frames are only resized and
+    JPEG-encoded while at least one viewer is connected, and no more often
+    than max_fps. With nobody watching, publish() is a single integer check.
+    """
+    
+    BOUNDARY = "frame"
+    
+    def __init__(self, max_fps: int = 10, max_width: int = 640, quality: int = 70):
+        """
+        Initialize the broadcaster.
+        
+        Args:
+            max_fps: Maximum preview frame rate
+            max_width: Preview frames wider than this are downscaled
+            quality: JPEG quality (0-100)
+        """
+        self.max_fps = max(1, max_fps)
+        self.max_width = max_width
+        self.quality = quality
+        self._lock = threading.Lock()
+        self._viewers = 0
+        self._jpeg: Optional[bytes] = None
+        self._seq = 0
+        self._last_encoded = 0.0
+    
+    @property
+    def viewers(self) -> int:
+        """Number of connected viewers."""
+        return self._viewers
+    
+    @contextmanager
+    def viewer(self):
+        """Register a viewer for the duration of the block."""
+        with self._lock:
+            self._viewers += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._viewers -= 1
+                if self._viewers == 0:
+                    self._jpeg = None
+    
+    def publish(self, frame: np.ndarray):
+        """
+        Offer a frame to the preview stream.
+        
+        Args:
+            frame: BGR frame from the capture thread
+        """
+        if self._viewers == 0:
+            return
+        
+        now = time.monotonic()
+        if now - self._last_encoded < 1.0 / self.max_fps:
+            return
+        self._last_encoded = now
+        
+        height, width = frame.shape[:2]
+        if width > self.max_width:
+            scale = self.max_width / float(width)
+            frame = cv2.resize(frame, (self.max_width, int(height * scale)), interpolation=cv2.INTER_AREA)
+        
+        ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            return
+        with self._lock:
+            self._jpeg = buffer.tobytes()
+            self._seq += 1
+    
+    def latest(self) -> Tuple[int, Optional[bytes]]:
+        """Get the latest encoded frame and its sequence number."""
+        with self._lock:
+            return self._seq, self._jpeg
+    
+    async def stream(self) -> AsyncIterator[bytes]:
+        """
+        Yield multipart MJPEG chunks until the client disconnects.
+        
+        Polls for new frames at max_fps on the event loop, so a viewer never
+        holds a threadpool worker.
+        """
+        last_seq = -1
+        interval = 1.0 / self.max_fps
+        with self.viewer():
+            while True:
+                seq, jpeg = self.latest()
+                if jpeg is not None and seq != last_seq:
+                    last_seq = seq
+                    yield (
+                        f"--{self.BOUNDARY}\r\n"
+                        f"Content-Type: image/jpeg\r\n"
+                        f"Content-Length: {len(jpeg)}\r\n\r\n"
+                    ).encode() + jpeg + b"\r\n"
+                await asyncio.sleep(interval)
+
+
+# Global preview broadcaster
+preview_broadcaster = PreviewBroadcaster(max_fps=settings.SCANNER_PREVIEW_FPS)
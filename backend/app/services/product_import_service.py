@@ -0,0 +1,409 @@
+"""Streaming bulk import of products from CSV or NDJSON."""
+import codecs
+import csv
+import json
+import math
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.logging import logger
+from app.services.inventory_service import product_cache
+from app.utils.validators import validate_barcode, validate_price, validate_quantity
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+REQUIRED_COLUMNS = ("barcode", "product_name", "price")
+
+# Defaults for optional columns of new products (as in add_product)
+NEW_PRODUCT_DEFAULTS = {"quantity": 1, "details": "to fill", "reorder_point": 0, "category_id": None}
+
+# Lines a CSV record (quoted fields with line breaks) may span before it is
+# rejected as an unterminated quote
+MAX_RECORD_LINES = 100
+
+
+class _NeedMoreInput(Exception):
+    """Raised through csv.reader when a record continues past the lines received so far."""
+
+
+class _LineFeed:
+    """
+    Line iterator for one persistent csv.reader, filled as the body arrives.
+    
+    Running out of lines mid-body raises _NeedMoreInput instead of ending
+    the reader; the lines of the unfinished record are kept in taken so
+    they can be handed over again once more of the body is in.
+    """
+    
+    def __init__(self):
+        self.lines = deque()
+        self.taken: List[str] = []
+        self.final = False
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self) -> str:
+        if not self.lines:
+            if self.final:
+                raise StopIteration
+            raise _NeedMoreInput
+        line = self.lines.popleft()
+        self.taken.append(line)
+        return line
+
+
+class ProductImport:
+    """
+    One bulk product import, fed the request body chunk by chunk.
+    
+    The body is decoded and split into records incrementally, so memory use
+    is bounded by one batch rather than the file. Each record is validated
+    as it arrives; valid rows are collected into batches of
+    PRODUCT_IMPORT_BATCH_SIZE and each batch is written in its own
+    transaction with one multi-row INSERT ... ON DUPLICATE KEY UPDATE and
+    one batched stock history insert. Optional columns missing from a row
+    keep their current value for existing products and get the add_product
+    defaults for new ones.
+    
+    feed() and finish() return the batches that are ready; the caller
+    passes each to write_batch() (which blocks on the database).
+    """
+    
+    def __init__(
+        self,
+        import_format: str,
+        batch_size: Optional[int] = None,
+        max_errors: Optional[int] = None,
+        reason: str = "Bulk import"
+    ):
+        """
+        Initialize the import.
+        
+        Args:
+            import_format: "csv" (header row required) or "ndjson" (one JSON object per line)
+            batch_size: Rows per upsert (defaults to PRODUCT_IMPORT_BATCH_SIZE)
+            max_errors: Row errors kept for the report (defaults to PRODUCT_IMPORT_MAX_ERRORS)
+            reason: Stock history reason for quantity changes
+        """
+        if import_format not in IMPORT_FORMATS:
+            raise ValueError(f"Unsupported import format {import_format!r}; use {' or '.join(IMPORT_FORMATS)}")
+        self.format = import_format
+        self.batch_size = batch_size or settings.PRODUCT_IMPORT_BATCH_SIZE
+        self.max_errors = settings.PRODUCT_IMPORT_MAX_ERRORS if max_errors is None else max_errors
+        self.reason = reason
+        
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._tail = ""
+        self._lines = _LineFeed()
+        self._reader = csv.reader(self._lines, strict=True)
+        self._header: Optional[List[str]] = None
+        self._batch: List[Tuple[int, Dict]] = []
+        self._row_number = 0
+        self._started = time.perf_counter()
+        
+        self.stats = {"inserted": 0, "updated": 0, "failed": 0}
+        self.errors: List[Dict] = []
+    
+    def feed(self, data: bytes) -> List[List[Tuple[int, Dict]]]:
+        """
+        Consume a chunk of the request body.
+        
+        Args:
+            data: Next bytes of the body
+        
+        Returns:
+            Batches of (row number, product) ready to be written
+        
+        Raises:
+            ValueError: If the body is not UTF-8 or the CSV header lacks a required column
+        """
+        text = self._tail + self._decoder.decode(data)
+        lines = text.split("\n")
+        self._tail = lines.pop()
+        return self._consume(lines)
+    
+    def finish(self) -> List[List[Tuple[int, Dict]]]:
+        """
+        Consume the end of the body.
+        
+        Returns:
+            The remaining batches to be written
+        """
+        lines = [self._tail + self._decoder.decode(b"", final=True)]
+        self._tail = ""
+        self._lines.final = True
+        batches = self._consume(lines)
+        if self._batch:
+            batches.append(self._batch)
+            self._batch = []
+        return batches
+    
+    def _consume(self, lines: List[str]) -> List[List[Tuple[int, Dict]]]:
+        """Parse complete lines into rows and cut full batches."""
+        batches = []
+        if self.format == "csv":
+            self._lines.lines.extend(line + "\n" for line in lines)
+            records = self._csv_records()
+        else:
+            records = self._ndjson_records(lines)
+        for raw in records:
+            try:
+                product = validate_import_row(raw)
+            except ValueError as e:
+                self._fail(self._row_number, raw.get("barcode"), str(e))
+                continue
+            
+            self._batch.append((self._row_number, product))
+            if len(self._batch) >= self.batch_size:
+                batches.append(self._batch)
+                self._batch = []
+        return batches
+    
+    def _csv_records(self):
+        """Yield the CSV rows complete in the lines fed so far, as dicts keyed by the header."""
+        while True:
+            self._lines.taken = []
+            try:
+                values = next(self._reader)
+            except _NeedMoreInput:
+                pending = self._lines.taken
+                if len(pending) <= MAX_RECORD_LINES:
+                    # Parse the record again from its first line once more arrives
+                    self._lines.lines.extendleft(reversed(pending))
+                    return
+                self._row_number += 1
+                self._fail(
+                    self._row_number, None,
+                    f"Record spans more than {MAX_RECORD_LINES} lines (unterminated quoted field?)"
+                )
+                self._lines.lines.extendleft(reversed(pending[1:]))
+                continue
+            except StopIteration:
+                return
+            except csv.Error as e:
+                if self._header is None:
+                    raise ValueError(f"Invalid CSV header: {e}")
+                self._row_number += 1
+                self._fail(self._row_number, None, f"Invalid CSV: {e}")
+                continue
+            if not values or (len(values) == 1 and not values[0].strip()):
+                continue
+            if self._header is None:
+                self._header = [column.strip().lower() for column in values]
+                missing = [column for column in REQUIRED_COLUMNS if column not in self._header]
+                if missing:
+                    raise ValueError(f"CSV header is missing column(s): {', '.join(missing)}")
+                continue
+            self._row_number += 1
+            yield dict(zip(self._header, values))
+    
+    def _ndjson_records(self, lines: List[str]):
+        """Yield the JSON objects of complete NDJSON lines."""
+        for line in lines:
+            if not line.strip():
+                continue
+            self._row_number += 1
+            try:
+                raw = json.loads(line)
+            except ValueError as e:
+                self._fail(self._row_number, None, f"Invalid JSON: {e}")
+                continue
+            if not isinstance(raw, dict):
+                self._fail(self._row_number, None, "Each line must be a JSON object")
+                continue
+            yield raw
+    
+    def write_batch(self, batch: List[Tuple[int, Dict]]):
+        """
+        Upsert one batch of validated rows in a single transaction.
+        
+        Existing rows are locked and read first to fill in missing columns
+        and to record quantity changes. Rows naming an unknown category are
+        rejected individually; a database error fails the whole batch.
+        
+        Args:
+            batch: (row number, product) pairs from feed() or finish()
+        """
+        # A barcode repeated within the batch: the last row wins
+        rows = {product['barcode']: (row_number, product) for row_number, product in batch}
+        now = datetime.utcnow()
+        
+        with get_db() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                barcodes = list(rows)
+                placeholders = ", ".join(["%s"] * len(barcodes))
+                cursor.execute(
+                    f"SELECT barcode, quantity, details, reorder_point, category_id "
+                    f"FROM products WHERE barcode IN ({placeholders}) FOR UPDATE",
+                    barcodes
+                )
+                existing = {row['barcode']: row for row in cursor.fetchall()}
+                
+                category_ids = {product['category_id'] for _, product in rows.values() if product.get('category_id') is not None}
+                known_categories = set()
+                if category_ids:
+                    cursor.execute(
+                        f"SELECT id FROM categories WHERE id IN ({', '.join(['%s'] * len(category_ids))})",
+                        list(category_ids)
+                    )
+                    known_categories = {row['id'] for row in cursor.fetchall()}
+                
+                values = []
+                history = []
+                inserted = updated = 0
+                for barcode, (row_number, product) in rows.items():
+                    category_id = product.get('category_id')
+                    if category_id is not None and category_id not in known_categories:
+                        self._fail(row_number, barcode, f"Category {category_id} does not exist")
+                        continue
+                    
+                    current = existing.get(barcode) or NEW_PRODUCT_DEFAULTS
+                    full = {column: product.get(column, current[column]) for column in NEW_PRODUCT_DEFAULTS}
+                    values.extend((
+                        barcode, product['product_name'], product['price'], full['quantity'],
+                        full['details'], full['reorder_point'], full['category_id'], now
+                    ))
+                    
+                    previous_quantity = existing[barcode]['quantity'] if barcode in existing else 0
+                    if full['quantity'] != previous_quantity:
+                        history.append((
+                            barcode, full['quantity'] - previous_quantity, previous_quantity,
+                            full['quantity'], self.reason, None, now
+                        ))
+                    if barcode in existing:
+                        updated += 1
+                    else:
+                        inserted += 1
+                
+                written = inserted + updated
+                if written:
+                    cursor.execute(f"""
+                        INSERT INTO products
+                        (barcode, product_name, price, quantity, details, reorder_point, category_id, timestamp)
+                        VALUES {', '.join(['(%s, %s, %s, %s, %s, %s, %s, %s)'] * written)} AS new
+                        ON DUPLICATE KEY UPDATE
+                            product_name = new.product_name,
+                            price = new.price,
+                            quantity = new.quantity,
+                            details = new.details,
+                            reorder_point = new.reorder_point,
+                            category_id = new.category_id,
+                            timestamp = new.timestamp
+                    """, values)
+                if history:
+                    cursor.executemany("""
+                        INSERT INTO stock_history
+                        (barcode, quantity_change, previous_quantity, new_quantity, reason, user_id, created_at)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    """, history)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Product import batch failed: {e}")
+                for barcode, (row_number, _) in rows.items():
+                    self._fail(row_number, barcode, f"Database error: {e}")
+                return
+            finally:
+                cursor.close()
+        
+        product_cache.invalidate(*rows)
+        self.stats["inserted"] += inserted
+        self.stats["updated"] += updated
+        # Earlier rows overridden by a later duplicate count as updates
+        self.stats["updated"] += len(batch) - len(rows)
+    
+    def report(self) -> Dict:
+        """
+        Summarize the import.
+        
+        Returns:
+            Row counts, per-row errors (up to max_errors) and throughput
+        """
+        elapsed = time.perf_counter() - self._started
+        return {
+            "format": self.format,
+            "rows": self._row_number,
+            **self.stats,
+            "errors": sorted(self.errors, key=lambda error: error["row"]),
+            "errors_truncated": self.stats["failed"] > len(self.errors),
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self._row_number / elapsed) if elapsed > 0 else 0
+        }
+    
+    def _fail(self, row_number: int, barcode: Any, error: str):
+        """Count a rejected row and keep its error for the report."""
+        self.stats["failed"] += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row_number, "barcode": None if barcode is None else str(barcode), "error": error})
+
+
+def validate_import_row(raw: Dict) -> Dict:
+    """
+    Validate and normalize one imported product.
+    
+    Args:
+        raw: Field values from a CSV row (strings) or an NDJSON object
+    
+    Returns:
+        Product with barcode, product_name, price and whichever optional
+        columns were given (empty values count as not given)
+    
+    Raises:
+        ValueError: If a field is missing or invalid
+    """
+    barcode = validate_barcode(str(raw.get("barcode") or ""))
+    
+    product_name = str(raw.get("product_name") or "").strip()
+    if not product_name:
+        raise ValueError("product_name is required")
+    if len(product_name) > 255:
+        raise ValueError("product_name cannot exceed 255 characters")
+    
+    if _is_blank(raw.get("price")):
+        raise ValueError("price is required")
+    try:
+        price = float(raw["price"])
+    except (TypeError, ValueError):
+        raise ValueError("price must be a number")
+    if not math.isfinite(price):
+        raise ValueError("price must be a number")
+    product = {"barcode": barcode, "product_name": product_name, "price": round(validate_price(price), 2)}
+    
+    if not _is_blank(raw.get("quantity")):
+        product['quantity'] = validate_quantity(_parse_int("quantity", raw["quantity"]))
+    if not _is_blank(raw.get("reorder_point")):
+        product['reorder_point'] = _parse_int("reorder_point", raw["reorder_point"])
+        if product['reorder_point'] < 0:
+            raise ValueError("reorder_point cannot be negative")
+    if not _is_blank(raw.get("category_id")):
+        product['category_id'] = _parse_int("category_id", raw["category_id"])
+    if not _is_blank(raw.get("details")):
+        product['details'] = str(raw["details"])
+        if len(product['details']) > 5000:
+            raise ValueError("details cannot exceed 5000 characters")
+    return product
+
+
+def _is_blank(value: Any) -> bool:
+    """True for a missing or empty field."""
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _parse_int(field: str, value: Any) -> int:
+    """Parse an integer field from a CSV string or JSON number."""
+    if isinstance(value, bool):
+        raise ValueError(f"{field} must be an integer")
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        raise ValueError(f"{field} must be an integer")
@@ -1,15 +1,137 @@
 """Sales reporting service using raw MySQL queries."""
-from typing import Dict, List, Optional
+import json
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
 
+from app.core.cache import CachedReport, ReportCache
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.logging import logger
+from app.utils.date_ranges import (
+    DATE_FORMAT, DateRange, day_range, month_range, parse_day, period_range, trailing_days_range, week_range
+)
+
+# Normalized report parameters -> rendered report, shared by all requests.
+# Checkout clears open-period reports after commit; closed periods should not
+# change, but still expire after REPORT_CACHE_CLOSED_TTL.
+report_cache = ReportCache(
+    maxsize=settings.REPORT_CACHE_SIZE,
+    open_ttl=settings.REPORT_CACHE_TTL,
+    closed_ttl=settings.REPORT_CACHE_CLOSED_TTL
+)
 
 
 class ReportService:
     """Service for sales reporting operations."""
     
+    # Item-level reports aggregate bill_items over an indexed created_at range
+    TOP_PRODUCTS_QUERY = """
+        SELECT
+            barcode,
+            product_name,
+            SUM(quantity) AS units,
+            SUM(line_total) AS revenue,
+            COUNT(DISTINCT bill_id) AS bills
+        FROM bill_items
+        WHERE {where}
+        GROUP BY barcode, product_name
+        ORDER BY {order} DESC
+        LIMIT %s
+    """
+    
+    # Sales breakdown dimension -> sales rollup column
+    SALES_DIMENSIONS = {
+        "payment": "payment_method",
+        "cashier": "cashier_name",
+        "day": "DATE(period_start)",
+        "hour": "period_start",
+    }
+    
+    SALES_METRICS = ("count", "subtotal", "discount", "tax", "total")
+    
+    # Cacheable report name -> method computing it
+    REPORTS = {
+        "daily": "get_daily_sales",
+        "weekly": "get_weekly_sales",
+        "monthly": "get_monthly_sales",
+        "sales": "get_sales",
+        "top-products": "get_top_products",
+        "category-units": "get_category_units",
+        "basket-sizes": "get_basket_sizes",
+    }
+    
+    def get_cached_report(self, report: str, **params) -> CachedReport:
+        """
+        Get a rendered report, computing it only on a cache miss.
+        
+        Parameters are normalized first (defaults filled in, days in
+        canonical form, an empty cashier treated as no filter), so equivalent
+        requests share one entry. A report whose period ended more than
+        REPORT_CACHE_TTL ago is closed and cached for REPORT_CACHE_CLOSED_TTL;
+        otherwise it is cached until the next checkout or REPORT_CACHE_TTL.
+        
+        Args:
+            report: Report name (key of REPORTS)
+            **params: Arguments of the report method
+        
+        Returns:
+            Cached report with its JSON body and validators
+        """
+        params, period = self._normalize_params(report, params)
+        key = (report, tuple(sorted(params.items())))
+        # bills.created_at is UTC. A bill is stamped before its checkout
+        # commits and reports may read a lagging replica, so a period only
+        # counts as closed a grace interval after its end
+        grace = timedelta(seconds=settings.REPORT_CACHE_TTL)
+        closed = period.end is not None and period.end + grace <= datetime.utcnow()
+        
+        def render() -> bytes:
+            result = getattr(self, self.REPORTS[report])(**params)
+            return json.dumps(
+                jsonable_encoder(result), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+            ).encode("utf-8")
+        
+        return report_cache.get_or_render(key, closed, render)
+    
+    def _normalize_params(self, report: str, params: Dict) -> Tuple[Dict, DateRange]:
+        """
+        Fill in report defaults and canonicalize parameters.
+        
+        Args:
+            report: Report name
+            params: Report method arguments
+        
+        Returns:
+            (normalized params, period covered by the report)
+        """
+        params = dict(params)
+        if "cashier_name" in params:
+            params["cashier_name"] = params["cashier_name"] or None
+        if "dimensions" in params:
+            params["dimensions"] = tuple(dict.fromkeys(params["dimensions"] or ()))
+        
+        if report == "daily":
+            day = parse_day(params["date"]) if params.get("date") else datetime.now()
+            params["date"] = day.strftime(DATE_FORMAT)
+            return params, day_range(params["date"])
+        if report == "weekly":
+            if params.get("week_start"):
+                week_start = parse_day(params["week_start"])
+            else:
+                today = datetime.now()
+                week_start = today - timedelta(days=today.weekday())
+            params["week_start"] = week_start.strftime(DATE_FORMAT)
+            return params, week_range(params["week_start"])
+        if report == "monthly":
+            return params, month_range(params["year"], params["month"])
+        
+        start_date, end_date = self._default_period(params.get("start_date"), params.get("end_date"))
+        params["start_date"] = parse_day(start_date).strftime(DATE_FORMAT)
+        params["end_date"] = parse_day(end_date).strftime(DATE_FORMAT)
+        return params, period_range(params["start_date"], params["end_date"])
+    
     def get_daily_sales(
         self,
         date: Optional[str] = None,
@@ -21,74 +143,43 @@ class ReportService:
         Args:
             date: Date in YYYY-MM-DD format (defaults to today)
             cashier_name: Optional cashier name filter
-            
+        
         Returns:
             Daily sales summary
         """
         if not date:
             date = datetime.now().strftime('%Y-%m-%d')
+        day = day_range(date)
         
-        with get_db() as conn:
+        with get_db(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             
-            where_clauses = ["DATE(created_at) = %s"]
-            params = [date]
-            
-            if cashier_name:
-                where_clauses.append("cashier_name = %s")
-                params.append(cashier_name)
+            # One grouped query; summary, payment and hourly breakdowns are reduced from it
+            groups = self._sales_groups(cursor, day, cashier_name, ["payment", "hour"])
             
-            # Get total sales
-            query = f"""
-                SELECT 
-                    COUNT(*) as total_bills,
-                    SUM(subtotal) as total_subtotal,
-                    SUM(discount_amount) as total_discount,
-                    SUM(tax_amount) as total_tax,
-                    SUM(total_amount) as total_amount,
-                    AVG(total_amount) as avg_bill_amount
-                FROM bills
-                WHERE {' AND '.join(where_clauses)}
-            """
-            cursor.execute(query, params)
-            summary = cursor.fetchone()
+            # Get top products sold
+            item_clauses, item_params = day.clauses()
+            cursor.execute(
+                self.TOP_PRODUCTS_QUERY.format(where=" AND ".join(item_clauses), order="units"),
+                (*item_params, 5)
+            )
+            top_products = cursor.fetchall()
             
-            # Get payment method breakdown
-            query = f"""
-                SELECT 
-                    payment_method,
-                    COUNT(*) as count,
-                    SUM(total_amount) as total
-                FROM bills
-                WHERE {' AND '.join(where_clauses)}
-                GROUP BY payment_method
-            """
-            cursor.execute(query, params)
-            payment_methods = cursor.fetchall()
-            
-            # Get top products sold (from bill_text - simplified)
-            # In a real system, you'd have a bill_items table
             cursor.close()
             
             return {
                 "date": date,
                 "cashier": cashier_name,
-                "summary": {
-                    "total_bills": summary['total_bills'] or 0,
-                    "total_subtotal": float(summary['total_subtotal'] or 0),
-                    "total_discount": float(summary['total_discount'] or 0),
-                    "total_tax": float(summary['total_tax'] or 0),
-                    "total_amount": float(summary['total_amount'] or 0),
-                    "avg_bill_amount": float(summary['avg_bill_amount'] or 0)
-                },
+                "summary": self._summarize(groups),
                 "payment_methods": [
-                    {
-                        "method": pm['payment_method'],
-                        "count": pm['count'],
-                        "total": float(pm['total'])
-                    }
-                    for pm in payment_methods
-                ]
+                    {"method": row['payment'], "count": row['count'], "total": row['total']}
+                    for row in self._reduce(groups, "payment")
+                ],
+                "hourly_breakdown": [
+                    {"hour": row['hour'].strftime('%H:00'), "count": row['count'], "total": row['total']}
+                    for row in self._reduce(groups, "hour")
+                ],
+                "top_products": [self._format_product_row(row) for row in top_products]
             }
     
     def get_weekly_sales(
@@ -102,7 +193,7 @@ class ReportService:
         Args:
             week_start: Start date in YYYY-MM-DD format (defaults to start of current week)
             cashier_name: Optional cashier name filter
-            
+        
         Returns:
             Weekly sales summary
         """
@@ -112,71 +203,24 @@ class ReportService:
             week_start_date = today - timedelta(days=days_since_monday)
             week_start = week_start_date.strftime('%Y-%m-%d')
         
-        week_end_date = datetime.strptime(week_start, '%Y-%m-%d') + timedelta(days=6)
-        week_end = week_end_date.strftime('%Y-%m-%d')
+        week = week_range(week_start)
+        week_end = (week.end - timedelta(days=1)).strftime('%Y-%m-%d')
         
-        with get_db() as conn:
+        with get_db(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
-            
-            where_clauses = ["DATE(created_at) >= %s", "DATE(created_at) <= %s"]
-            params = [week_start, week_end]
-            
-            if cashier_name:
-                where_clauses.append("cashier_name = %s")
-                params.append(cashier_name)
-            
-            # Get total sales
-            query = f"""
-                SELECT 
-                    COUNT(*) as total_bills,
-                    SUM(subtotal) as total_subtotal,
-                    SUM(discount_amount) as total_discount,
-                    SUM(tax_amount) as total_tax,
-                    SUM(total_amount) as total_amount,
-                    AVG(total_amount) as avg_bill_amount
-                FROM bills
-                WHERE {' AND '.join(where_clauses)}
-            """
-            cursor.execute(query, params)
-            summary = cursor.fetchone()
-            
-            # Get daily breakdown
-            query = f"""
-                SELECT 
-                    DATE(created_at) as date,
-                    COUNT(*) as count,
-                    SUM(total_amount) as total
-                FROM bills
-                WHERE {' AND '.join(where_clauses)}
-                GROUP BY DATE(created_at)
-                ORDER BY date ASC
-            """
-            cursor.execute(query, params)
-            daily_breakdown = cursor.fetchall()
-            
+            groups = self._sales_groups(cursor, week, cashier_name, ["day"])
             cursor.close()
-            
-            return {
-                "week_start": week_start,
-                "week_end": week_end,
-                "cashier": cashier_name,
-                "summary": {
-                    "total_bills": summary['total_bills'] or 0,
-                    "total_subtotal": float(summary['total_subtotal'] or 0),
-                    "total_discount": float(summary['total_discount'] or 0),
-                    "total_tax": float(summary['total_tax'] or 0),
-                    "total_amount": float(summary['total_amount'] or 0),
-                    "avg_bill_amount": float(summary['avg_bill_amount'] or 0)
-                },
-                "daily_breakdown": [
-                    {
-                        "date": str(row['date']),
-                        "count": row['count'],
-                        "total": float(row['total'])
-                    }
-                    for row in daily_breakdown
-                ]
-            }
+        
+        return {
+            "week_start": week_start,
+            "week_end": week_end,
+            "cashier": cashier_name,
+            "summary": self._summarize(groups),
+            "daily_breakdown": [
+                {"date": str(row['day']), "count": row['count'], "total": row['total']}
+                for row in self._reduce(groups, "day")
+            ]
+        }
     
     def get_monthly_sales(
         self,
@@ -191,69 +235,343 @@ class ReportService:
             year: Year (e.g., 2024)
             month: Month (1-12)
             cashier_name: Optional cashier name filter
-            
+        
         Returns:
             Monthly sales summary
         """
-        with get_db() as conn:
+        month_period = month_range(year, month)
+        
+        with get_db(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
-            
-            where_clauses = ["YEAR(created_at) = %s", "MONTH(created_at) = %s"]
-            params = [year, month]
-            
-            if cashier_name:
-                where_clauses.append("cashier_name = %s")
-                params.append(cashier_name)
-            
-            # Get total sales
-            query = f"""
-                SELECT 
-                    COUNT(*) as total_bills,
-                    SUM(subtotal) as total_subtotal,
-                    SUM(discount_amount) as total_discount,
-                    SUM(tax_amount) as total_tax,
-                    SUM(total_amount) as total_amount,
-                    AVG(total_amount) as avg_bill_amount
-                FROM bills
-                WHERE {' AND '.join(where_clauses)}
-            """
-            cursor.execute(query, params)
-            summary = cursor.fetchone()
-            
-            # Get cashier breakdown
-            query = f"""
-                SELECT 
-                    cashier_name,
-                    COUNT(*) as count,
-                    SUM(total_amount) as total
-                FROM bills
-                WHERE {' AND '.join(where_clauses)}
-                GROUP BY cashier_name
-                ORDER BY total DESC
-            """
-            cursor.execute(query, params)
-            cashier_breakdown = cursor.fetchall()
-            
+            groups = self._sales_groups(cursor, month_period, cashier_name, ["cashier"])
             cursor.close()
-            
-            return {
-                "year": year,
-                "month": month,
-                "summary": {
-                    "total_bills": summary['total_bills'] or 0,
-                    "total_subtotal": float(summary['total_subtotal'] or 0),
-                    "total_discount": float(summary['total_discount'] or 0),
-                    "total_tax": float(summary['total_tax'] or 0),
-                    "total_amount": float(summary['total_amount'] or 0),
-                    "avg_bill_amount": float(summary['avg_bill_amount'] or 0)
-                },
-                "cashier_breakdown": [
-                    {
-                        "cashier": row['cashier_name'] or "Unknown",
-                        "count": row['count'],
-                        "total": float(row['total'])
-                    }
-                    for row in cashier_breakdown
-                ]
+        
+        return {
+            "year": year,
+            "month": month,
+            "summary": self._summarize(groups),
+            "cashier_breakdown": [
+                {"cashier": row['cashier'] or "Unknown", "count": row['count'], "total": row['total']}
+                for row in sorted(self._reduce(groups, "cashier"), key=lambda row: row['total'], reverse=True)
+            ]
+        }
+    
+    def get_sales(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        dimensions: Optional[List[str]] = None,
+        cashier_name: Optional[str] = None
+    ) -> Dict:
+        """
+        Get a sales summary with any combination of breakdowns.
+        
+        All breakdowns come from one grouped query over the sales rollups
+        (grouped by every requested dimension) reduced in Python.
+        
+        Args:
+            start_date: First day in YYYY-MM-DD format (defaults to 29 days before end_date)
+            end_date: Last day in YYYY-MM-DD format (defaults to today)
+            dimensions: Breakdown dimensions out of payment, cashier, day and hour
+            cashier_name: Optional cashier name filter
+        
+        Returns:
+            Summary, one breakdown per dimension and, for several dimensions,
+            the combined groups
+        """
+        dimensions = list(dict.fromkeys(dimensions or []))
+        unknown = [dimension for dimension in dimensions if dimension not in self.SALES_DIMENSIONS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown breakdown {', '.join(unknown)}; use {', '.join(self.SALES_DIMENSIONS)}"
+            )
+        
+        start_date, end_date = self._default_period(start_date, end_date)
+        period = period_range(start_date, end_date)
+        
+        with get_db(read_only=True) as conn:
+            cursor = conn.cursor(dictionary=True)
+            groups = self._sales_groups(cursor, period, cashier_name, dimensions)
+            cursor.close()
+        
+        result = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "cashier": cashier_name,
+            "dimensions": dimensions,
+            "summary": self._summarize(groups),
+            "breakdowns": {
+                dimension: [self._format_group(row, [dimension]) for row in self._reduce(groups, dimension)]
+                for dimension in dimensions
             }
-
+        }
+        if len(dimensions) > 1:
+            result["groups"] = [self._format_group(row, dimensions) for row in groups]
+        return result
+    
+    def _sales_groups(self, cursor, period, cashier_name: Optional[str], dimensions: List[str]) -> List[Dict]:
+        """
+        Read sales rollup counters for a period, grouped by the given dimensions.
+        
+        Uses sales_hourly when an hour breakdown is requested and the smaller
+        sales_daily otherwise. The rollups are maintained inside the checkout
+        transaction, so they are as current as the bills table.
+        
+        Args:
+            cursor: Dictionary cursor
+            period: DateRange of whole days to report on
+            cashier_name: Optional cashier filter
+            dimensions: Breakdown dimensions (keys of SALES_DIMENSIONS)
+        
+        Returns:
+            One row per group with the dimension values, count, subtotal,
+            discount, tax and total
+        """
+        hourly = "hour" in dimensions
+        table = "sales_hourly" if hourly else "sales_daily"
+        
+        where_clauses, params = period.clauses("period_start")
+        if not hourly:
+            params = [bound.date() for bound in params]
+        if cashier_name:
+            where_clauses.append("cashier_name = %s")
+            params.append(cashier_name)
+        
+        columns = [
+            f"{'period_start' if dimension == 'day' and not hourly else self.SALES_DIMENSIONS[dimension]} AS `{dimension}`"
+            for dimension in dimensions
+        ]
+        group_by = f"GROUP BY {', '.join(f'`{dimension}`' for dimension in dimensions)}" if dimensions else ""
+        
+        cursor.execute(f"""
+            SELECT
+                {''.join(column + ', ' for column in columns)}
+                SUM(bill_count) AS count,
+                SUM(subtotal) AS subtotal,
+                SUM(discount_amount) AS discount,
+                SUM(tax_amount) AS tax,
+                SUM(total_amount) AS total
+            FROM {table}
+            WHERE {' AND '.join(where_clauses)}
+            {group_by}
+        """, params)
+        
+        groups = []
+        for row in cursor.fetchall():
+            if row['count'] is None:
+                continue  # Ungrouped aggregate over no rows
+            group = {dimension: row[dimension] for dimension in dimensions}
+            if "cashier" in group:
+                group["cashier"] = group["cashier"] or None
+            group.update({metric: float(row[metric]) for metric in self.SALES_METRICS})
+            group["count"] = int(row['count'])
+            groups.append(group)
+        return groups
+    
+    def _reduce(self, groups: List[Dict], dimension: str) -> List[Dict]:
+        """
+        Add up grouped rows into a breakdown by one dimension.
+        
+        Args:
+            groups: Rows from _sales_groups
+            dimension: Dimension to break down by
+        
+        Returns:
+            One row per dimension value, ordered by value
+        """
+        reduced = {}
+        for group in groups:
+            key = group[dimension]
+            row = reduced.setdefault(key, {dimension: key, **{metric: 0 for metric in self.SALES_METRICS}})
+            for metric in self.SALES_METRICS:
+                row[metric] += group[metric]
+        
+        rows = sorted(reduced.values(), key=lambda row: (row[dimension] is None, str(row[dimension])))
+        for row in rows:
+            for metric in ("subtotal", "discount", "tax", "total"):
+                row[metric] = round(row[metric], 2)
+        return rows
+    
+    def _summarize(self, groups: List[Dict]) -> Dict:
+        """Add up grouped rows into a report summary."""
+        totals = {metric: sum((group[metric] for group in groups), 0.0) for metric in self.SALES_METRICS}
+        total_bills = int(totals["count"])
+        return {
+            "total_bills": total_bills,
+            "total_subtotal": round(totals["subtotal"], 2),
+            "total_discount": round(totals["discount"], 2),
+            "total_tax": round(totals["tax"], 2),
+            "total_amount": round(totals["total"], 2),
+            "avg_bill_amount": round(totals["total"] / total_bills, 2) if total_bills else 0.0
+        }
+    
+    @staticmethod
+    def _format_group(row: Dict, dimensions: List[str]) -> Dict:
+        """Convert dimension values of a group to JSON-friendly strings."""
+        formatted = dict(row)
+        for dimension in dimensions:
+            value = formatted[dimension]
+            if dimension in ("day", "hour") and value is not None:
+                formatted[dimension] = value.isoformat()
+        formatted["count"] = int(formatted["count"])
+        for metric in ("subtotal", "discount", "tax", "total"):
+            formatted[metric] = round(formatted[metric], 2)
+        return formatted
+    
+    def get_top_products(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: int = 10,
+        order_by: str = "units"
+    ) -> Dict:
+        """
+        Get the best-selling products.
+        
+        Args:
+            start_date: First day in YYYY-MM-DD format (defaults to 29 days before end_date)
+            end_date: Last day in YYYY-MM-DD format (defaults to today)
+            limit: Number of products returned
+            order_by: Rank by "units" sold or "revenue"
+        
+        Returns:
+            Ranked products with units, revenue and number of bills
+        """
+        if order_by not in ("units", "revenue"):
+            raise HTTPException(status_code=400, detail="order_by must be 'units' or 'revenue'")
+        
+        start_date, end_date = self._default_period(start_date, end_date)
+        where_clauses, params = period_range(start_date, end_date).clauses()
+        with get_db(read_only=True) as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                self.TOP_PRODUCTS_QUERY.format(where=" AND ".join(where_clauses), order=order_by),
+                (*params, limit)
+            )
+            rows = cursor.fetchall()
+            cursor.close()
+        
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "order_by": order_by,
+            "products": [self._format_product_row(row) for row in rows]
+        }
+    
+    def get_category_units(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Dict:
+        """
+        Get units sold and revenue per product category.
+        
+        Args:
+            start_date: First day in YYYY-MM-DD format (defaults to 29 days before end_date)
+            end_date: Last day in YYYY-MM-DD format (defaults to today)
+        
+        Returns:
+            Categories ordered by units sold (uncategorized items under None)
+        """
+        start_date, end_date = self._default_period(start_date, end_date)
+        where_clauses, params = period_range(start_date, end_date).clauses()
+        with get_db(read_only=True) as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"""
+                SELECT
+                    t.category_id,
+                    c.name AS category_name,
+                    t.units,
+                    t.revenue
+                FROM (
+                    SELECT category_id, SUM(quantity) AS units, SUM(line_total) AS revenue
+                    FROM bill_items
+                    WHERE {' AND '.join(where_clauses)}
+                    GROUP BY category_id
+                ) t
+                LEFT JOIN categories c ON c.id = t.category_id
+                ORDER BY t.units DESC
+            """, params)
+            rows = cursor.fetchall()
+            cursor.close()
+        
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "categories": [
+                {
+                    "category_id": row['category_id'],
+                    "category_name": row['category_name'] or "Uncategorized",
+                    "units": int(row['units'] or 0),
+                    "revenue": round(float(row['revenue'] or 0), 2)
+                }
+                for row in rows
+            ]
+        }
+    
+    def get_basket_sizes(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Dict:
+        """
+        Get the distribution of basket sizes (units per bill).
+        
+        Args:
+            start_date: First day in YYYY-MM-DD format (defaults to 29 days before end_date)
+            end_date: Last day in YYYY-MM-DD format (defaults to today)
+        
+        Returns:
+            Number of bills per basket size, with average lines and units per bill
+        """
+        start_date, end_date = self._default_period(start_date, end_date)
+        where_clauses, params = period_range(start_date, end_date).clauses()
+        with get_db(read_only=True) as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(f"""
+                SELECT units, COUNT(*) AS bills, SUM(line_count) AS total_lines
+                FROM (
+                    SELECT bill_id, COUNT(*) AS line_count, SUM(quantity) AS units
+                    FROM bill_items
+                    WHERE {' AND '.join(where_clauses)}
+                    GROUP BY bill_id
+                ) b
+                GROUP BY units
+                ORDER BY units
+            """, params)
+            rows = cursor.fetchall()
+            cursor.close()
+        
+        total_bills = sum(row['bills'] for row in rows)
+        total_units = sum(int(row['units']) * row['bills'] for row in rows)
+        total_lines = sum(int(row['total_lines']) for row in rows)
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "total_bills": total_bills,
+            "avg_units_per_bill": round(total_units / total_bills, 2) if total_bills else 0,
+            "avg_lines_per_bill": round(total_lines / total_bills, 2) if total_bills else 0,
+            "distribution": [
+                {"units": int(row['units']), "bills": row['bills']}
+                for row in rows
+            ]
+        }
+    
+    @staticmethod
+    def _default_period(start_date: Optional[str], end_date: Optional[str]):
+        """Default an item report to the 30 days ending on end_date (or today)."""
+        if start_date:
+            return start_date, end_date or datetime.now().strftime('%Y-%m-%d')
+        return trailing_days_range(30, end_date)
+    
+    @staticmethod
+    def _format_product_row(row: Dict) -> Dict:
+        """Convert a top-products row to JSON-friendly types."""
+        return {
+            "barcode": row['barcode'],
+            "product_name": row['product_name'],
+            "units": int(row['units'] or 0),
+            "revenue": round(float(row['revenue'] or 0), 2),
+            "bills": row['bills']
+        }
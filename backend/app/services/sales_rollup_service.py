@@ -0,0 +1,122 @@
+"""Pre-aggregated hourly and daily sales rollups."""
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.core.database import get_db
+from app.core.logging import logger
+from app.utils.date_ranges import parse_day
+
+
+class SalesRollupService:
+    """
+    Maintains the sales_hourly and sales_daily rollup tables.
+    
+    Each rollup row holds counters for one (period, cashier, payment method)
+    bucket. Checkout adds its bill to both tables inside its own transaction,
+    so rollups are exactly as current as the bills table and reports can read
+    them instead of re-aggregating raw bills. A missing cashier is stored as
+    '' because it is part of the primary key.
+    """
+    
+    # Rollup table -> MySQL format truncating created_at to the period start
+    ROLLUPS = {
+        "sales_hourly": "%Y-%m-%d %H:00:00",
+        "sales_daily": "%Y-%m-%d",
+    }
+    
+    @staticmethod
+    def record_bill(
+        cursor,
+        created_at: datetime,
+        cashier_name: Optional[str],
+        payment_method: str,
+        subtotal: float,
+        discount: float,
+        tax: float,
+        total_amount: float
+    ):
+        """
+        Add a bill to the rollups inside the caller's transaction.
+        
+        Args:
+            cursor: Cursor of the open checkout transaction
+            created_at: Bill timestamp (as stored in bills.created_at)
+            cashier_name: Cashier name or None
+            payment_method: Payment method
+            subtotal: Bill subtotal
+            discount: Discount amount
+            tax: Tax amount
+            total_amount: Bill total
+        """
+        periods = {
+            "sales_hourly": created_at.replace(minute=0, second=0, microsecond=0),
+            "sales_daily": created_at.date(),
+        }
+        for table, period_start in periods.items():
+            cursor.execute(f"""
+                INSERT INTO {table}
+                (period_start, cashier_name, payment_method, bill_count, subtotal, discount_amount, tax_amount, total_amount)
+                VALUES (%s, %s, %s, 1, %s, %s, %s, %s) AS new
+                ON DUPLICATE KEY UPDATE
+                    bill_count = {table}.bill_count + 1,
+                    subtotal = {table}.subtotal + new.subtotal,
+                    discount_amount = {table}.discount_amount + new.discount_amount,
+                    tax_amount = {table}.tax_amount + new.tax_amount,
+                    total_amount = {table}.total_amount + new.total_amount
+            """, (period_start, cashier_name or "", payment_method, subtotal, discount, tax, total_amount))
+    
+    def rebuild(self, since: Optional[str] = None) -> Dict[str, int]:
+        """
+        Recompute the rollups from the bills table.
+        
+        Sums over the FLOAT bill columns are cast explicitly, since storing a
+        double into a DECIMAL column raises a truncation note (an error with
+        the pool's raise_on_warnings).
+        
+        Runs as one transaction per rollup table. The INSERT ... SELECT locks
+        the bills it reads and the DELETE locks the rollup rows, so a
+        concurrent checkout waits instead of being counted twice or lost.
+        
+        Args:
+            since: Only rebuild periods from this day on (YYYY-MM-DD); all history if None
+        
+        Returns:
+            Number of rollup rows written per table
+        """
+        start = parse_day(since) if since else None
+        written = {}
+        
+        with get_db() as conn:
+            cursor = conn.cursor()
+            try:
+                for table, period_format in self.ROLLUPS.items():
+                    where = "WHERE created_at >= %s" if start else ""
+                    params = (start,) if start else ()
+                    
+                    cursor.execute(f"DELETE FROM {table} {'WHERE period_start >= %s' if start else ''}", params)
+                    cursor.execute(f"""
+                        INSERT INTO {table}
+                        (period_start, cashier_name, payment_method, bill_count, subtotal, discount_amount, tax_amount, total_amount)
+                        SELECT
+                            DATE_FORMAT(created_at, '{period_format}') AS period,
+                            COALESCE(cashier_name, '') AS cashier,
+                            COALESCE(payment_method, 'cash') AS method,
+                            COUNT(*),
+                            CAST(COALESCE(SUM(subtotal), 0) AS DECIMAL(14, 2)),
+                            CAST(COALESCE(SUM(discount_amount), 0) AS DECIMAL(14, 2)),
+                            CAST(COALESCE(SUM(tax_amount), 0) AS DECIMAL(14, 2)),
+                            CAST(COALESCE(SUM(total_amount), 0) AS DECIMAL(14, 2))
+                        FROM bills
+                        {where}
+                        GROUP BY period, cashier, method
+                    """, params)
+                    written[table] = cursor.rowcount
+                    conn.commit()
+                    logger.info(f"Rebuilt {table}: {cursor.rowcount} row(s)")
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+        
+        return written
@@ -0,0 +1,216 @@
+"""Asynchronous scan jobs run on a dedicated executor."""
+import asyncio
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Optional
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.barcode_service import BarcodeService
+
+
+class ScanJob:
+    """A single scan request and its outcome."""
+    
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    
+    FINAL_STATES = (COMPLETED, FAILED, CANCELLED)
+    
+    def __init__(self, timeout: int):
+        """
+        Initialize the job.
+        
+        Args:
+            timeout: Maximum scan duration in seconds
+        """
+        self.id = uuid.uuid4().hex
+        self.timeout = timeout
+        self.status = self.PENDING
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+    
+    @property
+    def done(self) -> bool:
+        """True once the job reached a final state."""
+        return self.status in self.FINAL_STATES
+    
+    def to_dict(self) -> Dict:
+        """Serialize the job for API responses."""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ScanJobManager:
+    """
+    Runs scans as background jobs so no request waits on the camera.
+    
+    Scans execute on a dedicated, bounded thread pool rather than Starlette's
+    shared threadpool, so slow scans can never starve other routes. Callers
+    wait for results with awaitables (long-poll or SSE) that hold no thread.
+    Finished jobs are kept for settings.SCAN_JOB_TTL seconds.
+    """
+    
+    def __init__(self, max_workers: int = 4, ttl: float = 300.0):
+        """
+        Initialize the job manager.
+        
+        Args:
+            max_workers: Maximum number of scans running at once
+            ttl: Seconds finished jobs remain retrievable
+        """
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scan-job")
+        self._jobs: Dict[str, ScanJob] = {}
+        self._lock = threading.Lock()
+    
+    def submit(self, timeout: Optional[int] = None) -> ScanJob:
+        """
+        Start a scan job.
+        
+        Args:
+            timeout: Maximum scan duration in seconds (defaults to settings.SCANNER_TIMEOUT)
+        
+        Returns:
+            The queued ScanJob
+        """
+        self._purge_expired()
+        job = ScanJob(timeout or settings.SCANNER_TIMEOUT)
+        with self._lock:
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job)
+        logger.info(f"Scan job {job.id} queued")
+        return job
+    
+    def get(self, job_id: str) -> Optional[ScanJob]:
+        """Get a job by id, or None if unknown or expired."""
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def cancel(self, job_id: str) -> Optional[ScanJob]:
+        """
+        Cancel a job.
+        
+        A queued job never starts; a running one unsubscribes from the camera
+        at its next poll (within a quarter of a second) so decoding stops.
+        
+        Args:
+            job_id: Job id
+        
+        Returns:
+            The job, or None if unknown
+        """
+        job = self.get(job_id)
+        if job is None or job.done:
+            return job
+        
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, ScanJob.CANCELLED)
+        logger.info(f"Scan job {job.id} cancelled")
+        return job
+    
+    async def wait(self, job: ScanJob, timeout: float) -> ScanJob:
+        """
+        Wait for a job to finish without holding a thread.
+        
+        Args:
+            job: Job to wait for
+            timeout: Maximum time to wait in seconds
+        
+        Returns:
+            The job (possibly still running if the timeout elapsed)
+        """
+        if job.done or job.future is None or timeout <= 0:
+            return job
+        # asyncio.wait (unlike wait_for) never cancels the scan when the poll times out
+        await asyncio.wait({asyncio.wrap_future(job.future)}, timeout=timeout)
+        return job
+    
+    async def events(self, job: ScanJob, heartbeat: float = 15.0) -> AsyncIterator[str]:
+        """
+        Yield Server-Sent Events for a job until it finishes.
+        
+        Args:
+            job: Job to follow
+            heartbeat: Seconds between keep-alive comments
+        
+        Yields:
+            SSE-formatted messages
+        """
+        yield f"event: status\ndata: {json.dumps(job.to_dict())}\n\n"
+        while not job.done:
+            await self.wait(job, heartbeat)
+            if not job.done:
+                yield ": keep-alive\n\n"
+        yield f"event: {job.status}\ndata: {json.dumps(job.to_dict())}\n\n"
+    
+    def shutdown(self):
+        """Cancel outstanding jobs and stop the executor."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _run(self, job: ScanJob):
+        """Execute a scan on an executor thread."""
+        if job.cancel_event.is_set():
+            self._finish(job, ScanJob.CANCELLED)
+            return
+        
+        job.status = ScanJob.RUNNING
+        try:
+            result = BarcodeService().scan_barcode(timeout=job.timeout, cancel_event=job.cancel_event)
+        except Exception as e:
+            logger.error(f"Scan job {job.id} failed: {e}")
+            self._finish(job, ScanJob.FAILED, error=f"Error scanning barcode: {str(e)}")
+            return
+        
+        if job.cancel_event.is_set():
+            self._finish(job, ScanJob.CANCELLED)
+        elif "error" in result:
+            self._finish(job, ScanJob.FAILED, error=result["error"])
+        else:
+            self._finish(job, ScanJob.COMPLETED, result=result)
+    
+    def _finish(self, job: ScanJob, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        """Record a job's final state."""
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        job.status = status
+    
+    def _purge_expired(self):
+        """Forget finished jobs older than the TTL."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.done and job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+
+# Global scan job manager
+scan_job_manager = ScanJobManager(
+    max_workers=settings.SCANNER_MAX_CONCURRENT_SCANS,
+    ttl=settings.SCAN_JOB_TTL
+)
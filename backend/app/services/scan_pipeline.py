@@ -0,0 +1,260 @@
+"""Threaded capture/decode pipeline for camera barcode scanning."""
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from pyzbar.pyzbar import decode
+
+from app.core.logging import logger
+
+# Queued by the last decode worker to exit, after every detection, so
+# get_barcodes() waiters return as soon as the pipeline has ended
+_CAPTURE_ENDED = None
+
+
+def decode_frame(frame: np.ndarray) -> List[str]:
+    """
+    Decode all barcodes in a frame.
+    
+    Args:
+        frame: Image frame (BGR or grayscale)
+    
+    Returns:
+        List of decoded barcode strings
+    """
+    return [barcode.data.decode("utf-8") for barcode in decode(frame)]
+
+
+class LatestFrameSlot:
+    """
+    Single-slot frame buffer.
+    
+    The capture thread overwrites the slot on every read, so decode workers
+    always pick up the newest frame and stale frames are dropped instead of
+    queueing up behind a slow decoder.
+    """
+    
+    def __init__(self):
+        """Initialize an empty slot."""
+        self._cond = threading.Condition()
+        self._frame: Optional[np.ndarray] = None
+        self._closed = False
+        self.dropped = 0
+    
+    def put(self, frame: np.ndarray):
+        """Store a frame, replacing (and counting) any frame not yet taken."""
+        with self._cond:
+            if self._frame is not None:
+                self.dropped += 1
+            self._frame = frame
+            self._cond.notify()
+    
+    def take(self, timeout: float) -> Optional[np.ndarray]:
+        """
+        Take the newest frame, waiting up to timeout seconds for one.
+        
+        Returns:
+            Frame or None if the slot stayed empty
+        """
+        with self._cond:
+            if self._frame is None and not self._closed:
+                self._cond.wait(timeout)
+            frame, self._frame = self._frame, None
+            return frame
+    
+    def close(self):
+        """Wake up all waiting workers."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class ScanPipeline:
+    """
+    Producer/consumer scan pipeline.
+    
+    One capture thread reads frames from the source into a LatestFrameSlot and
+    a pool of decode workers decodes whatever frame is newest. pyzbar releases
+    the GIL while decoding, so workers decode consecutive frames in parallel.
+    
+    Usage:
+        pipeline = ScanPipeline(cv2.VideoCapture(0), workers=2)
+        pipeline.start()
+        try:
+            barcodes = pipeline.get_barcodes(timeout=1.0)
+        finally:
+            pipeline.stop()
+    """
+    
+    def __init__(
+        self,
+        source,
+        decoder: Callable[[np.ndarray], List[str]] = decode_frame,
+        workers: int = 2,
+        max_pending_results: int = 32,
+        on_frame: Optional[Callable[[np.ndarray], None]] = None
+    ):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            source: Frame source with a cv2.VideoCapture-style read() method
+            decoder: Callable returning decoded barcode strings for a frame
+            workers: Number of decode worker threads
+            max_pending_results: Maximum number of undelivered detections kept
+            on_frame: Optional callback invoked with every captured frame
+        """
+        self._source = source
+        self._decoder = decoder
+        self._on_frame = on_frame
+        self._workers = max(1, workers)
+        self._slot = LatestFrameSlot()
+        self._results: "queue.Queue[List[str]]" = queue.Queue(maxsize=max_pending_results)
+        self._stop_event = threading.Event()
+        self._capture_done = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._stats_lock = threading.Lock()
+        self._latest_frame: Optional[np.ndarray] = None
+        self._workers_running = 0
+        
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.first_detection_at: Optional[float] = None
+        self.frames_captured = 0
+        self.frames_decoded = 0
+    
+    def start(self):
+        """Start the capture thread and decode workers."""
+        self.started_at = time.perf_counter()
+        self._workers_running = self._workers
+        capture_thread = threading.Thread(target=self._capture_loop, name="scan-capture", daemon=True)
+        self._threads.append(capture_thread)
+        for i in range(self._workers):
+            self._threads.append(
+                threading.Thread(target=self._decode_loop, name=f"scan-decode-{i}", daemon=True)
+            )
+        for thread in self._threads:
+            thread.start()
+    
+    def stop(self, timeout: float = 2.0):
+        """Stop all threads and wait for them to exit."""
+        self._stop_event.set()
+        self._slot.close()
+        self.join(timeout)
+    
+    def join(self, timeout: Optional[float] = None):
+        """Wait for the pipeline threads to finish."""
+        for thread in self._threads:
+            thread.join(timeout)
+    
+    @property
+    def finished(self) -> bool:
+        """True once the source is exhausted (or failed) and all workers exited."""
+        return self._capture_done.is_set() and not any(t.is_alive() for t in self._threads[1:])
+    
+    def latest_frame(self) -> Optional[np.ndarray]:
+        """Return the most recently captured frame (for preview)."""
+        return self._latest_frame
+    
+    def get_barcodes(self, timeout: float) -> List[str]:
+        """
+        Wait for the next decoded detection.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+        
+        Returns:
+            List of barcode strings from one frame, or an empty list on
+            timeout or once the pipeline has ended (see error)
+        """
+        try:
+            barcodes = self._results.get(timeout=timeout)
+        except queue.Empty:
+            return []
+        if barcodes is _CAPTURE_ENDED:
+            # Leave the marker for the next waiter
+            self._publish(_CAPTURE_ENDED)
+            return []
+        return barcodes
+    
+    def get_stats(self) -> Dict:
+        """Get pipeline counters."""
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        return {
+            "frames_captured": self.frames_captured,
+            "frames_decoded": self.frames_decoded,
+            "frames_dropped": self._slot.dropped,
+            "decode_fps": self.frames_decoded / elapsed if elapsed > 0 else 0.0,
+            "time_to_first_detection": (
+                self.first_detection_at - self.started_at
+                if self.first_detection_at is not None else None
+            ),
+        }
+    
+    def _capture_loop(self):
+        """Read frames from the source as fast as it delivers them."""
+        try:
+            while not self._stop_event.is_set():
+                ret, frame = self._source.read()
+                if not ret:
+                    if self.frames_captured == 0:
+                        self.error = "Failed to capture image"
+                    else:
+                        self.error = f"Failed to capture image after {self.frames_captured} frame(s)"
+                    logger.warning(self.error)
+                    break
+                self.frames_captured += 1
+                self._latest_frame = frame
+                self._slot.put(frame)
+                if self._on_frame is not None:
+                    self._on_frame(frame)
+        except Exception as e:
+            self.error = f"Error capturing frame: {e}"
+            logger.error(self.error)
+        finally:
+            self._capture_done.set()
+            self._slot.close()
+    
+    def _decode_loop(self):
+        """Decode the newest available frame until stopped or the source ends."""
+        try:
+            while not self._stop_event.is_set():
+                frame = self._slot.take(timeout=0.1)
+                if frame is None:
+                    if self._capture_done.is_set():
+                        break
+                    continue
+                
+                try:
+                    barcodes = self._decoder(frame)
+                except Exception as e:
+                    logger.warning(f"Error decoding frame: {e}")
+                    continue
+                
+                with self._stats_lock:
+                    self.frames_decoded += 1
+                    if barcodes and self.first_detection_at is None:
+                        self.first_detection_at = time.perf_counter()
+                
+                if barcodes:
+                    self._publish(barcodes)
+        finally:
+            with self._stats_lock:
+                self._workers_running -= 1
+                last_worker = self._workers_running == 0
+            if last_worker:
+                self._publish(_CAPTURE_ENDED)
+    
+    def _publish(self, barcodes: Optional[List[str]]):
+        """Queue a detection, discarding the oldest one if nobody is consuming."""
+        while True:
+            try:
+                self._results.put_nowait(barcodes)
+                return
+            except queue.Full:
+                try:
+                    self._results.get_nowait()
+                except queue.Empty:
+                    pass
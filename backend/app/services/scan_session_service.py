@@ -0,0 +1,140 @@
+"""Continuous scan sessions that report every newly detected barcode."""
+import time
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.camera_manager import camera_manager
+from app.services.inventory_service import InventoryService
+
+
+class ScanSession:
+    """
+    A checkout lane's continuous scan session.
+    
+    Detections arrive from the shared camera through a bounded async
+    subscription, so a 30 fps camera can never build an unbounded backlog.
+    A barcode seen again within the dedup window is suppressed before any
+    database work; only new codes are joined with their product row.
+    """
+    
+    def __init__(
+        self,
+        dedup_window: Optional[float] = None,
+        queue_size: Optional[int] = None,
+        inventory_service: Optional[InventoryService] = None
+    ):
+        """
+        Initialize the session.
+        
+        Args:
+            dedup_window: Seconds a repeated barcode is suppressed (defaults to settings)
+            queue_size: Pending detections buffered (defaults to settings)
+            inventory_service: Inventory service used for product lookups
+        """
+        self.id = uuid.uuid4().hex
+        self.dedup_window = settings.SCAN_SESSION_DEDUP_SECONDS if dedup_window is None else dedup_window
+        self.queue_size = queue_size or settings.SCAN_SESSION_QUEUE_SIZE
+        self.inventory_service = inventory_service or InventoryService()
+        self._last_seen: Dict[str, float] = {}
+        self._seq = 0
+        self._suppressed = 0
+        self._subscription = None
+    
+    def is_new(self, barcode: str, now: Optional[float] = None) -> bool:
+        """
+        Check a detection against the dedup window and record it.
+        
+        The window slides: a code held in front of the camera keeps being
+        suppressed until it has been out of view for dedup_window seconds.
+        
+        Args:
+            barcode: Decoded barcode
+            now: Monotonic timestamp (defaults to time.monotonic())
+        
+        Returns:
+            True if the barcode should be reported
+        """
+        now = time.monotonic() if now is None else now
+        last = self._last_seen.get(barcode)
+        self._last_seen[barcode] = now
+        
+        # Forget codes outside the window so the map stays small
+        if len(self._last_seen) > 256:
+            cutoff = now - self.dedup_window
+            self._last_seen = {code: seen for code, seen in self._last_seen.items() if seen >= cutoff}
+        
+        if last is not None and now - last < self.dedup_window:
+            self._suppressed += 1
+            return False
+        return True
+    
+    def reset(self):
+        """Forget seen barcodes so the next detection of any code is reported."""
+        self._last_seen.clear()
+    
+    async def lookup(self, barcode: str) -> Optional[Dict]:
+        """
+        Fetch the product row for a barcode without blocking the event loop.
+        
+        Args:
+            barcode: Decoded barcode
+        
+        Returns:
+            JSON-ready product dictionary, or None if the barcode is unknown
+        """
+        try:
+            product = await run_in_threadpool(self.inventory_service.get_product, barcode)
+        except Exception as e:
+            logger.error(f"Product lookup failed for {barcode}: {e}")
+            return None
+        return jsonable_encoder(product) if product else None
+    
+    async def events(self) -> AsyncIterator[Dict]:
+        """
+        Yield an event for every newly detected barcode until cancelled.
+        
+        Yields:
+            Event dictionaries ("barcode" events, or a final "error")
+        """
+        camera_manager.start()
+        if not await run_in_threadpool(camera_manager.wait_until_open, settings.CAMERA_OPEN_TIMEOUT):
+            yield {"type": "error", "detail": camera_manager.last_error or "Could not open camera"}
+            return
+        
+        with camera_manager.subscribe_async(self.queue_size) as subscription:
+            self._subscription = subscription
+            while True:
+                for barcode in await subscription.get_async(timeout=1.0):
+                    if not self.is_new(barcode):
+                        continue
+                    product = await self.lookup(barcode)
+                    self._seq += 1
+                    logger.info(f"Scan session {self.id}: barcode {barcode}")
+                    yield {
+                        "type": "barcode",
+                        "seq": self._seq,
+                        "barcode": barcode,
+                        "known": product is not None,
+                        "product": product,
+                        "detected_at": datetime.now().isoformat(),
+                    }
+    
+    def get_stats(self) -> Dict:
+        """
+        Get session counters.
+        
+        Returns:
+            Dictionary with events sent, duplicates suppressed and detections dropped
+        """
+        return {
+            "session_id": self.id,
+            "events": self._seq,
+            "duplicates_suppressed": self._suppressed,
+            "detections_dropped": self._subscription.dropped if self._subscription else 0,
+        }
@@ -7,6 +7,7 @@ import uuid
 from app.core.database import get_db
 from app.core.logging import logger
 from app.core.exceptions import UserNotFoundError
+from app.utils.pagination import Page, build_page, decode_cursor, keyset_condition
 
 
 class UserService:
@@ -45,27 +46,34 @@ class UserService:
             cursor.close()
             return user
     
-    def get_all_users(self, page: int = 1, page_size: int = 100) -> List[Dict]:
+    def get_all_users(self, page: int = 1, page_size: int = 100, cursor: Optional[str] = None) -> Page:
         """
-        Get all users with pagination.
+        Get all users with pagination, newest first by (added_at, id).
         
         Args:
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), ignored when a cursor is given
             page_size: Number of items per page
-            
+            cursor: Next-page token from a previous page
+        
         Returns:
-            List of user dictionaries
+            Page of user dictionaries and the next-page token
         """
+        where = ""
+        params = []
+        if cursor:
+            where, params = keyset_condition("added_at", "id", decode_cursor("users", cursor))
+            where = f"WHERE {where}"
+        offset = 0 if cursor else (page - 1) * page_size
+        
         with get_db() as conn:
-            cursor = conn.cursor(dictionary=True)
-            offset = (page - 1) * page_size
-            cursor.execute(
-                "SELECT * FROM users ORDER BY added_at DESC LIMIT %s OFFSET %s",
-                (page_size, offset)
+            db_cursor = conn.cursor(dictionary=True)
+            db_cursor.execute(
+                f"SELECT * FROM users {where} ORDER BY added_at DESC, id DESC LIMIT %s OFFSET %s",
+                (*params, page_size + 1, offset)
             )
-            users = cursor.fetchall()
-            cursor.close()
-            return users
+            users = db_cursor.fetchall()
+            db_cursor.close()
+            return build_page(users, page_size, "users", ("added_at", "id"))
     
     def update_user(self, user_id: str, name: str) -> Dict:
         """Update a user."""
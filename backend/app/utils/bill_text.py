@@ -0,0 +1,52 @@
+"""Parsing of stored bill ticket text."""
+from typing import Dict, List
+
+
+def parse_bill_items(bill_text: str) -> List[Dict]:
+    """
+    Extract the line items from a bill ticket's text.
+    
+    Understands the ticket layout written by BillService.generate_bill
+    ("Product:", "Quantity:", "Price per Unit: ... USD", "Total Price: ... USD"
+    per item). Used to backfill bill_items for bills stored before line
+    items were recorded; lines that cannot be parsed are skipped.
+    
+    Args:
+        bill_text: Bill ticket text
+    
+    Returns:
+        List of dictionaries with product_name, quantity, price and line_total
+    """
+    items = []
+    current = None
+    
+    for line in (bill_text or "").splitlines():
+        key, sep, value = line.partition(": ")
+        if not sep:
+            continue
+        value = value.strip()
+        
+        try:
+            if key == "Product":
+                current = {"product_name": value}
+                items.append(current)
+            elif current is None:
+                continue
+            elif key == "Quantity":
+                current["quantity"] = int(value)
+            elif key == "Price per Unit":
+                current["price"] = float(value.removesuffix(" USD"))
+            elif key == "Total Price":
+                current["line_total"] = float(value.removesuffix(" USD"))
+                current = None
+        except ValueError:
+            current["invalid"] = True
+            current = None
+    
+    parsed = []
+    for item in items:
+        if item.get("invalid") or "quantity" not in item or "price" not in item:
+            continue
+        item.setdefault("line_total", round(item["price"] * item["quantity"], 2))
+        parsed.append(item)
+    return parsed
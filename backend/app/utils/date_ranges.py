@@ -0,0 +1,145 @@
+"""Half-open datetime ranges for filtering rows by calendar period."""
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional, Tuple
+
+from app.core.exceptions import InvalidDateRangeError
+
+DATE_FORMAT = '%Y-%m-%d'
+
+
+class DateRange(NamedTuple):
+    """
+    A [start, end) datetime range; either bound may be open (None).
+    
+    Filtering with `column >= start AND column < end` instead of wrapping
+    the column in DATE(), YEAR() or MONTH() keeps the condition sargable,
+    so MySQL can use an index on the column.
+    """
+    start: Optional[datetime]
+    end: Optional[datetime]
+    
+    def clauses(self, column: str = "created_at") -> Tuple[List[str], List[datetime]]:
+        """
+        Build WHERE conditions for the range.
+        
+        Args:
+            column: Datetime column to filter
+        
+        Returns:
+            (conditions, params) to AND into a WHERE clause
+        """
+        conditions = []
+        params = []
+        if self.start is not None:
+            conditions.append(f"{column} >= %s")
+            params.append(self.start)
+        if self.end is not None:
+            conditions.append(f"{column} < %s")
+            params.append(self.end)
+        return conditions, params
+
+
+def parse_day(value: str) -> datetime:
+    """
+    Parse a YYYY-MM-DD day.
+    
+    Args:
+        value: Day string
+    
+    Returns:
+        Midnight at the start of that day
+    
+    Raises:
+        InvalidDateRangeError: If the value is not a valid day
+    """
+    try:
+        return datetime.strptime(value, DATE_FORMAT)
+    except (TypeError, ValueError):
+        raise InvalidDateRangeError(f"Invalid date: {value!r}")
+
+
+def period_range(start_date: Optional[str] = None, end_date: Optional[str] = None) -> DateRange:
+    """
+    Range covering the inclusive days start_date..end_date.
+    
+    Args:
+        start_date: First day (YYYY-MM-DD), or None for no lower bound
+        end_date: Last day (YYYY-MM-DD), or None for no upper bound
+    
+    Returns:
+        Half-open range ending at midnight after end_date
+    
+    Raises:
+        InvalidDateRangeError: If a day is invalid or start_date is after end_date
+    """
+    start = parse_day(start_date) if start_date else None
+    end = parse_day(end_date) + timedelta(days=1) if end_date else None
+    if start is not None and end is not None and start >= end:
+        raise InvalidDateRangeError(f"Start date {start_date} is after end date {end_date}")
+    return DateRange(start, end)
+
+
+def day_range(day: str) -> DateRange:
+    """
+    Range covering one day.
+    
+    Args:
+        day: Day (YYYY-MM-DD)
+    
+    Returns:
+        Half-open range for that day
+    """
+    return period_range(day, day)
+
+
+def week_range(week_start: str) -> DateRange:
+    """
+    Range covering the seven days starting at week_start.
+    
+    Args:
+        week_start: First day of the week (YYYY-MM-DD)
+    
+    Returns:
+        Half-open range for the week
+    """
+    start = parse_day(week_start)
+    return DateRange(start, start + timedelta(days=7))
+
+
+def month_range(year: int, month: int) -> DateRange:
+    """
+    Range covering a calendar month.
+    
+    Args:
+        year: Year
+        month: Month (1-12)
+    
+    Returns:
+        Half-open range from the first of the month to the first of the next
+    
+    Raises:
+        InvalidDateRangeError: If the month is invalid
+    """
+    try:
+        start = datetime(year, month, 1)
+    except ValueError:
+        raise InvalidDateRangeError(f"Invalid month: {year}-{month}")
+    if month == 12:
+        return DateRange(start, datetime(year + 1, 1, 1))
+    return DateRange(start, datetime(year, month + 1, 1))
+
+
+def trailing_days_range(days: int, end_date: Optional[str] = None) -> Tuple[str, str]:
+    """
+    First and last day of the `days` days ending on end_date.
+    
+    Args:
+        days: Number of days in the period
+        end_date: Last day (YYYY-MM-DD), defaults to today
+    
+    Returns:
+        (start_date, end_date) as YYYY-MM-DD strings
+    """
+    end = parse_day(end_date) if end_date else datetime.now()
+    start = end - timedelta(days=days - 1)
+    return start.strftime(DATE_FORMAT), end.strftime(DATE_FORMAT)
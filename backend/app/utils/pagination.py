@@ -0,0 +1,113 @@
+"""Keyset (cursor) pagination helpers."""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.core.exceptions import InvalidCursorError
+
+# Response header carrying the next-page token (list bodies stay unchanged)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Page(NamedTuple):
+    """One page of rows and the token for the next one (None on the last page)."""
+    items: List[Dict]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(scope: str, values: Sequence[Any]) -> str:
+    """
+    Build an opaque page token from the sort key of the last row.
+    
+    Args:
+        scope: Listing the token belongs to (rejects tokens from other listings)
+        values: Sort key values (datetimes, strings or numbers)
+    
+    Returns:
+        URL-safe token
+    """
+    key = [{"dt": value.isoformat()} if isinstance(value, datetime) else value for value in values]
+    payload = json.dumps({"s": scope, "k": key}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(scope: str, token: str, size: int = 2) -> List[Any]:
+    """
+    Read the sort key back from a page token.
+    
+    Args:
+        scope: Listing the token must belong to
+        token: Token from encode_cursor
+        size: Number of sort key values expected
+    
+    Returns:
+        Sort key values
+    
+    Raises:
+        InvalidCursorError: If the token is malformed or from another listing
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if payload["s"] != scope or len(payload["k"]) != size:
+            raise ValueError("cursor does not match this listing")
+        return [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in payload["k"]
+        ]
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid page cursor: {e}")
+
+
+def keyset_condition(sort_column: str, tie_column: str, values: Sequence[Any]) -> Tuple[str, List[Any]]:
+    """
+    WHERE condition selecting the rows after a cursor.
+    
+    For listings ordered by `sort_column DESC, tie_column DESC`, where
+    tie_column is unique and NOT NULL. MySQL sorts NULLs last in descending
+    order, so rows with a NULL sort value follow every non-NULL one. The
+    condition is spelled out as ORs of plain comparisons so the range
+    optimizer can seek an index on (sort_column, tie_column) instead of
+    skipping rows like OFFSET does.
+    
+    Args:
+        sort_column: Primary sort column (nullable)
+        tie_column: Unique tiebreaker column
+        values: (sort value, tie value) of the last row already returned
+    
+    Returns:
+        (condition, params) to AND into a WHERE clause
+    """
+    sort_value, tie_value = values
+    if sort_value is None:
+        return f"({sort_column} IS NULL AND {tie_column} < %s)", [tie_value]
+    return (
+        f"({sort_column} < %s OR ({sort_column} = %s AND {tie_column} < %s) OR {sort_column} IS NULL)",
+        [sort_value, sort_value, tie_value]
+    )
+
+
+def set_next_cursor(response, page: Page):
+    """Expose a page's next-page token on the response, if there is one."""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+
+
+def build_page(rows: List[Dict], page_size: int, scope: str, key: Sequence[str]) -> Page:
+    """
+    Trim a query result fetched with LIMIT page_size + 1 into a page.
+    
+    Args:
+        rows: Rows in listing order, at most page_size + 1
+        page_size: Rows per page
+        scope: Listing name for the next-page token
+        key: Row fields forming the sort key
+    
+    Returns:
+        Page with a next-page token if more rows exist
+    """
+    if len(rows) <= page_size:
+        return Page(rows, None)
+    rows = rows[:page_size]
+    return Page(rows, encode_cursor(scope, [rows[-1][field] for field in key]))
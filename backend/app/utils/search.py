@@ -0,0 +1,59 @@
+"""Helpers for building product search queries."""
+import re
+from typing import Optional
+
+# MySQL's default ngram_token_size: the FULLTEXT index on product_name
+# stores every 2-character substring of the name
+NGRAM_TOKEN_SIZE = 2
+
+# Characters with a meaning in boolean-mode MATCH ... AGAINST
+_BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]+')
+
+# Search text that may be the start of a barcode
+_BARCODE_PREFIX = re.compile(r'^[A-Za-z0-9\-_]*[0-9][A-Za-z0-9\-_]*$')
+
+
+def build_fulltext_query(text: str) -> Optional[str]:
+    """
+    Turn free search text into a boolean-mode query for the ngram index.
+    
+    Every term is required. A term of at least NGRAM_TOKEN_SIZE characters
+    is searched as a phrase of its ngrams, i.e. as a substring of the name
+    (which also covers prefixes); a shorter term matches ngrams starting
+    with it.
+    
+    Args:
+        text: Search text as typed by the user
+    
+    Returns:
+        Boolean-mode query, or None if the text has no searchable terms
+    """
+    terms = _BOOLEAN_OPERATORS.sub(" ", text).split()
+    parts = [f'+"{term}"' if len(term) >= NGRAM_TOKEN_SIZE else f"+{term}*" for term in terms]
+    return " ".join(parts) or None
+
+
+def escape_like(value: str) -> str:
+    """
+    Escape LIKE wildcards so a value matches literally.
+    
+    Args:
+        value: Literal text
+    
+    Returns:
+        Text safe to embed in a LIKE pattern
+    """
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def is_barcode_prefix(text: str) -> bool:
+    """
+    Check whether search text could be the start of a barcode.
+    
+    Args:
+        text: Stripped search text
+    
+    Returns:
+        True for a single token of barcode characters with at least one digit
+    """
+    return bool(_BARCODE_PREFIX.match(text))
@@ -0,0 +1,144 @@
+"""Load test: sync (threadpool + mysql.connector) vs async (aiomysql) routes.
+
+Serves a small comparison app with uvicorn in a subprocess (one worker, so
+both variants share one event loop) and drives it with --concurrency
+clients, each sending requests back to back for --duration seconds:
+
+    sync:   def routes on Starlette's threadpool, calling CartService /
+            InventoryService on the mysql.connector pool (DB_POOL_SIZE)
+    async:  async def routes calling AsyncCartService /
+            AsyncInventoryService on the aiomysql pool (ASYNC_DB_POOL_MAX_SIZE)
+
+Endpoints are the cart listing and a product's stock history (an uncached
+indexed read). Failed requests (e.g. "pool exhausted" on the sync pool)
+are counted separately and left out of the latency figures.
+
+Usage (from backend/):
+    python -m benchmarks.bench_async_routes
+    python -m benchmarks.bench_async_routes --concurrency 50,200 --duration 20 --barcode 0000000000001
+"""
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.async_database import async_pool
+from app.services.cart_service import AsyncCartService, CartService
+from app.services.inventory_service import AsyncInventoryService, InventoryService
+
+app = FastAPI()
+
+
+@app.on_event("startup")
+async def startup():
+    """Open the async pool inside the server's event loop."""
+    await async_pool.open()
+
+
+@app.get("/sync/cart")
+def sync_cart():
+    """Cart listing through the sync service."""
+    return len(CartService().get_all_cart_items())
+
+
+@app.get("/async/cart")
+async def async_cart():
+    """Cart listing through the async service."""
+    return len(await AsyncCartService().get_all_cart_items())
+
+
+@app.get("/sync/stock-history/{barcode}")
+def sync_stock_history(barcode: str):
+    """Stock history page through the sync service."""
+    return len(InventoryService().get_stock_history(barcode).items)
+
+
+@app.get("/async/stock-history/{barcode}")
+async def async_stock_history(barcode: str):
+    """Stock history page through the async service."""
+    return len((await AsyncInventoryService().get_stock_history(barcode)).items)
+
+
+async def run_load(base_url: str, path: str, concurrency: int, duration: float) -> Dict:
+    """Send requests from `concurrency` clients for `duration` seconds."""
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client(http: httpx.AsyncClient):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await http.get(path)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) if latencies else float("nan"),
+        "p99": latencies[int(len(latencies) * 0.99)] if latencies else float("nan"),
+        "errors": errors,
+    }
+
+
+def wait_for_server(base_url: str, timeout: float = 30):
+    """Poll until the server answers."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(f"{base_url}/docs", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("Benchmark server did not start")
+
+
+def main():
+    """Run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="50,200,1000", help="Comma-separated client counts")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per run")
+    parser.add_argument("--barcode", default="0000000000001", help="Product whose stock history is read")
+    parser.add_argument("--port", type=int, default=8765, help="Port of the benchmark server")
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "benchmarks.bench_async_routes:app",
+        "--port", str(args.port), "--log-level", "warning", "--backlog", "4096"
+    ])
+    try:
+        wait_for_server(base_url)
+        for endpoint in ("cart", f"stock-history/{args.barcode}"):
+            print(endpoint)
+            for concurrency in (int(value) for value in args.concurrency.split(",")):
+                for mode in ("sync", "async"):
+                    result = asyncio.run(run_load(base_url, f"/{mode}/{endpoint}", concurrency, args.duration))
+                    print(f"  {mode:<5} clients={concurrency:>5}  {result['rps']:>8.0f} req/s  "
+                          f"p50={result['p50']:>8.1f} ms  p99={result['p99']:>8.1f} ms  errors={result['errors']}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Benchmark: statements per cart add and adds per second under concurrency.
+
+Compares the previous add path (SELECT ... FOR UPDATE on cart, SELECT on
+products, UPDATE or INSERT, SELECT to re-read) with CartService.add_product's
+single upsert. Statements are counted from the server's global 'Questions'
+counter, so run it against an otherwise idle database.
+
+Creates products with barcodes starting with BENCH and removes them (and
+their cart lines) afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.bench_cart_add
+    python -m benchmarks.bench_cart_add --adds 2000 --threads 8 --products 4
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from app.core.database import get_db
+from app.services.cart_service import CartService
+
+PREFIX = "BENCH"
+
+
+def legacy_add(barcode: str, product_data: Dict) -> Dict:
+    """The statement sequence the cart add path used before the upsert."""
+    quantity = product_data.get("quantity") or 1
+    with get_db() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT * FROM cart WHERE barcode = %s FOR UPDATE", (barcode,))
+        cart_item = cursor.fetchone()
+        cursor.execute("SELECT * FROM products WHERE barcode = %s", (barcode,))
+        product = cursor.fetchone()
+        if cart_item:
+            if product["quantity"] < cart_item["quantity"] + quantity:
+                raise ValueError("Insufficient inventory")
+            cursor.execute(
+                "UPDATE cart SET product_name = %s, price = %s, quantity = %s, details = %s, timestamp = %s "
+                "WHERE barcode = %s",
+                (product_data["product_name"], product_data["price"], cart_item["quantity"] + quantity,
+                 product_data["details"], datetime.utcnow(), barcode)
+            )
+        else:
+            if product["quantity"] < quantity:
+                raise ValueError("Insufficient inventory")
+            cursor.execute(
+                "INSERT INTO cart (barcode, product_name, price, quantity, details, timestamp) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                (barcode, product_data["product_name"], product_data["price"], quantity,
+                 product_data["details"], datetime.utcnow())
+            )
+        conn.commit()
+        cursor.execute("SELECT * FROM cart WHERE barcode = %s", (barcode,))
+        row = cursor.fetchone()
+        cursor.close()
+        return row
+
+
+def questions() -> int:
+    """Server-wide count of statements executed so far."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SHOW GLOBAL STATUS LIKE 'Questions'")
+        value = int(cursor.fetchone()[1])
+        cursor.close()
+        return value
+
+
+def setup(products: int) -> List[str]:
+    """Create benchmark products with plenty of stock and an empty cart."""
+    barcodes = [f"{PREFIX}{i:08d}" for i in range(products)]
+    with get_db() as conn:
+        cursor = conn.cursor()
+        for barcode in barcodes:
+            cursor.execute(
+                "INSERT INTO products (barcode, product_name, price, quantity, details) "
+                "VALUES (%s, 'Bench product', 1.0, 100000000, 'benchmark') AS new "
+                "ON DUPLICATE KEY UPDATE quantity = new.quantity",
+                (barcode,)
+            )
+        cursor.execute("DELETE FROM cart WHERE barcode LIKE %s", (f"{PREFIX}%",))
+        conn.commit()
+        cursor.close()
+    return barcodes
+
+
+def teardown():
+    """Remove benchmark rows."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM cart WHERE barcode LIKE %s", (f"{PREFIX}%",))
+        cursor.execute("DELETE FROM products WHERE barcode LIKE %s", (f"{PREFIX}%",))
+        conn.commit()
+        cursor.close()
+
+
+def run(name: str, add: Callable[[str, Dict], Dict], barcodes: List[str], args) -> None:
+    """Measure statements per add (serial) and adds per second (concurrent)."""
+    product_data = {"product_name": "Bench product", "price": 1.0, "quantity": 1, "details": "benchmark"}
+    setup(len(barcodes))
+
+    serial = min(args.adds, 200)
+    before = questions()
+    for i in range(serial):
+        add(barcodes[i % len(barcodes)], product_data)
+    # One statement of the delta is the second SHOW STATUS itself
+    statements = (questions() - before - 1) / serial
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(lambda i: add(barcodes[i % len(barcodes)], product_data), range(args.adds)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{name:<8} statements/add={statements:>5.2f}  adds/s={args.adds / elapsed:>8.1f}  "
+          f"({args.adds} adds, {args.threads} threads, {len(barcodes)} barcodes)")
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--adds", type=int, default=1000, help="Adds per concurrent run")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent clients (keep <= DB_POOL_SIZE)")
+    parser.add_argument("--products", type=int, default=8, help="Distinct barcodes added")
+    args = parser.parse_args()
+
+    barcodes = [f"{PREFIX}{i:08d}" for i in range(args.products)]
+    try:
+        run("legacy", legacy_add, barcodes, args)
+        run("upsert", CartService().add_product, barcodes, args)
+    finally:
+        teardown()
+
+
+if __name__ == "__main__":
+    main()
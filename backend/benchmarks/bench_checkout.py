@@ -0,0 +1,99 @@
+"""Benchmark: checkout (BillService.generate_bill) latency vs basket size.
+
+Fills the cart with N benchmark products and times generate_bill, counting
+the statements it executes from the server's global 'Questions' counter
+(run against an otherwise idle database). With set-based inventory
+decrements both numbers should stay flat as the basket grows, and since
+ticket files and PDFs are rendered by the background worker, checkout
+latency contains no filesystem or PDF time.
+
+Refuses to run if the cart already holds non-benchmark items. Benchmark
+products, bills, render jobs and ticket files are removed afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.bench_checkout
+    python -m benchmarks.bench_checkout --sizes 1,10,60,200 --repeat 10
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import List
+
+from app.core.database import get_db
+from app.services.bill_service import BillService
+from benchmarks.bench_cart_add import PREFIX, questions
+
+
+def fill_cart(size: int):
+    """Create `size` benchmark products and put one of each in the cart."""
+    rows = [(f"{PREFIX}{i:08d}",) for i in range(size)]
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            "INSERT INTO products (barcode, product_name, price, quantity, details) "
+            "VALUES (%s, 'Bench product', 1.0, 1000000, 'benchmark') AS new "
+            "ON DUPLICATE KEY UPDATE quantity = new.quantity",
+            rows
+        )
+        cursor.executemany(
+            "INSERT INTO cart (barcode, product_name, price, quantity, details) "
+            "VALUES (%s, 'Bench product', 1.0, 1, 'benchmark')",
+            rows
+        )
+        conn.commit()
+        cursor.close()
+
+
+def cleanup(bills: List[dict]):
+    """Remove benchmark bills, ticket files and products."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        for bill in bills:
+            cursor.execute("DELETE FROM bill_render_jobs WHERE bill_id = %s", (bill["bill_id"],))
+            cursor.execute("DELETE FROM bills WHERE id = %s", (bill["bill_id"],))
+        cursor.execute("DELETE FROM cart WHERE barcode LIKE %s", (f"{PREFIX}%",))
+        cursor.execute("DELETE FROM products WHERE barcode LIKE %s", (f"{PREFIX}%",))
+        conn.commit()
+        cursor.close()
+    for bill in bills:
+        path = Path(bill["file_path"])
+        path.unlink(missing_ok=True)
+        path.with_suffix(".pdf").unlink(missing_ok=True)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1,10,30,60,120", help="Comma-separated basket sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="Checkouts per basket size")
+    args = parser.parse_args()
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM cart WHERE barcode NOT LIKE %s", (f"{PREFIX}%",))
+        if cursor.fetchone()[0]:
+            raise SystemExit("Cart is not empty; refusing to run the checkout benchmark")
+        cursor.close()
+
+    service = BillService()
+    bills = []
+    try:
+        for size in (int(value) for value in args.sizes.split(",") if value):
+            latencies = []
+            statements = []
+            for _ in range(args.repeat):
+                fill_cart(size)
+                before = questions()
+                start = time.perf_counter()
+                bills.append(service.generate_bill(cashier_name="bench"))
+                latencies.append((time.perf_counter() - start) * 1000)
+                statements.append(questions() - before - 1)
+            print(f"basket={size:>4}  median={statistics.median(latencies):>8.2f} ms  "
+                  f"max={max(latencies):>8.2f} ms  statements={statistics.median(statements):>5.0f}")
+    finally:
+        cleanup(bills)
+
+
+if __name__ == "__main__":
+    main()
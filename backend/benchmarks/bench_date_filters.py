@@ -0,0 +1,143 @@
+"""Benchmark: function-wrapped vs half-open date filters on a large bills table.
+
+Builds a synthetic copy of the bills table (bench_bills, same columns and
+indexes via CREATE TABLE ... LIKE) with --rows bills spread over two years,
+then times the report queries both ways:
+
+    old: DATE(created_at) = %s / YEAR(...) = %s AND MONTH(...) = %s
+    new: created_at >= %s AND created_at < %s   (app.utils.date_ranges)
+
+and prints the index MySQL chose for each. Filling 10M rows takes a few
+minutes and roughly 2 GB; the table is kept for re-runs unless --drop is given.
+
+Usage (from backend/):
+    python -m benchmarks.bench_date_filters
+    python -m benchmarks.bench_date_filters --rows 1000000 --repeat 3 --drop
+"""
+import argparse
+import statistics
+import time
+from typing import List, Tuple
+
+from app.core.database import get_db
+from app.utils.date_ranges import day_range, month_range, period_range
+
+TABLE = "bench_bills"
+CASHIERS = ("alice", "bob", "carol", "dave", "erin", "frank", "grace", "heidi")
+CHUNK = 1_000_000
+
+
+def build_table(rows: int):
+    """Create and fill bench_bills unless it already holds `rows` rows."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        # Existence is checked up front: the pool raises on the note that
+        # CREATE TABLE IF NOT EXISTS emits for an existing table
+        cursor.execute(
+            "SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (TABLE,)
+        )
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(f"CREATE TABLE {TABLE} LIKE bills")
+        cursor.execute(f"SELECT COUNT(*) FROM {TABLE}")
+        if cursor.fetchone()[0] == rows:
+            print(f"Reusing {TABLE} ({rows} rows)")
+            cursor.close()
+            return
+
+        print(f"Filling {TABLE} with {rows} rows...")
+        cursor.execute(f"TRUNCATE TABLE {TABLE}")
+        cursor.execute("CREATE TEMPORARY TABLE bench_digits (d INT PRIMARY KEY)")
+        conn.mark_session_dirty()
+        cursor.executemany("INSERT INTO bench_digits VALUES (%s)", [(d,) for d in range(10)])
+
+        # Six cross-joined digit tables produce one million numbers per chunk
+        numbers = " + ".join(f"d{i}.d * {10 ** i}" for i in range(6))
+        sources = ", ".join(f"bench_digits d{i}" for i in range(6))
+        cashier_list = ", ".join(f"'{name}'" for name in CASHIERS)
+        span_seconds = 2 * 365 * 24 * 3600
+        for offset in range(0, rows, CHUNK):
+            start = time.perf_counter()
+            cursor.execute(f"""
+                INSERT INTO {TABLE}
+                (bill_text, cashier_name, total_amount, subtotal, discount_amount, tax_amount, payment_method, created_at)
+                SELECT 'bench', ELT(1 + n % {len(CASHIERS)}, {cashier_list}),
+                       10 + n % 90, 10 + n % 90, 0, 0,
+                       ELT(1 + n % 3, 'cash', 'card', 'mobile'),
+                       TIMESTAMP('2023-01-01') + INTERVAL FLOOR(n * {span_seconds} / {rows}) SECOND
+                FROM (SELECT {offset} + {numbers} AS n FROM {sources}) t
+                WHERE n < {rows}
+            """)
+            conn.commit()
+            print(f"  {min(offset + CHUNK, rows):>10} rows ({time.perf_counter() - start:.1f}s)")
+        cursor.execute(f"ANALYZE TABLE {TABLE}")
+        cursor.fetchall()
+        cursor.close()
+
+
+def time_query(sql: str, params: List, repeat: int) -> Tuple[float, str, int]:
+    """Run a query `repeat` times; return median ms, chosen index and result."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"EXPLAIN {sql}", params)
+        columns = [column[0] for column in cursor.description]
+        plan = dict(zip(columns, cursor.fetchone()))
+
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cursor.execute(sql, params)
+            result = cursor.fetchone()[0]
+            latencies.append((time.perf_counter() - start) * 1000)
+        cursor.close()
+    return statistics.median(latencies), plan.get("key") or "(full scan)", result
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Synthetic bills")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query")
+    parser.add_argument("--drop", action="store_true", help="Drop the synthetic table afterwards")
+    args = parser.parse_args()
+
+    build_table(args.rows)
+    select = f"SELECT COUNT(*), SUM(total_amount) FROM {TABLE} WHERE "
+
+    def half_open(period, extra="", extra_params=()):
+        clauses, params = period.clauses()
+        return select + " AND ".join(clauses) + extra, params + list(extra_params)
+
+    cases = [
+        ("day",
+         (select + "DATE(created_at) = %s", ["2024-06-15"]),
+         half_open(day_range("2024-06-15"))),
+        ("month",
+         (select + "YEAR(created_at) = %s AND MONTH(created_at) = %s", [2024, 6]),
+         half_open(month_range(2024, 6))),
+        ("week+cashier",
+         (select + "DATE(created_at) >= %s AND DATE(created_at) <= %s AND cashier_name = %s",
+          ["2024-06-10", "2024-06-16", "alice"]),
+         half_open(period_range("2024-06-10", "2024-06-16"), " AND cashier_name = %s", ["alice"])),
+        ("day+payment",
+         (select + "DATE(created_at) = %s AND payment_method = %s", ["2024-06-15", "card"]),
+         half_open(day_range("2024-06-15"), " AND payment_method = %s", ["card"])),
+    ]
+
+    try:
+        for name, (old_sql, old_params), (new_sql, new_params) in cases:
+            old_ms, old_key, old_count = time_query(old_sql, old_params, args.repeat)
+            new_ms, new_key, new_count = time_query(new_sql, new_params, args.repeat)
+            assert old_count == new_count, f"{name}: {old_count} != {new_count}"
+            print(f"{name:<13} rows={new_count:>8}  old={old_ms:>9.1f} ms [{old_key}]  "
+                  f"new={new_ms:>7.1f} ms [{new_key}]  speedup={old_ms / max(new_ms, 0.001):>7.1f}x")
+    finally:
+        if args.drop:
+            with get_db() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"DROP TABLE {TABLE}")
+                cursor.close()
+
+
+if __name__ == "__main__":
+    main()
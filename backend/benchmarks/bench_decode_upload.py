@@ -0,0 +1,171 @@
+"""Benchmark: uploaded image decode throughput and latency.
+
+Decodes a corpus of encoded JPEG/PNG images the way POST /scan/decode does
+(np.frombuffer + cv2.imdecode, pyzbar in a process pool) and reports
+throughput per core and p50/p99 request latency. A single-process run is
+included as the baseline.
+
+With --url the same corpus is posted to a running server instead, as raw
+image bodies with --concurrency requests in flight.
+
+Usage (from backend/):
+    python -m benchmarks.bench_decode_upload
+    python -m benchmarks.bench_decode_upload --images 400 --processes 4 --per-request 4
+    python -m benchmarks.bench_decode_upload --url http://127.0.0.1:8000/api/v1/scan/decode
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.image_decode_service import ImageDecodeService, decode_image_bytes
+from benchmarks.corpus import encoded_corpus
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: List[float], elapsed: float, images: int, correct: int, cores: int) -> Dict:
+    """Build a result dictionary from raw measurements."""
+    throughput = images / elapsed
+    return {
+        "images": images,
+        "correct": correct,
+        "throughput": throughput,
+        "per_core": throughput / cores,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def count_correct(expected: List[Optional[str]], results: List[Dict]) -> int:
+    """Count images whose decoded barcodes match the expected code."""
+    correct = 0
+    for code, result in zip(expected, results):
+        barcodes = result.get("barcodes") or []
+        if (code is None and not barcodes) or (code is not None and code in barcodes):
+            correct += 1
+    return correct
+
+
+def run_single_process(corpus: List[Tuple[Optional[str], bytes]]) -> Dict:
+    """Baseline: decode every image in this process, one at a time."""
+    latencies = []
+    results = []
+    start = time.perf_counter()
+    for _, data in corpus:
+        request_start = time.perf_counter()
+        results.append(decode_image_bytes(data))
+        latencies.append(time.perf_counter() - request_start)
+    elapsed = time.perf_counter() - start
+    correct = count_correct([code for code, _ in corpus], results)
+    return summarize(latencies, elapsed, len(corpus), correct, 1)
+
+
+async def run_pool(corpus: List[Tuple[Optional[str], bytes]], args) -> Dict:
+    """Decode through ImageDecodeService with concurrent requests."""
+    service = ImageDecodeService()
+    requests = [corpus[i:i + args.per_request] for i in range(0, len(corpus), args.per_request)]
+
+    # Start the workers before timing so spawn cost is not measured
+    await asyncio.gather(*(
+        service.decode_images([(None, corpus[0][1])]) for _ in range(settings.SCANNER_DECODE_PROCESSES * 2)
+    ))
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    results: List[Dict] = []
+
+    async def one_request(batch):
+        async with semaphore:
+            request_start = time.perf_counter()
+            decoded = await service.decode_images([(None, data) for _, data in batch])
+            latencies.append(time.perf_counter() - request_start)
+            return decoded
+
+    start = time.perf_counter()
+    for decoded in await asyncio.gather(*(one_request(batch) for batch in requests)):
+        results.extend(decoded)
+    elapsed = time.perf_counter() - start
+    ImageDecodeService.shutdown_pool()
+
+    correct = count_correct([code for code, _ in corpus], results)
+    result = summarize(latencies, elapsed, len(corpus), correct, settings.SCANNER_DECODE_PROCESSES)
+    result["requests"] = len(requests)
+    return result
+
+
+async def run_http(corpus: List[Tuple[Optional[str], bytes]], args) -> Dict:
+    """Post every image to a running server as a raw image body."""
+    import httpx
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    content_type = "image/png" if args.format == "png" else "image/jpeg"
+
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        async def one_request(data: bytes) -> Dict:
+            async with semaphore:
+                request_start = time.perf_counter()
+                response = await client.post(args.url, content=data, headers={"Content-Type": content_type})
+                latencies.append(time.perf_counter() - request_start)
+                response.raise_for_status()
+                return response.json()["results"][0]
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(one_request(data) for _, data in corpus))
+        elapsed = time.perf_counter() - start
+
+    correct = count_correct([code for code, _ in corpus], results)
+    return summarize(latencies, elapsed, len(corpus), correct, args.server_cores)
+
+
+def format_result(name: str, result: Dict) -> str:
+    """Format one benchmark result line."""
+    return (
+        f"{name:<24} images={result['images']:>5}  correct={result['correct']:>5}  "
+        f"img/s={result['throughput']:>7.1f}  img/s/core={result['per_core']:>6.1f}  "
+        f"p50={result['p50_ms']:>7.1f} ms  p99={result['p99_ms']:>7.1f} ms"
+    )
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=200, help="Corpus size")
+    parser.add_argument("--format", choices=("jpg", "png"), default="jpg", help="Corpus image encoding")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Decode process pool size")
+    parser.add_argument("--batch-size", type=int, default=settings.SCANNER_DECODE_BATCH_SIZE,
+                        help="Images per pool task")
+    parser.add_argument("--per-request", type=int, default=1, help="Images uploaded per request")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight")
+    parser.add_argument("--url", help="Benchmark a running server's /scan/decode endpoint instead")
+    parser.add_argument("--server-cores", type=int, default=os.cpu_count() or 1,
+                        help="Cores available to the server (for img/s/core with --url)")
+    args = parser.parse_args()
+
+    corpus = list(encoded_corpus(args.images, ext=f".{args.format}"))
+    print(f"Corpus: {len(corpus)} {args.format.upper()} images, "
+          f"{sum(len(data) for _, data in corpus) / len(corpus) / 1024:.0f} KiB average")
+
+    if args.url:
+        print(format_result(f"http/c{args.concurrency}", asyncio.run(run_http(corpus, args))))
+        return
+
+    settings.SCANNER_DECODE_PROCESSES = args.processes
+    settings.SCANNER_DECODE_BATCH_SIZE = args.batch_size
+    print(format_result("single-process", run_single_process(corpus)))
+    print(format_result(
+        f"pool/p{args.processes}/b{args.batch_size}/r{args.per_request}",
+        asyncio.run(run_pool(corpus, args))
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark: OFFSET vs keyset (cursor) pagination, page 1 vs a deep page.
+
+Reuses the synthetic bench_bills table of bench_date_filters (same columns
+and indexes as bills) and times the bill listing query both ways:
+
+    offset: ORDER BY created_at DESC, id DESC LIMIT n OFFSET (page - 1) * n
+    keyset: WHERE (created_at, id) after the cursor ... LIMIT n
+            (app.utils.pagination.keyset_condition)
+
+The cursor for the deep page is taken from the last row of the page before
+it, exactly as a client following X-Next-Cursor would hold it. Page 10,000
+at the default page size needs at least 1M rows.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pagination
+    python -m benchmarks.bench_pagination --rows 2000000 --page 10000 --page-size 100
+"""
+import argparse
+import statistics
+import time
+from typing import List, Tuple
+
+from app.core.database import get_db
+from app.utils.pagination import keyset_condition
+from benchmarks.bench_date_filters import TABLE, build_table
+
+SELECT = f"SELECT id, created_at, total_amount FROM {TABLE}"
+ORDER = "ORDER BY created_at DESC, id DESC"
+
+
+def time_query(sql: str, params: List, repeat: int) -> Tuple[float, List]:
+    """Run a query `repeat` times; return median ms and the rows."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            latencies.append((time.perf_counter() - start) * 1000)
+        cursor.close()
+    return statistics.median(latencies), rows
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Synthetic bills")
+    parser.add_argument("--page", type=int, default=10_000, help="Deep page number")
+    parser.add_argument("--page-size", type=int, default=100, help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query")
+    args = parser.parse_args()
+
+    if (args.page - 1) * args.page_size >= args.rows:
+        parser.error("--page is past the end of the table; raise --rows")
+    build_table(args.rows)
+
+    offset_sql = f"{SELECT} {ORDER} LIMIT %s OFFSET %s"
+    # The row just before the deep page is what the previous page's cursor points at
+    _, previous = time_query(offset_sql, [1, (args.page - 1) * args.page_size - 1], 1)
+
+    for page in (1, args.page):
+        offset_ms, offset_rows = time_query(offset_sql, [args.page_size, (page - 1) * args.page_size], args.repeat)
+        if page == 1:
+            keyset_sql, keyset_params = f"{SELECT} {ORDER} LIMIT %s", [args.page_size]
+        else:
+            last_id, last_created_at = previous[0][0], previous[0][1]
+            condition, keyset_params = keyset_condition("created_at", "id", [last_created_at, last_id])
+            keyset_sql = f"{SELECT} WHERE {condition} {ORDER} LIMIT %s"
+            keyset_params.append(args.page_size)
+        keyset_ms, keyset_rows = time_query(keyset_sql, keyset_params, args.repeat)
+        assert offset_rows == keyset_rows, f"page {page}: keyset rows differ from offset rows"
+        print(f"page {page:>7}  offset={offset_ms:>9.1f} ms  keyset={keyset_ms:>7.1f} ms  "
+              f"speedup={offset_ms / max(keyset_ms, 0.001):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
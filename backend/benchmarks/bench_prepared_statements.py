@@ -0,0 +1,142 @@
+"""Benchmark: parse cost saved by server-side prepared statements.
+
+Runs the hot statements of the scan path (product lookup by barcode) and
+the cart path (CartService's add upsert) on one pooled connection, first as
+client-side interpolated text (COM_QUERY: parsed on every call) and then
+through PooledConnection.execute_prepared (prepared once, then only
+COM_STMT_EXECUTE). The difference of the mean latencies is the per-request
+cost saved. mysql.connector also sends a COM_STMT_RESET before every
+prepared execution; that round trip is included in the prepared figures.
+
+The session's Com_stmt_prepare counter is read after each prepared run to
+show that the statement was parsed once, not per call. Cart upserts are
+rolled back, so every call does the same work.
+
+Creates products with barcodes starting with BENCH and removes them afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.bench_prepared_statements
+    python -m benchmarks.bench_prepared_statements --calls 20000
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from app.core.database import get_db
+from app.services.cart_service import CartService
+from app.services.inventory_service import InventoryService
+
+PREFIX = "BENCH"
+
+
+def setup(products: int) -> List[str]:
+    """Create benchmark products with plenty of stock."""
+    barcodes = [f"{PREFIX}{i:08d}" for i in range(products)]
+    with get_db() as conn:
+        cursor = conn.cursor()
+        for barcode in barcodes:
+            cursor.execute(
+                "INSERT INTO products (barcode, product_name, price, quantity, details) "
+                "VALUES (%s, 'Bench product', 1.0, 100000000, 'benchmark') AS new "
+                "ON DUPLICATE KEY UPDATE quantity = new.quantity",
+                (barcode,)
+            )
+        cursor.execute("DELETE FROM cart WHERE barcode LIKE %s", (f"{PREFIX}%",))
+        conn.commit()
+        cursor.close()
+    return barcodes
+
+
+def teardown():
+    """Remove benchmark rows."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM cart WHERE barcode LIKE %s", (f"{PREFIX}%",))
+        cursor.execute("DELETE FROM products WHERE barcode LIKE %s", (f"{PREFIX}%",))
+        conn.commit()
+        cursor.close()
+
+
+def session_prepares(conn) -> int:
+    """Statements prepared so far on this connection's session."""
+    cursor = conn.cursor()
+    cursor.execute("SHOW SESSION STATUS LIKE 'Com_stmt_prepare'")
+    value = int(cursor.fetchone()[1])
+    cursor.close()
+    return value
+
+
+def measure(call: Callable[[int], None], calls: int) -> List[float]:
+    """Time individual calls in microseconds."""
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        call(i)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+def report(path: str, results: Dict[str, List[float]], prepares: int):
+    """Print both variants of a path and the cost saved per request."""
+    for name, latencies in results.items():
+        latencies = sorted(latencies)
+        print(f"  {name:<8} mean={statistics.mean(latencies):>8.1f} us  "
+              f"p50={latencies[len(latencies) // 2]:>8.1f} us  p99={latencies[int(len(latencies) * 0.99)]:>8.1f} us")
+    saved = statistics.mean(results["text"]) - statistics.mean(results["prepared"])
+    print(f"  {path}: {saved:.1f} us saved per request; "
+          f"{prepares} COM_STMT_PREPARE for {len(results['prepared'])} prepared calls")
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=5000, help="Calls per variant")
+    parser.add_argument("--products", type=int, default=20, help="Distinct barcodes used")
+    args = parser.parse_args()
+
+    barcodes = setup(args.products)
+    lookup = InventoryService.PRODUCT_BY_BARCODE
+    upsert = CartService.ADD_PRODUCT_UPSERT
+
+    def upsert_params(i: int):
+        barcode = barcodes[i % len(barcodes)]
+        return ("Bench product", 1.0, 1, "benchmark", datetime.utcnow().replace(microsecond=0), barcode, 1)
+
+    try:
+        with get_db() as conn:
+            def text_lookup(i: int):
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute(lookup, (barcodes[i % len(barcodes)],))
+                cursor.fetchall()
+                cursor.close()
+
+            def prepared_lookup(i: int):
+                conn.execute_prepared(lookup, (barcodes[i % len(barcodes)],), dictionary=True).fetchall()
+
+            def text_upsert(i: int):
+                cursor = conn.cursor()
+                cursor.execute(upsert, upsert_params(i))
+                cursor.close()
+                conn.rollback()
+
+            def prepared_upsert(i: int):
+                conn.execute_prepared(upsert, upsert_params(i))
+                conn.rollback()
+
+            for path, text_call, prepared_call in (
+                ("scan", text_lookup, prepared_lookup),
+                ("cart", text_upsert, prepared_upsert),
+            ):
+                print(f"{path} path ({args.calls} calls)")
+                text = measure(text_call, args.calls)
+                before = session_prepares(conn)
+                prepared = measure(prepared_call, args.calls)
+                report(path, {"text": text, "prepared": prepared}, session_prepares(conn) - before)
+    finally:
+        teardown()
+
+
+if __name__ == "__main__":
+    main()
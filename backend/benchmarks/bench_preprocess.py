@@ -0,0 +1,55 @@
+"""Benchmark: per-frame decode latency vs camera resolution, per preprocessor.
+
+Decodes the same synthetic scene at increasing resolutions with the
+full-frame decoder ("none") and the region preprocessor ("regions"), and
+prints mean/p95 latency, detection rate and the per-stage breakdown.
+
+Usage (from backend/):
+    python -m benchmarks.bench_preprocess
+    python -m benchmarks.bench_preprocess --frames 100 --resolutions 1280x720,3840x2160
+"""
+import argparse
+import statistics
+import time
+
+from app.services.barcode_decoder import create_decoder
+from benchmarks.corpus import synthetic_frames
+
+
+def parse_resolutions(value: str):
+    """Parse a comma-separated list of WIDTHxHEIGHT values."""
+    return [tuple(int(part) for part in item.lower().split("x")) for item in value.split(",") if item]
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=50, help="Frames per resolution")
+    parser.add_argument("--resolutions", default="640x480,1280x720,1920x1080,3840x2160")
+    parser.add_argument("--empty-ratio", type=float, default=0.3, help="Fraction of frames without a barcode")
+    args = parser.parse_args()
+
+    print(f"{'resolution':<11} {'preprocess':<9} {'mean_ms':>8} {'p95_ms':>8} {'detected':>9}  stages (avg ms)")
+    for width, height in parse_resolutions(args.resolutions):
+        frames = synthetic_frames(args.frames, int(args.frames * args.empty_ratio), (width, height))
+        for name in ("none", "regions"):
+            decoder = create_decoder(name)
+            latencies = []
+            detected = 0
+            for frame in frames:
+                start = time.perf_counter()
+                if decoder.decode(frame):
+                    detected += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            stages = decoder.get_stats()["stages"]
+            breakdown = " ".join(f"{stage}={data['avg_ms']:.2f}" for stage, data in stages.items() if data["calls"])
+            print(
+                f"{width}x{height:<6} {name:<9} {statistics.mean(latencies):>8.2f} {p95:>8.2f} "
+                f"{detected:>4}/{len(frames):<4}  {breakdown}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark: bulk product import throughput vs one add_product call per row.
+
+Generates a CSV catalogue of --rows benchmark products in memory and feeds
+it to ProductImport in 64 KiB chunks, as the streaming endpoint does, first
+as new products and then again as updates (so every row also writes stock
+history). For comparison, --baseline rows go through
+InventoryService.add_product one by one, as a client without the bulk
+endpoint would.
+
+Benchmark products (barcodes starting with BENCH) are removed afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.bench_product_import
+    python -m benchmarks.bench_product_import --rows 500000 --batch-size 2000 --baseline 0
+"""
+import argparse
+import time
+
+from app.core.database import get_db
+from app.services.inventory_service import InventoryService
+from app.services.product_import_service import ProductImport
+from benchmarks.bench_cart_add import PREFIX
+
+CHUNK_BYTES = 64 * 1024
+
+
+def make_csv(rows: int, quantity: int) -> bytes:
+    """Build a CSV catalogue of benchmark products."""
+    lines = ["barcode,product_name,price,quantity,details"]
+    lines.extend(
+        f"{PREFIX}{i:09d},Bench product {i},{1 + i % 100}.99,{quantity},benchmark"
+        for i in range(rows)
+    )
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def run_import(body: bytes, batch_size: int) -> dict:
+    """Feed a CSV body through ProductImport chunk by chunk; return its report."""
+    product_import = ProductImport("csv", batch_size=batch_size)
+    for start in range(0, len(body), CHUNK_BYTES):
+        for batch in product_import.feed(body[start:start + CHUNK_BYTES]):
+            product_import.write_batch(batch)
+    for batch in product_import.finish():
+        product_import.write_batch(batch)
+    return product_import.report()
+
+
+def cleanup():
+    """Remove benchmark products (their stock history cascades)."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM products WHERE barcode LIKE %s", (f"{PREFIX}%",))
+        conn.commit()
+        cursor.close()
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000, help="Products imported")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per upsert")
+    parser.add_argument("--baseline", type=int, default=2000, help="Products added one by one for comparison (0 skips)")
+    args = parser.parse_args()
+
+    cleanup()
+    try:
+        for label, quantity in (("insert", 10), ("update", 20)):
+            body = make_csv(args.rows, quantity)
+            start = time.perf_counter()
+            report = run_import(body, args.batch_size)
+            elapsed = time.perf_counter() - start
+            assert report["failed"] == 0, report["errors"][:5]
+            print(f"bulk {label:<7} rows={report['rows']:>8}  {elapsed:>7.2f} s  "
+                  f"{report['rows'] / elapsed:>9.0f} rows/s  "
+                  f"(inserted={report['inserted']}, updated={report['updated']})")
+        cleanup()
+
+        if args.baseline:
+            service = InventoryService()
+            start = time.perf_counter()
+            for i in range(args.baseline):
+                service.add_product(f"{PREFIX}{i:09d}", {
+                    "product_name": f"Bench product {i}", "price": 1.99, "quantity": 10, "details": "benchmark"
+                })
+            elapsed = time.perf_counter() - start
+            print(f"add_product     rows={args.baseline:>8}  {elapsed:>7.2f} s  {args.baseline / elapsed:>9.0f} rows/s")
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark: scan-to-product lookup latency with and without the product cache.
+
+Looks up the same barcodes repeatedly through InventoryService.get_product,
+first with the cache cleared before every call (one pooled connection and
+one SELECT per lookup, as before) and then with a warm cache.
+
+Requires the configured MySQL database (reads the .env like the API does).
+
+Usage (from backend/):
+    python -m benchmarks.bench_product_lookup
+    python -m benchmarks.bench_product_lookup --lookups 20000 --products 50
+"""
+import argparse
+import statistics
+import time
+from typing import List
+
+from app.core.database import get_db
+from app.services.inventory_service import InventoryService, product_cache
+
+
+def sample_barcodes(count: int) -> List[str]:
+    """Pick existing barcodes to look up (plus one unknown code)."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT barcode FROM products ORDER BY barcode LIMIT %s", (count,))
+        barcodes = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+    return barcodes + ["0000000000000"]
+
+
+def measure(service: InventoryService, barcodes: List[str], lookups: int, cold: bool) -> List[float]:
+    """Time individual lookups in microseconds."""
+    latencies = []
+    for i in range(lookups):
+        barcode = barcodes[i % len(barcodes)]
+        if cold:
+            product_cache.clear()
+        start = time.perf_counter()
+        service.get_product(barcode)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+def format_result(name: str, latencies: List[float]) -> str:
+    """Format one benchmark result line."""
+    latencies = sorted(latencies)
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    return (
+        f"{name:<8} lookups={len(latencies):>6}  mean={statistics.mean(latencies):>9.1f} us  "
+        f"p50={latencies[len(latencies) // 2]:>9.1f} us  p99={p99:>9.1f} us"
+    )
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=5000, help="Lookups per run")
+    parser.add_argument("--products", type=int, default=20, help="Distinct barcodes looked up")
+    args = parser.parse_args()
+
+    service = InventoryService()
+    barcodes = sample_barcodes(args.products)
+    print(f"Looking up {len(barcodes)} distinct barcodes")
+
+    print(format_result("cold", measure(service, barcodes, min(args.lookups, 2000), cold=True)))
+    product_cache.clear()
+    measure(service, barcodes, len(barcodes), cold=False)
+    print(format_result("warm", measure(service, barcodes, args.lookups, cold=False)))
+    print(f"cache: {product_cache.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
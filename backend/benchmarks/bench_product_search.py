@@ -0,0 +1,149 @@
+"""Benchmark: product search with LIKE '%term%' vs the ngram FULLTEXT index.
+
+Builds a synthetic copy of the products table (bench_products, same columns
+and indexes via CREATE TABLE ... LIKE, including ft_product_name) with
+--rows products named from brand/item/variant word lists, then times:
+
+    old:    product_name LIKE '%term%' ORDER BY product_name LIMIT 20
+    new:    MATCH(product_name) AGAINST (... IN BOOLEAN MODE), ranked as
+            InventoryService.search_products does
+    prefix: barcode LIKE 'prefix%' (primary key range)
+
+Filling 1M rows takes a few minutes (the FULLTEXT index is built as rows
+are inserted); the table is kept for re-runs unless --drop is given.
+
+Usage (from backend/):
+    python -m benchmarks.bench_product_search
+    python -m benchmarks.bench_product_search --rows 100000 --repeat 10 --drop
+"""
+import argparse
+import statistics
+import time
+from typing import List, Tuple
+
+from app.core.database import get_db
+from app.utils.search import build_fulltext_query, escape_like
+
+TABLE = "bench_products"
+BRANDS = ("Acme", "Bolt", "Crisp", "Delta", "Evergreen", "Fjord", "Golden", "Harbor", "Ivy", "Juniper")
+ITEMS = ("Cola", "Orange Juice", "Sparkling Water", "Potato Chips", "Dark Chocolate",
+         "Green Tea", "Peanut Butter", "Oat Cookies", "Tomato Soup", "Espresso Beans")
+VARIANTS = ("Classic", "Light", "Zero", "Family Pack", "Mini", "Organic", "Spicy", "Vanilla", "Lemon", "Extra")
+CHUNK = 1_000_000
+SEARCHES = ("cola", "choc", "organic tea", "family pack chips", "z", "harbor espresso")
+
+
+def word_list(words) -> str:
+    """Format words as ELT() arguments."""
+    return ", ".join("'" + word + "'" for word in words)
+
+
+def build_table(rows: int):
+    """Create and fill bench_products unless it already holds `rows` rows."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (TABLE,)
+        )
+        if cursor.fetchone()[0] == 0:
+            # Same stopword setting as the products index (see db_init)
+            cursor.execute("SET SESSION innodb_ft_enable_stopword = OFF")
+            conn.mark_session_dirty()
+            cursor.execute(f"CREATE TABLE {TABLE} LIKE products")
+        cursor.execute(f"SELECT COUNT(*) FROM {TABLE}")
+        if cursor.fetchone()[0] == rows:
+            print(f"Reusing {TABLE} ({rows} rows)")
+            cursor.close()
+            return
+
+        print(f"Filling {TABLE} with {rows} rows...")
+        cursor.execute(f"TRUNCATE TABLE {TABLE}")
+        cursor.execute("CREATE TEMPORARY TABLE bench_digits (d INT PRIMARY KEY)")
+        conn.mark_session_dirty()
+        cursor.executemany("INSERT INTO bench_digits VALUES (%s)", [(d,) for d in range(10)])
+
+        # Six cross-joined digit tables produce one million numbers per chunk
+        numbers = " + ".join(f"d{i}.d * {10 ** i}" for i in range(6))
+        sources = ", ".join(f"bench_digits d{i}" for i in range(6))
+        for offset in range(0, rows, CHUNK):
+            start = time.perf_counter()
+            cursor.execute(f"""
+                INSERT INTO {TABLE} (barcode, product_name, price, quantity, details)
+                SELECT LPAD(n, 13, '0'),
+                       CONCAT_WS(' ', ELT(1 + n % 10, {word_list(BRANDS)}),
+                                      ELT(1 + FLOOR(n / 10) % 10, {word_list(ITEMS)}),
+                                      ELT(1 + FLOOR(n / 100) % 10, {word_list(VARIANTS)}),
+                                      n),
+                       1 + n % 50, n % 100, 'bench'
+                FROM (SELECT {offset} + {numbers} AS n FROM {sources}) t
+                WHERE n < {rows}
+            """)
+            conn.commit()
+            print(f"  {min(offset + CHUNK, rows):>10} rows ({time.perf_counter() - start:.1f}s)")
+        cursor.execute(f"ANALYZE TABLE {TABLE}")
+        cursor.fetchall()
+        cursor.close()
+
+
+def time_query(sql: str, params: List, repeat: int) -> Tuple[float, int]:
+    """Run a query `repeat` times; return median ms and the number of rows."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            latencies.append((time.perf_counter() - start) * 1000)
+        cursor.close()
+    return statistics.median(latencies), len(rows)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic products")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query")
+    parser.add_argument("--limit", type=int, default=20, help="Results per search")
+    parser.add_argument("--drop", action="store_true", help="Drop the synthetic table afterwards")
+    args = parser.parse_args()
+
+    build_table(args.rows)
+    like_sql = f"SELECT barcode FROM {TABLE} WHERE product_name LIKE %s ORDER BY product_name LIMIT %s"
+    match_sql = f"""
+        SELECT barcode,
+            product_name LIKE %s AS is_prefix,
+            MATCH(product_name) AGAINST (%s IN BOOLEAN MODE) AS relevance
+        FROM {TABLE}
+        WHERE MATCH(product_name) AGAINST (%s IN BOOLEAN MODE)
+        ORDER BY is_prefix DESC, relevance DESC, product_name
+        LIMIT %s
+    """
+
+    try:
+        for text in SEARCHES:
+            like_pattern = f"%{escape_like(text)}%"  # as the old get_all_products search
+            fulltext_query = build_fulltext_query(text)
+            old_ms, old_rows = time_query(like_sql, [like_pattern, args.limit], args.repeat)
+            new_ms, new_rows = time_query(
+                match_sql, [f"{escape_like(text)}%", fulltext_query, fulltext_query, args.limit], args.repeat
+            )
+            print(f"{text!r:<22} old={old_ms:>9.1f} ms ({old_rows:>3})  new={new_ms:>7.1f} ms ({new_rows:>3})  "
+                  f"speedup={old_ms / max(new_ms, 0.001):>7.1f}x")
+
+        prefix_ms, prefix_rows = time_query(
+            f"SELECT barcode FROM {TABLE} WHERE barcode LIKE %s ORDER BY barcode LIMIT %s",
+            ["00000000012%", args.limit], args.repeat
+        )
+        print(f"{'barcode 00000000012...':<22} prefix={prefix_ms:>6.1f} ms ({prefix_rows:>3})")
+    finally:
+        if args.drop:
+            with get_db() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"DROP TABLE {TABLE}")
+                cursor.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Benchmark: sequential scan loop vs threaded ScanPipeline.
+
+Replays recorded frames through a simulated camera that delivers frames at a
+fixed rate into a small FIFO driver buffer (like V4L2/DirectShow do). A slow
+consumer therefore reads stale buffered frames, which is exactly what the old
+read -> decode -> imshow loop suffered from.
+
+Reports frames decoded per second and time to first detection, measured from
+the moment the first frame containing a barcode was delivered by the camera.
+
+Usage (from backend/):
+    python -m benchmarks.bench_scan_pipeline
+    python -m benchmarks.bench_scan_pipeline --frames recorded_frames/ --workers 4
+"""
+import argparse
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.services.barcode_decoder import create_decoder
+from app.services.scan_pipeline import ScanPipeline, decode_frame
+from benchmarks.corpus import load_frames, synthetic_frames
+
+
+class ReplayCamera:
+    """cv2.VideoCapture stand-in that replays frames at a fixed frame rate."""
+
+    def __init__(self, frames: List[np.ndarray], fps: float, buffer_size: int, first_barcode_at: Optional[int]):
+        """
+        Initialize the replay camera.
+
+        Args:
+            frames: Frames to replay
+            fps: Delivery rate in frames per second
+            buffer_size: Driver buffer depth; new frames are dropped when full
+            first_barcode_at: Index of the first frame with a barcode (if known)
+        """
+        self._frames = frames
+        self._interval = 1.0 / fps
+        self._buffer: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize=buffer_size)
+        self._first_barcode_at = first_barcode_at
+        self.started_at: Optional[float] = None
+        self.barcode_delivered_at: Optional[float] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """Start delivering frames."""
+        self.started_at = time.perf_counter()
+        self._thread.start()
+
+    def _run(self):
+        """Deliver frames at the configured rate, dropping them when the buffer is full."""
+        for index, frame in enumerate(self._frames):
+            target = self.started_at + index * self._interval
+            delay = target - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if index == self._first_barcode_at:
+                self.barcode_delivered_at = time.perf_counter()
+            try:
+                self._buffer.put_nowait(frame)
+            except queue.Full:
+                pass
+        self._buffer.put(None)
+
+    def read(self):
+        """Return the oldest buffered frame, blocking like a real device."""
+        frame = self._buffer.get()
+        if frame is None:
+            self._buffer.put(None)
+            return False, None
+        return True, frame
+
+    def detection_reference(self) -> float:
+        """Time origin for time-to-first-detection."""
+        return self.barcode_delivered_at or self.started_at
+
+
+def run_sequential(frames: List[np.ndarray], args) -> Dict:
+    """Old behaviour: read and decode in the same loop."""
+    camera = ReplayCamera(frames, args.fps, args.buffer_size, args.first_barcode_at)
+    decoded = 0
+    first_detection = None
+    camera.start()
+    while True:
+        ret, frame = camera.read()
+        if not ret:
+            break
+        barcodes = decode_frame(frame)
+        decoded += 1
+        if barcodes and first_detection is None:
+            first_detection = time.perf_counter()
+    elapsed = time.perf_counter() - camera.started_at
+    return {
+        "frames_decoded": decoded,
+        "decode_fps": decoded / elapsed,
+        "time_to_first_detection": (
+            first_detection - camera.detection_reference() if first_detection else None
+        ),
+    }
+
+
+def run_pipeline(frames: List[np.ndarray], args) -> Dict:
+    """New behaviour: capture thread + decode worker pool."""
+    camera = ReplayCamera(frames, args.fps, args.buffer_size, args.first_barcode_at)
+    decoder = create_decoder(args.preprocess)
+    pipeline = ScanPipeline(camera, decoder=decoder.decode, workers=args.workers)
+    camera.start()
+    pipeline.start()
+    pipeline.join()
+    stats = pipeline.get_stats()
+    first_detection = pipeline.first_detection_at
+    return {
+        "frames_decoded": stats["frames_decoded"],
+        "decode_fps": stats["decode_fps"],
+        "frames_dropped": stats["frames_dropped"],
+        "time_to_first_detection": (
+            first_detection - camera.detection_reference() if first_detection else None
+        ),
+    }
+
+
+def format_result(name: str, result: Dict) -> str:
+    """Format one benchmark result line."""
+    ttfd = result["time_to_first_detection"]
+    ttfd_text = f"{ttfd * 1000:.1f} ms" if ttfd is not None else "not detected"
+    return (
+        f"{name:<20} decoded={result['frames_decoded']:>5}  "
+        f"decode_fps={result['decode_fps']:>7.1f}  first_detection={ttfd_text}"
+    )
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=Path, help="Directory of recorded frames or a video file")
+    parser.add_argument("--count", type=int, default=300, help="Synthetic frame count")
+    parser.add_argument("--first-barcode-at", type=int, default=60, help="Index of the first barcode frame")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--fps", type=float, default=30.0, help="Simulated camera frame rate")
+    parser.add_argument("--buffer-size", type=int, default=4, help="Simulated driver buffer depth")
+    parser.add_argument("--workers", type=int, default=2, help="Pipeline decode workers")
+    parser.add_argument("--preprocess", default="regions", help="Pipeline preprocessor (regions or none)")
+    args = parser.parse_args()
+
+    if args.frames:
+        frames = load_frames(args.frames)
+        args.first_barcode_at = None
+        print(f"Replaying {len(frames)} recorded frames from {args.frames}")
+    else:
+        frames = synthetic_frames(args.count, args.first_barcode_at, (args.width, args.height))
+        print(f"Replaying {len(frames)} synthetic {args.width}x{args.height} frames "
+              f"(barcode from frame {args.first_barcode_at})")
+
+    print(format_result("sequential", run_sequential(frames, args)))
+    print(format_result(f"pipeline/{args.workers}/{args.preprocess}", run_pipeline(frames, args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Synthetic barcode image corpus used by the benchmarks.
+
+Frames are generated deterministically so benchmark runs are comparable
+between machines without shipping binary fixtures. A directory of real
+recorded frames (or a video file) can be used instead wherever a
+benchmark accepts ``--frames``.
+"""
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+import random
+
+import cv2
+import numpy as np
+
+
+# EAN-13 digit encodings (1 = bar, 0 = space)
+_L_CODES = ["0001101", "0011001", "0010011", "0111101", "0100011",
+            "0110001", "0101111", "0111011", "0110111", "0001011"]
+_G_CODES = ["0100111", "0110011", "0011011", "0100001", "0011101",
+            "0111001", "0000101", "0010001", "0001001", "0010111"]
+_R_CODES = ["1110010", "1100110", "1101100", "1000010", "1011100",
+            "1001110", "1010000", "1000100", "1001000", "1110100"]
+_PARITY = ["LLLLLL", "LLGLGG", "LLGGLG", "LLGGGL", "LGLLGG",
+           "LGGLLG", "LGGGLL", "LGLGLG", "LGLGGL", "LGGLGL"]
+
+DEFAULT_RESOLUTION = (1280, 720)
+CORPUS_RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080)]
+
+
+def ean13_checksum(digits: str) -> str:
+    """Return the check digit for a 12-digit EAN-13 payload."""
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits[:12]))
+    return str((10 - total % 10) % 10)
+
+
+def make_ean13(seed: int) -> str:
+    """Build a valid 13-digit EAN code from an integer seed."""
+    payload = f"{400000000000 + seed % 10 ** 11:012d}"
+    return payload + ean13_checksum(payload)
+
+
+def render_ean13(code: str, module_px: int = 3, height: int = 160) -> np.ndarray:
+    """
+    Render an EAN-13 barcode as a grayscale image.
+
+    Args:
+        code: 13-digit EAN code
+        module_px: Width of a single bar module in pixels
+        height: Bar height in pixels
+
+    Returns:
+        Grayscale uint8 image (white background, black bars)
+    """
+    parity = _PARITY[int(code[0])]
+    bits = "101"
+    for i, digit in enumerate(code[1:7]):
+        table = _L_CODES if parity[i] == "L" else _G_CODES
+        bits += table[int(digit)]
+    bits += "01010"
+    for digit in code[7:]:
+        bits += _R_CODES[int(digit)]
+    bits += "101"
+
+    quiet = 11 * module_px
+    row = np.repeat(np.array([0 if b == "1" else 255 for b in bits], dtype=np.uint8), module_px)
+    row = np.concatenate([np.full(quiet, 255, np.uint8), row, np.full(quiet, 255, np.uint8)])
+    image = np.tile(row, (height, 1))
+    return cv2.copyMakeBorder(image, 20, 20, 0, 0, cv2.BORDER_CONSTANT, value=255)
+
+
+def make_frame(
+    code: Optional[str],
+    resolution: Tuple[int, int] = DEFAULT_RESOLUTION,
+    rng: Optional[random.Random] = None
+) -> np.ndarray:
+    """
+    Build a camera-like BGR frame, optionally containing a barcode.
+
+    Args:
+        code: EAN-13 code to draw, or None for an empty scene
+        resolution: Frame (width, height)
+        rng: Random source for placement and noise
+
+    Returns:
+        BGR uint8 frame
+    """
+    rng = rng or random.Random(0)
+    width, height = resolution
+    np_rng = np.random.default_rng(rng.randrange(2 ** 32))
+    frame = np_rng.normal(110, 18, (height, width)).clip(0, 255).astype(np.uint8)
+
+    if code:
+        barcode = render_ean13(code)
+        bh, bw = barcode.shape
+        scale = min(1.0, (width * 0.6) / bw, (height * 0.6) / bh)
+        if scale < 1.0:
+            barcode = cv2.resize(barcode, (int(bw * scale), int(bh * scale)), interpolation=cv2.INTER_AREA)
+            bh, bw = barcode.shape
+        x = rng.randrange(0, max(1, width - bw))
+        y = rng.randrange(0, max(1, height - bh))
+        frame[y:y + bh, x:x + bw] = barcode
+
+    frame = cv2.GaussianBlur(frame, (3, 3), 0)
+    return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+
+
+def synthetic_frames(
+    count: int,
+    first_barcode_at: int = 0,
+    resolution: Tuple[int, int] = DEFAULT_RESOLUTION,
+    seed: int = 42
+) -> List[np.ndarray]:
+    """
+    Generate a sequence of frames where a barcode appears from a given index.
+
+    Args:
+        count: Number of frames
+        first_barcode_at: Index of the first frame containing a barcode
+        resolution: Frame (width, height)
+        seed: Random seed
+
+    Returns:
+        List of BGR frames
+    """
+    rng = random.Random(seed)
+    code = make_ean13(seed)
+    return [
+        make_frame(code if i >= first_barcode_at else None, resolution, rng)
+        for i in range(count)
+    ]
+
+
+def encoded_corpus(
+    count: int,
+    seed: int = 7,
+    ext: str = ".jpg",
+    empty_ratio: float = 0.1
+) -> Iterator[Tuple[Optional[str], bytes]]:
+    """
+    Generate encoded still images like those uploaded by handheld clients.
+
+    Args:
+        count: Number of images
+        seed: Random seed
+        ext: Image encoding (".jpg" or ".png")
+        empty_ratio: Fraction of images without a barcode
+
+    Yields:
+        (expected EAN-13 code or None, encoded image bytes)
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        code = None if rng.random() < empty_ratio else make_ean13(seed + i)
+        frame = make_frame(code, rng.choice(CORPUS_RESOLUTIONS), rng)
+        ok, buffer = cv2.imencode(ext, frame)
+        if ok:
+            yield code, buffer.tobytes()
+
+
+def load_frames(path: Path, limit: Optional[int] = None) -> List[np.ndarray]:
+    """
+    Load recorded frames from a directory of images or a video file.
+
+    Args:
+        path: Directory of .jpg/.png frames (sorted by name) or a video file
+        limit: Optional maximum number of frames
+
+    Returns:
+        List of BGR frames
+    """
+    frames: List[np.ndarray] = []
+    if path.is_dir():
+        for image_path in sorted(path.iterdir()):
+            if image_path.suffix.lower() not in (".jpg", ".jpeg", ".png", ".bmp"):
+                continue
+            frame = cv2.imread(str(image_path), cv2.IMREAD_COLOR)
+            if frame is not None:
+                frames.append(frame)
+            if limit and len(frames) >= limit:
+                break
+        return frames
+
+    cap = cv2.VideoCapture(str(path))
+    try:
+        while not limit or len(frames) < limit:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+    finally:
+        cap.release()
+    return frames
+
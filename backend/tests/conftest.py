@@ -1,8 +1,9 @@
 """Pytest configuration and fixtures."""
+import asyncio
 import pytest
 import os
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
-from app.main import app
 
 
 # Set test environment variables before importing app modules
@@ -13,9 +14,161 @@ os.environ.setdefault("DEBUG", "True")
 os.environ.setdefault("ALLOWED_ORIGINS", "*")
 
 
+class FakeCursor:
+    """
+    mysql.connector cursor double.
+
+    Statements are recorded on the connection and passed to its handler,
+    which answers them by setting rows, rowcount or lastrowid on the cursor.
+    """
+
+    def __init__(self, conn, **options):
+        self.conn = conn
+        self.options = options
+        self.rowcount = -1
+        self.lastrowid = None
+        self.rows = []
+        self.closed = False
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append((" ".join(sql.split()), params))
+        self.rows = []
+        if self.conn.handler:
+            self.conn.handler(self, sql, params)
+
+    def executemany(self, sql, rows):
+        self.conn.statements.append((" ".join(sql.split()), rows))
+        self.rowcount = len(rows)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def fetchmany(self, size):
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        return chunk
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    """
+    mysql.connector connection double, as handed out by get_db or opened by a pool.
+
+    Counts commits, rollbacks and session resets; a broken connection
+    fails its reset like a lost one.
+    """
+
+    def __init__(self, handler=None):
+        """
+        Initialize the connection.
+
+        Args:
+            handler: Called as handler(cursor, sql, params) for every executed statement
+        """
+        self.handler = handler
+        self.statements = []
+        self.cursors = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.resets = 0
+        self.connection_id = 1
+        self.in_transaction = False
+        self.session_dirty = False
+        self.consumed = False
+        self.broken = False
+        self.disconnected = False
+
+    def cursor(self, **options):
+        cursor = FakeCursor(self, **options)
+        self.cursors.append(cursor)
+        return cursor
+
+    def execute_prepared(self, sql, params=(), dictionary=False):
+        cursor = self.cursor(prepared=True, dictionary=dictionary)
+        cursor.execute(sql, params)
+        return cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def mark_session_dirty(self):
+        self.session_dirty = True
+
+    def consume_results(self):
+        self.consumed = True
+
+    def reset_session(self):
+        if self.broken:
+            raise RuntimeError("connection lost")
+        self.resets += 1
+
+    def ping(self, reconnect=False):
+        pass
+
+    def disconnect(self):
+        self.disconnected = True
+
+
+class FakeAsyncPool:
+    """aiomysql pool double; without a connection, acquire() waits forever like an exhausted or hung pool."""
+
+    def __init__(self, connection=None, size=0, freesize=0):
+        self.connection = connection
+        self.size = size
+        self.freesize = freesize
+
+    async def acquire(self):
+        if self.connection is None:
+            await asyncio.Event().wait()
+        return self.connection
+
+
+@pytest.fixture
+def fake_connection():
+    """Factory of FakeConnections answering statements with a handler."""
+    return FakeConnection
+
+
+@pytest.fixture
+def fake_async_pool():
+    """Factory of FakeAsyncPools."""
+    return FakeAsyncPool
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """
+    Serve get_db in the given modules from one FakeConnection.
+
+    Returns:
+        fake_db(handler, *modules) -> the FakeConnection
+    """
+    def patch(handler, *modules):
+        conn = FakeConnection(handler)
+
+        @contextmanager
+        def fake_get_db(read_only=False):
+            yield conn
+
+        for module in modules:
+            monkeypatch.setattr(module, "get_db", fake_get_db)
+        return conn
+
+    return patch
+
+
 @pytest.fixture
 def client():
     """Create a test client."""
+    from app.main import app
     return TestClient(app)
 
 
@@ -0,0 +1,102 @@
+"""Bill render worker tests."""
+import json
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+
+from app.core.exceptions import DatabasePoolTimeoutError
+from app.services import bill_render_service
+from app.services.bill_render_service import BillRenderWorker
+
+
+@pytest.fixture
+def db(fake_db):
+    """Connection whose claim query returns db.job (None: no job due)."""
+    def handler(cursor, sql, params):
+        if db.job is not None and sql.lstrip().startswith("SELECT"):
+            cursor.rows = [db.job]
+
+    db = fake_db(handler, bill_render_service)
+    db.job = None
+    return db
+
+
+def make_job(attempts=1):
+    return {
+        "id": 7, "bill_id": 42, "attempts": attempts,
+        "payload": json.dumps({"file_path": "unused.txt", "bill_text": "BILL"}),
+        "created_at": datetime.utcnow(),
+    }
+
+
+def updates(db):
+    return [(query, params) for query, params in db.statements if query.startswith("UPDATE")]
+
+
+def test_claim_marks_job_running(db):
+    """Test that a claimed job is locked, counted as an attempt and committed."""
+    db.job = make_job(attempts=0)
+
+    job = BillRenderWorker(poll_interval=0.01)._claim()
+
+    assert job["attempts"] == 1
+    [(query, params)] = updates(db)
+    assert "status = 'running'" in query and params[1] == 7
+    assert db.commits == 1
+
+
+def test_failed_render_is_retried_then_marked_failed(db, monkeypatch):
+    """Test exponential retry scheduling and the final 'failed' state."""
+    worker = BillRenderWorker(poll_interval=0.01, max_attempts=3, retry_base=10)
+
+    def broken_render(payload):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(worker, "render", broken_render)
+
+    worker._process(make_job(attempts=2))
+    [(query, params)] = updates(db)
+    assert "status = 'pending'" in query
+    assert params[0] == "OSError: disk full"
+    assert 19 <= (params[1] - datetime.utcnow()).total_seconds() <= 20
+
+    db.statements.clear()
+    worker._process(make_job(attempts=3))
+    [(query, params)] = updates(db)
+    assert "status = 'failed'" in query
+
+    metrics = worker.get_metrics()
+    assert (metrics["retries"], metrics["failed"], metrics["rendered"]) == (1, 1, 0)
+
+
+def test_worker_survives_pool_timeouts(monkeypatch):
+    """Test that pool timeouts while claiming, recording or finishing a job do not end the worker loop."""
+    worker = BillRenderWorker(poll_interval=0.01)
+
+    @contextmanager
+    def busy_get_db(read_only=False):
+        raise DatabasePoolTimeoutError("busy")
+        yield
+
+    monkeypatch.setattr(bill_render_service, "get_db", busy_get_db)
+    worker._record_failure(make_job(), OSError("disk full"))
+
+    calls = []
+
+    def claim():
+        calls.append(True)
+        if len(calls) == 1:
+            raise DatabasePoolTimeoutError("busy")
+        if len(calls) == 3:
+            worker._stop.set()
+        return make_job()
+
+    def process(job):
+        raise DatabasePoolTimeoutError("busy")
+
+    monkeypatch.setattr(worker, "_claim", claim)
+    monkeypatch.setattr(worker, "_process", process)
+    worker._run()
+
+    assert len(calls) == 3
@@ -0,0 +1,89 @@
+"""Bill service tests."""
+from collections import defaultdict
+
+import pytest
+
+from app.services import bill_service
+from app.services.bill_service import BillService
+from app.services.sales_rollup_service import SalesRollupService
+
+
+class FakeCheckoutDB:
+    """
+    products, cart and stock_history as seen by BillService.generate_bill.
+
+    The stock statements are applied the way MySQL runs them: the rows
+    joined as "c" are the cart lines, or one summed row per barcode when the
+    statement groups the cart first, and a multi-table UPDATE changes each
+    product row only once, using the first matching "c" row.
+    """
+
+    def __init__(self, products, cart):
+        self.products = dict(products)
+        self.cart = [dict(line) for line in cart]
+        self.stock_history = []
+
+    def joined_cart(self, sql):
+        if "GROUP BY barcode" not in sql:
+            return [(line["barcode"], line["quantity"]) for line in self.cart]
+        totals = defaultdict(int)
+        for line in self.cart:
+            totals[line["barcode"]] += line["quantity"]
+        return list(totals.items())
+
+    def execute(self, cursor, sql, params):
+        """Apply a statement to the tables and answer it on the cursor."""
+        sql = " ".join(sql.split())
+        if "FROM cart c" in sql and "FOR UPDATE" in sql:
+            cursor.rows = [dict(line, category_id=None) for line in self.cart]
+        elif sql.startswith("INSERT INTO stock_history"):
+            for barcode, quantity in self.joined_cart(sql):
+                previous = self.products.get(barcode, 0)
+                if barcode in self.products and previous > 0:
+                    new = max(previous - quantity, 0)
+                    self.stock_history.append((barcode, new - previous, previous, new))
+        elif sql.startswith("UPDATE products p"):
+            updated = set()
+            for barcode, quantity in self.joined_cart(sql):
+                if barcode in self.products and barcode not in updated:
+                    updated.add(barcode)
+                    self.products[barcode] = max(self.products[barcode] - quantity, 0)
+            cursor.rowcount = len(updated)
+        elif sql.startswith("DELETE FROM cart"):
+            cursor.rowcount, self.cart = len(self.cart), []
+
+
+@pytest.fixture
+def checkout(fake_db, monkeypatch):
+    def make(products, cart):
+        db = FakeCheckoutDB(products, cart)
+        db.conn = fake_db(db.execute, bill_service)
+        return db
+
+    monkeypatch.setattr(SalesRollupService, "record_bill", staticmethod(lambda *args: None))
+    monkeypatch.setattr(bill_service.bill_render_worker, "enqueue", lambda *args: None)
+    return make
+
+
+def test_generate_bill_with_repeated_product_lines(checkout, monkeypatch):
+    """Test that several cart lines for one product decrement its stock and log its history once, by their sum."""
+    line = {"product_name": "Milk", "price": 1.5, "details": "1L", "timestamp": None}
+    db = checkout(
+        {"111": 10, "222": 4},
+        [
+            dict(line, barcode="111", quantity=2),
+            dict(line, barcode="222", quantity=1),
+            dict(line, barcode="111", quantity=3),
+        ]
+    )
+
+    rollups = []
+    monkeypatch.setattr(SalesRollupService, "record_bill", staticmethod(lambda *args: rollups.append(args)))
+
+    bill = BillService().generate_bill(cashier_name="alice")
+
+    assert bill["subtotal"] == 9.0
+    assert rollups[0][1].microsecond == 0
+    assert db.products == {"111": 5, "222": 3}
+    assert sorted(db.stock_history) == [("111", -5, 10, 5), ("222", -1, 4, 3)]
+    assert db.cart == [] and db.conn.commits == 1
@@ -0,0 +1,190 @@
+"""Cart service tests."""
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import HTTPException
+from mysql.connector import Error, errorcode
+
+from app.services import cart_service
+from app.services.cart_service import AsyncCartService, CartService
+
+PRODUCT = {"product_name": "Milk", "price": 1.5, "details": "1L"}
+CATALOG = {"111": {"product_name": "Milk 1L", "price": 2.0, "details": "", "quantity": 5}}
+
+
+class FakeCartTable:
+    """
+    Products and cart lines with the outcomes of ADD_PRODUCT_UPSERT.
+
+    Like MySQL: rowcount 1 and no LAST_INSERT_ID on insert, rowcount 2 and
+    LAST_INSERT_ID(new quantity) on increment, rowcount 0 and
+    LAST_INSERT_ID(current quantity) when the stock check refuses the add.
+    Omitted (NULL) fields come from the product on insert and are kept on
+    increment.
+    """
+
+    def __init__(self, products, deadlocks=0):
+        self.products = products
+        self.cart = {}
+        self.deadlocks = deadlocks
+        self.executions = 0
+
+    def quantities(self):
+        return {barcode: line["quantity"] for barcode, line in self.cart.items()}
+
+    def upsert(self, sql, params):
+        assert sql == CartService.ADD_PRODUCT_UPSERT
+        self.executions += 1
+        if self.deadlocks:
+            self.deadlocks -= 1
+            raise self.deadlock_error()
+        product_name, price, quantity, details, timestamp, barcode = params[:6]
+        product = self.products.get(barcode)
+        if product is None or product["quantity"] < quantity:
+            return 0, 0
+        line = self.cart.get(barcode)
+        if line is None:
+            self.cart[barcode] = {
+                "barcode": barcode,
+                "product_name": product_name or product["product_name"],
+                "price": product["price"] if price is None else price,
+                "quantity": quantity,
+                "details": details or product["details"] or "to fill",
+                "timestamp": timestamp,
+            }
+            return 1, 0
+        if line["quantity"] + quantity > product["quantity"]:
+            return 0, line["quantity"]
+        line.update(
+            product_name=product_name or line["product_name"],
+            price=line["price"] if price is None else price,
+            details=details or line["details"] or "to fill",
+            quantity=line["quantity"] + quantity,
+            timestamp=timestamp,
+        )
+        return 2, line["quantity"]
+
+    def select(self, sql, params):
+        assert sql == CartService.CART_ITEM_BY_BARCODE
+        line = self.cart.get(params[0])
+        return [dict(line)] if line else []
+
+    def execute(self, cursor, sql, params):
+        if sql.startswith("SELECT"):
+            cursor.rows = self.select(sql, params)
+        else:
+            cursor.rowcount, cursor.lastrowid = self.upsert(sql, params)
+
+    def deadlock_error(self):
+        return Error(msg="Deadlock found", errno=errorcode.ER_LOCK_DEADLOCK)
+
+
+@pytest.fixture
+def table(fake_db):
+    table = FakeCartTable({barcode: dict(product) for barcode, product in CATALOG.items()})
+    table.conn = fake_db(table.execute, cart_service)
+    return table
+
+
+def test_add_product_inserts_then_increments(table, monkeypatch):
+    """Test that the first add inserts the line and later adds increment it up to the stock."""
+    monkeypatch.setattr(cart_service.InventoryService, "get_product", lambda self, barcode: {"quantity": 5})
+    service = CartService()
+
+    item = service.add_product("111", dict(PRODUCT, quantity=2))
+    assert item["quantity"] == 2 and item["product_name"] == "Milk"
+
+    item = service.add_product("111", dict(PRODUCT, quantity=3))
+    assert item["quantity"] == 5
+    assert table.quantities() == {"111": 5}
+
+    with pytest.raises(HTTPException) as exc:
+        service.add_product("111", dict(PRODUCT, quantity=1))
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Insufficient inventory. Available: 5, Requested: 6"
+    assert table.quantities() == {"111": 5}
+
+
+def test_add_product_retries_deadlocks(table):
+    """Test that a deadlocked upsert is rolled back and retried, and gives up after DEADLOCK_RETRIES."""
+    table.deadlocks = 1
+    item = CartService().add_product("111", dict(PRODUCT, quantity=1))
+
+    assert item["quantity"] == 1
+    assert table.executions == 2
+    assert (table.conn.rollbacks, table.conn.commits) == (1, 1)
+
+    table.deadlocks = CartService.DEADLOCK_RETRIES
+    with pytest.raises(Error):
+        CartService().add_product("111", dict(PRODUCT, quantity=1))
+    assert table.quantities() == {"111": 1}
+
+
+def test_rescan_keeps_cart_line_fields(table):
+    """Test that a scan without name, price or details fills a new line from the product and keeps an edited line's values."""
+    service = CartService()
+
+    item = service.add_product("111", {"quantity": 1})
+    assert (item["product_name"], item["price"], item["details"]) == ("Milk 1L", 2.0, "to fill")
+
+    table.cart["111"]["price"] = 1.25
+    table.products["111"]["price"] = 3.0
+    item = service.add_product("111", {"quantity": 1, "price": None, "details": ""})
+    assert (item["product_name"], item["price"], item["quantity"]) == ("Milk 1L", 1.25, 2)
+    assert table.cart["111"]["price"] == 1.25
+
+
+class FakeAsyncCursor:
+    """aiomysql cursor double; aiomysql errors carry the errno as args[0]."""
+
+    def __init__(self, table):
+        self.table = table
+        self.rowcount = -1
+        self.lastrowid = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, sql, params=()):
+        if sql.startswith("SELECT"):
+            self.rows = self.table.select(sql, params)
+            return
+        try:
+            self.rowcount, self.lastrowid = self.table.upsert(sql, params)
+        except Error as e:
+            raise cart_service.AsyncDBError(e.errno, e.msg)
+
+    async def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeAsyncConnection:
+    def __init__(self, table):
+        self.table = table
+
+    def cursor(self, cursor_class=None):
+        return FakeAsyncCursor(self.table)
+
+
+async def test_async_add_product(table, monkeypatch):
+    """Test the async upsert path: insert, increment and deadlock retry."""
+
+    @asynccontextmanager
+    async def fake_get_async_db(read_only=False):
+        yield FakeAsyncConnection(table)
+
+    monkeypatch.setattr(cart_service, "get_async_db", fake_get_async_db)
+    service = AsyncCartService()
+
+    assert (await service.add_product("111", dict(PRODUCT, quantity=1)))["quantity"] == 1
+    table.deadlocks = 1
+    assert (await service.add_product("111", dict(PRODUCT, quantity=2)))["quantity"] == 3
+    assert table.executions == 3
+    assert table.quantities() == {"111": 3}
+
+    table.cart["111"]["price"] = 0.5
+    item = await service.add_product("111", {"quantity": 1})
+    assert (item["price"], item["quantity"]) == (0.5, 4)
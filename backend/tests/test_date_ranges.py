@@ -0,0 +1,31 @@
+"""Report and listing date range tests."""
+from datetime import datetime
+
+import pytest
+
+from app.core.exceptions import InvalidDateRangeError
+from app.utils.date_ranges import month_range, period_range, week_range
+
+
+def test_date_ranges_are_half_open():
+    """Test that calendar periods become half-open created_at ranges."""
+    clauses, params = period_range("2024-02-28", "2024-02-29").clauses()
+    assert clauses == ["created_at >= %s", "created_at < %s"]
+    assert params == [datetime(2024, 2, 28), datetime(2024, 3, 1)]
+
+    assert week_range("2024-12-30").end == datetime(2025, 1, 6)
+    assert month_range(2024, 12) == (datetime(2024, 12, 1), datetime(2025, 1, 1))
+    assert period_range(None, None).clauses() == ([], [])
+    assert period_range(end_date="2024-01-31").clauses("b.created_at") == (
+        ["b.created_at < %s"], [datetime(2024, 2, 1)]
+    )
+
+
+def test_date_ranges_reject_invalid_input():
+    """Test that malformed or inverted periods raise InvalidDateRangeError."""
+    with pytest.raises(InvalidDateRangeError):
+        period_range("2024-13-01")
+    with pytest.raises(InvalidDateRangeError):
+        period_range("2024-02-02", "2024-02-01")
+    with pytest.raises(InvalidDateRangeError):
+        month_range(2024, 0)
@@ -0,0 +1,145 @@
+"""Bounded connection pool tests."""
+import threading
+import time
+
+import pytest
+
+from app.core import async_database, db_pool
+from app.core.async_database import AsyncMySQLPool, get_async_db
+from app.core.config import settings
+from app.core.db_pool import BoundedConnectionPool
+from app.core.exceptions import DatabasePoolTimeoutError
+
+
+def count_prepares(cursor, sql, params):
+    """Count a statement prepare on the connection when a cursor executes a new statement."""
+    if sql is not getattr(cursor, "prepared_sql", None):
+        cursor.conn.prepares += 1
+        cursor.prepared_sql = sql
+
+
+@pytest.fixture
+def make_pool(monkeypatch, fake_connection):
+    """Build pools whose connections are FakeConnections."""
+    def connect(**config):
+        cnx = fake_connection(count_prepares)
+        cnx.prepares = 0
+        return cnx
+
+    monkeypatch.setattr(db_pool.mysql.connector, "connect", connect)
+    pools = []
+
+    def make(**options):
+        settings = dict(
+            min_size=1, max_size=2, acquire_timeout=0.2, max_waiters=0, idle_timeout=60, ping_interval=60,
+            statement_cache_size=2
+        )
+        settings.update(options)
+        pool = BoundedConnectionPool({}, **settings)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def test_pool_grows_queues_and_times_out(make_pool):
+    """Test growth to max_size, a waiter being handed a returned connection, and the timeout."""
+    pool = make_pool()
+    first, second = pool.get_connection(), pool.get_connection()
+    assert pool.get_stats()["size"] == 2
+
+    with pytest.raises(DatabasePoolTimeoutError):
+        pool.get_connection(timeout=0.05)
+
+    threading.Timer(0.05, first.close).start()
+    third = pool.get_connection(timeout=2)
+    stats = pool.get_stats()
+    assert stats["in_use"] == 2 and stats["exhausted"] == 2 and stats["timeouts"] == 1
+    assert stats["wait_seconds_max"] >= 0.04
+    third.close()
+    second.close()
+    assert pool.get_stats()["idle"] == 2
+
+
+def test_pool_discards_broken_connections_and_reaps_idle(make_pool):
+    """Test that unresettable connections are dropped and idle ones reaped down to min_size."""
+    pool = make_pool(max_size=3, idle_timeout=0.01)
+    connections = [pool.get_connection() for _ in range(3)]
+    connections[0]._cnx.broken = True
+    for conn in connections:
+        conn.close()
+
+    stats = pool.get_stats()
+    assert stats["discarded"] == 1 and stats["size"] == 2
+
+    time.sleep(0.02)
+    assert pool.reap_idle() == 1
+    assert pool.get_stats()["size"] == 1
+
+    with pytest.raises(Exception):
+        connections[1].cursor()
+
+
+def test_prepared_statements_survive_checkouts_until_reset(make_pool):
+    """Test statement reuse across checkouts, LRU eviction, and clearing on reset and reconnect."""
+    pool = make_pool(max_size=1, reset_session=False)
+    for _ in range(3):
+        conn = pool.get_connection()
+        conn.execute_prepared("SELECT * FROM products WHERE barcode = %s", ("1",))
+        conn.close()
+    cnx = pool._idle[-1][0]
+    assert cnx.prepares == 1
+
+    conn = pool.get_connection()
+    conn.execute_prepared("SELECT 2")
+    conn.execute_prepared("SELECT 3")
+    conn.execute_prepared("SELECT * FROM products WHERE barcode = %s", ("1",))
+    stats = pool.get_stats()
+    assert stats["statements_reused"] == 2 and stats["statements_evicted"] == 2 and cnx.prepares == 4
+
+    cnx.connection_id = 2  # reconnected: new server session
+    conn.execute_prepared("SELECT 3")
+    assert cnx.prepares == 5
+    conn.close()
+
+    pool.reset_session = True
+    conn = pool.get_connection()
+    conn.close()
+    assert len(pool.prepared_statements(cnx)) == 0
+
+
+def test_lean_checkout_resets_only_dirty_sessions(make_pool):
+    """Test that clean checkins skip the reset, dirty ones and every Nth clean one do not."""
+    pool = make_pool(max_size=1, reset_when_dirty=True, reset_every=3)
+    conn = pool.get_connection()
+    cnx = conn._cnx
+    conn.execute_prepared("SELECT 1")
+    cnx.in_transaction = True
+    conn.close()
+    assert cnx.resets == 0 and cnx.rollbacks == 1 and len(pool.prepared_statements(cnx)) == 1
+
+    conn = pool.get_connection()
+    conn.time_zone = "+00:00"
+    conn.close()
+    assert cnx.resets == 1 and cnx.time_zone == "+00:00"
+
+    for _ in range(3):
+        pool.get_connection().close()
+    stats = pool.get_stats()
+    assert cnx.resets == 2 and stats["session_resets"] == 2 and stats["resets_avoided"] == 3
+
+
+async def test_async_acquire_times_out(monkeypatch, fake_async_pool):
+    """Test that an exhausted async pool fails with DatabasePoolTimeoutError instead of waiting forever."""
+    monkeypatch.setattr(settings, "DB_POOL_ACQUIRE_TIMEOUT", 0.05)
+    pool = AsyncMySQLPool()
+    pool.pool = fake_async_pool(size=2)
+    monkeypatch.setattr(async_database, "async_pool", pool)
+
+    start = time.monotonic()
+    with pytest.raises(DatabasePoolTimeoutError):
+        async with get_async_db():
+            pass
+    assert time.monotonic() - start < 1
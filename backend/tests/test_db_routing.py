@@ -0,0 +1,82 @@
+"""Read-replica routing tests."""
+from mysql.connector import Error
+
+from app.core import async_database
+from app.core.async_database import AsyncMySQLPool
+from app.core.database import MySQLConnectionPool
+from app.core.db_routing import ReplicaSet, begin_request_scope, end_request_scope, parse_hosts
+from app.core.exceptions import DatabasePoolTimeoutError
+
+
+class FakePool:
+    """Pool double returning its own name, or raising a given error."""
+
+    def __init__(self, name, error=None, in_use=0):
+        self.name = name
+        self.error = error
+        self.in_use = in_use
+
+    def get_connection(self):
+        if self.error:
+            raise self.error
+        return self.name
+
+    def get_stats(self):
+        return {"in_use": self.in_use}
+
+
+def make_router(*replicas, selection="round_robin"):
+    """Build a MySQLConnectionPool around fake pools without touching MySQL."""
+    router = MySQLConnectionPool.__new__(MySQLConnectionPool)
+    router.pool = FakePool("primary")
+    router.replicas = ReplicaSet(
+        [(pool.name, pool) for pool in replicas], selection, retry_seconds=60, in_use=lambda pool: pool.in_use
+    )
+    return router
+
+
+def test_replica_selection_and_parse_hosts():
+    """Test round-robin rotation, least-connections ordering and host parsing."""
+    router = make_router(FakePool("a"), FakePool("b"))
+    assert [router.get_connection(read_only=True) for _ in range(3)] == ["a", "b", "a"]
+
+    router = make_router(FakePool("a", in_use=5), FakePool("b", in_use=1), selection="least_connections")
+    assert router.get_connection(read_only=True) == "b"
+
+    assert parse_hosts("r1, r2:3307,", 3306) == [("r1", 3306), ("r2", 3307)]
+
+
+def test_failover_and_read_your_writes():
+    """Test failover past broken and busy replicas, and reads pinned to the primary after a write."""
+    broken = FakePool("broken", error=Error("connection refused"))
+    busy = FakePool("busy", error=DatabasePoolTimeoutError("busy"))
+    router = make_router(broken, busy)
+
+    assert router.get_connection(read_only=True) == "primary"
+    stats = router.get_replica_stats()
+    assert stats["primary_fallbacks"] == 1
+    assert [(r["name"], r["healthy"]) for r in stats["replicas"]] == [("broken", False), ("busy", True)]
+
+    router = make_router(FakePool("replica"))
+    token = begin_request_scope()
+    try:
+        assert router.get_connection(read_only=True) == "replica"
+        assert router.get_connection() == "primary"
+        assert router.get_connection(read_only=True) == "primary"
+    finally:
+        end_request_scope(token)
+    assert router.get_connection(read_only=True) == "replica"
+    assert router.replicas.get_stats()["pinned_reads"] == 1
+
+
+async def test_async_replica_timeout_marks_unconnected_replica_down(monkeypatch, fake_async_pool):
+    """Test that an acquire timeout marks a replica with no connections down, but not a busy one."""
+    monkeypatch.setattr(async_database.settings, "DB_POOL_ACQUIRE_TIMEOUT", 0.01)
+    router = AsyncMySQLPool()
+    router.pool = fake_async_pool(connection="primary")
+    hung, busy = fake_async_pool(), fake_async_pool(size=3)
+    router.replicas = ReplicaSet([("hung", hung), ("busy", busy)], "round_robin", 60, async_database._pool_in_use)
+
+    assert await router.acquire(read_only=True) == (router.pool, "primary")
+    stats = router.get_replica_stats()
+    assert [(r["name"], r["healthy"]) for r in stats["replicas"]] == [("hung", False), ("busy", True)]
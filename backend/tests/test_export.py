@@ -0,0 +1,43 @@
+"""Streaming export tests."""
+import gzip
+from datetime import datetime
+
+from app.services import export_service
+from app.services.export_service import ExportService
+
+
+def serve_rows(rows):
+    """Handler answering the export query with rows."""
+    def handler(cursor, sql, params):
+        assert cursor.options == {"buffered": False}
+        cursor.rows = list(rows)
+    return handler
+
+
+def test_gzipped_csv_export_streams_every_chunk(fake_db):
+    """Test that a chunked, gzipped CSV export round-trips all rows."""
+    rows = [(f"B{i}", f'Item, "{i}"', 1.5, i, None, 0, None, datetime(2026, 1, 1)) for i in range(7)]
+    conn = fake_db(serve_rows(rows), export_service)
+
+    chunks, media_type, filename = ExportService(fetch_size=3).export("products")
+    lines = gzip.decompress(b"".join(chunks)).decode("utf-8").splitlines()
+
+    assert media_type == "application/gzip" and filename.endswith(".csv.gz")
+    assert lines[0].startswith("barcode,product_name,price")
+    assert lines[1] == 'B0,"Item, ""0""",1.5,0,,0,,2026-01-01 00:00:00'
+    assert len(lines) == 8
+    assert not conn.consumed
+
+
+def test_abandoned_export_drains_unread_rows(fake_db):
+    """Test that stopping early drains the cursor before releasing the connection."""
+    rows = [(i, "B", 1, 0, 1, "Sale", None, datetime(2026, 1, 1)) for i in range(10)]
+    conn = fake_db(serve_rows(rows), export_service)
+
+    chunks, media_type, _ = ExportService(fetch_size=4).export("stock-history", "ndjson", compress=False)
+    first = next(chunks)
+    chunks.close()
+
+    assert media_type == "application/x-ndjson"
+    assert first.count(b"\n") == 4
+    assert conn.consumed
@@ -0,0 +1,114 @@
+"""Product cache invalidation tests."""
+import re
+
+import pytest
+
+from app.services import bill_service, inventory_service, product_import_service
+from app.services.bill_service import BillService
+from app.services.inventory_service import InventoryService, product_cache
+from app.services.product_import_service import ProductImport
+from app.services.sales_rollup_service import SalesRollupService
+
+PRODUCT = {
+    "barcode": "111", "product_name": "Milk", "price": 1.5, "quantity": 10, "details": "1L",
+    "reorder_point": 0, "category_id": None, "timestamp": None,
+}
+
+
+class FakeProductsDB:
+    """products and cart tables for the statements of the writers that touch the product cache."""
+
+    def __init__(self):
+        self.products = {"111": dict(PRODUCT)}
+        self.cart = []
+        self.reads = 0
+
+    def execute(self, cursor, sql, params):
+        if sql == InventoryService.PRODUCT_BY_BARCODE:
+            self.reads += 1
+        sql = " ".join(sql.split())
+        products = self.products
+        if sql.startswith("SELECT * FROM products WHERE barcode = %s"):
+            cursor.rows = [dict(products[params[0]])] if params[0] in products else []
+        elif sql.startswith("UPDATE products SET"):
+            columns = re.findall(r"(\w+) = %s", sql.split(" WHERE ")[0])
+            products[params[-1]].update(zip(columns, params))
+        elif sql.startswith("DELETE FROM products"):
+            products.pop(params[0], None)
+        elif sql.startswith("SELECT barcode, quantity"):
+            cursor.rows = [dict(products[barcode]) for barcode in params if barcode in products]
+        elif sql.startswith("INSERT INTO products"):
+            columns = ["barcode", "product_name", "price", "quantity", "details", "reorder_point", "category_id", "timestamp"]
+            for start in range(0, len(params), len(columns)):
+                row = dict(zip(columns, params[start:start + len(columns)]))
+                products[row["barcode"]] = row
+        elif "FROM cart c" in sql and "FOR UPDATE" in sql:
+            cursor.rows = [dict(line, category_id=None) for line in self.cart]
+        elif sql.startswith("UPDATE products p"):
+            for line in self.cart:
+                product = products[line["barcode"]]
+                product["quantity"] = max(product["quantity"] - line["quantity"], 0)
+            cursor.rowcount = len(self.cart)
+        elif sql.startswith("DELETE FROM cart"):
+            cursor.rowcount, self.cart = len(self.cart), []
+
+
+@pytest.fixture
+def db(fake_db, monkeypatch):
+    db = FakeProductsDB()
+    fake_db(db.execute, inventory_service, bill_service, product_import_service)
+    monkeypatch.setattr(SalesRollupService, "record_bill", staticmethod(lambda *args: None))
+    monkeypatch.setattr(bill_service.bill_render_worker, "enqueue", lambda *args: None)
+    product_cache.clear()
+    yield db
+    product_cache.clear()
+
+
+def cached_read(db):
+    """Read product 111 through the cache and tell whether the database was hit."""
+    reads = db.reads
+    product = InventoryService().get_product("111")
+    return product, db.reads > reads
+
+
+def test_cache_serves_repeated_reads(db):
+    """Test that a second read of an unchanged product is served from the cache."""
+    assert cached_read(db)[1]
+    product, hit_db = cached_read(db)
+    assert product["quantity"] == 10 and not hit_db
+
+
+def test_update_and_delete_invalidate(db):
+    """Test that updating and deleting a product drop its cached row."""
+    cached_read(db)
+    InventoryService().update_product("111", {"price": 2.0})
+    product, hit_db = cached_read(db)
+    assert product["price"] == 2.0 and hit_db
+
+    InventoryService().delete_product("111")
+    product, hit_db = cached_read(db)
+    assert product is None and hit_db
+
+
+def test_checkout_invalidates_sold_products(db):
+    """Test that generating a bill drops the cached rows of the products sold."""
+    cached_read(db)
+    db.cart = [{"barcode": "111", "product_name": "Milk", "price": 1.5, "quantity": 4, "details": "1L", "timestamp": None}]
+
+    BillService().generate_bill()
+
+    product, hit_db = cached_read(db)
+    assert product["quantity"] == 6 and hit_db
+
+
+def test_import_invalidates_imported_products(db):
+    """Test that a product import drops the cached rows of the imported barcodes."""
+    cached_read(db)
+    product_import = ProductImport("csv", max_errors=10)
+    batches = product_import.feed(b"barcode,product_name,price,quantity\n111,Whole milk,1.75,30\n")
+    batches.extend(product_import.finish())
+    for batch in batches:
+        product_import.write_batch(batch)
+
+    product, hit_db = cached_read(db)
+    assert (product["product_name"], product["quantity"]) == ("Whole milk", 30) and hit_db
@@ -0,0 +1,58 @@
+"""Migration tests."""
+import re
+from datetime import datetime
+
+from mysql.connector import Error
+
+from app.core import migrations
+from app.services.sales_rollup_service import SalesRollupService
+
+
+def existing_schema(migrations_done):
+    """
+    Handler for a database where every table already exists.
+
+    CREATE TABLE fails with 1050 like it does through the pool, where
+    raise_on_warnings turns IF NOT EXISTS's note into an error.
+    """
+    def handler(cursor, query, params):
+        cursor.rows = [(0,)]
+        if "CREATE TABLE" in query:
+            raise Error(msg="Table already exists", errno=1050)
+        if "INFORMATION_SCHEMA.TABLES" in query:
+            cursor.rows = [(1,)]
+        elif "FROM schema_migrations" in query:
+            cursor.rows = [(int(params[0] in migrations_done),)]
+        elif "INSERT INTO schema_migrations" in query:
+            migrations_done.add(params[0])
+        elif "EXISTS(SELECT 1 FROM sales_daily)" in query:
+            cursor.rows = [(0, 1)]
+        elif "FROM bills b" in query:
+            cursor.rows = [(1, "", None), (2, "", datetime(2024, 6, 15, 9))] if params[0] == 0 else []
+    return handler
+
+
+def test_migrate_existing_tables_runs_backfill_and_rollup_rebuild(fake_db, monkeypatch):
+    """Test that existing tables are not created again, do not stop the bill_items backfill or the rollup rebuild, and the backfill runs once."""
+    migrations_done = set()
+    conn = fake_db(existing_schema(migrations_done), migrations)
+    rebuilds = []
+    monkeypatch.setattr(SalesRollupService, "rebuild", lambda self, *args, **kwargs: rebuilds.append(True))
+
+    migrations.migrate_database()
+
+    statements = [statement for statement, _ in conn.statements]
+    assert rebuilds == [True]
+    assert migrations_done == {migrations.BILL_ITEMS_BACKFILL_MIGRATION}
+    backfill_reads = [s for s in statements if "FROM bills b" in s]
+    assert len(backfill_reads) == 2
+    recreated = [
+        table for table in ("bill_items", "sales_hourly", "sales_daily", "bill_render_jobs")
+        if any(re.search(rf"CREATE TABLE (IF NOT EXISTS )?{table}\b", s) for s in statements)
+    ]
+    assert recreated == []
+
+    conn.statements.clear()
+    migrations.migrate_database()
+
+    assert not [s for s, _ in conn.statements if "FROM bills b" in s]
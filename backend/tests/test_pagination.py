@@ -0,0 +1,30 @@
+"""Keyset pagination cursor tests."""
+from datetime import datetime
+
+import pytest
+
+from app.core.exceptions import InvalidCursorError
+from app.utils.pagination import build_page, decode_cursor, encode_cursor, keyset_condition
+
+
+def test_page_cursor_round_trip():
+    """Test that a page token carries the last row's sort key."""
+    rows = [{"created_at": datetime(2024, 6, 15, 10, 30), "id": bill_id} for bill_id in (9, 8, 7)]
+    page = build_page(rows, 2, "bills", ("created_at", "id"))
+
+    assert page.items == rows[:2]
+    assert decode_cursor("bills", page.next_cursor) == [datetime(2024, 6, 15, 10, 30), 8]
+    assert build_page(rows, 3, "bills", ("created_at", "id")).next_cursor is None
+
+
+def test_page_cursor_rejects_foreign_or_garbled_tokens():
+    """Test that tokens only work for the listing that issued them."""
+    token = encode_cursor("users", [None, "abc"])
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("bills", token)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("users", "not-a-cursor")
+    assert keyset_condition("added_at", "id", decode_cursor("users", token)) == (
+        "(added_at IS NULL AND id < %s)", ["abc"]
+    )
@@ -0,0 +1,71 @@
+"""Bulk product import parsing tests."""
+import pytest
+
+from app.services.product_import_service import MAX_RECORD_LINES, ProductImport
+
+
+def feed_all(product_import, body: bytes, chunk_size: int):
+    """Feed a body in fixed-size chunks and collect the batches."""
+    batches = []
+    for start in range(0, len(body), chunk_size):
+        batches.extend(product_import.feed(body[start:start + chunk_size]))
+    batches.extend(product_import.finish())
+    return batches
+
+
+def test_csv_rows_survive_chunk_boundaries():
+    """Test that records split across chunks, quotes and lines parse intact."""
+    body = (
+        "\ufeffbarcode,product_name,price,quantity,details\r\n"
+        "111,\"Chips, \"\"salty\"\"\",2.499,5,\"two\nlines\"\r\n"
+        "222,Cola,1,,\r\n"
+        "333,Bad,-1,1,\r\n"
+        "444,Tea,3,2,"
+    ).encode("utf-8")
+    product_import = ProductImport("csv", batch_size=2, max_errors=10)
+
+    batches = feed_all(product_import, body, chunk_size=5)
+
+    assert [[row for row, _ in batch] for batch in batches] == [[1, 2], [4]]
+    assert batches[0][0][1] == {
+        "barcode": "111", "product_name": 'Chips, "salty"', "price": 2.5, "quantity": 5, "details": "two\nlines"
+    }
+    assert "quantity" not in batches[0][1][1]
+    assert product_import.errors == [{"row": 3, "barcode": "333", "error": "Price cannot be negative"}]
+
+
+def test_ndjson_reports_bad_lines_and_rejects_bad_csv_header():
+    """Test per-row errors for NDJSON and a hard failure for a bad CSV header."""
+    product_import = ProductImport("ndjson", max_errors=10)
+    batches = feed_all(product_import, b'{"barcode": "1", "product_name": "A", "price": 1}\n[]\n{"barcode": "2"}\n', 7)
+
+    assert [row for row, _ in batches[0]] == [1]
+    assert [error["row"] for error in product_import.errors] == [2, 3]
+    assert product_import.report()["rows"] == 3
+
+    with pytest.raises(ValueError):
+        ProductImport("csv").feed(b"barcode,name\n1,A\n")
+
+
+def test_csv_bad_records_are_row_errors():
+    """Test that inch marks parse, and malformed or unterminated records fail alone without stopping the import."""
+    body = (
+        'barcode,product_name,price\n'
+        '12345678,TV 32" LED,10\n'
+        '222,"Cola"x,1\n'
+        '333,Tea,2\n'
+        '444,"Open quote,3\n'
+        + "more\n" * MAX_RECORD_LINES +
+        '555,Salt,1\n'
+        '666,"Sugar\n'
+    ).encode("utf-8")
+    product_import = ProductImport("csv", max_errors=2 * MAX_RECORD_LINES)
+
+    batches = feed_all(product_import, body, chunk_size=7)
+
+    products = [product for batch in batches for _, product in batch]
+    assert [product["barcode"] for product in products] == ["12345678", "333", "555"]
+    assert products[0]["product_name"] == 'TV 32" LED'
+    errors = {error["row"]: error["error"] for error in product_import.errors if error["barcode"] is None}
+    assert errors[2].startswith("Invalid CSV") and errors[4].startswith("Record spans more than")
+    assert list(errors)[-1] == product_import.report()["rows"]
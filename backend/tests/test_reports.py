@@ -0,0 +1,144 @@
+"""Report service tests."""
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import reports
+from app.core.cache import ReportCache
+from app.services import report_service
+from app.services.report_service import ReportService
+
+ROLLUP_ROWS = [
+    {
+        "payment": "cash", "cashier": "alice", "day": date(2024, 6, 15), "hour": datetime(2024, 6, 15, 9),
+        "count": Decimal(2), "subtotal": Decimal("20.00"), "discount": Decimal("0.00"),
+        "tax": Decimal("2.00"), "total": Decimal("22.00"),
+    },
+    {
+        "payment": "card", "cashier": "", "day": date(2024, 6, 15), "hour": datetime(2024, 6, 15, 10),
+        "count": Decimal(1), "subtotal": Decimal("10.00"), "discount": Decimal("1.00"),
+        "tax": Decimal("0.90"), "total": Decimal("9.90"),
+    },
+]
+
+
+def rollup_rows(cursor, sql, params):
+    """Answer report queries with the canned rollup rows (and no bill items)."""
+    cursor.rows = [] if "bill_items" in sql else [dict(row) for row in ROLLUP_ROWS]
+
+
+@pytest.fixture
+def statements(fake_db, monkeypatch):
+    """Replace the report service's database with a statement recorder."""
+    conn = fake_db(rollup_rows, report_service)
+    monkeypatch.setattr(report_service, "report_cache", ReportCache(maxsize=16, open_ttl=60))
+    return conn.statements
+
+
+def test_daily_report_runs_two_queries(statements):
+    """Test that the daily report reads sales once plus the top products."""
+    report = ReportService().get_daily_sales(date="2024-06-15")
+
+    assert len(statements) == 2
+    assert report["summary"]["total_bills"] == 3
+    assert report["summary"]["total_amount"] == 31.9
+    assert [row["method"] for row in report["payment_methods"]] == ["card", "cash"]
+    assert [row["hour"] for row in report["hourly_breakdown"]] == ["09:00", "10:00"]
+
+
+def test_weekly_and_monthly_reports_run_one_query_each(statements):
+    """Test that summary and breakdown come from the same query."""
+    weekly = ReportService().get_weekly_sales(week_start="2024-06-10")
+    monthly = ReportService().get_monthly_sales(year=2024, month=6)
+
+    assert len(statements) == 2
+    assert weekly["daily_breakdown"] == [{"date": "2024-06-15", "count": 3, "total": 31.9}]
+    assert [row["cashier"] for row in monthly["cashier_breakdown"]] == ["alice", "Unknown"]
+
+
+def test_sales_breakdowns_come_from_one_query(statements):
+    """Test that any combination of breakdowns costs a single query."""
+    report = ReportService().get_sales("2024-06-01", "2024-06-30", ["payment", "cashier", "hour"])
+
+    assert len(statements) == 1
+    assert "sales_hourly" in statements[0][0]
+    assert set(report["breakdowns"]) == {"payment", "cashier", "hour"}
+    assert report["breakdowns"]["cashier"][0] == {
+        "cashier": "alice", "count": 2, "subtotal": 20.0, "discount": 0.0, "tax": 2.0, "total": 22.0
+    }
+    assert report["breakdowns"]["hour"][1]["hour"] == "2024-06-15T10:00:00"
+    assert len(report["groups"]) == 2
+
+
+def test_closed_period_reports_are_cached_by_normalized_params(statements):
+    """Test that equivalent requests for a past day share one cached report."""
+    service = ReportService()
+    first = service.get_cached_report("daily", date="2024-06-15", cashier_name=None)
+    second = service.get_cached_report("daily", date="2024-6-15", cashier_name="")
+    report_service.report_cache.invalidate_open()
+    third = service.get_cached_report("daily", date="2024-06-15", cashier_name=None)
+
+    assert len(statements) == 2
+    assert first.closed
+    assert second is first and third is first
+    assert first.etag.startswith('"')
+
+
+def test_current_period_reports_are_dropped_by_checkout_invalidation(statements):
+    """Test that open-period reports are recomputed after invalidate_open."""
+    service = ReportService()
+    first = service.get_cached_report("weekly", cashier_name=None)
+    cached = service.get_cached_report("weekly", cashier_name=None)
+    report_service.report_cache.invalidate_open()
+    recomputed = service.get_cached_report("weekly", cashier_name=None)
+
+    assert not first.closed
+    assert cached is first
+    assert recomputed is not first
+    assert recomputed.etag == first.etag
+    assert len(statements) == 2
+
+
+def test_recently_ended_period_is_not_cached_as_closed(statements, monkeypatch):
+    """Test that a period stays open for REPORT_CACHE_TTL after its end, for late commits and replica lag."""
+    monkeypatch.setattr(report_service.settings, "REPORT_CACHE_TTL", 10 ** 10)
+    report = ReportService().get_cached_report("daily", date="2024-06-15", cashier_name=None)
+
+    assert not report.closed
+
+
+@pytest.fixture
+def report_client(statements):
+    """Test client for the report routes alone."""
+    app = FastAPI()
+    app.include_router(reports.router)
+    return TestClient(app)
+
+
+def test_report_etag_revalidation(report_client):
+    """Test ETag and Cache-Control headers, and 304 for matching If-None-Match or If-Modified-Since."""
+    response = report_client.get("/reports/daily", params={"date": "2024-06-15"})
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert response.json()["summary"]["total_bills"] == 3
+    assert response.headers["cache-control"] == f"max-age={reports.settings.REPORT_CACHE_MAX_AGE}"
+
+    for if_none_match in (etag, f'"other", W/{etag}', "*"):
+        response = report_client.get("/reports/daily", params={"date": "2024-06-15"}, headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304 and response.content == b""
+        assert response.headers["etag"] == etag
+
+    last_modified = response.headers["last-modified"]
+    response = report_client.get(
+        "/reports/daily", params={"date": "2024-06-15"},
+        headers={"If-None-Match": '"other"', "If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 200
+    response = report_client.get("/reports/daily", params={"date": "2024-06-15"}, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+    response = report_client.get("/reports/weekly")
+    assert response.status_code == 200 and response.headers["cache-control"] == "no-cache"
@@ -0,0 +1,23 @@
+"""Product search query tests."""
+from app.services.inventory_service import _product_list_query
+from app.utils.search import build_fulltext_query, escape_like, is_barcode_prefix
+
+
+def test_fulltext_query_requires_every_term():
+    """Test that search text becomes a safe boolean-mode ngram query."""
+    assert build_fulltext_query("coca cola") == '+"coca" +"cola"'
+    assert build_fulltext_query('tea "x" -(z)') == '+"tea" +x* +z*'
+    assert build_fulltext_query("+-*") is None
+    assert escape_like("50%_off") == "50\\%\\_off"
+    assert is_barcode_prefix("40001")
+    assert not is_barcode_prefix("cola")
+    assert not is_barcode_prefix("cola 1")
+
+
+def test_operator_only_search_keeps_a_filter():
+    """Test that search text without searchable terms filters by literal name prefix instead of listing everything."""
+    query, params = _product_list_query("-", None, None, None, None, 1, 20, None)
+    assert "product_name LIKE %s" in query and params[0] == "-%"
+
+    query, params = _product_list_query("cola", None, None, None, None, 1, 20, None)
+    assert "MATCH(product_name)" in query and "LIKE" not in query
@@ -1,5 +1,8 @@
 """Utility function tests."""
+import time
 from datetime import datetime
+from app.core.cache import TTLCache
+from app.utils.bill_text import parse_bill_items
 from app.utils.datetime_utils import serialize_datetime, serialize_datetime_optional
 
 
@@ -30,3 +33,60 @@ def test_serialize_datetime_optional():
     result = serialize_datetime_optional(dt)
     assert isinstance(result, str)
 
+
+def test_ttl_cache_lru_eviction():
+    """Test the least recently used entry is evicted when the cache is full."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_ttl_cache_negative_entries_expire():
+    """Test unknown keys are cached as None with their own TTL."""
+    cache = TTLCache(maxsize=10, ttl=60, negative_ttl=0.01)
+    cache.set("missing", None)
+    assert cache.get("missing") == (True, None)
+    time.sleep(0.02)
+    assert cache.get("missing") == (False, None)
+
+
+def test_ttl_cache_invalidation_discards_stale_load():
+    """Test a value loaded before an invalidation is not stored."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation
+    cache.invalidate("a")
+    cache.set("a", "stale", generation=generation)
+    assert cache.get("a") == (False, None)
+
+
+def test_parse_bill_items():
+    """Test parsing line items back out of a bill ticket."""
+    bill_text = "\n".join([
+        "BILL TICKET",
+        "-------------------------",
+        "Date: 2024-01-01 12:00:00",
+        "Cashier: Alice",
+        "-------------------------",
+        "Product: Milk: 1L",
+        "Quantity: 2",
+        "Price per Unit: 1.25 USD",
+        "Total Price: 2.5 USD",
+        "-------------------------",
+        "Product: Bread",
+        "Quantity: 1",
+        "Price per Unit: 3.0 USD",
+        "Total Price: 3.0 USD",
+        "-------------------------",
+        "Subtotal: 5.5 USD",
+        "Total: 5.5 USD",
+    ])
+    assert parse_bill_items(bill_text) == [
+        {"product_name": "Milk: 1L", "quantity": 2, "price": 1.25, "line_total": 2.5},
+        {"product_name": "Bread", "quantity": 1, "price": 3.0, "line_total": 3.0},
+    ]
+    assert parse_bill_items("") == []
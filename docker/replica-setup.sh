@@ -0,0 +1,23 @@
+#!/bin/sh
+# Seed the db_replica container from db and start GTID replication.
+# Run by the db_replica_setup service of docker-compose.yml; does nothing
+# once the replica is already replicating.
+set -e
+export MYSQL_PWD="$MYSQL_ROOT_PASSWORD"
+
+if [ -n "$(mysql -uroot -h db_replica -N -e 'SHOW REPLICA STATUS')" ]; then
+  echo "db_replica is already replicating from db"
+  exit 0
+fi
+
+# Copy everything written so far (including users and the GTID position)
+mysql -uroot -h db_replica -e "RESET MASTER"
+mysqldump -uroot -h db --all-databases --single-transaction --set-gtid-purged=ON \
+  --triggers --routines --events | mysql -uroot -h db_replica
+
+mysql -uroot -h db_replica -e "
+  CHANGE REPLICATION SOURCE TO
+    SOURCE_HOST='db', SOURCE_USER='root', SOURCE_PASSWORD='$MYSQL_ROOT_PASSWORD',
+    SOURCE_AUTO_POSITION=1, GET_SOURCE_PUBLIC_KEY=1;
+  START REPLICA;"
+echo "db_replica is replicating from db"